@@ -6,13 +6,15 @@ import inspect
 import os
 import json
 import time
-from collections import deque
-from types import SimpleNamespace
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
 from datetime import datetime
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Mapping, Tuple, Optional
 
-from core.logging_utils import log_debug, log_info, log_warning, log_error
+from core.logging_utils import is_debug_enabled, log_debug, log_info, log_warning, log_error
 from core.prompt_engine import build_full_json_instructions
+from core.reply_stream import reply_stream
 from core.validation_registry import get_validation_registry
 from core.config_manager import config_registry
 
@@ -32,15 +34,19 @@ CORRECTOR_RETRIES = config_registry.get_var(
 
 _retry_tracker = {}
 
-
-def _extract_json_local(text: str):
-    """Local helper to extract JSON from text using transport_layer's extract_json_from_text.
-    
-    Returns:
-        Parsed JSON object or None if not found
-    """
-    from core.transport_layer import extract_json_from_text
-    return extract_json_from_text(text, return_metadata=False)
+ACTION_CONCURRENCY = config_registry.get_var(
+    "ACTION_CONCURRENCY",
+    4,
+    value_type=int,
+    label="Action Concurrency",
+    description=(
+        "Maximum number of independent actions from one reply executed at the same time. "
+        "Actions for the same chat always run in order."
+    ),
+    group="core",
+    component="core",
+    advanced=True,
+)
 
 
 ERROR_RETRY_POLICY = {
@@ -111,47 +117,171 @@ def _increment_retry(message):
 # update them to the new orchestrator or the message chain.
 
 
-# Cache for interface actions discovered via the interface registry
-_INTERFACE_ACTIONS: Dict[str, str] | None = None
+@dataclass(frozen=True)
+class ActionRoute:
+    """Handlers, validators and flags resolved for a single action type."""
 
+    handlers: Tuple[Any, ...] = ()
+    validators: Tuple[Tuple[Any, str], ...] = ()
+    interface: Optional[str] = None
+    restricted: bool = False
 
-def _load_interface_actions() -> Dict[str, str]:
-    """Return a mapping of action_type -> interface_name from registered interfaces."""
-    global _INTERFACE_ACTIONS
 
-    if _INTERFACE_ACTIONS is not None:
-        log_debug(
-            f"[action_parser] 🔄 Returning cached interface actions ({len(_INTERFACE_ACTIONS)})"
-        )
-        return _INTERFACE_ACTIONS
+_EMPTY_ROUTE = ActionRoute()
+
+
+@dataclass(frozen=True)
+class ActionDispatchTable:
+    """Immutable action type -> :class:`ActionRoute` index.
 
+    Built in one pass over ``PLUGIN_REGISTRY`` and ``INTERFACE_REGISTRY`` so
+    dispatching or validating an action no longer queries every component.
+    A new table replaces the old one whenever components register or the
+    actions block is rebuilt.
+    """
+
+    routes: Mapping[str, ActionRoute]
+    action_types: frozenset
+    interface_actions: Mapping[str, str]
+
+    def route(self, action_type: str) -> ActionRoute:
+        return self.routes.get(action_type, _EMPTY_ROUTE)
+
+
+_DISPATCH_TABLE: ActionDispatchTable | None = None
+
+
+def invalidate_dispatch_table() -> None:
+    """Forget the cached plugin list and dispatch table; the next lookup rebuilds them."""
+    global _DISPATCH_TABLE, _ACTION_PLUGINS, _STATIC_INJECTORS
+    _ACTION_PLUGINS = None
+    _STATIC_INJECTORS = None
+    _DISPATCH_TABLE = None
+
+
+def _query_actions(kind: str, name: str, component) -> Tuple[Any, Any]:
+    """Return ``(action_types, supported_actions)`` as declared by ``component``.
+
+    Either value is ``None`` when the component does not implement the
+    corresponding method or the call fails.
+    """
+    action_types = supported = None
+    if hasattr(component, "get_supported_action_types"):
+        try:
+            action_types = component.get_supported_action_types()
+        except Exception as e:
+            log_error(f"[action_parser] Error querying {kind} {name}: {repr(e)}")
+    if hasattr(component, "get_supported_actions"):
+        try:
+            supported = component.get_supported_actions()
+        except Exception as e:
+            log_error(f"[action_parser] Error querying {kind} {name}: {repr(e)}")
+    return action_types, supported
+
+
+_ACTION_COLLECTIONS = (list, set, frozenset, tuple, dict)
+
+
+def _build_dispatch_table() -> ActionDispatchTable:
     try:
         from core.core_initializer import INTERFACE_REGISTRY
     except Exception as e:  # pragma: no cover - registry unavailable
         log_warning(f"[action_parser] Unable to access INTERFACE_REGISTRY: {e}")
         INTERFACE_REGISTRY = {}
 
-    actions: Dict[str, str] = {}
+    plugin_handlers: Dict[str, List[Any]] = {}
+    interface_handlers: Dict[str, List[Any]] = {}
+    validators: Dict[str, List[Tuple[Any, str]]] = {}
+    restricted: set = set()
+    action_types: set = set()
+    interface_actions: Dict[str, str] = {}
+
+    def _collect(kind, name, component, handlers):
+        types, supported = _query_actions(kind, name, component)
+        # Types a component can execute: declared types plus actions dict keys
+        handled = set(types) if isinstance(types, _ACTION_COLLECTIONS) else set()
+        if isinstance(supported, dict):
+            handled.update(supported.keys())
+            for act, meta in supported.items():
+                if isinstance(meta, dict) and meta.get("restricted"):
+                    restricted.add(act)
+        for act in handled:
+            bucket = handlers.setdefault(act, [])
+            # Message actions go to the first component that supports them
+            if not (act.startswith("message_") and bucket):
+                bucket.append(component)
+        return types, supported
+
+    for plugin in _load_action_plugins():
+        name = plugin.__class__.__name__
+        types, supported = _collect("plugin", name, plugin, plugin_handlers)
+
+        if hasattr(plugin, "get_supported_action_types"):
+            declared = set(types) if isinstance(types, _ACTION_COLLECTIONS) else set()
+            if isinstance(types, (list, set)):
+                action_types.update(types)
+        elif isinstance(supported, (dict, list, set, tuple)):
+            declared = set(supported)
+            action_types.update(declared)
+        else:
+            declared = set()
+
+        kind = None
+        if hasattr(plugin, "validate_payload"):
+            kind = "payload"
+        elif hasattr(plugin, "validate_action"):
+            kind = "action"
+        if kind:
+            for act in declared:
+                validators.setdefault(act, []).append((plugin, kind))
+
     for name, iface in INTERFACE_REGISTRY.items():
-        try:
-            if hasattr(iface, "get_supported_actions"):
-                supported = iface.get_supported_actions()
-                if isinstance(supported, dict):
-                    for act in supported.keys():
-                        actions[act] = name
-
-            # Dynamic check for supported actions
-            if hasattr(iface, "get_supported_action_types"):
-                action_types = iface.get_supported_action_types()
-                if isinstance(action_types, (list, set)):
-                    for act in action_types:
-                        actions[act] = name
+        types, supported = _collect("interface", name, iface, interface_handlers)
+        if isinstance(supported, dict):
+            for act in supported.keys():
+                interface_actions[act] = name
+        if isinstance(types, (list, set)):
+            for act in types:
+                interface_actions[act] = name
+    action_types.update(interface_actions)
+
+    routes: Dict[str, ActionRoute] = {}
+    all_types = set(plugin_handlers) | set(interface_handlers) | set(validators) | set(interface_actions) | restricted
+    for act in all_types:
+        route_validators = list(validators.get(act, ()))
+        iface_name = interface_actions.get(act)
+        iface = INTERFACE_REGISTRY.get(iface_name) if iface_name else None
+        if iface is not None and hasattr(iface, "validate_payload"):
+            route_validators.append((iface, "interface"))
+        routes[act] = ActionRoute(
+            handlers=tuple(plugin_handlers.get(act, ())) + tuple(interface_handlers.get(act, ())),
+            validators=tuple(route_validators),
+            interface=iface_name,
+            restricted=act in restricted,
+        )
 
-        except Exception as e:  # pragma: no cover - defensive
-            log_debug(f"[action_parser] Error inspecting interface {name}: {e}")
+    table = ActionDispatchTable(
+        routes=MappingProxyType(routes),
+        action_types=frozenset(action_types),
+        interface_actions=MappingProxyType(interface_actions),
+    )
+    log_debug("[action_parser] Dispatch table built with %s action types", len(routes))
+    return table
 
-    _INTERFACE_ACTIONS = actions
-    return actions
+
+def get_dispatch_table() -> ActionDispatchTable:
+    """Return the current dispatch table, building it on first use."""
+    global _DISPATCH_TABLE
+    table = _DISPATCH_TABLE
+    if table is None:
+        table = _build_dispatch_table()
+        _DISPATCH_TABLE = table
+    return table
+
+
+def _load_interface_actions() -> Mapping[str, str]:
+    """Return a mapping of action_type -> interface_name from registered interfaces."""
+    return get_dispatch_table().interface_actions
 
 
 def get_supported_action_types() -> set[str]:
@@ -165,31 +295,25 @@ def get_supported_action_types() -> set[str]:
     except Exception as e:
         log_warning(f"[action_parser] Error getting action types from validation registry: {e}")
 
-    # Legacy discovery from plugins
+    # Legacy discovery from plugins and interfaces
     try:
-        for plugin in _load_action_plugins():
-            if hasattr(plugin, "get_supported_action_types"):
-                plugin_types = plugin.get_supported_action_types()
-                if isinstance(plugin_types, (list, set)):
-                    supported_types.update(plugin_types)
-            elif hasattr(plugin, "get_supported_actions"):
-                plugin_actions = plugin.get_supported_actions()
-                if isinstance(plugin_actions, dict):
-                    supported_types.update(plugin_actions.keys())
-                elif isinstance(plugin_actions, (list, set, tuple)):
-                    supported_types.update(plugin_actions)
+        supported_types.update(get_dispatch_table().action_types)
     except Exception as e:
         log_warning(f"[action_parser] Error discovering action types: {e}")
 
-    # Legacy discovery from interfaces
-    try:
-        supported_types.update(_load_interface_actions().keys())
-    except Exception as e:  # pragma: no cover - defensive
-        log_debug(f"[action_parser] Error loading interface actions: {e}")
-
     return supported_types
 
 
+def _is_supported_action_type(action_type: str) -> bool:
+    if action_type in get_dispatch_table().action_types:
+        return True
+    try:
+        return get_validation_registry().supports_action_type(action_type)
+    except Exception as e:
+        log_warning(f"[action_parser] Error getting action types from validation registry: {e}")
+        return False
+
+
 def _validate_payload(action_type: str, payload: dict, errors: List[str]) -> None:
     """Validate payload using centralized validation registry and legacy plugin/interface validation.
     
@@ -207,76 +331,28 @@ def _validate_payload(action_type: str, payload: dict, errors: List[str]) -> Non
         registry_errors = validation_registry.validate_action_payload(action_type, payload)
         if registry_errors:
             errors.extend(registry_errors)
-            log_debug(f"[action_parser] Validation registry added {len(registry_errors)} errors for {action_type}")
+            log_debug("[action_parser] Validation registry added %s errors for %s", len(registry_errors), action_type)
     except Exception as e:
         log_warning(f"[action_parser] Error using validation registry: {e}")
     
     # Legacy validation - keep for backward compatibility until all components migrate
     try:
-        for plugin in _load_action_plugins():
-            supports_action = False
+        for component, kind in get_dispatch_table().route(action_type).validators:
+            name = component.__class__.__name__
             try:
-                if hasattr(plugin, "get_supported_action_types"):
-                    if action_type in plugin.get_supported_action_types():
-                        supports_action = True
-                elif hasattr(plugin, "get_supported_actions"):
-                    actions = plugin.get_supported_actions()
-                    if isinstance(actions, dict) and action_type in actions:
-                        supports_action = True
-                    elif isinstance(actions, (list, set, tuple)) and action_type in actions:
-                        supports_action = True
-            except Exception as e:
-                log_debug(f"[action_parser] Error checking plugin support for {action_type}: {e}")
-                continue
-
-            if supports_action:
-                if hasattr(plugin, "validate_payload"):
-                    try:
-                        plugin_errors = plugin.validate_payload(action_type, payload)
-                        if plugin_errors and isinstance(plugin_errors, list):
-                            errors.extend(plugin_errors)
-                            log_debug(
-                                f"[action_parser] Plugin {plugin.__class__.__name__} added {len(plugin_errors)} validation errors"
-                            )
-                    except Exception as e:
-                        log_warning(
-                            f"[action_parser] Error validating payload with plugin {plugin.__class__.__name__}: {e}"
-                        )
-                elif hasattr(plugin, "validate_action"):
-                    try:
-                        action_dict = {"type": action_type, "payload": payload}
-                        plugin_errors = plugin.validate_action(action_dict)
-                        if plugin_errors and isinstance(plugin_errors, list):
-                            errors.extend(plugin_errors)
-                            log_debug(
-                                f"[action_parser] Plugin {plugin.__class__.__name__} added {len(plugin_errors)} validation errors"
-                            )
-                    except Exception as e:
-                        log_warning(
-                            f"[action_parser] Error validating action with plugin {plugin.__class__.__name__}: {e}"
-                        )
+                if kind == "action":
+                    component_errors = component.validate_action({"type": action_type, "payload": payload})
                 else:
-                    # Plugin doesn't have validation - that's OK, skip
+                    component_errors = component.validate_payload(action_type, payload)
+                if component_errors and isinstance(component_errors, list):
+                    errors.extend(component_errors)
                     log_debug(
-                        f"[action_parser] Plugin {plugin.__class__.__name__} supports {action_type} but has no validation method"
+                        "[action_parser] %s added %s validation errors",
+                        name, len(component_errors),
                     )
-
-        # Interface-based validation
-        iface_name = _load_interface_actions().get(action_type)
-        if iface_name:
-            try:
-                from core.core_initializer import INTERFACE_REGISTRY
-                iface = INTERFACE_REGISTRY.get(iface_name)
-                if iface and hasattr(iface, "validate_payload"):
-                    iface_errors = iface.validate_payload(action_type, payload)
-                    if iface_errors and isinstance(iface_errors, list):
-                        errors.extend(iface_errors)
-                        log_debug(
-                            f"[action_parser] Interface {iface_name} added {len(iface_errors)} validation errors"
-                        )
-            except Exception as e:  # pragma: no cover - defensive
+            except Exception as e:
                 log_warning(
-                    f"[action_parser] Error validating payload with interface {iface_name}: {e}"
+                    f"[action_parser] Error validating payload with {name}: {e}"
                 )
     except Exception as e:
         log_error(f"[action_parser] Error during payload validation: {e}")
@@ -310,11 +386,11 @@ def validate_action(action: dict, context: dict = None, original_message=None) -
         return False, ["action must be a dict"]
 
     # Validate action type - with specific action names, interface is implicit
-    supported_types = get_supported_action_types()
     action_type = action.get("type")
+    supported = bool(action_type) and _is_supported_action_type(action_type)
     if not action_type:
         errors.append("Missing 'type'")
-    elif action_type not in supported_types:
+    elif not supported:
         # Check if any plugin or interface supports this action type
         errors.append(
             f"Unsupported type '{action_type}' - no plugin or interface found to handle it"
@@ -332,7 +408,7 @@ def validate_action(action: dict, context: dict = None, original_message=None) -
         errors.append("'payload' must be a dict")
 
     # Dynamic validation - delegate to plugins or interfaces that support this action type
-    if (isinstance(payload, dict) or action_type in actions_with_flexible_payload) and action_type in supported_types:
+    if (isinstance(payload, dict) or action_type in actions_with_flexible_payload) and supported:
         _validate_payload(action_type, payload or {}, errors)
 
         if _is_restricted_action(action_type):
@@ -367,7 +443,7 @@ def _load_action_plugins() -> List[Any]:
     """Return plugin instances registered with the core initializer."""
     global _ACTION_PLUGINS
     if _ACTION_PLUGINS is not None:
-        log_debug(f"[action_parser] 🔄 Returning cached plugins ({len(_ACTION_PLUGINS)})")
+        log_debug("[action_parser] 🔄 Returning cached plugins (%s)", len(_ACTION_PLUGINS))
         return _ACTION_PLUGINS
 
     try:
@@ -381,100 +457,11 @@ def _load_action_plugins() -> List[Any]:
     return _ACTION_PLUGINS
 
 def _plugins_for(action_type: str) -> List[Any]:
-    plugins = []
-    loaded_plugins = _load_action_plugins()
+    """Return the plugins, then interfaces, that can execute ``action_type``."""
+    plugins = list(get_dispatch_table().route(action_type).handlers)
     log_debug(
-        f"[action_parser] _plugins_for({action_type}): Checking {len(loaded_plugins)} loaded plugins"
-    )
-
-    for plugin in loaded_plugins:
-        try:
-            supported = None
-
-            if hasattr(plugin, "get_supported_action_types"):
-                action_types = plugin.get_supported_action_types()
-                log_debug(
-                    f"[action_parser] Plugin {plugin.__class__.__name__}.get_supported_action_types(): {action_types}"
-                )
-                if action_types and action_type in action_types:
-                    plugins.append(plugin)
-                    log_debug(
-                        f"[action_parser] ✅ Plugin {plugin.__class__.__name__} supports {action_type} (via action_types)"
-                    )
-                    # Optimization: Stop searching for message actions after first match
-                    if action_type.startswith("message_"):
-                        log_debug(f"[action_parser] ⚡ Optimization: Stopping search for message action {action_type} after first match")
-                        break
-                    continue
-
-            if hasattr(plugin, "get_supported_actions"):
-                actions_dict = plugin.get_supported_actions()
-                log_debug(
-                    f"[action_parser] Plugin {plugin.__class__.__name__}.get_supported_actions(): {actions_dict}"
-                )
-                if isinstance(actions_dict, dict) and action_type in actions_dict:
-                    plugins.append(plugin)
-                    log_debug(
-                        f"[action_parser] ✅ Plugin {plugin.__class__.__name__} supports {action_type} (via actions_dict)"
-                    )
-                    # Optimization: Stop searching for message actions after first match
-                    if action_type.startswith("message_"):
-                        log_debug(f"[action_parser] ⚡ Optimization: Stopping search for message action {action_type} after first match")
-                        break
-                    continue
-
-        except Exception as e:
-            log_error(f"[action_parser] Error querying plugin {plugin}: {repr(e)}")
-
-    try:
-        from core.core_initializer import INTERFACE_REGISTRY
-    except Exception as e:  # pragma: no cover - defensive
-        log_error(f"[action_parser] Error loading INTERFACE_REGISTRY: {e}")
-        INTERFACE_REGISTRY = {}
-
-    for name, iface in INTERFACE_REGISTRY.items():
-        try:
-            supported = None
-            if hasattr(iface, "get_supported_action_types"):
-                action_types = iface.get_supported_action_types()
-                log_debug(
-                    f"[action_parser] Interface {name}.get_supported_action_types(): {action_types}"
-                )
-                if action_types and action_type in action_types:
-                    plugins.append(iface)
-                    log_debug(
-                        f"[action_parser] ✅ Interface {name} supports {action_type} (via action_types)"
-                    )
-                    # Optimization: Stop searching for message actions after first match
-                    if action_type.startswith("message_"):
-                        log_debug(f"[action_parser] ⚡ Optimization: Stopping search for message action {action_type} after first match")
-                        break
-                    continue
-
-            if hasattr(iface, "get_supported_actions"):
-                actions_dict = iface.get_supported_actions()
-                log_debug(
-                    f"[action_parser] Interface {name}.get_supported_actions(): {actions_dict}"
-                )
-                if isinstance(actions_dict, dict) and action_type in actions_dict:
-                    plugins.append(iface)
-                    log_debug(
-                        f"[action_parser] ✅ Interface {name} supports {action_type} (via actions_dict)"
-                    )
-                    # Optimization: Stop searching for message actions after first match
-                    if action_type.startswith("message_"):
-                        log_debug(f"[action_parser] ⚡ Optimization: Stopping search for message action {action_type} after first match")
-                        break
-                    continue
-
-            log_debug(
-                f"[action_parser] ❌ Interface {name} does not support {action_type}"
-            )
-        except Exception as e:
-            log_error(f"[action_parser] Error querying interface {name}: {repr(e)}")
-
-    log_debug(
-        f"[action_parser] _plugins_for({action_type}): Found {len(plugins)} supporting plugins"
+        "[action_parser] _plugins_for(%s): Found %s supporting plugins",
+        action_type, len(plugins),
     )
     return plugins
 
@@ -523,8 +510,7 @@ async def _handle_plugin_action(
         
         # If interface not found, try to refresh the interface actions cache
         if not iface_name and action_type.startswith("message_"):
-            global _INTERFACE_ACTIONS
-            _INTERFACE_ACTIONS = None  # Force refresh
+            invalidate_dispatch_table()  # Force refresh
             iface_name = _load_interface_actions().get(action_type)
 
         try:
@@ -599,7 +585,7 @@ async def _handle_plugin_action(
                 log_info(
                     f"[action_parser] 🚀 Delegating action to {plugin.__class__.__name__}: type={action_type} interface={plugin_iface}"
                 )
-                log_debug(f"[action_parser] 📦 Action payload: {payload}")
+                log_debug("[action_parser] 📦 Action payload: %s", payload)
 
                 result = plugin.execute_action(
                     new_action, context, bot, original_message
@@ -643,6 +629,11 @@ async def run_action(action: Any, context: Dict[str, Any], bot, original_message
         log_error(f"[action_parser] ❌ {error_msg}")
         return {"error": error_msg}
 
+    return await _execute_action(action, context, bot, original_message)
+
+
+async def _execute_action(action: Dict[str, Any], context: Dict[str, Any], bot, original_message):
+    """Dispatch an action that has already been validated."""
     action_type = action.get("type")
     action_interface = action.get("interface")
     log_info(f"[action_parser] 🚀 Executing action: type={action_type}, interface={action_interface}")
@@ -709,7 +700,7 @@ IMPORTANT: Do not include the {successful_count} actions that were already execu
 """
     
     log_info(f"[action_parser] Requesting selective correction for {failed_count} failed actions (preserving {successful_count} successful ones)")
-    log_debug(f"[action_parser] Correction context: {correction_context}")
+    log_debug("[action_parser] Correction context: %s", correction_context)
     
     try:
         # Create a synthetic message with correction context
@@ -731,14 +722,74 @@ IMPORTANT: Do not include the {successful_count} actions that were already execu
         log_error(f"[action_parser] Failed to request selective correction: {e}")
 
 
+def _action_ordering_key(action: Dict[str, Any], original_message) -> tuple:
+    """Key under which actions must keep their relative order.
+
+    Any action addressed to a chat (``target`` or ``chat_id`` in its payload,
+    or a message action falling back to the originating chat) is ordered per
+    chat, so a voice note or image never overtakes the text it follows.
+    Actions without a chat are ordered per type so two updates of the same
+    kind never race each other.
+    """
+    action_type = action.get("type") or ""
+    payload = action.get("payload")
+    target = None
+    if isinstance(payload, dict):
+        target = payload.get("target") or payload.get("chat_id")
+    if target is None and action_type.startswith("message_"):
+        target = getattr(original_message, "chat_id", None)
+    if target is not None:
+        return ("chat", str(target))
+    return ("type", action_type)
+
+
+async def _run_action_batch(batch, context, bot, original_message, outcomes, timings):
+    """Run ``batch`` of ``(index, action)`` pairs concurrently.
+
+    Actions sharing an ordering key run one after another inside a single
+    task; independent keys run in parallel, bounded by ``ACTION_CONCURRENCY``.
+    """
+    lanes: Dict[tuple, List[Tuple[int, Dict[str, Any]]]] = {}
+    for idx, action in batch:
+        lanes.setdefault(_action_ordering_key(action, original_message), []).append((idx, action))
+
+    semaphore = asyncio.Semaphore(max(1, int(ACTION_CONCURRENCY)))
+
+    async def _run_lane(lane):
+        for idx, action in lane:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    log_debug("[action_parser] Running action %s: %s", idx, action.get('type'))
+                    outcomes[idx] = (await _execute_action(action, context, bot, original_message), None)
+                except Exception as e:
+                    outcomes[idx] = (None, e)
+                finally:
+                    timings.append({
+                        "index": idx,
+                        "type": action.get("type"),
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    })
+
+    if len(lanes) == 1:
+        await _run_lane(next(iter(lanes.values())))
+    else:
+        await asyncio.gather(*(_run_lane(lane) for lane in lanes.values()))
+
+
 async def run_actions(actions: Any, context: Dict[str, Any], bot, original_message):
-    """Execute multiple actions in sequence.
+    """Execute multiple actions, running independent ones concurrently.
 
     If ``actions`` is a single dict, it will be wrapped in a list.
     Valid actions are executed, invalid actions are collected for selective correction.
+    Actions addressed to the same chat (or of the same non-message type) keep
+    their order; ``terminal`` actions act as barriers and, once one has
+    produced output, remaining non-terminal actions wait for the LLM.
     
     Returns:
-        dict: {"processed": [successful_actions], "errors": [error_messages], "failed_actions": [failed_actions]}
+        dict: {"processed": [successful_actions], "errors": [error_messages],
+        "failed_actions": [failed_actions], "action_outputs": [...],
+        "timings": [{"index", "type", "duration_ms"}]}
     """
     if actions is None:
         return {"processed": [], "errors": [], "failed_actions": []}
@@ -750,14 +801,25 @@ async def run_actions(actions: Any, context: Dict[str, Any], bot, original_messa
         log_error(error_msg)
         return {"processed": [], "errors": [error_msg], "failed_actions": []}
 
-    log_debug(f"[action_parser] run_actions called with {len(actions)} actions")
-    log_debug(f"[action_parser] Actions: {actions}")
+    log_debug("[action_parser] run_actions called with %s actions", len(actions))
+    log_debug("[action_parser] Actions: %s", actions)
 
     processed_actions = []
     collected_errors = []
     failed_actions = []
     action_outputs: List[Dict[str, Any]] = []
+    timings: List[Dict[str, Any]] = []
+    # index -> (error message, error list) for actions that never ran
+    rejected: Dict[int, Tuple[str, List[str]]] = {}
+    # index -> (result, exception) for executed actions
+    outcomes: Dict[int, Tuple[Any, Optional[BaseException]]] = {}
     terminal_seen = False
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def _flush_batch():
+        if batch:
+            await _run_action_batch(list(batch), context, bot, original_message, outcomes, timings)
+            batch.clear()
 
     for idx, action in enumerate(actions):
         try:
@@ -772,38 +834,72 @@ async def run_actions(actions: Any, context: Dict[str, Any], bot, original_messa
                 break
 
             valid, errors = validate_action(action, context, original_message)
-            if not valid:
-                error_msg = f"Invalid action {idx}: {errors}"
-                log_warning(f"[action_parser] Skipping {error_msg}")
-                collected_errors.append(error_msg)
-                failed_actions.append({"index": idx, "action": action, "errors": errors})
-                continue
+        except Exception as e:
+            error_msg = f"Error executing action {idx}: {repr(e)}"
+            log_error(f"[action_parser] {error_msg}")
+            rejected[idx] = (error_msg, [error_msg])
+            continue
 
-            log_debug(f"[action_parser] Running action {idx}: {action_type}")
-            result = await run_action(action, context, bot, original_message)
+        if not valid:
+            error_msg = f"Invalid action {idx}: {errors}"
+            log_warning(f"[action_parser] Skipping {error_msg}")
+            rejected[idx] = (error_msg, errors)
+            continue
 
-            # Check if run_action returned error info
-            if isinstance(result, dict) and "error" in result:
-                collected_errors.append(result["error"])
-                failed_actions.append({"index": idx, "action": action, "errors": [result["error"]]})
-            else:
-                processed_actions.append(action)
-
-                if action_type == "terminal" and isinstance(result, str):
-                    terminal_seen = True
-                    action_outputs.append(
-                        {
-                            "type": "terminal",
-                            "command": action.get("payload", {}).get("command", ""),
-                            "output": result,
-                        }
-                    )
+        if action_type != "terminal":
+            batch.append((idx, action))
+            continue
 
-        except Exception as e:
-            error_msg = f"Error executing action {idx}: {repr(e)}"
+        # Terminal actions are barriers: everything before them completes
+        # first and nothing after them starts until they are done.
+        await _flush_batch()
+        await _run_action_batch([(idx, action)], context, bot, original_message, outcomes, timings)
+        result, error = outcomes[idx]
+        if error is None and isinstance(result, str):
+            terminal_seen = True
+            action_outputs.append(
+                {
+                    "type": "terminal",
+                    "command": action.get("payload", {}).get("command", ""),
+                    "output": result,
+                }
+            )
+    await _flush_batch()
+
+    # Report in the order the model listed the actions
+    for idx in sorted(set(rejected) | set(outcomes)):
+        action = actions[idx]
+        if idx in rejected:
+            error_msg, errors = rejected[idx]
+            collected_errors.append(error_msg)
+            failed_actions.append({"index": idx, "action": action, "errors": errors})
+            continue
+
+        result, error = outcomes[idx]
+        if error is not None:
+            error_msg = f"Error executing action {idx}: {repr(error)}"
             log_error(f"[action_parser] {error_msg}")
             collected_errors.append(error_msg)
             failed_actions.append({"index": idx, "action": action, "errors": [error_msg]})
+        elif isinstance(result, dict) and "error" in result:
+            # Check if run_action returned error info
+            collected_errors.append(result["error"])
+            failed_actions.append({"index": idx, "action": action, "errors": [result["error"]]})
+        else:
+            processed_actions.append(action)
+
+    timings.sort(key=lambda t: t["index"])
+    if timings and is_debug_enabled():
+        slowest = max(timings, key=lambda t: t["duration_ms"])
+        log_debug(
+            "[action_parser] Action timings (ms): %s; slowest %s",
+            ", ".join(f"{t['type']}={t['duration_ms']}" for t in timings), slowest['type'],
+        )
+
+    llm_reply = getattr(original_message, "llm_reply", None)
+    if llm_reply is not None:
+        elapsed = llm_reply.mark("actions")
+        log_debug("[action_parser] %s actions done %.1fms after reply received", len(processed_actions), elapsed * 1000)
 
     # After all actions processed, mark scheduled event as delivered if applicable
     event_id = context.get("event_id") or getattr(original_message, "event_id", None)
@@ -876,6 +972,7 @@ async def run_actions(actions: Any, context: Dict[str, Any], bot, original_messa
         "errors": collected_errors,
         "failed_actions": failed_actions,
         "action_outputs": action_outputs,
+        "timings": timings,
     }
 
 
@@ -981,12 +1078,12 @@ async def _create_diary_entry_for_actions(processed_actions, context, original_m
             thread_id=str(thread_id) if thread_id else None
         )
         
-        log_debug(f"[action_parser] Created personal diary entry: {synth_response[:100]}...")
+        log_debug("[action_parser] Created personal diary entry: %s...", synth_response[:100])
         
     except Exception as e:
         log_warning(f"[action_parser] Failed to create diary entry: {e}")
         import traceback
-        log_debug(f"[action_parser] Diary error traceback: {traceback.format_exc()}")
+        log_debug("[action_parser] Diary error traceback: %s", traceback.format_exc())
 
 
 def _generate_context_tags(action_types: List[str], synth_response: str, user_message: str, interface_name: str) -> List[str]:
@@ -1065,7 +1162,7 @@ def _generate_context_tags(action_types: List[str], synth_response: str, user_me
 
 async def parse_action(action: dict, bot, message):
     """Parse and execute a single action."""
-    log_debug(f"[action_parser] Received action: {action}")
+    log_debug("[action_parser] Received action: %s", action)
 
     action_type = action.get("type")
     interface = action.get("interface")
@@ -1076,12 +1173,8 @@ async def parse_action(action: dict, bot, message):
         return
 
     log_debug(
-        "[action_parser] Action type: "
-        + str(action_type)
-        + ", Interface: "
-        + str(interface)
-        + ", Payload: "
-        + str(payload)
+        "[action_parser] Action type: %s, Interface: %s, Payload: %s",
+        action_type, interface, payload,
     )
 
     # First allow the active LLM plugin to handle custom actions
@@ -1113,12 +1206,12 @@ async def parse_action(action: dict, bot, message):
                     if inspect.iscoroutine(result):
                         await result
                     action_handled = True
-                    log_debug(f"[action_parser] Action {action_type} handled by {plugin.__class__.__name__}")
+                    log_debug("[action_parser] Action %s handled by %s", action_type, plugin.__class__.__name__)
                     break  # Stop after first successful handler
                 elif hasattr(plugin, "handle_custom_action"):
                     await plugin.handle_custom_action(action_type, payload)
                     action_handled = True
-                    log_debug(f"[action_parser] Action {action_type} handled by {plugin.__class__.__name__} (custom)")
+                    log_debug("[action_parser] Action %s handled by %s (custom)", action_type, plugin.__class__.__name__)
                     break  # Stop after first successful handler
                 else:
                     log_warning(
@@ -1130,7 +1223,7 @@ async def parse_action(action: dict, bot, message):
                 )
         
         if action_handled:
-            log_debug(f"[action_parser] Action {action_type} successfully handled")
+            log_debug("[action_parser] Action %s successfully handled", action_type)
         else:
             log_warning(f"[action_parser] No plugin successfully handled action {action_type}")
         return
@@ -1169,9 +1262,150 @@ def get_action_plugin_instructions() -> dict[str, dict]:
     return instructions
 
 
+STATIC_INJECTION_TIMEOUT = config_registry.get_var(
+    "STATIC_INJECTION_TIMEOUT",
+    3.0,
+    value_type=float,
+    label="Static Injection Timeout",
+    description=(
+        "Seconds to wait for each plugin's static injection while building a prompt. "
+        "A plugin that misses the deadline contributes its last good value for the chat."
+    ),
+    group="core",
+    component="core",
+    advanced=True,
+)
+
+_STATIC_INJECTORS: List[Any] | None = None
+_STATIC_INJECTORS_SOURCE: List[Any] | None = None
+_STATIC_INJECTION_CACHE_SIZE = 512
+_static_injection_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+_static_injection_inflight: Dict[tuple, asyncio.Future] = {}
+
+
+def _supports_static_inject(plugin) -> bool:
+    if not hasattr(plugin, "get_static_injection"):
+        return False
+    if hasattr(plugin, "get_supported_action_types"):
+        types = plugin.get_supported_action_types()
+        return bool(types) and "static_inject" in types
+    if hasattr(plugin, "get_supported_actions"):
+        acts = plugin.get_supported_actions()
+        if isinstance(acts, (dict, list, set, tuple)):
+            return "static_inject" in acts
+    return False
+
+
+def _static_injectors() -> List[Any]:
+    """Return the plugins providing ``static_inject``, resolved once per plugin list."""
+    global _STATIC_INJECTORS, _STATIC_INJECTORS_SOURCE
+    plugins = _load_action_plugins()
+    if _STATIC_INJECTORS is not None and _STATIC_INJECTORS_SOURCE is plugins:
+        return _STATIC_INJECTORS
+
+    injectors = []
+    for plugin in plugins:
+        try:
+            if _supports_static_inject(plugin):
+                injectors.append(plugin)
+        except Exception as e:
+            log_error(f"[action_parser] Error probing static injection on {plugin.__class__.__name__}: {e}")
+    _STATIC_INJECTORS = injectors
+    _STATIC_INJECTORS_SOURCE = plugins
+    log_debug(
+        "[action_parser] Static injectors: %s",
+        [p.__class__.__name__ for p in injectors],
+    )
+    return injectors
+
+
+def _invoke_static_injection(plugin, message, context_memory):
+    # Pass message and context_memory if the plugin expects them
+    try:
+        return plugin.get_static_injection(message, context_memory)
+    except TypeError:
+        return plugin.get_static_injection()
+
+
+async def _call_static_injection(plugin, message, context_memory):
+    # Synchronous injectors typically do blocking DB work, so keep them off
+    # the loop; otherwise neither gather() nor the deadline would apply.
+    if inspect.iscoroutinefunction(plugin.get_static_injection):
+        result = _invoke_static_injection(plugin, message, context_memory)
+    else:
+        result = await asyncio.to_thread(
+            _invoke_static_injection, plugin, message, context_memory
+        )
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _remember_static_injection(key: tuple, result) -> None:
+    if not isinstance(result, dict):
+        return
+    _static_injection_cache[key] = result
+    _static_injection_cache.move_to_end(key)
+    while len(_static_injection_cache) > _STATIC_INJECTION_CACHE_SIZE:
+        _static_injection_cache.popitem(last=False)
+
+
+def _static_injection_done(key: tuple, inflight_key: tuple, task: asyncio.Future) -> None:
+    if _static_injection_inflight.get(inflight_key) is task:
+        del _static_injection_inflight[inflight_key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    _remember_static_injection(key, task.result())
+
+
+async def _run_static_injector(plugin, message, context_memory) -> dict | None:
+    """Run one injector within its deadline, falling back to its last good value.
+
+    A call that misses the deadline keeps running in the background and
+    refreshes the chat's cached value when it completes. Only prompts for the
+    same message share an in-flight call, so a newer message never receives
+    participants resolved from an older one.
+    """
+    name = plugin.__class__.__name__
+    key = (
+        id(plugin),
+        str(getattr(message, "chat_id", None)),
+        str(getattr(message, "thread_id", None)),
+    )
+    message_id = getattr(message, "message_id", None)
+    inflight_key = key + (message_id if message_id is not None else id(message),)
+    timeout = getattr(plugin, "static_injection_timeout", None) or float(STATIC_INJECTION_TIMEOUT)
+
+    task = _static_injection_inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.ensure_future(_call_static_injection(plugin, message, context_memory))
+        _static_injection_inflight[inflight_key] = task
+        task.add_done_callback(lambda t: _static_injection_done(key, inflight_key, t))
+
+    try:
+        result = await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        cached = _static_injection_cache.get(key)
+        log_warning(
+            f"[action_parser] Static injection from {name} exceeded {timeout}s, "
+            f"{'serving last good value' if cached is not None else 'skipping'}"
+        )
+        return cached
+    except Exception as e:
+        log_error(f"[action_parser] Error gathering static injection from {name}: {e}")
+        return _static_injection_cache.get(key)
+
+    return result if isinstance(result, dict) else None
+
+
 async def gather_static_injections(message=None, context_memory=None) -> dict:
     """Collect static injections from plugins supporting the ``static_inject`` action.
 
+    Injectors run concurrently, each bounded by ``STATIC_INJECTION_TIMEOUT``
+    (or the plugin's ``static_injection_timeout`` attribute), so a prompt
+    waits for the slowest single injector rather than for all of them in turn.
+    Results are merged in plugin order.
+
     Parameters
     ----------
     message : optional
@@ -1184,40 +1418,15 @@ async def gather_static_injections(message=None, context_memory=None) -> dict:
 
     injections: dict = {}
     try:
-        for plugin in _load_action_plugins():
-            try:
-                supported = False
-                if hasattr(plugin, "get_supported_action_types"):
-                    types = plugin.get_supported_action_types()
-                    if types and "static_inject" in types:
-                        supported = True
-                elif hasattr(plugin, "get_supported_actions"):
-                    acts = plugin.get_supported_actions()
-                    if isinstance(acts, dict):
-                        supported = "static_inject" in acts
-                    elif isinstance(acts, (list, set, tuple)):
-                        supported = "static_inject" in acts
-                if not supported or not hasattr(plugin, "get_static_injection"):
-                    continue
-
-                # Pass message and context_memory if the plugin expects them
-                try:
-                    result = plugin.get_static_injection(message, context_memory)
-                except TypeError:
-                    try:
-                        result = plugin.get_static_injection()
-                    except Exception as inner_e:
-                        log_error(f"[action_parser] Error calling get_static_injection() on {plugin.__class__.__name__}: {inner_e}")
-                        continue
-
-                if inspect.iscoroutine(result):
-                    result = await result
-                if isinstance(result, dict):
-                    injections.update(result)
-            except Exception as e:
-                log_error(
-                    f"[action_parser] Error gathering static injection from {plugin.__class__.__name__}: {e}"
-                )
+        injectors = _static_injectors()
+        if not injectors:
+            return injections
+        results = await asyncio.gather(
+            *(_run_static_injector(plugin, message, context_memory) for plugin in injectors)
+        )
+        for result in results:
+            if result:
+                injections.update(result)
     except Exception as e:
         log_error(f"[action_parser] Error collecting static injections: {e}")
     return injections
@@ -1226,27 +1435,9 @@ async def gather_static_injections(message=None, context_memory=None) -> dict:
 def _is_restricted_action(action_type: str) -> bool:
     """Return True if the action is marked as restricted."""
     try:
-        for plugin in _load_action_plugins():
-            if hasattr(plugin, "get_supported_actions"):
-                actions = plugin.get_supported_actions()
-                if isinstance(actions, dict):
-                    meta = actions.get(action_type)
-                    if isinstance(meta, dict) and meta.get("restricted"):
-                        return True
+        return get_dispatch_table().route(action_type).restricted
     except Exception:
-        pass
-    try:  # Check interface actions as well
-        from core.core_initializer import INTERFACE_REGISTRY
-        for iface in INTERFACE_REGISTRY.values():
-            if hasattr(iface, "get_supported_actions"):
-                actions = iface.get_supported_actions()
-                if isinstance(actions, dict):
-                    meta = actions.get(action_type)
-                    if isinstance(meta, dict) and meta.get("restricted"):
-                        return True
-    except Exception:
-        pass
-    return False
+        return False
 
 
 __all__ = [
@@ -1261,7 +1452,7 @@ __all__ = [
 ]
 
 
-async def corrector_orchestrator(text: str, context: dict, bot, message, max_retries: int | None = None, completed_actions: list = None):
+async def corrector_orchestrator(text: str, context: dict, bot, message, max_retries: int | None = None, completed_actions: list = None, reply=None):
     """Process model text: parse JSON actions or run the corrector loop.
     
     Args:
@@ -1272,6 +1463,7 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
         max_retries: Maximum number of correction attempts
         completed_actions: List of action types that were already successfully executed
                           (so the corrector knows not to regenerate them)
+        reply: Optional ``LLMReply`` for ``text``; its cached parse is reused
 
     Returns:
         True  -> actions parsed and executed
@@ -1294,26 +1486,19 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
     if completed_actions is None:
         completed_actions = []
 
-    # Quick parse attempt
-    parsed = None
-    try:
-        parsed = _extract_json_local(text)
-    except Exception as e:
-        log_debug(f"[corrector_orchestrator] initial parse failed: {e}")
+    from core.llm_reply import LLMReply
+
+    if reply is None or reply.text != (text or ""):
+        reply = LLMReply(text, chat_id=getattr(message, 'chat_id', None), thread_id=getattr(message, 'thread_id', None))
+
+    # Quick parse attempt, reusing the envelope's cached extraction
+    parsed = reply.payload
 
     if parsed is not None:
         # Build actions list similar to transport layer
-        if isinstance(parsed, dict) and "actions" in parsed:
-            actions = parsed["actions"] if isinstance(parsed["actions"], list) else None
-            if actions is None:
-                log_warning("[corrector_orchestrator] actions field must be a list")
-                return None
-        elif isinstance(parsed, list):
-            actions = parsed
-        elif isinstance(parsed, dict) and "type" in parsed:
-            actions = [parsed]
-        else:
-            log_warning(f"[corrector_orchestrator] Unrecognized JSON structure: {parsed}")
+        actions = reply.actions
+        if actions is None:
+            log_warning(f"[corrector_orchestrator] {reply.actions_error}")
             return None
         
         # Filter out already completed actions to avoid duplicates (e.g., double diary entries)
@@ -1356,6 +1541,17 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
         context['completed_actions'] = completed_actions
         context['instruction'] = f"The previous response had corrupted JSON. These actions were already successfully executed: {', '.join(completed_actions)}. Please regenerate ONLY the missing/corrupted actions. Do NOT regenerate: {', '.join(completed_actions)}"
     
+    # The regenerated reply must not stream on top of the preview already shown
+    chat_id = getattr(message, 'chat_id', None)
+    reply_stream.pause(chat_id)
+    try:
+        return await _correction_loop(text, context, bot, message, max_retries, completed_actions, reply, parsed)
+    finally:
+        reply_stream.resume(chat_id)
+
+
+async def _correction_loop(text: str, context: dict, bot, message, max_retries: int, completed_actions: list, reply, parsed):
+    """Corrector retries of :func:`corrector_orchestrator` for a reply that is not valid JSON."""
     tried_texts = set()
     attempt = 0
     while attempt < max_retries:
@@ -1382,7 +1578,7 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
             return False
 
         if corrected is None:
-            log_debug(f"[corrector_orchestrator] Corrector returned None on attempt {attempt}")
+            log_debug("[corrector_orchestrator] Corrector returned None on attempt %s", attempt)
             # corrected failed; loop will check retry and possibly continue
             text = text  # keep original or last value
             continue
@@ -1393,15 +1589,7 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
             # Try to execute already-parsed actions from the original text instead of blocking completely
             if parsed is not None:
                 log_info("[corrector_orchestrator] Attempting to execute actions from originally-parsed JSON before blocking")
-                # Build actions list
-                if isinstance(parsed, dict) and "actions" in parsed:
-                    actions = parsed["actions"] if isinstance(parsed["actions"], list) else None
-                elif isinstance(parsed, list):
-                    actions = parsed
-                elif isinstance(parsed, dict) and "type" in parsed:
-                    actions = [parsed]
-                else:
-                    actions = None
+                actions = reply.actions
                 
                 if actions:
                     # Filter out already-completed actions
@@ -1424,25 +1612,14 @@ async def corrector_orchestrator(text: str, context: dict, bot, message, max_ret
         tried_texts.add(corrected)
 
         # Try parsing corrected
-        try:
-            parsed2 = _extract_json_local(corrected)
-        except Exception as e:
-            parsed2 = None
-            log_debug(f"[corrector_orchestrator] Parsing corrected failed: {e}")
+        corrected_reply = reply.with_text(corrected)
+        parsed2 = corrected_reply.payload
 
         if parsed2 is not None:
             # run actions
-            if isinstance(parsed2, dict) and "actions" in parsed2:
-                actions = parsed2["actions"] if isinstance(parsed2["actions"], list) else None
-                if actions is None:
-                    log_warning("[corrector_orchestrator] corrected actions field must be a list")
-                    return False
-            elif isinstance(parsed2, list):
-                actions = parsed2
-            elif isinstance(parsed2, dict) and "type" in parsed2:
-                actions = [parsed2]
-            else:
-                log_warning(f"[corrector_orchestrator] Unrecognized corrected JSON structure: {parsed2}")
+            actions = corrected_reply.actions
+            if actions is None:
+                log_warning(f"[corrector_orchestrator] corrected {corrected_reply.actions_error}")
                 return False
 
             try:
@@ -0,0 +1,269 @@
+# core/browser_supervisor.py
+"""Warm-standby browser for the Selenium engines.
+
+Recovering from a dead WebDriver used to happen inline on the first
+request after the crash: kill leftover Chromium, launch a new one, check
+the login and select the model. That took tens of seconds. A
+:class:`WarmStandby` keeps a second, already logged-in Chromium ready on
+its own worker thread. When the engine finds its driver dead it takes the
+standby in a single step and a new standby is built in the background.
+
+Two Chromium instances cannot share a user-data directory, so the
+standby runs on a copy of the active profile (see :func:`clone_profile`).
+The engine and the standby swap between the two profile slots each time
+the standby is promoted.
+
+While the engine is idle it checks its driver every
+``SELENIUM_HEALTH_PROBE_INTERVAL`` seconds (see :func:`probe_interval`),
+so a crash is repaired before the next request arrives.
+"""
+
+import concurrent.futures
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.browser_worker import BrowserWorker
+from core.config_manager import config_registry
+from core.logging_utils import log_debug, log_info, log_warning
+
+SELENIUM_WARM_STANDBY = config_registry.get_var(
+    "SELENIUM_WARM_STANDBY",
+    False,
+    value_type=bool,
+    label="Keep A Standby Browser",
+    description=(
+        "Keep a second logged-in Chromium ready and switch to it when the browser "
+        "crashes. Uses the memory of a second browser."
+    ),
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+SELENIUM_HEALTH_PROBE_INTERVAL = config_registry.get_var(
+    "SELENIUM_HEALTH_PROBE_INTERVAL",
+    30,
+    value_type=int,
+    label="Browser Health Check Interval (s)",
+    description=(
+        "How often an idle Selenium engine checks that its browser still responds. "
+        "0 disables the check."
+    ),
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+# Suffix of the second profile slot
+STANDBY_SUFFIX = "-standby"
+# Wait this long before building again after a standby failed to come up
+RETRY_DELAY = 300.0
+# Longest take() waits for the standby worker to check the browser
+TAKE_TIMEOUT = 10.0
+
+# Locks of the running browser and caches Chromium rebuilds by itself
+_PROFILE_SKIP = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "*Cache*", "Crashpad", "BrowserMetrics*"
+)
+
+
+def probe_interval() -> Optional[float]:
+    """Seconds between health checks of an idle browser, or ``None`` when disabled."""
+    interval = int(SELENIUM_HEALTH_PROBE_INTERVAL)
+    return float(interval) if interval > 0 else None
+
+
+def standby_profile(active: str) -> str:
+    """The profile slot for a standby next to the active profile ``active``."""
+    if active.endswith(STANDBY_SUFFIX):
+        return active[: -len(STANDBY_SUFFIX)]
+    return active + STANDBY_SUFFIX
+
+
+def clone_profile(source: str, target: str) -> None:
+    """Replace ``target`` with a copy of the Chromium profile ``source``.
+
+    The copy keeps cookies and local storage, so the standby starts
+    logged in. Files that change while they are copied are skipped.
+    """
+    shutil.rmtree(target, ignore_errors=True)
+    if not os.path.isdir(source):
+        os.makedirs(target, exist_ok=True)
+        return
+    try:
+        shutil.copytree(source, target, symlinks=True, ignore=_PROFILE_SKIP)
+    except shutil.Error as e:
+        log_debug(f"[browser_supervisor] Skipped {len(e.args[0])} files copying {source}")
+
+
+def _alive(driver) -> bool:
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        log_debug(f"[browser_supervisor] Failed to quit standby browser: {e}")
+
+
+def _quit_handed_over(future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    taken = future.result()
+    if taken is not None:
+        _quit(taken[0])
+
+
+class WarmStandby:
+    """A spare browser an engine can switch to when its own one dies.
+
+    ``launch(profile_dir)`` starts Chromium and returns its driver;
+    ``prepare(driver)`` opens the site, checks the login and selects the
+    model, returning ``False`` when the browser is not usable. Both run on
+    the standby's own worker thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        launch: Callable[[str], Any],
+        prepare: Callable[[Any], bool],
+    ):
+        self.name = name
+        self._launch = launch
+        self._prepare = prepare
+        self._worker = BrowserWorker(f"{name}-standby")
+        self._lock = threading.Lock()
+        self._driver = None
+        self._profile: Optional[str] = None
+        self._building = False
+        self._generation = 0
+        self._retry_at = 0.0
+        self._swaps = 0
+        self._failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(SELENIUM_WARM_STANDBY)
+
+    def ensure(self, active_profile: Optional[str]) -> None:
+        """Build a standby in the background unless one is ready or on its way."""
+        if not self.enabled or not active_profile:
+            return
+        with self._lock:
+            if self._driver is not None or self._building or time.monotonic() < self._retry_at:
+                return
+            self._building = True
+            generation = self._generation
+        self._worker.submit(self._build, generation, active_profile, step="standby_build")
+
+    def maintain(self, active_profile: Optional[str]) -> None:
+        """Replace a standby that died while waiting, then :meth:`ensure` one."""
+        if not self.enabled:
+            self.discard()
+            return
+        self._worker.submit(self._check, active_profile, step="standby_probe")
+
+    def take(self) -> Optional[Tuple[Any, str]]:
+        """Hand over the standby's driver and profile, or ``None`` when none is ready.
+
+        The caller owns the driver afterwards and should :meth:`ensure` a
+        new standby. The hand-over runs on the standby worker, so its
+        liveness check never overlaps a probe of the same driver.
+        """
+        with self._lock:
+            if self._driver is None:
+                return None
+        future = self._worker.submit(self._take, step="standby_take")
+        try:
+            return future.result(TAKE_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            log_warning(f"[browser_supervisor] {self.name} standby did not answer, dropping it")
+            # _take may already hold the driver; quit whatever it hands over late
+            future.add_done_callback(_quit_handed_over)
+            self.discard()
+            return None
+
+    def _take(self) -> Optional[Tuple[Any, str]]:
+        with self._lock:
+            driver, profile = self._driver, self._profile
+            self._driver = self._profile = None
+        if driver is None:
+            return None
+        if not _alive(driver):
+            log_warning(f"[browser_supervisor] {self.name} standby browser is dead")
+            _quit(driver)
+            return None
+        self._swaps += 1
+        log_info(f"[browser_supervisor] {self.name} switched to the standby browser")
+        return driver, profile
+
+    def discard(self) -> None:
+        """Drop the standby, including one still being built."""
+        with self._lock:
+            self._generation += 1
+            driver = self._driver
+            self._driver = self._profile = None
+        if driver is not None:
+            self._worker.submit(_quit, driver, step="standby_quit")
+
+    def close(self) -> None:
+        self.discard()
+        self._worker.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ready": self._driver is not None,
+            "building": self._building,
+            "swaps": self._swaps,
+            "failures": self._failures,
+        }
+
+    def _build(self, generation: int, active_profile: str) -> None:
+        driver = None
+        try:
+            profile = standby_profile(active_profile)
+            clone_profile(active_profile, profile)
+            driver = self._launch(profile)
+            if not self._prepare(driver):
+                raise RuntimeError("standby browser is not logged in")
+            with self._lock:
+                if generation == self._generation:
+                    self._driver, self._profile = driver, profile
+                    driver = None
+            if driver is not None:
+                log_debug(f"[browser_supervisor] {self.name} standby discarded while starting")
+            else:
+                log_debug(f"[browser_supervisor] {self.name} standby ready on {profile}")
+        except Exception as e:
+            self._failures += 1
+            self._retry_at = time.monotonic() + RETRY_DELAY
+            log_warning(f"[browser_supervisor] {self.name} standby failed to start: {e}")
+        finally:
+            if driver is not None:
+                _quit(driver)
+            with self._lock:
+                self._building = False
+
+    def _check(self, active_profile: Optional[str]) -> None:
+        # Probe in place so take() can still hand the standby over meanwhile
+        with self._lock:
+            driver = self._driver
+        if driver is not None and not _alive(driver):
+            with self._lock:
+                dead = self._driver is driver
+                if dead:
+                    self._driver = self._profile = None
+            if dead:
+                log_warning(f"[browser_supervisor] {self.name} standby browser died, rebuilding")
+                _quit(driver)
+        self.ensure(active_profile)
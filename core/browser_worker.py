@@ -0,0 +1,411 @@
+# core/browser_worker.py
+"""Dedicated thread that owns a Selenium WebDriver.
+
+WebDriver calls block for anything from milliseconds to minutes. The
+Selenium engines used to make most of them (driver start, login checks,
+page loads, retry back-offs) directly on the event loop, which froze every
+interface while a browser was busy. A :class:`BrowserWorker` runs them on
+one thread instead: callers post commands to its mailbox and await the
+returned future, and the driver is only ever touched from that thread.
+Long waits are written as step generators (:meth:`BrowserWorker.submit_steps`)
+so the thread can serve other browser tabs while a reply is generated.
+
+Commands are timed per ``step``, and code running on the worker can add
+intermediate timings with :func:`mark`. The timings and the mailbox depth
+are reported by :meth:`BrowserWorker.stats` and :func:`get_stats`.
+"""
+
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+from core.logging_utils import log_debug, log_error
+
+_local = threading.local()
+_workers: Dict[str, "BrowserWorker"] = {}
+_counter = itertools.count(1)
+_STOP = object()
+
+
+class _StepStats:
+    __slots__ = ("count", "last", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.last = seconds
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "last": round(self.last, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+        }
+
+
+class _Context:
+    """Timing state of one command while it runs."""
+
+    __slots__ = ("label", "started", "reference", "marked")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = self.reference = time.perf_counter()
+        self.marked: set = set()
+
+
+class _StepTask:
+    """A generator command that pauses between steps (see :meth:`BrowserWorker.submit_steps`)."""
+
+    __slots__ = ("future", "steps", "before", "step", "context", "seq")
+
+    def __init__(self, future, steps, before, step, context, seq):
+        self.future = future
+        self.steps = steps
+        self.before = before
+        self.step = step
+        self.context = context
+        self.seq = seq
+
+
+class BrowserWorker:
+    """A single thread executing browser commands in submission order.
+
+    Besides plain callables the worker runs *step commands*: generators
+    that ``yield`` the number of seconds they want to wait instead of
+    sleeping. While one is paused the thread serves other commands, so
+    several conversations can wait for their replies at the same time.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._mailbox: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+        self._steps: Dict[str, _StepStats] = {}
+        self._active: Optional[_Context] = None
+        self._paused: List[Tuple[float, int, _StepTask]] = []
+        self._cancelled: set = set()
+        self._seq = itertools.count()
+        self._completed = 0
+        self._failed = 0
+        _workers[name] = self
+
+    # -- lifecycle -----------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"browser-{self.name}-{next(_counter)}", daemon=True
+        )
+        self._thread.start()
+        log_debug(f"[browser_worker] {self.name} thread started")
+
+    def _post(self, command: tuple) -> None:
+        """Queue ``command``, starting the thread if it is not running.
+
+        Holding the lock orders this against a thread that is exiting: the
+        command either reaches the mailbox before the thread drains it, or
+        it finds the thread gone and starts a new one.
+        """
+        with self._lock:
+            self._start_locked()
+            self._mailbox.put(command)
+
+    def stop(self, wait: float = 0) -> None:
+        """Ask the thread to exit once the commands already queued are done."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._mailbox.put(_STOP)
+        if wait and not self.on_worker_thread():
+            thread.join(wait)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def on_worker_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    # -- commands ------------------------------------------------------
+
+    def submit(self, fn: Callable, *args, step: Optional[str] = None, **kwargs) -> concurrent.futures.Future:
+        """Queue ``fn(*args, **kwargs)`` and return a future for its result.
+
+        Commands submitted from the worker thread itself run inline, so a
+        command may call helpers that submit in turn without deadlocking.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if self.on_worker_thread():
+            try:
+                future.set_result(self._execute(fn, args, kwargs, step))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        self._post(("call", future, fn, args, kwargs, step))
+        return future
+
+    def submit_steps(
+        self,
+        fn: Callable[..., Generator],
+        *args,
+        step: Optional[str] = None,
+        before: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ) -> concurrent.futures.Future:
+        """Queue the generator ``fn(*args, **kwargs)`` as a step command.
+
+        ``before`` runs ahead of every step, e.g. to focus the browser tab
+        the command works in. Submitted from the worker thread, the steps
+        run inline and pauses are plain sleeps.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if self.on_worker_thread():
+            def inline():
+                if before is not None:
+                    before()
+                return run_steps(fn(*args, **kwargs))
+
+            try:
+                future.set_result(self._execute(inline, (), {}, step))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        self._post(("steps", future, fn, args, kwargs, step, before))
+        return future
+
+    async def call(
+        self,
+        fn: Callable,
+        *args,
+        step: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Run ``fn`` on the worker and await its result without blocking the loop.
+
+        On timeout the caller stops waiting but the command still finishes on
+        the worker; later commands queue behind it.
+        """
+        future = asyncio.wrap_future(self.submit(fn, *args, step=step, **kwargs))
+        if timeout is None:
+            return await future
+        return await asyncio.wait_for(future, timeout)
+
+    async def call_steps(
+        self,
+        fn: Callable[..., Generator],
+        *args,
+        step: Optional[str] = None,
+        before: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ) -> Any:
+        """Await a step command; cancelling the caller stops it at its next pause."""
+        submitted = self.submit_steps(fn, *args, step=step, before=before, **kwargs)
+        try:
+            return await asyncio.wrap_future(submitted)
+        except asyncio.CancelledError:
+            self._cancelled.add(submitted)
+            raise
+
+    def _run(self) -> None:
+        _local.worker = self
+        while True:
+            timeout = None
+            if self._paused:
+                timeout = max(0.0, self._paused[0][0] - time.monotonic())
+            try:
+                command = self._mailbox.get(timeout=timeout)
+            except queue.Empty:
+                command = None
+            if command is _STOP:
+                break
+            if command is not None:
+                self._dispatch(command)
+            self._resume_due()
+
+        stopped = RuntimeError(f"browser worker {self.name} stopped")
+        for _, _, task in self._paused:
+            task.steps.close()
+            task.future.set_exception(stopped)
+        self._paused.clear()
+        with self._lock:
+            # Commands queued behind the stop would otherwise never resolve
+            self._thread = None
+            self._fail_pending(stopped)
+        log_debug(f"[browser_worker] {self.name} thread stopped")
+
+    def _fail_pending(self, error: BaseException) -> None:
+        while True:
+            try:
+                command = self._mailbox.get_nowait()
+            except queue.Empty:
+                return
+            if command is _STOP:
+                continue
+            future = command[1]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _dispatch(self, command: tuple) -> None:
+        kind, future = command[0], command[1]
+        if not future.set_running_or_notify_cancel():
+            return
+        if kind == "call":
+            _, _, fn, args, kwargs, step = command
+            try:
+                result = self._execute(fn, args, kwargs, step)
+            except BaseException as e:
+                self._failed += 1
+                future.set_exception(e)
+            else:
+                self._completed += 1
+                future.set_result(result)
+            return
+
+        _, _, fn, args, kwargs, step, before = command
+        context = _Context(step or getattr(fn, "__name__", "steps"))
+        try:
+            steps = fn(*args, **kwargs)
+        except BaseException as e:
+            self._failed += 1
+            future.set_exception(e)
+            return
+        self._advance(_StepTask(future, steps, before, step, context, next(self._seq)))
+
+    def _resume_due(self) -> None:
+        now = time.monotonic()
+        while self._paused and self._paused[0][0] <= now:
+            _, _, task = heapq.heappop(self._paused)
+            self._advance(task)
+
+    def _advance(self, task: _StepTask) -> None:
+        """Run ``task`` up to its next pause, or finish it."""
+        if task.future in self._cancelled:
+            self._cancelled.discard(task.future)
+            task.steps.close()
+            self._finish(task, error=asyncio.CancelledError())
+            return
+        self._active = task.context
+        try:
+            if task.before is not None:
+                task.before()
+            delay = next(task.steps)
+        except StopIteration as stop:
+            self._finish(task, result=stop.value)
+        except BaseException as e:
+            self._finish(task, error=e)
+        else:
+            resume_at = time.monotonic() + max(0.0, float(delay or 0))
+            heapq.heappush(self._paused, (resume_at, task.seq, task))
+        finally:
+            self._active = None
+
+    def _finish(self, task: _StepTask, result: Any = None, error: Optional[BaseException] = None) -> None:
+        if task.step:
+            self.record(task.step, time.perf_counter() - task.context.started)
+        if error is not None:
+            self._failed += 1
+            task.future.set_exception(error)
+        else:
+            self._completed += 1
+            task.future.set_result(result)
+
+    def _execute(self, fn: Callable, args: tuple, kwargs: dict, step: Optional[str]) -> Any:
+        nested = self._active is not None
+        if not nested:
+            self._active = _Context(step or getattr(fn, "__name__", "command"))
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if step:
+                self.record(step, time.perf_counter() - started)
+            if not nested:
+                self._active = None
+
+    # -- timings -------------------------------------------------------
+
+    def record(self, step: str, seconds: float) -> None:
+        stats = self._steps.get(step)
+        if stats is None:
+            stats = self._steps[step] = _StepStats()
+        stats.add(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        active = self._active
+        return {
+            "alive": self.is_alive(),
+            "busy": active is not None,
+            "current": active.label if active is not None else None,
+            "current_for": round(time.perf_counter() - active.started, 1) if active is not None else 0.0,
+            "queue_depth": self._mailbox.qsize() + (1 if active is not None else 0),
+            "paused": len(self._paused),
+            "completed": self._completed,
+            "failed": self._failed,
+            "steps": {name: s.as_dict() for name, s in self._steps.items()},
+        }
+
+
+def run_steps(steps: Generator) -> Any:
+    """Drive a step generator to completion in the calling thread, sleeping through its pauses."""
+    while True:
+        try:
+            delay = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if delay:
+            time.sleep(delay)
+
+
+def current_worker() -> Optional[BrowserWorker]:
+    """The worker owning the calling thread, if any."""
+    return getattr(_local, "worker", None)
+
+
+def set_reference() -> None:
+    """Start the clock used by :func:`mark` (e.g. when a prompt was sent)."""
+    worker = current_worker()
+    if worker is not None and worker._active is not None:
+        worker._active.reference = time.perf_counter()
+
+
+def mark(step: str) -> None:
+    """Record the time since :func:`set_reference` under ``step``, once per command."""
+    worker = current_worker()
+    context = worker._active if worker is not None else None
+    if context is None or step in context.marked:
+        return
+    context.marked.add(step)
+    worker.record(step, time.perf_counter() - context.reference)
+
+
+def get_stats() -> Dict[str, Any]:
+    """Stats of every worker that is still running."""
+    stats = {}
+    for name, worker in list(_workers.items()):
+        if not worker.is_alive():
+            continue
+        try:
+            stats[name] = worker.stats()
+        except Exception as e:  # pragma: no cover - best effort
+            log_error(f"[browser_worker] Failed to collect stats for {name}: {e}")
+    return stats
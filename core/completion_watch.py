@@ -0,0 +1,232 @@
+# core/completion_watch.py
+"""Event-driven detection of the end of a reply in a chat web UI.
+
+The Selenium engines used to poll the page every half second and call a
+reply finished after 3.5 s without growth. :func:`watch_steps` instead
+injects a ``MutationObserver`` with ``execute_async_script``. The
+observer watches the site's stop button and the last response element,
+and the script calls back as soon as the stop button has gone and the
+text has been quiet for ``SELENIUM_COMPLETION_QUIET_MS``.
+
+Each script call waits at most ``WATCH_BUDGET`` seconds so the browser worker
+can serve other tabs in between. The watch state lives on ``window``
+and survives those calls. When the script cannot run (old driver, page
+navigated away, JavaScript error) :func:`watch_steps` returns ``None``
+and the caller falls back to polling.
+
+Given an ``on_text`` callback the script also returns whenever the reply
+has grown, at most every ``SELENIUM_STREAM_INTERVAL_MS``, so the text can
+be streamed to interfaces (see :mod:`core.reply_stream`).
+"""
+
+import time
+from typing import Any, Callable, Dict, Generator, Optional
+
+from core.browser_worker import mark
+from core.config_manager import config_registry
+from core.logging_utils import log_debug
+
+SELENIUM_DOM_WATCH = config_registry.get_var(
+    "SELENIUM_DOM_WATCH",
+    True,
+    value_type=bool,
+    label="Detect Reply End From DOM Events",
+    description=(
+        "Watch the chat page with a MutationObserver to notice the end of a reply "
+        "right away. Disable to fall back to polling the page."
+    ),
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+SELENIUM_COMPLETION_QUIET_MS = config_registry.get_var(
+    "SELENIUM_COMPLETION_QUIET_MS",
+    250,
+    value_type=int,
+    label="Reply Settle Time (ms)",
+    description=(
+        "How long the reply text must stay unchanged after the stop button "
+        "disappears before it is considered complete."
+    ),
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+SELENIUM_STREAM_INTERVAL_MS = config_registry.get_var(
+    "SELENIUM_STREAM_INTERVAL_MS",
+    200,
+    value_type=int,
+    label="Reply Streaming Interval (ms)",
+    description="How often a growing reply is read from the page while a client streams it.",
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+# Longest single script call; the worker serves other tabs between calls
+WATCH_BUDGET = 1.0
+
+_WATCH_SCRIPT = r"""
+var stopSelector = arguments[0], responseSelector = arguments[1];
+var quietMs = arguments[2], graceMs = arguments[3], budgetMs = arguments[4];
+var reset = arguments[5], reportMs = arguments[6];
+var callback = arguments[arguments.length - 1];
+
+function lastText(nodes) {
+    return nodes.length ? (nodes[nodes.length - 1].innerText || '') : '';
+}
+
+function lastLength(nodes) {
+    return lastText(nodes).length;
+}
+
+var state = window.__synthCompletionWatch;
+if (reset || !state) {
+    var nodes = document.querySelectorAll(responseSelector);
+    state = window.__synthCompletionWatch = {
+        seen: false, started: false, reported: false, streamed: -1, streamedAt: 0,
+        count: nodes.length, length: lastLength(nodes), since: Date.now(), changedAt: Date.now()
+    };
+}
+
+function generating() {
+    var buttons = document.querySelectorAll(stopSelector);
+    for (var i = 0; i < buttons.length; i++) {
+        var b = buttons[i];
+        if (!b.getClientRects().length || b.disabled) continue;
+        if ((b.getAttribute('aria-disabled') || 'false') !== 'false') continue;
+        return true;
+    }
+    return false;
+}
+
+var observer = null, budgetTimer = null, settleTimer = null, streamTimer = null, finished = false;
+
+function finish(done) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(budgetTimer);
+    clearTimeout(settleTimer);
+    clearTimeout(streamTimer);
+    var result = {done: done, seen: state.seen, started: state.started, length: state.length};
+    if (reportMs > 0) {
+        result.text = lastText(document.querySelectorAll(responseSelector));
+        state.streamed = state.length;
+        state.streamedAt = Date.now();
+    }
+    callback(result);
+}
+
+function check() {
+    if (finished) return;
+    var busy = generating();
+    if (busy) state.seen = true;
+    var nodes = document.querySelectorAll(responseSelector);
+    var length = lastLength(nodes);
+    if (length !== state.length || nodes.length !== state.count) {
+        // A new reply element, or the last one changed
+        state.started = state.started || length > 0;
+        state.count = nodes.length;
+        state.length = length;
+        state.changedAt = Date.now();
+    }
+    if (state.started && !state.reported) {
+        // Return once so the caller can record the first token
+        state.reported = true;
+        finish(false);
+        return;
+    }
+    if (reportMs > 0 && state.started && state.length !== state.streamed) {
+        var due = state.streamedAt + reportMs - Date.now();
+        if (due <= 0) {
+            finish(false);
+            return;
+        }
+        if (!streamTimer) {
+            streamTimer = setTimeout(function () { streamTimer = null; check(); }, due);
+        }
+    }
+    clearTimeout(settleTimer);
+    if (busy) return;
+    // Nothing seen yet, or no stop button ever seen: wait as long as the
+    // polling path did and let the caller judge the text
+    var since = state.started ? state.changedAt : state.since;
+    var wait = (state.seen && state.started ? quietMs : graceMs) - (Date.now() - since);
+    if (wait <= 0) {
+        finish(true);
+    } else {
+        settleTimer = setTimeout(check, wait);
+    }
+}
+
+try {
+    observer = new MutationObserver(check);
+    observer.observe(document.body, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+    budgetTimer = setTimeout(function () { finish(false); }, budgetMs);
+    check();
+} catch (e) {
+    finished = true;
+    if (observer) observer.disconnect();
+    callback({error: String(e)});
+}
+"""
+
+
+def watch_steps(
+    driver,
+    stop_selector: str,
+    response_selector: str,
+    timeout: float,
+    grace: float = 3.5,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> Generator[float, None, Optional[bool]]:
+    """Step command waiting for the reply on the current page to finish.
+
+    Returns ``True`` once it has, ``False`` on timeout and ``None`` when
+    the watcher is disabled or cannot run, in which case the caller
+    should poll instead. ``on_text`` receives snapshots of the growing
+    reply, the last one taken when it finished.
+    """
+    if not SELENIUM_DOM_WATCH:
+        return None
+    deadline = time.monotonic() + timeout
+    quiet_ms = max(0, int(SELENIUM_COMPLETION_QUIET_MS))
+    report_ms = max(50, int(SELENIUM_STREAM_INTERVAL_MS)) if on_text is not None else 0
+    reset = True
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            log_debug("[completion_watch] Timed out waiting for the reply to finish")
+            return False
+        budget_ms = int(min(WATCH_BUDGET, remaining) * 1000)
+        try:
+            result: Dict[str, Any] = driver.execute_async_script(
+                _WATCH_SCRIPT,
+                stop_selector,
+                response_selector,
+                quiet_ms,
+                int(grace * 1000),
+                budget_ms,
+                reset,
+                report_ms,
+            ) or {}
+        except Exception as e:
+            log_debug(f"[completion_watch] Watcher unavailable, falling back to polling: {e}")
+            return None
+        if "error" in result:
+            log_debug(f"[completion_watch] Watcher failed, falling back to polling: {result['error']}")
+            return None
+        reset = False
+        if result.get("started"):
+            mark("first_token")
+        if on_text is not None and result.get("text"):
+            on_text(result["text"])
+        if result.get("done"):
+            return True
+        # Let the worker serve other tabs before watching again
+        yield 0
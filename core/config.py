@@ -8,7 +8,7 @@ try:
 except Exception:  # pragma: no cover - fallback when dotenv not installed
     def load_dotenv(*args, **kwargs):
         return False
-from core.db import get_conn
+from core.db import acquire
 import aiomysql
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 from core.config_manager import config_registry
@@ -86,20 +86,18 @@ _active_llm = None  # local global variable
 async def get_active_llm():
     global _active_llm
     if _active_llm is None:
-        conn = await get_conn()
-        try:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute("SELECT value FROM settings WHERE `setting_key` = 'active_llm'")
-                row = await cur.fetchone()
-                if row:
-                    _active_llm = row["value"]
-                    log_debug(f"[config] 🧠 Active LLM plugin loaded from DB: {_active_llm}")
-                else:
-                    _active_llm = "manual"
-        except Exception as e:
-            log_error(f"[config] ❌ Error in get_active_llm(): {repr(e)}")
-        finally:
-            conn.close()
+        async with acquire() as conn:
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cur:
+                    await cur.execute("SELECT value FROM settings WHERE `setting_key` = 'active_llm'")
+                    row = await cur.fetchone()
+                    if row:
+                        _active_llm = row["value"]
+                        log_debug(f"[config] 🧠 Active LLM plugin loaded from DB: {_active_llm}")
+                    else:
+                        _active_llm = "manual"
+            except Exception as e:
+                log_error(f"[config] ❌ Error in get_active_llm(): {repr(e)}")
     return _active_llm
 
 async def set_active_llm(name: str):
@@ -110,19 +108,17 @@ async def set_active_llm(name: str):
     _active_llm = name
     from core.db import ensure_core_tables
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "REPLACE INTO settings (`setting_key`, value) VALUES (%s, %s)",
-                ("active_llm", name),
-            )
-            await conn.commit()
-            log_debug(f"[config] 💾 Saved active plugin in DB: {name}")
-    except Exception as e:
-        log_error(f"[config] ❌ Error in set_active_llm(): {repr(e)}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "REPLACE INTO settings (`setting_key`, value) VALUES (%s, %s)",
+                    ("active_llm", name),
+                )
+                await conn.commit()
+                log_debug(f"[config] 💾 Saved active plugin in DB: {name}")
+        except Exception as e:
+            log_error(f"[config] ❌ Error in set_active_llm(): {repr(e)}")
 
 _log_chat_id: int | None = None  # cached log chat ID
 _log_chat_thread_id: int | None = None  # cached log chat thread ID
@@ -132,25 +128,23 @@ async def get_log_chat_id() -> int | None:
     """Return the configured log chat ID, if any."""
     global _log_chat_id
     if _log_chat_id is None:
-        conn = await get_conn()
-        try:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(
-                    "SELECT value FROM settings WHERE `setting_key` = 'log_chat_id'"
-                )
-                row = await cur.fetchone()
-                if row:
-                    try:
-                        _log_chat_id = int(row["value"])
-                        log_debug(
-                            f"[config] 📥 Loaded log_chat_id from DB: {_log_chat_id}"
-                        )
-                    except (ValueError, TypeError):
-                        _log_chat_id = None
-        except Exception as e:
-            log_error(f"[config] ❌ Error in get_log_chat_id(): {repr(e)}")
-        finally:
-            conn.close()
+        async with acquire() as conn:
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cur:
+                    await cur.execute(
+                        "SELECT value FROM settings WHERE `setting_key` = 'log_chat_id'"
+                    )
+                    row = await cur.fetchone()
+                    if row:
+                        try:
+                            _log_chat_id = int(row["value"])
+                            log_debug(
+                                f"[config] 📥 Loaded log_chat_id from DB: {_log_chat_id}"
+                            )
+                        except (ValueError, TypeError):
+                            _log_chat_id = None
+            except Exception as e:
+                log_error(f"[config] ❌ Error in get_log_chat_id(): {repr(e)}")
     return _log_chat_id
 
 
@@ -158,22 +152,20 @@ async def get_log_chat_interface() -> str | None:
     """Return the configured log chat interface, if any."""
     global _log_chat_interface
     if _log_chat_interface is None:
-        conn = await get_conn()
-        try:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(
-                    "SELECT value FROM settings WHERE `setting_key` = 'log_chat_interface'"
-                )
-                row = await cur.fetchone()
-                if row:
-                    _log_chat_interface = row["value"]
-                    log_debug(
-                        f"[config] 📥 Loaded log_chat_interface from DB: {_log_chat_interface}"
+        async with acquire() as conn:
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cur:
+                    await cur.execute(
+                        "SELECT value FROM settings WHERE `setting_key` = 'log_chat_interface'"
                     )
-        except Exception as e:
-            log_error(f"[config] ❌ Error in get_log_chat_interface(): {repr(e)}")
-        finally:
-            conn.close()
+                    row = await cur.fetchone()
+                    if row:
+                        _log_chat_interface = row["value"]
+                        log_debug(
+                            f"[config] 📥 Loaded log_chat_interface from DB: {_log_chat_interface}"
+                        )
+            except Exception as e:
+                log_error(f"[config] ❌ Error in get_log_chat_interface(): {repr(e)}")
     return _log_chat_interface
 
 async def set_log_chat_id(chat_id: int) -> None:
@@ -182,45 +174,41 @@ async def set_log_chat_id(chat_id: int) -> None:
     _log_chat_id = chat_id
     from core.db import ensure_core_tables
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
-                ("log_chat", str(chat_id)),
-            )
-            await conn.commit()
-            log_debug(
-                f"[config] 💾 Saved log_chat in DB: {chat_id}"
-            )
-    except Exception as e:
-        log_error(f"[config] ❌ Error in set_log_chat_id(): {repr(e)}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
+                    ("log_chat", str(chat_id)),
+                )
+                await conn.commit()
+                log_debug(
+                    f"[config] 💾 Saved log_chat in DB: {chat_id}"
+                )
+        except Exception as e:
+            log_error(f"[config] ❌ Error in set_log_chat_id(): {repr(e)}")
 
 async def get_log_chat_thread_id() -> int | None:
     """Return the configured log chat thread ID, if any."""
     global _log_chat_thread_id
     if _log_chat_thread_id is None:
-        conn = await get_conn()
-        try:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(
-                    "SELECT value FROM settings WHERE `setting_key` = 'log_chat_thread_id'"
-                )
-                row = await cur.fetchone()
-                if row:
-                    try:
-                        _log_chat_thread_id = int(row["value"])
-                        log_debug(
-                            f"[config] 📥 Loaded log_chat_thread_id from DB: {_log_chat_thread_id}"
-                        )
-                    except (ValueError, TypeError):
-                        _log_chat_thread_id = None
-        except Exception as e:
-            log_error(f"[config] ❌ Error in get_log_chat_thread_id(): {repr(e)}")
-        finally:
-            conn.close()
+        async with acquire() as conn:
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cur:
+                    await cur.execute(
+                        "SELECT value FROM settings WHERE `setting_key` = 'log_chat_thread_id'"
+                    )
+                    row = await cur.fetchone()
+                    if row:
+                        try:
+                            _log_chat_thread_id = int(row["value"])
+                            log_debug(
+                                f"[config] 📥 Loaded log_chat_thread_id from DB: {_log_chat_thread_id}"
+                            )
+                        except (ValueError, TypeError):
+                            _log_chat_thread_id = None
+            except Exception as e:
+                log_error(f"[config] ❌ Error in get_log_chat_thread_id(): {repr(e)}")
     return _log_chat_thread_id
 
 async def set_log_chat_id_and_thread(chat_id: int, thread_id: int | None = None, interface: str = "webui") -> None:
@@ -231,35 +219,33 @@ async def set_log_chat_id_and_thread(chat_id: int, thread_id: int | None = None,
     _log_chat_interface = interface
     from core.db import ensure_core_tables
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
-                ("log_chat_id", str(chat_id)),
-            )
-            await cur.execute(
-                "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
-                ("log_chat_interface", interface),
-            )
-            if thread_id is not None:
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
                 await cur.execute(
                     "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
-                    ("log_chat_thread_id", str(thread_id)),
+                    ("log_chat_id", str(chat_id)),
                 )
-            else:
-                # Remove thread setting if None
                 await cur.execute(
-                    "DELETE FROM settings WHERE `setting_key` = 'log_chat_thread_id'"
+                    "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
+                    ("log_chat_interface", interface),
                 )
-            await conn.commit()
-            log_debug(
-                f"[config] 💾 Saved log chat in DB: {chat_id}, thread: {thread_id}, interface: {interface}"
-            )
-    except Exception as e:
-        log_error(f"[config] ❌ Error in set_log_chat_id_and_thread(): {repr(e)}")
-    finally:
-        conn.close()
+                if thread_id is not None:
+                    await cur.execute(
+                        "REPLACE INTO settings (`setting_key`, `value`) VALUES (%s, %s)",
+                        ("log_chat_thread_id", str(thread_id)),
+                    )
+                else:
+                    # Remove thread setting if None
+                    await cur.execute(
+                        "DELETE FROM settings WHERE `setting_key` = 'log_chat_thread_id'"
+                    )
+                await conn.commit()
+                log_debug(
+                    f"[config] 💾 Saved log chat in DB: {chat_id}, thread: {thread_id}, interface: {interface}"
+                )
+        except Exception as e:
+            log_error(f"[config] ❌ Error in set_log_chat_id_and_thread(): {repr(e)}")
 
 def get_log_chat_id_sync() -> int | None:
     """Synchronous helper to fetch cached log chat ID, loading from DB if needed."""
@@ -416,22 +416,19 @@ class ConfigRegistry:
 
     async def _load_from_db(self, key: str) -> Optional[str]:
         try:
-            from core.db import get_conn, ensure_core_tables
+            from core.db import acquire, ensure_core_tables
         except ImportError as e:
             # Circular import during initialization - skip DB load
             print(f"[config] Skipping DB load for '{key}' during initialization: {e}", flush=True)
             return None
 
         await ensure_core_tables()
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute("SELECT value FROM config WHERE config_key = %s", (key,))
                 row = await cur.fetchone()
                 if row:
                     return row[0]
-        finally:
-            conn.close()
         return None
 
     def _persist_background(self, key: str, value: str) -> None:
@@ -444,23 +441,20 @@ class ConfigRegistry:
 
     async def _persist_to_db(self, key: str, value: str) -> None:
         try:
-            from core.db import get_conn, ensure_core_tables
+            from core.db import acquire, ensure_core_tables
         except ImportError as e:
             # Circular import during initialization - skip DB persist
             print(f"[config] Skipping DB persist for '{key}' during initialization: {e}", flush=True)
             return
 
         await ensure_core_tables()
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     "REPLACE INTO config (config_key, value) VALUES (%s, %s)",
                     (key, value),
                 )
                 await conn.commit()
-        finally:
-            conn.close()
 
     def _serialize_value(self, definition: ConfigDefinition, value: Any) -> str:
         if value is None:
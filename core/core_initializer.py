@@ -776,6 +776,16 @@ class CoreInitializer:
             "available_actions": available_actions,
             "static_context": static_context,
         }
+        try:
+            from core.prompt_engine import invalidate_static_prompt_block
+            invalidate_static_prompt_block()
+        except Exception as e:
+            log_warning(f"[core_initializer] Could not invalidate static prompt block: {e}")
+        try:
+            from core import action_parser
+            action_parser.invalidate_dispatch_table()
+        except Exception as e:
+            log_warning(f"[core_initializer] Could not invalidate action dispatch table: {e}")
         log_debug(f"[core_initializer] Actions block built with {len(available_actions)} action types, static_context: {list(static_context.keys())}")
         log_debug(f"[core_initializer] Available action types: {sorted(available_actions.keys())}")
         log_debug("[core_initializer] About to reset _building_actions_block flag")
@@ -1033,8 +1043,7 @@ def register_action(action_type: str, handler: Any) -> None:
     try:
         from core import action_parser
 
-        action_parser._ACTION_HANDLERS = None
-        action_parser._INTERFACE_ACTIONS = None
+        action_parser.invalidate_dispatch_table()
         # Don't auto-rebuild here to prevent infinite loops
         # The rebuild will happen when _build_actions_block() is explicitly called
     except Exception:
@@ -1076,7 +1085,7 @@ def register_plugin(name: str, plugin_obj: Any) -> None:
     try:
         from core import action_parser
 
-        action_parser._ACTION_PLUGINS = None
+        action_parser.invalidate_dispatch_table()
     except Exception:
         pass
 
@@ -1122,6 +1131,13 @@ def register_interface(name: str, interface_obj: Any) -> None:
     INTERFACE_REGISTRY[name] = interface_obj
     log_debug(f"[core_initializer] Registered interface: {name}")
 
+    try:
+        from core import action_parser
+
+        action_parser.invalidate_dispatch_table()
+    except Exception:
+        pass
+
     # Log detailed information about the interface loading
     log_debug(f"[core_initializer] Loading interface: {name}")
 
@@ -5,6 +5,7 @@ import calendar
 import asyncio
 import time
 
+from contextlib import asynccontextmanager
 from types import SimpleNamespace
 from typing import Any
 
@@ -79,6 +80,50 @@ DB_NAME = config_registry.get_value(
     advanced=True,
     tags=["bootstrap"],
 )
+DB_POOL_MIN_SIZE = config_registry.get_value(
+    "DB_POOL_MIN_SIZE",
+    1,
+    label="Database Pool Min Size",
+    description="Connections kept open in the shared MariaDB pool.",
+    value_type=int,
+    group="database",
+    component="core",
+    advanced=True,
+    tags=["bootstrap"],
+)
+DB_POOL_MAX_SIZE = config_registry.get_value(
+    "DB_POOL_MAX_SIZE",
+    10,
+    label="Database Pool Max Size",
+    description="Maximum number of concurrent connections in the shared MariaDB pool.",
+    value_type=int,
+    group="database",
+    component="core",
+    advanced=True,
+    tags=["bootstrap"],
+)
+DB_POOL_RECYCLE = config_registry.get_value(
+    "DB_POOL_RECYCLE",
+    3600,
+    label="Database Pool Recycle",
+    description="Seconds after which an idle pooled connection is reopened (-1 disables).",
+    value_type=int,
+    group="database",
+    component="core",
+    advanced=True,
+    tags=["bootstrap"],
+)
+DB_POOL_HEALTHCHECK_INTERVAL = config_registry.get_value(
+    "DB_POOL_HEALTHCHECK_INTERVAL",
+    30,
+    label="Database Pool Health Check",
+    description="Idle seconds after which a pooled connection is pinged before being reused.",
+    value_type=int,
+    group="database",
+    component="core",
+    advanced=True,
+    tags=["bootstrap"],
+)
 
 # Test di connessione con retry e logging dettagliato
 async def wait_for_db(max_attempts=10, delay=3):
@@ -122,7 +167,10 @@ _DB_LOG_THROTTLE_SEC = 2
 _last_db_log_time = 0
 
 async def get_conn() -> aiomysql.Connection:
-    """Return an async MariaDB connection using aiomysql."""
+    """Open a dedicated MariaDB connection outside the shared pool.
+
+    The caller owns the connection and must close it. Prefer ``acquire()``.
+    """
     global _last_db_log_time
     try:
         now = time.time()
@@ -180,6 +228,183 @@ async def get_conn() -> aiomysql.Connection:
     log_debug("[db] Connection opened")
     return conn
 
+
+# === Shared connection pool ===
+
+_pool = None
+_pool_loop: asyncio.AbstractEventLoop | None = None
+_pool_host: str | None = None
+_pool_stats = {
+    "acquisitions": 0,
+    "waiting": 0,
+    "direct": 0,
+    "healthcheck_failures": 0,
+    "acquire_time_total": 0.0,
+    "acquire_time_max": 0.0,
+    "acquire_time_last": 0.0,
+}
+
+
+async def init_pool() -> bool:
+    """Create the shared connection pool on the running event loop.
+
+    The pool is bound to the loop that creates it; ``acquire()`` callers running
+    on any other loop (threads using ``asyncio.run``, import-time config loads)
+    transparently get a dedicated connection instead.
+    """
+    global _pool, _pool_loop, _pool_host
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop and not _pool.closed:
+        return True
+    if _pool is not None:
+        await close_pool()
+
+    create_pool = getattr(aiomysql, "create_pool", None)
+    if create_pool is None:
+        log_warning("[db] aiomysql pool support unavailable, using direct connections")
+        return False
+
+    minsize = max(0, int(DB_POOL_MIN_SIZE))
+    maxsize = max(1, minsize, int(DB_POOL_MAX_SIZE))
+    hosts = [DB_HOST] if DB_HOST == "localhost" else [DB_HOST, "localhost"]
+    for host in hosts:
+        try:
+            _pool = await create_pool(
+                minsize=minsize,
+                maxsize=maxsize,
+                pool_recycle=int(DB_POOL_RECYCLE),
+                host=host,
+                port=DB_PORT,
+                user=DB_USER,
+                password=DB_PASS,
+                db=DB_NAME,
+                autocommit=True,
+            )
+        except Exception as e:  # pragma: no cover - network errors
+            log_warning(f"[db] Pool creation for {host} failed: {e}")
+            continue
+        _pool_loop = loop
+        _pool_host = host
+        log_info(
+            f"[db] Connection pool ready on {DB_USER}@{host}:{DB_PORT}/{DB_NAME} "
+            f"(min={minsize}, max={maxsize})"
+        )
+        return True
+
+    log_error("[db] Could not create connection pool, using direct connections")
+    return False
+
+
+async def close_pool() -> None:
+    """Close the shared pool and drop its connections."""
+    global _pool, _pool_loop, _pool_host
+    pool, loop = _pool, _pool_loop
+    _pool = None
+    _pool_loop = None
+    _pool_host = None
+    if pool is None:
+        return
+    pool.close()
+    try:
+        if loop is asyncio.get_running_loop():
+            await pool.wait_closed()
+    except Exception as e:  # pragma: no cover - best effort
+        log_debug(f"[db] Error while closing pool: {e}")
+    log_info("[db] Connection pool closed")
+
+
+async def _ensure_healthy(pool, conn):
+    """Ping ``conn`` if it sat idle too long and replace it when it is dead."""
+    interval = int(DB_POOL_HEALTHCHECK_INTERVAL)
+    if interval < 0 or _pool_loop.time() - conn.last_usage < interval:
+        return conn
+    try:
+        await conn.ping(reconnect=True)
+        return conn
+    except Exception as e:
+        _pool_stats["healthcheck_failures"] += 1
+        log_warning(f"[db] Pooled connection failed health check: {e}")
+        conn.close()
+        pool.release(conn)
+        return await pool.acquire()
+
+
+@asynccontextmanager
+async def acquire():
+    """Borrow a MariaDB connection from the shared pool.
+
+    Usage::
+
+        async with db.acquire() as conn:
+            async with conn.cursor() as cur:
+                ...
+
+    The connection is returned to the pool on exit and must not be closed by
+    the caller. When the pool is not running on the current event loop a
+    dedicated connection is opened and closed around the block.
+    """
+    pool = _pool
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # pragma: no cover - always called from a coroutine
+        loop = None
+
+    if pool is None or pool.closed or _pool_loop is not loop:
+        _pool_stats["direct"] += 1
+        conn = await get_conn()
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    start = time.perf_counter()
+    _pool_stats["waiting"] += 1
+    try:
+        conn = await pool.acquire()
+        conn = await _ensure_healthy(pool, conn)
+    finally:
+        _pool_stats["waiting"] -= 1
+    elapsed = time.perf_counter() - start
+    _pool_stats["acquisitions"] += 1
+    _pool_stats["acquire_time_total"] += elapsed
+    _pool_stats["acquire_time_last"] = elapsed
+    if elapsed > _pool_stats["acquire_time_max"]:
+        _pool_stats["acquire_time_max"] = elapsed
+
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def get_pool_stats() -> dict:
+    """Return a snapshot of pool usage for diagnostics."""
+    pool = _pool
+    active = pool is not None and not pool.closed
+    size = pool.size if active else 0
+    free = pool.freesize if active else 0
+    acquisitions = _pool_stats["acquisitions"]
+    avg = _pool_stats["acquire_time_total"] / acquisitions if acquisitions else 0.0
+    return {
+        "enabled": active,
+        "host": _pool_host,
+        "size": size,
+        "free": free,
+        "in_use": size - free,
+        "min_size": pool.minsize if active else int(DB_POOL_MIN_SIZE),
+        "max_size": pool.maxsize if active else int(DB_POOL_MAX_SIZE),
+        "waiters": _pool_stats["waiting"],
+        "acquisitions": acquisitions,
+        "direct_connections": _pool_stats["direct"],
+        "healthcheck_failures": _pool_stats["healthcheck_failures"],
+        "acquire_latency_ms": {
+            "last": round(_pool_stats["acquire_time_last"] * 1000, 3),
+            "avg": round(avg * 1000, 3),
+            "max": round(_pool_stats["acquire_time_max"] * 1000, 3),
+        },
+    }
+
 async def test_connection() -> bool:
     """Check if the database is reachable."""
     try:
@@ -195,42 +420,40 @@ async def test_connection() -> bool:
 
 async def init_db() -> None:
     """Asynchronously initialize essential MariaDB tables (core only)."""
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            # settings table for configuration values - core functionality
-            await cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS settings (
-                    `setting_key` VARCHAR(255) PRIMARY KEY,
-                    `value` TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                # settings table for configuration values - core functionality
+                await cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS settings (
+                        `setting_key` VARCHAR(255) PRIMARY KEY,
+                        `value` TEXT NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    )
+                    """
                 )
-                """
-            )
 
-            await cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS config (
-                    `config_key` VARCHAR(255) PRIMARY KEY,
-                    `value` TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                await cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS config (
+                        `config_key` VARCHAR(255) PRIMARY KEY,
+                        `value` TEXT NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    )
+                    """
                 )
-                """
-            )
 
-            # Insert default settings if they don't exist
-            await cur.execute(
-                """
-                INSERT IGNORE INTO settings (`setting_key`, `value`) VALUES ('active_llm', 'manual')
-                """
-            )
-    except Exception as e:
-        print(f"[init_db] Error: {e}")
-    finally:
-        conn.close()
+                # Insert default settings if they don't exist
+                await cur.execute(
+                    """
+                    INSERT IGNORE INTO settings (`setting_key`, `value`) VALUES ('active_llm', 'manual')
+                    """
+                )
+        except Exception as e:
+            print(f"[init_db] Error: {e}")
 
 
 async def ensure_core_tables() -> None:
@@ -260,20 +483,18 @@ async def insert_memory(
 
     await ensure_core_tables()
 
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO memories (timestamp, content, author, source, tags, scope, emotion, intensity, emotion_state)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (timestamp, content, author, source, tags, scope, emotion, intensity, emotion_state),
-            )
-    except Exception as e:
-        print(f"[insert_memory] Error: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO memories (timestamp, content, author, source, tags, scope, emotion, intensity, emotion_state)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (timestamp, content, author, source, tags, scope, emotion, intensity, emotion_state),
+                )
+        except Exception as e:
+            print(f"[insert_memory] Error: {e}")
 
 # 💥 Insert a new emotional event
 async def insert_emotion_event(
@@ -288,126 +509,114 @@ async def insert_emotion_event(
     next_check: str,
 ) -> None:
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO emotion_diary (id, source, event, emotion, intensity, state, trigger_condition, decision_logic, next_check)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    eid,
-                    source,
-                    event,
-                    emotion,
-                    intensity,
-                    state,
-                    trigger_condition,
-                    decision_logic,
-                    next_check,
-                ),
-            )
-    except Exception as e:
-        print(f"[insert_emotion_event] Error: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO emotion_diary (id, source, event, emotion, intensity, state, trigger_condition, decision_logic, next_check)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        eid,
+                        source,
+                        event,
+                        emotion,
+                        intensity,
+                        state,
+                        trigger_condition,
+                        decision_logic,
+                        next_check,
+                    ),
+                )
+        except Exception as e:
+            print(f"[insert_emotion_event] Error: {e}")
 
 # 🔍 Retrieve active emotions
 async def get_active_emotions() -> list[dict]:
-    conn = await get_conn()
-    try:
-        async with conn.cursor(aiomysql.DictCursor) as cur:
-            await cur.execute(
-                """
-                SELECT * FROM emotion_diary
-                WHERE state = 'active'
-                """
-            )
-            rows = await cur.fetchall()
-    except Exception as e:
-        print(f"[get_active_emotions] Error: {e}")
-        rows = []
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(
+                    """
+                    SELECT * FROM emotion_diary
+                    WHERE state = 'active'
+                    """
+                )
+                rows = await cur.fetchall()
+        except Exception as e:
+            print(f"[get_active_emotions] Error: {e}")
+            rows = []
     return [dict(row) for row in rows]
 
 # ➕ Modify the intensity of an emotion
 async def update_emotion_intensity(eid: str, delta: int) -> None:
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                UPDATE emotion_diary
-                SET intensity = intensity + %s
-                WHERE id = %s
-                """,
-                (delta, eid),
-            )
-    except Exception as e:
-        print(f"[update_emotion_intensity] Error: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE emotion_diary
+                    SET intensity = intensity + %s
+                    WHERE id = %s
+                    """,
+                    (delta, eid),
+                )
+        except Exception as e:
+            print(f"[update_emotion_intensity] Error: {e}")
 
 # 💀 Mark an emotion as resolved
 async def mark_emotion_resolved(eid: str) -> None:
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                UPDATE emotion_diary
-                SET state = 'resolved'
-                WHERE id = %s
-                """,
-                (eid,),
-            )
-    except Exception as e:
-        print(f"[mark_emotion_resolved] Error: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE emotion_diary
+                    SET state = 'resolved'
+                    WHERE id = %s
+                    """,
+                    (eid,),
+                )
+        except Exception as e:
+            print(f"[mark_emotion_resolved] Error: {e}")
 
 # 💎 Crystallize an active emotion
 async def crystallize_emotion(eid: str) -> None:
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                UPDATE emotion_diary
-                SET state = 'crystallized'
-                WHERE id = %s
-                """,
-                (eid,),
-            )
-    except Exception as e:
-        print(f"[crystallize_emotion] Error: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE emotion_diary
+                    SET state = 'crystallized'
+                    WHERE id = %s
+                    """,
+                    (eid,),
+                )
+        except Exception as e:
+            print(f"[crystallize_emotion] Error: {e}")
 
 # 🔁 Retrieve recent responses generated by the bot
 async def get_recent_responses(since_timestamp: str) -> list[dict]:
-    conn = await get_conn()
-    try:
-        async with conn.cursor(aiomysql.DictCursor) as cur:
-            await cur.execute(
-                """
-                SELECT * FROM memories
-                WHERE source = 'synth' AND timestamp >= %s
-                ORDER BY timestamp DESC
-                """,
-                (since_timestamp,),
-            )
-            rows = await cur.fetchall()
-    except Exception as e:
-        print(f"[get_recent_responses] Error: {e}")
-        rows = []
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(
+                    """
+                    SELECT * FROM memories
+                    WHERE source = 'synth' AND timestamp >= %s
+                    ORDER BY timestamp DESC
+                    """,
+                    (since_timestamp,),
+                )
+                rows = await cur.fetchall()
+        except Exception as e:
+            print(f"[get_recent_responses] Error: {e}")
+            rows = []
     return [dict(row) for row in rows]
 
 # === Event management helpers ===
@@ -425,38 +634,36 @@ async def insert_scheduled_event(
         time = "00:00"
 
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            try:
-                from core.time_zone_utils import parse_local_to_utc
-                next_run_utc = parse_local_to_utc(date, time)
-            except Exception as e:
-                log_warning(
-                    f"[insert_scheduled_event] Invalid date/time: {date} {time} - {e}"
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                try:
+                    from core.time_zone_utils import parse_local_to_utc
+                    next_run_utc = parse_local_to_utc(date, time)
+                except Exception as e:
+                    log_warning(
+                        f"[insert_scheduled_event] Invalid date/time: {date} {time} - {e}"
+                    )
+                    return
+
+                await safe_db_execute(
+                    cur,
+                    """
+                    INSERT INTO scheduled_events (`date`, `time`, next_run, recurrence_type, description, created_by)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        date,
+                        time,
+                        next_run_utc.isoformat(),
+                        recurrence_type or "none",
+                        description,
+                        created_by,
+                    ),
+                    ensure_fn=ensure_core_tables,
                 )
-                return
-
-            await safe_db_execute(
-                cur,
-                """
-                INSERT INTO scheduled_events (`date`, `time`, next_run, recurrence_type, description, created_by)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    date,
-                    time,
-                    next_run_utc.isoformat(),
-                    recurrence_type or "none",
-                    description,
-                    created_by,
-                ),
-                ensure_fn=ensure_core_tables,
-            )
-    except Exception as e:
-        log_error(f"[insert_scheduled_event] Error: {e}")
-    finally:
-        conn.close()
+        except Exception as e:
+            log_error(f"[insert_scheduled_event] Error: {e}")
 
 
 async def get_due_events(now: datetime | None = None) -> list[dict]:
@@ -470,20 +677,18 @@ async def get_due_events(now: datetime | None = None) -> list[dict]:
     query = "SELECT * FROM scheduled_events WHERE delivered = 0 AND next_run <= %s ORDER BY id"
     log_debug(f"[get_due_events] Executing query: {query}")
 
-    conn = await get_conn()
-    try:
-        async with conn.cursor(aiomysql.DictCursor) as cur:
-            await safe_db_execute(cur, query, (now.isoformat(),), ensure_fn=ensure_core_tables)
-            rows = await cur.fetchall()
-            log_debug(f"[get_due_events] Retrieved {len(rows)} rows")
-            for row in rows:
-                log_debug(f"[get_due_events] Row: {dict(row)}")
-    except Exception as e:
-        log_error(f"[get_due_events] Error executing query: {repr(e)}")
-        rows = []
-    finally:
-        conn.close()
-        log_debug("[get_due_events] Connection closed")
+    async with acquire() as conn:
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await safe_db_execute(cur, query, (now.isoformat(),), ensure_fn=ensure_core_tables)
+                rows = await cur.fetchall()
+                log_debug(f"[get_due_events] Retrieved {len(rows)} rows")
+                for row in rows:
+                    log_debug(f"[get_due_events] Row: {dict(row)}")
+        except Exception as e:
+            log_error(f"[get_due_events] Error executing query: {repr(e)}")
+            rows = []
+    log_debug("[get_due_events] Connection released")
 
     due = []
     log_debug(f"[get_due_events] Retrieved {len(rows)} events from the database")
@@ -532,84 +737,80 @@ async def mark_event_delivered(event_id: int) -> bool:
     Returns ``True`` when the update succeeds and ``False`` otherwise.
     """
     await ensure_core_tables()
-    conn = await get_conn()
-
-    async with conn.cursor(aiomysql.DictCursor) as cur:
-        await safe_db_execute(cur, "SELECT recurrence_type, next_run FROM scheduled_events WHERE id = %s", (event_id,), ensure_fn=ensure_core_tables)
-        row = await cur.fetchone()
-    if not row:
-        log_warning(f"[db] Event {event_id} not found to be marked as delivered")
-        conn.close()
-        return False
-    repeat_type = (row.get("recurrence_type") or "none").lower()
-    next_run_val = row.get("next_run")
-
-    try:
+    async with acquire() as conn:
         async with conn.cursor(aiomysql.DictCursor) as cur:
-            try:
-                if next_run_val:
-                    next_run_dt = datetime.fromisoformat(str(next_run_val).replace('Z', '+00:00'))
-                else:
+            await safe_db_execute(cur, "SELECT recurrence_type, next_run FROM scheduled_events WHERE id = %s", (event_id,), ensure_fn=ensure_core_tables)
+            row = await cur.fetchone()
+        if not row:
+            log_warning(f"[db] Event {event_id} not found to be marked as delivered")
+            return False
+        repeat_type = (row.get("recurrence_type") or "none").lower()
+        next_run_val = row.get("next_run")
+
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                try:
+                    if next_run_val:
+                        next_run_dt = datetime.fromisoformat(str(next_run_val).replace('Z', '+00:00'))
+                    else:
+                        next_run_dt = None
+                    if next_run_dt and next_run_dt.tzinfo is None:
+                        from core.time_zone_utils import get_local_timezone
+                        next_run_dt = (
+                            next_run_dt.replace(tzinfo=get_local_timezone())
+                            .astimezone(timezone.utc)
+                        )
+                    elif next_run_dt:
+                        next_run_dt = next_run_dt.astimezone(timezone.utc)
+                except Exception as e:
+                    log_warning(f"[db] Invalid next_run for event {event_id}: {next_run_val} - {e}")
                     next_run_dt = None
-                if next_run_dt and next_run_dt.tzinfo is None:
-                    from core.time_zone_utils import get_local_timezone
-                    next_run_dt = (
-                        next_run_dt.replace(tzinfo=get_local_timezone())
-                        .astimezone(timezone.utc)
-                    )
-                elif next_run_dt:
-                    next_run_dt = next_run_dt.astimezone(timezone.utc)
-            except Exception as e:
-                log_warning(f"[db] Invalid next_run for event {event_id}: {next_run_val} - {e}")
-                next_run_dt = None
 
-            if repeat_type == "none":
-                await safe_db_execute(
-                    cur,
-                    "UPDATE scheduled_events SET delivered = 1 WHERE id = %s",
-                    (event_id,),
-                    ensure_fn=ensure_core_tables,
-                )
-                log_info(f"[db] Event {event_id} marked as delivered (one-time)")
-                return True
+                if repeat_type == "none":
+                    await safe_db_execute(
+                        cur,
+                        "UPDATE scheduled_events SET delivered = 1 WHERE id = %s",
+                        (event_id,),
+                        ensure_fn=ensure_core_tables,
+                    )
+                    log_info(f"[db] Event {event_id} marked as delivered (one-time)")
+                    return True
 
-            elif repeat_type == "always":
-                # Always recurring events stay active indefinitely
-                log_debug(f"[db] Event {event_id} remains active (always recurrence)")
-                return True
+                elif repeat_type == "always":
+                    # Always recurring events stay active indefinitely
+                    log_debug(f"[db] Event {event_id} remains active (always recurrence)")
+                    return True
 
-            else:
-                if not next_run_dt:
-                    log_warning(f"[db] Missing next_run for repeating event {event_id}")
-                    return False
-
-                if repeat_type == "daily":
-                    new_dt = next_run_dt + timedelta(days=1)
-                elif repeat_type == "weekly":
-                    new_dt = next_run_dt + timedelta(days=7)
-                elif repeat_type == "monthly":
-                    year = next_run_dt.year + (next_run_dt.month // 12)
-                    month = next_run_dt.month % 12 + 1
-                    day = min(next_run_dt.day, calendar.monthrange(year, month)[1])
-                    new_dt = next_run_dt.replace(year=year, month=month, day=day)
                 else:
-                    log_warning(f"[db] Unknown recurrence type '{repeat_type}' for event {event_id}")
-                    return False
-
-                new_iso = new_dt.astimezone(timezone.utc).isoformat()
-                await safe_db_execute(
-                    cur,
-                    "UPDATE scheduled_events SET next_run = %s WHERE id = %s",
-                    (new_iso, event_id),
-                    ensure_fn=ensure_core_tables,
-                )
-                log_info(f"[db] Event {event_id} rescheduled to {new_iso}")
-                return True
-    except Exception as e:
-        log_error(f"[mark_event_delivered] Error: {e}")
-        return False
-    finally:
-        conn.close()
+                    if not next_run_dt:
+                        log_warning(f"[db] Missing next_run for repeating event {event_id}")
+                        return False
+
+                    if repeat_type == "daily":
+                        new_dt = next_run_dt + timedelta(days=1)
+                    elif repeat_type == "weekly":
+                        new_dt = next_run_dt + timedelta(days=7)
+                    elif repeat_type == "monthly":
+                        year = next_run_dt.year + (next_run_dt.month // 12)
+                        month = next_run_dt.month % 12 + 1
+                        day = min(next_run_dt.day, calendar.monthrange(year, month)[1])
+                        new_dt = next_run_dt.replace(year=year, month=month, day=day)
+                    else:
+                        log_warning(f"[db] Unknown recurrence type '{repeat_type}' for event {event_id}")
+                        return False
+
+                    new_iso = new_dt.astimezone(timezone.utc).isoformat()
+                    await safe_db_execute(
+                        cur,
+                        "UPDATE scheduled_events SET next_run = %s WHERE id = %s",
+                        (new_iso, event_id),
+                        ensure_fn=ensure_core_tables,
+                    )
+                    log_info(f"[db] Event {event_id} rescheduled to {new_iso}")
+                    return True
+        except Exception as e:
+            log_error(f"[mark_event_delivered] Error: {e}")
+            return False
 
 def is_valid_datetime_format(date_str: str, time_str: str | None) -> bool:
     """Verifica se la data e l'ora sono in un formato valido."""
@@ -670,11 +871,10 @@ async def safe_db_execute(
 async def execute_query(query: str, params: tuple = ()) -> list:
     """Execute a SQL query and return the results."""
     try:
-        conn = await get_conn()
-        async with conn.cursor() as cur:
-            await cur.execute(query, params)
-            results = await cur.fetchall()
-        conn.close()
+        async with acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                results = await cur.fetchall()
         return results
     except Exception as e:
         log_error(f"[execute_query] Error executing query: {query}, Error: {e}")
@@ -0,0 +1,187 @@
+# core/llm_reply.py
+"""Parse-once envelope for model replies travelling to the interfaces.
+
+A reply enters the pipeline in ``transport_layer.llm_to_interface`` and then
+passes through the corrector orchestrator, the message chain, the universal
+sender and the action parser. Each of those used to re-extract the JSON from
+the raw string and rebuild its own message object; :class:`LLMReply` does
+that work once and carries the result along. Stages may edit the actions
+they get (the corrector and the action parser do), so every access returns
+a copy of the parsed JSON, like the extractor cache does.
+"""
+
+import copy
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from core.logging_utils import log_debug
+
+
+class LLMReply:
+    """A single model reply with its parsed actions and routing data.
+
+    JSON extraction runs lazily on first access and is cached on the
+    instance. Corrected replies are new envelopes created with
+    :meth:`with_text` so routing data is not re-derived.
+    """
+
+    __slots__ = (
+        "text",
+        "chat_id",
+        "thread_id",
+        "interface",
+        "created_at",
+        "timings",
+        "_started",
+        "_parsed",
+        "_payload",
+        "_metadata",
+        "_actions",
+        "_actions_error",
+    )
+
+    def __init__(
+        self,
+        text: Optional[str],
+        chat_id: Any = None,
+        thread_id: Any = None,
+        interface: Optional[str] = None,
+    ):
+        self.text = text or ""
+        self.chat_id = chat_id
+        self.thread_id = thread_id
+        self.interface = interface
+        self.created_at = datetime.utcnow()
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._parsed = False
+        self._payload: Any = None
+        self._metadata: Dict[str, Any] = {}
+        self._actions: Optional[List[Any]] = None
+        self._actions_error: Optional[str] = None
+
+    @classmethod
+    def from_send_args(cls, interface_send_func, args: tuple, kwargs: dict, text: Optional[str]) -> "LLMReply":
+        """Build an envelope from the arguments of an interface send call."""
+        chat_id = kwargs.get("chat_id")
+        if chat_id is None and len(args) > 1 and isinstance(args[1], (int, str)):
+            chat_id = args[1]
+
+        interface = kwargs.get("interface")
+        if not interface:
+            bot = getattr(interface_send_func, "__self__", None) or (args[0] if args else None)
+            getter = getattr(bot, "get_interface_id", None)
+            if callable(getter):
+                try:
+                    interface = getter()
+                except Exception as e:
+                    log_debug(f"[llm_reply] Could not get interface_id from bot: {e}")
+
+        return cls(text, chat_id=chat_id, thread_id=kwargs.get("thread_id"), interface=interface)
+
+    def with_text(self, text: Optional[str]) -> "LLMReply":
+        """Return an envelope for ``text`` sharing this reply's routing data."""
+        if text == self.text:
+            return self
+        reply = LLMReply(text, chat_id=self.chat_id, thread_id=self.thread_id, interface=self.interface)
+        reply._started = self._started
+        reply.timings = dict(self.timings)
+        return reply
+
+    def _parse(self) -> None:
+        if self._parsed:
+            return
+        self._parsed = True
+        if not self.text.strip():
+            return
+        # Local import: transport_layer imports this module
+        from core.transport_layer import extract_json_from_text
+
+        start = time.perf_counter()
+        try:
+            self._payload, self._metadata = extract_json_from_text(self.text, return_metadata=True)
+        except Exception as e:
+            log_debug(f"[llm_reply] JSON extraction failed: {e}")
+            self._payload, self._metadata = None, {}
+        self.timings["parse"] = time.perf_counter() - start
+
+        payload = self._payload
+        if payload is None:
+            return
+        if isinstance(payload, dict) and "actions" in payload:
+            if isinstance(payload["actions"], list):
+                self._actions = payload["actions"]
+            else:
+                self._actions_error = "actions field must be a list"
+        elif isinstance(payload, list):
+            self._actions = payload
+        elif isinstance(payload, dict) and "type" in payload:
+            self._actions = [payload]
+        else:
+            self._actions_error = f"Unrecognized JSON structure: {payload}"
+
+    @property
+    def payload(self) -> Any:
+        """The first JSON object or array found in the reply, if any (a copy)."""
+        self._parse()
+        return copy.deepcopy(self._payload)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Extraction metadata as returned by ``extract_json_from_text``."""
+        self._parse()
+        return self._metadata
+
+    @property
+    def actions(self) -> Optional[List[Any]]:
+        """Actions carried by the reply, normalised to a list, or ``None`` (a copy)."""
+        self._parse()
+        return copy.deepcopy(self._actions)
+
+    @property
+    def actions_error(self) -> Optional[str]:
+        """Why a JSON payload could not be turned into an action list."""
+        self._parse()
+        return self._actions_error
+
+    @property
+    def is_system_message(self) -> bool:
+        self._parse()
+        return isinstance(self._payload, dict) and "system_message" in self._payload
+
+    @property
+    def is_corrupted(self) -> bool:
+        """True when the JSON was only recovered from a damaged reply."""
+        metadata = self.metadata
+        return bool(metadata.get("recovered", False) or metadata.get("unparsed_content", ""))
+
+    @property
+    def looks_like_json(self) -> bool:
+        return "{" in self.text or "[" in self.text
+
+    def mark(self, stage: str) -> float:
+        """Record the time elapsed since the reply was received under ``stage``."""
+        elapsed = time.perf_counter() - self._started
+        self.timings[stage] = elapsed
+        return elapsed
+
+    def as_message(self, from_llm: bool = True) -> SimpleNamespace:
+        """Build the lightweight message object used by the action pipeline."""
+        message = SimpleNamespace()
+        message.chat_id = self.chat_id
+        message.text = ""
+        message.original_text = self.text
+        message.thread_id = self.thread_id
+        message.date = self.created_at
+        if from_llm:
+            message.from_llm = True
+        message.llm_reply = self
+        return message
+
+    def __repr__(self) -> str:
+        return (
+            f"LLMReply(chat_id={self.chat_id!r}, thread_id={self.thread_id!r}, "
+            f"interface={self.interface!r}, text_len={len(self.text)})"
+        )
@@ -1,12 +1,19 @@
+import asyncio
+import atexit
+import contextvars
 import logging
 import os
+import queue
 import sys
+import threading
 import traceback
-from logging.handlers import RotatingFileHandler
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
 
 _logger: Optional[logging.Logger] = None
+_listener: Optional[QueueListener] = None
 
 # Default to a "logs" directory inside the repository rather than /config
 # so running the tests does not attempt to write to restricted locations.
@@ -76,8 +83,12 @@ def _register_logging_config():
 
 
 def setup_logging() -> logging.Logger:
-    """Initialize the logger once and return it."""
-    global _logger
+    """Initialize the logger once and return it.
+
+    Records are handed to a ``QueueHandler`` and written to the log file and
+    stdout by a ``QueueListener`` thread, so callers never block on I/O.
+    """
+    global _logger, _listener
     if _logger:
         return _logger
 
@@ -102,106 +113,199 @@ def setup_logging() -> logging.Logger:
         fh.setFormatter(formatter)
         ch = logging.StreamHandler(sys.stdout)
         ch.setFormatter(formatter)
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(records))
+        _listener = QueueListener(records, fh, ch)
+        _listener.start()
+        atexit.register(_stop_listener)
 
     _logger = logger
     return logger
 
 
-def _log(level: str, message: str, exc: Optional[Exception] = None) -> None:
+def _stop_listener() -> None:
+    """Drain queued records to the handlers (registered with ``atexit``)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def is_enabled_for(level: str) -> bool:
+    """True when a record at ``level`` would be written or sent to LogChat.
+
+    Hot paths use this to skip building expensive debug output.
+    """
+    levelno = _LEVELS.get(level.upper(), logging.INFO)
+    if levelno >= _LEVELS.get(_LOGGING_LOGCHAT_LEVEL, logging.ERROR):
+        return True
+    return setup_logging().isEnabledFor(levelno)
+
+
+def is_debug_enabled() -> bool:
+    return is_enabled_for("DEBUG")
+
+
+class _LogChatSender:
+    """Forward log lines to the LogChat in rate-limited, deduplicated batches.
+
+    :meth:`submit` may be called from any thread; it only appends to a
+    pending map. Identical lines are merged with a repeat count. A task on
+    the main event loop sends at most one batch every ``interval`` seconds
+    and exits once nothing is pending.
+    """
+
+    def __init__(self, interval: float = 5.0, max_pending: int = 200, max_chars: int = 3500):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_chars = max_chars
+        self._pending: "OrderedDict[str, int]" = OrderedDict()
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, text: str) -> None:
+        with self._lock:
+            if text in self._pending:
+                self._pending[text] += 1
+            elif len(self._pending) >= self.max_pending:
+                self._dropped += 1
+            else:
+                self._pending[text] = 1
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and (self._loop is None or self._loop.is_closed()):
+            self._loop = running
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return  # Delivered once a log call happens on the event loop
+        if loop is running:
+            self._ensure_task()
+        else:
+            loop.call_soon_threadsafe(self._ensure_task)
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+
+    def _take_batch(self) -> Optional[str]:
+        with self._lock:
+            if not self._pending and not self._dropped:
+                return None
+            lines = []
+            size = 0
+            while self._pending:
+                text, count = next(iter(self._pending.items()))
+                line = f"{text} (x{count})" if count > 1 else text
+                if lines and size + len(line) > self.max_chars:
+                    break
+                del self._pending[text]
+                lines.append(line[: self.max_chars])
+                size += len(line) + 1
+            if self._dropped and not self._pending:
+                lines.append(f"... {self._dropped} more log line(s) dropped")
+                self._dropped = 0
+        return "\n".join(lines)
+
+    async def _run(self) -> None:
+        # Anything logged while delivering must not be forwarded again
+        _forwarding.set(True)
+        while True:
+            text = self._take_batch()
+            if text is None:
+                return
+            try:
+                await _deliver_to_logchat(text)
+            except Exception:
+                pass  # Silent failure - no recursive logging
+            await asyncio.sleep(self.interval)
+
+
+_forwarding: contextvars.ContextVar[bool] = contextvars.ContextVar("logchat_forwarding", default=False)
+_logchat_sender = _LogChatSender()
+
+
+async def _deliver_to_logchat(text: str) -> None:
+    from core.config import get_log_chat_id_sync, get_log_chat_thread_id_sync, get_log_chat_interface_sync, get_trainer_id
+    from core.core_initializer import INTERFACE_REGISTRY
+
+    # Try LogChat first - use the specific interface saved in DB
+    log_chat_id = get_log_chat_id_sync()
+    log_chat_interface = get_log_chat_interface_sync()
+
+    if log_chat_id and log_chat_interface and log_chat_interface in INTERFACE_REGISTRY:
+        iface = INTERFACE_REGISTRY.get(log_chat_interface)
+        if iface and hasattr(iface, 'send_message'):
+            try:
+                message_data = {"text": text, "target": log_chat_id}
+                thread_id = get_log_chat_thread_id_sync()
+                if thread_id:
+                    message_data["thread_id"] = thread_id
+                await iface.send_message(message_data)
+            except Exception:
+                # Silent fallback to trainer for the same interface
+                trainer_id = get_trainer_id(log_chat_interface)
+                if trainer_id:
+                    await iface.send_message({"text": text, "target": trainer_id})
+            return
+
+    # Fallback to trainer - use any available interface
+    for interface_name, iface in list(INTERFACE_REGISTRY.items()):
+        trainer_id = get_trainer_id(interface_name)
+        if trainer_id and hasattr(iface, 'send_message'):
+            try:
+                await iface.send_message({"text": text, "target": trainer_id})
+            except Exception:
+                pass  # Silent failure
+            return
+
+
+def _log(level: str, message: str, exc: Optional[Exception] = None, args: tuple = ()) -> None:
     logger = setup_logging()
     level = level.upper()
+    levelno = _LEVELS.get(level, logging.INFO)
+    to_logchat = levelno >= _LEVELS.get(_LOGGING_LOGCHAT_LEVEL, logging.ERROR)
+    if not to_logchat and not logger.isEnabledFor(levelno):
+        # Disabled level: no formatting, no I/O
+        return
+
     if exc is not None:
         message = f"{message}\n{''.join(traceback.format_exception(exc))}".rstrip()
-    logger.log(_LEVELS.get(level, logging.INFO), message, stacklevel=3)
-    
+    logger.log(levelno, message, *args, stacklevel=3)
+
+    if not to_logchat or _forwarding.get():
+        return
+    if args:
+        try:
+            message = message % args
+        except Exception:
+            pass
+
     # Skip notification for interface errors and transport errors to avoid recursion
     if ("Failed to send message" in message or 
         "Unknown channel" in message or
         "interface" in message.lower() or
         "transport" in message):
         return
-    
-    # Check if this level should trigger notifications
-    logchat_threshold = _LEVELS.get(_LOGGING_LOGCHAT_LEVEL, logging.ERROR)
-    current_level = _LEVELS.get(level, logging.INFO)
-    
-    if current_level >= logchat_threshold:
-        try:
-            from core.config import get_log_chat_id_sync, get_log_chat_thread_id_sync, get_log_chat_interface_sync, get_trainer_id
-            from core.core_initializer import INTERFACE_REGISTRY
-            import asyncio
-            
-            notification_message = f"[{level}] {message}"
-            
-            # Try LogChat first - use the specific interface saved in DB
-            log_chat_id = get_log_chat_id_sync()
-            log_chat_interface = get_log_chat_interface_sync()
-            
-            if log_chat_id and log_chat_interface and log_chat_interface in INTERFACE_REGISTRY:
-                iface = INTERFACE_REGISTRY.get(log_chat_interface)
-                if iface and hasattr(iface, 'send_message'):
-                    async def send_to_logchat():
-                        try:
-                            message_data = {"text": notification_message, "target": log_chat_id}
-                            thread_id = get_log_chat_thread_id_sync()
-                            if thread_id:
-                                message_data["thread_id"] = thread_id
-                            await iface.send_message(message_data)
-                        except Exception:
-                            # Silent fallback to trainer for the same interface
-                            trainer_id = get_trainer_id(log_chat_interface)
-                            if trainer_id:
-                                trainer_data = {"text": notification_message, "target": trainer_id}
-                                await iface.send_message(trainer_data)
-
-                    try:
-                        loop = asyncio.get_running_loop()
-                        if loop and loop.is_running():
-                            loop.create_task(send_to_logchat())
-                        else:
-                            asyncio.run(send_to_logchat())
-                    except RuntimeError:
-                        asyncio.run(send_to_logchat())
-                    return
-            
-            # Fallback to trainer - use any available interface
-            for interface_name, iface in INTERFACE_REGISTRY.items():
-                trainer_id = get_trainer_id(interface_name)
-                if trainer_id and hasattr(iface, 'send_message'):
-                    async def send_to_trainer():
-                        try:
-                            trainer_data = {"text": notification_message, "target": trainer_id}
-                            await iface.send_message(trainer_data)
-                        except Exception:
-                            pass  # Silent failure
-
-                    try:
-                        loop = asyncio.get_running_loop()
-                        if loop and loop.is_running():
-                            loop.create_task(send_to_trainer())
-                        else:
-                            asyncio.run(send_to_trainer())
-                    except RuntimeError:
-                        asyncio.run(send_to_trainer())
-                    return
-                        
-        except Exception:
-            # Silent failure - no recursive logging
-            pass
+
+    _logchat_sender.submit(f"[{level}] {message}")
 
 
-def log_debug(msg: str) -> None:
-    _log("DEBUG", msg)
+def log_debug(msg: str, *args) -> None:
+    """Log at DEBUG; ``args`` are %-formatted only when the level is enabled."""
+    _log("DEBUG", msg, args=args)
 
 
-def log_info(msg: str) -> None:
-    _log("INFO", msg)
+def log_info(msg: str, *args) -> None:
+    _log("INFO", msg, args=args)
 
 
-def log_warning(msg: str) -> None:
-    _log("WARNING", msg)
+def log_warning(msg: str, *args) -> None:
+    _log("WARNING", msg, args=args)
 
 
 def log_error(msg: str, exc: Optional[Exception] = None) -> None:
@@ -19,23 +19,78 @@ def get_current_aliases() -> list[str]:
     return synth_ALIASES
 
 
+from types import SimpleNamespace
+
 from core.logging_utils import log_debug
 
 
+# Bot identities (id, username) per interface. Interfaces fill this when they
+# connect so mention checks never need a get_me() round trip per message.
+_bot_identities: dict[str, SimpleNamespace] = {}
+
+
+def _identity_key(bot, interface_id: str | None) -> str | None:
+    if interface_id:
+        return interface_id
+    getter = getattr(bot, "get_interface_id", None)
+    if callable(getter):
+        try:
+            return getter()
+        except Exception:
+            pass
+    return bot.__class__.__name__ if bot is not None else None
+
+
+def set_bot_identity(interface_id: str, username: str | None, user_id=None) -> None:
+    """Record the bot account used by ``interface_id``."""
+    _bot_identities[interface_id] = SimpleNamespace(id=user_id, username=username)
+    log_debug(f"[mention] Bot identity for {interface_id}: {username} ({user_id})")
+
+
+def invalidate_bot_identity(interface_id: str | None = None) -> None:
+    """Forget one cached identity (e.g. after a reconnect), or all of them."""
+    if interface_id is None:
+        _bot_identities.clear()
+    else:
+        _bot_identities.pop(interface_id, None)
+
+
+async def get_bot_identity(bot, interface_id: str | None = None, refresh: bool = False):
+    """Return the cached ``(id, username)`` namespace for a bot.
 
-async def get_bot_username(bot):
-    """Get the bot's username from the bot instance."""
+    On a miss the identity is read from the bot once, preferring attributes
+    the client already holds over a ``get_me()`` call, and cached.
+    """
+    key = _identity_key(bot, interface_id)
+    if not refresh and key in _bot_identities:
+        return _bot_identities[key]
+    if bot is None:
+        return None
+
+    username = user_id = None
     try:
-        if hasattr(bot, 'username'):
-            return bot.username
-        elif hasattr(bot, 'get_me'):
+        username = getattr(bot, "username", None)
+        user_id = getattr(bot, "id", None)
+    except Exception:
+        # python-telegram-bot raises until the Bot is initialized
+        pass
+    if username is None and hasattr(bot, "get_me"):
+        try:
             me = await bot.get_me()
-            return getattr(me, 'username', None)
-        else:
+            username = getattr(me, "username", None)
+            user_id = getattr(me, "id", user_id)
+        except Exception as e:
+            log_debug(f"[mention] Error getting bot identity: {e}")
             return None
-    except Exception as e:
-        log_debug(f"[mention] Error getting bot username: {e}")
-        return None
+    if key is not None:
+        set_bot_identity(key, username, user_id)
+    return SimpleNamespace(id=user_id, username=username)
+
+
+async def get_bot_username(bot, interface_id: str | None = None):
+    """Get the bot's username from the identity cache."""
+    identity = await get_bot_identity(bot, interface_id)
+    return identity.username if identity else None
 
 
 def is_synth_mentioned(text: str) -> bool:
@@ -66,6 +121,7 @@ async def is_message_for_bot(
     bot,
     bot_username: str | None = None,
     human_count: int | None = None,
+    interface_id: str | None = None,
 ) -> tuple[bool, str | None]:
     """
     Check if a message is directed to the bot considering:
@@ -81,6 +137,8 @@ async def is_message_for_bot(
         human_count: Number of human participants in the chat (excluding bots).
             If ``None``, interfaces are unable to provide this information
             and the bot will fall back to mention-based activation.
+        interface_id: Interface the message came from, used to look up the
+            cached bot identity.
     
     Returns:
         tuple: (is_for_bot, reason)
@@ -107,6 +165,11 @@ async def is_message_for_bot(
         log_debug(f"[mention] Error checking private chat: {e}")
         return False, "error_checking_private"
     
+    identity = None
+    if bot_username is None:
+        identity = await get_bot_identity(bot, interface_id)
+        bot_username = identity.username if identity else None
+
     # Priority 2: Check for reply to bot message
     if hasattr(message, 'reply_to_message') and message.reply_to_message:
         reply_sender = getattr(message.reply_to_message, 'from_user', None)
@@ -121,7 +184,8 @@ async def is_message_for_bot(
                 return True, None
             
             # Check if reply is to bot by ID
-            if reply_id and hasattr(bot, 'id') and reply_id == bot.id:
+            bot_id = getattr(identity, 'id', None) or getattr(bot, 'id', None)
+            if reply_id and bot_id is not None and reply_id == bot_id:
                 log_debug("[mention] ✅ Reply to bot message (ID match) - PRIORITY 2 - message is for bot")
                 return True, None
     
@@ -86,7 +86,7 @@ async def send_llm_fallback_message(bot, message: SimpleNamespace, failure_reaso
         return fallback_text
 
 
-async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text: str, *, source: str = "interface", context: Optional[Dict[str, Any]] = None, **kwargs):
+async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text: str, *, source: str = "interface", context: Optional[Dict[str, Any]] = None, reply=None, **kwargs):
     """Main entry point for the message chain.
 
     Parameters
@@ -95,23 +95,21 @@ async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text:
     - text: incoming text to process
     - source: 'interface'|'user'|'llm' - origin of the text
     - context: optional context dict to pass to action parser
+    - reply: optional ``LLMReply`` already built for ``text``; its parse is reused
     - kwargs: additional metadata (e.g., thread_id)
 
     Returns one of the constants above.
     """
     # Local imports to avoid circular dependencies
-    from core.transport_layer import extract_json_from_text, run_corrector_middleware
+    from core.transport_layer import run_corrector_middleware
     from core.action_parser import run_actions, CORRECTOR_RETRIES
-    from types import SimpleNamespace
-    from datetime import datetime
+    from core.llm_reply import LLMReply
+
+    if reply is None or reply.text != (text or ""):
+        reply = LLMReply(text, chat_id=kwargs.get('chat_id'), thread_id=kwargs.get('thread_id'))
 
     if message is None:
-        message = SimpleNamespace()
-        message.chat_id = kwargs.get('chat_id')
-        message.text = ""
-        message.original_text = text
-        message.thread_id = kwargs.get('thread_id')
-        message.date = datetime.utcnow()
+        message = reply.as_message(from_llm=False)
 
     # Mark LLM-origin if source indicates so
     message.from_llm = True if source == 'llm' else getattr(message, 'from_llm', False)
@@ -144,13 +142,9 @@ async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text:
             f"[message_chain] iteration attempt={attempt} source={source} chat={getattr(message,'chat_id',None)}"
         )
 
-        # Quick JSON extraction with metadata to detect corruption
-        parsed = None
-        metadata = {}
-        try:
-            parsed, metadata = extract_json_from_text(text, return_metadata=True)
-        except Exception as e:
-            log_debug(f"[message_chain] extract_json failed: {e}")
+        # JSON extraction with metadata, done once per reply by the envelope
+        parsed = reply.payload
+        metadata = reply.metadata
 
         # Check if JSON was recovered from corruption - needs correction
         if parsed is not None and metadata.get('recovered'):
@@ -172,17 +166,9 @@ async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text:
                 return BLOCKED
 
             # Build actions list
-            if isinstance(parsed, dict) and 'actions' in parsed:
-                actions = parsed['actions'] if isinstance(parsed['actions'], list) else None
-                if actions is None:
-                    log_warning('[message_chain] actions field must be a list')
-                    return FORWARD_AS_TEXT
-            elif isinstance(parsed, list):
-                actions = parsed
-            elif isinstance(parsed, dict) and 'type' in parsed:
-                actions = [parsed]
-            else:
-                log_warning(f"[message_chain] Unrecognized JSON structure: {parsed}")
+            actions = reply.actions
+            if actions is None:
+                log_warning(f"[message_chain] {reply.actions_error}")
                 return FORWARD_AS_TEXT
 
             # Execute actions via action_parser
@@ -252,6 +238,7 @@ async def handle_incoming_message(bot, message: Optional[SimpleNamespace], text:
         # Accept corrected text and treat it as LLM-origin for next iteration
         log_debug('[message_chain] Received corrected text from LLM; retrying parse')
         text = corrected
+        reply = reply.with_text(corrected)
         source = 'llm'
         message.original_text = text
         message.from_llm = True
@@ -1,26 +1,361 @@
 import asyncio
+import heapq
+import itertools
+import os
 import time
 import queue as _thread_queue
 from datetime import datetime
 import traceback
+from collections import OrderedDict
 from types import SimpleNamespace
 
 from core import plugin_instance, rate_limit, recent_chats
-from core.logging_utils import log_debug, log_error, log_warning, log_info
+from core.logging_utils import is_debug_enabled, log_debug, log_error, log_warning, log_info
+from core.config_manager import config_registry
 from core.mention_utils import is_message_for_bot
 from core.reaction_handler import react_when_mentioned, get_reaction_emoji
 from core.core_initializer import INTERFACE_REGISTRY
 from core.interfaces_registry import get_interface_registry
+from core.queue_journal import QueueJournal, deserialize_item
 from plugins.blocklist import is_user_blocked
 from plugins.chat_link import ChatLinkStore
 
-# Use a priority queue so events can be processed before regular messages
+# Lower values are served first so events can be processed before regular messages
 HIGH_PRIORITY = 0
 NORMAL_PRIORITY = 1
 
-_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
-_lock = asyncio.Lock()
-_consumer_task: asyncio.Task | None = None
+# Messages from one conversation are merged when queued within this window
+COALESCE_WINDOW = 600
+COALESCE_LIMIT = 5
+
+
+def _lane_name(key: tuple) -> str:
+    interface, chat_id, thread_id = key
+    name = f"{interface}:{chat_id}"
+    return f"{name}:{thread_id}" if thread_id is not None else name
+
+
+class _LaneStats:
+    """Wait and service time counters for the most recently active lanes."""
+
+    MAX_LANES = 256
+
+    def __init__(self):
+        self._lanes: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    @staticmethod
+    def empty() -> dict:
+        return {
+            "depth": 0,
+            "busy": False,
+            "served": 0,
+            "batches": 0,
+            "wait_avg_ms": 0.0,
+            "wait_max_ms": 0.0,
+            "service_avg_ms": 0.0,
+            "service_max_ms": 0.0,
+        }
+
+    def _entry(self, key: tuple) -> dict:
+        entry = self._lanes.get(key)
+        if entry is None:
+            entry = {"served": 0, "batches": 0, "wait_total": 0.0, "wait_max": 0.0,
+                     "service_count": 0, "service_total": 0.0, "service_max": 0.0}
+            self._lanes[key] = entry
+            while len(self._lanes) > self.MAX_LANES:
+                self._lanes.popitem(last=False)
+        else:
+            self._lanes.move_to_end(key)
+        return entry
+
+    def record_wait(self, key: tuple, count: int, wait: float) -> None:
+        entry = self._entry(key)
+        entry["served"] += count
+        entry["batches"] += 1
+        entry["wait_total"] += wait
+        entry["wait_max"] = max(entry["wait_max"], wait)
+
+    def record_service(self, key: tuple, service_time: float) -> None:
+        entry = self._entry(key)
+        entry["service_count"] += 1
+        entry["service_total"] += service_time
+        entry["service_max"] = max(entry["service_max"], service_time)
+
+    def snapshot(self) -> dict:
+        lanes = {}
+        for key, entry in self._lanes.items():
+            lane = self.empty()
+            lane["served"] = entry["served"]
+            lane["batches"] = entry["batches"]
+            if entry["batches"]:
+                lane["wait_avg_ms"] = round(entry["wait_total"] / entry["batches"] * 1000, 2)
+            lane["wait_max_ms"] = round(entry["wait_max"] * 1000, 2)
+            if entry["service_count"]:
+                lane["service_avg_ms"] = round(entry["service_total"] / entry["service_count"] * 1000, 2)
+            lane["service_max_ms"] = round(entry["service_max"] * 1000, 2)
+            lanes[_lane_name(key)] = lane
+        return lanes
+
+
+class LaneQueue:
+    """Priority queue split into per-conversation lanes.
+
+    Items are grouped by ``(interface, chat_id, thread_id)``. Each lane is a
+    small heap ordered by ``(priority, seq)``, where ``seq`` is a monotonic
+    counter, so items are never compared with each other. A ready heap holds
+    the head of every idle lane; :meth:`get_batch` takes the best head and
+    coalesces the following items of the same lane, which costs O(batch)
+    rather than a scan of the whole queue. A lane stays checked out until
+    :meth:`release` is called, so one conversation is never processed twice
+    at the same time.
+
+    Deferred items wait in a separate heap keyed by their due timestamp
+    (wall clock, so it survives a restart) and join their lane once due.
+    """
+
+    def __init__(self):
+        self._lanes: dict[tuple, list] = {}
+        self._ready: list = []
+        self._delayed: list = []
+        self._busy: set = set()
+        self._seq = itertools.count()
+        self._size = 0
+        self._wakeup = asyncio.Event()
+        self._stats = _LaneStats()
+
+    @staticmethod
+    def lane_key(item: dict) -> tuple:
+        return (item.get("interface"), item.get("chat_id"), item.get("thread_id"))
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def delayed(self) -> int:
+        return len(self._delayed)
+
+    def items(self):
+        """Iterate over queued and deferred items in no particular order."""
+        for lane in self._lanes.values():
+            for entry in lane:
+                yield entry[3]
+        for entry in self._delayed:
+            yield entry[3]
+
+    def _schedule(self, key: tuple) -> None:
+        lane = self._lanes.get(key)
+        if lane and key not in self._busy:
+            priority, seq = lane[0][0], lane[0][1]
+            heapq.heappush(self._ready, (priority, seq, key))
+            self._wakeup.set()
+
+    def put_nowait(self, item: dict, priority: int = NORMAL_PRIORITY) -> None:
+        key = self.lane_key(item)
+        lane = self._lanes.setdefault(key, [])
+        entry = (priority, next(self._seq), time.monotonic(), item)
+        heapq.heappush(lane, entry)
+        self._size += 1
+        if lane[0] is entry:
+            # New head: earlier ready entries for this lane become stale
+            self._schedule(key)
+
+    def requeue(self, batch: list, priority: int) -> None:
+        """Put an interrupted ``batch`` back at the head of its lane, in order."""
+        for item in reversed(batch):
+            key = self.lane_key(item)
+            lane = self._lanes.setdefault(key, [])
+            heapq.heappush(lane, (priority, -next(self._seq), time.monotonic(), item))
+            self._size += 1
+            self._schedule(key)
+
+    async def put(self, item: dict, priority: int = NORMAL_PRIORITY) -> None:
+        self.put_nowait(item, priority)
+
+    def put_later(self, item: dict, priority: int, due_at: float) -> None:
+        """Queue ``item`` once ``time.time()`` reaches ``due_at``."""
+        heapq.heappush(self._delayed, (due_at, next(self._seq), priority, item))
+        # Wake a waiting consumer so it recomputes its timeout
+        self._wakeup.set()
+
+    def _promote_due(self) -> float | None:
+        """Move due items into their lanes; return seconds until the next one."""
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, priority, item = heapq.heappop(self._delayed)
+            self.put_nowait(item, priority)
+        if self._delayed:
+            return max(0.0, self._delayed[0][0] - now)
+        return None
+
+    def _take_batch(self, limit: int, window: float):
+        self._promote_due()
+        while self._ready:
+            priority, seq, key = heapq.heappop(self._ready)
+            lane = self._lanes.get(key)
+            if not lane or key in self._busy or lane[0][1] != seq:
+                continue  # stale entry
+            _, _, queued_at, first = heapq.heappop(lane)
+            batch = [first]
+            first_ts = first.get("timestamp", 0)
+            # Only user messages are merged; events are delivered one by one
+            while (
+                first.get("message") is not None
+                and lane
+                and len(batch) < limit
+                and lane[0][3].get("message") is not None
+                and lane[0][3].get("timestamp", 0) - first_ts <= window
+            ):
+                batch.append(heapq.heappop(lane)[3])
+            if not lane:
+                del self._lanes[key]
+            self._busy.add(key)
+            self._size -= len(batch)
+            self._stats.record_wait(key, len(batch), time.monotonic() - queued_at)
+            batch.sort(key=lambda x: x.get("timestamp", 0))
+            return key, priority, batch
+        return None
+
+    async def get_batch(self, limit: int = COALESCE_LIMIT, window: float = COALESCE_WINDOW):
+        """Wait for the next ready lane and return ``(key, priority, batch)``."""
+        while True:
+            taken = self._take_batch(limit, window)
+            if taken is not None:
+                return taken
+            self._wakeup.clear()
+            next_due = self._promote_due()
+            if self._ready:
+                continue
+            if next_due is None:
+                await self._wakeup.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), next_due)
+                except asyncio.TimeoutError:
+                    pass
+
+    def release(self, key: tuple, service_time: float | None = None) -> None:
+        """Mark ``key`` idle again so its remaining items can be served."""
+        if service_time is not None:
+            self._stats.record_service(key, service_time)
+        self._busy.discard(key)
+        self._schedule(key)
+
+    def stats(self) -> dict:
+        """Queue depth plus per-lane depth, wait time and service time."""
+        lanes = self._stats.snapshot()
+        for key, lane in self._lanes.items():
+            lanes.setdefault(_lane_name(key), _LaneStats.empty())["depth"] = len(lane)
+        for key in self._busy:
+            lanes.setdefault(_lane_name(key), _LaneStats.empty())["busy"] = True
+        return {
+            "depth": self._size,
+            "delayed": len(self._delayed),
+            "busy_lanes": len(self._busy),
+            "lanes": lanes,
+        }
+
+
+_queue = LaneQueue()
+_consumer_tasks: list[asyncio.Task] = []
+
+MESSAGE_QUEUE_WORKERS = config_registry.get_var(
+    "MESSAGE_QUEUE_WORKERS",
+    4,
+    value_type=int,
+    label="Message Queue Workers",
+    description=(
+        "Number of consumer tasks serving the message queue. Messages of one "
+        "conversation are always handled in order; different conversations run in "
+        "parallel up to the concurrency advertised by the active LLM engine."
+    ),
+    group="core",
+    component="message_queue",
+    advanced=True,
+)
+
+MESSAGE_QUEUE_PERSIST = config_registry.get_var(
+    "MESSAGE_QUEUE_PERSIST",
+    False,
+    value_type=bool,
+    label="Persist Message Queue",
+    description=(
+        "Keep pending and rate-limited messages in an on-disk journal so they are "
+        "replayed after a restart instead of being dropped."
+    ),
+    group="core",
+    component="message_queue",
+    advanced=True,
+)
+
+MESSAGE_QUEUE_JOURNAL = config_registry.get_var(
+    "MESSAGE_QUEUE_JOURNAL",
+    os.path.join(os.getcwd(), "data", "message_queue.journal"),
+    label="Message Queue Journal",
+    description="Path of the journal file used when the message queue is persisted.",
+    group="core",
+    component="message_queue",
+    advanced=True,
+)
+
+_journal: QueueJournal | None = None
+
+# Cached (plugin, limit, checked_at) for the active engine's concurrency
+_engine_limit_cache: tuple | None = None
+_ENGINE_LIMIT_TTL = 30.0
+_active_workers = 0
+_slot_freed: asyncio.Event | None = None
+
+
+def _engine_concurrency() -> int:
+    """Concurrent requests the active LLM engine accepts (``max_concurrent_requests``)."""
+    global _engine_limit_cache
+    plugin = plugin_instance.get_plugin()
+    now = time.monotonic()
+    cached = _engine_limit_cache
+    if cached and cached[0] is plugin and now - cached[2] < _ENGINE_LIMIT_TTL:
+        return cached[1]
+
+    limit = 1
+    if plugin is not None and hasattr(plugin, "get_interface_limits"):
+        try:
+            limit = int(plugin.get_interface_limits().get("max_concurrent_requests", 1) or 1)
+        except Exception as e:
+            log_debug("[QUEUE] Could not read engine concurrency: %s", e)
+    limit = max(1, limit)
+    _engine_limit_cache = (plugin, limit, now)
+    return limit
+
+
+async def _acquire_slot() -> None:
+    global _active_workers, _slot_freed
+    if _slot_freed is None:
+        _slot_freed = asyncio.Event()
+    # The check and the increment share one loop step, so a worker cancelled
+    # while waiting never holds a slot.
+    while _active_workers >= _engine_concurrency():
+        _slot_freed.clear()
+        await _slot_freed.wait()
+    _active_workers += 1
+
+
+def _release_slot() -> None:
+    """Free a slot; synchronous so it cannot be interrupted by cancellation."""
+    global _active_workers
+    _active_workers -= 1
+    if _slot_freed is not None:
+        _slot_freed.set()
+
+
+def get_queue_stats() -> dict:
+    """Queue depth, worker usage and per-lane wait/service metrics."""
+    stats = _queue.stats()
+    stats["workers"] = sum(1 for t in _consumer_tasks if not t.done())
+    stats["active"] = _active_workers
+    stats["engine_concurrency"] = _engine_limit_cache[1] if _engine_limit_cache else None
+    stats["journal"] = _journal.stats() if _journal is not None else None
+    return stats
 
 
 class MessageQueue:
@@ -36,10 +371,49 @@ class MessageQueue:
         return self._q.get(timeout=timeout)
 
 
-async def _delayed_put(item: dict, delay: float) -> None:
-    await asyncio.sleep(delay)
+def _queue_item(item: dict, priority: int, due_at: float | None = None) -> None:
+    """Put ``item`` in the queue, journaling it first when persistence is on."""
+    if _journal is not None:
+        item["journal_id"] = _journal.put(item, priority, due_at)
+    if due_at is None:
+        _queue.put_nowait(item, priority)
+    else:
+        _queue.put_later(item, priority, due_at)
+
+
+def _defer(item: dict, delay: float) -> None:
+    """Queue ``item`` again after ``delay`` seconds."""
     priority = HIGH_PRIORITY if item.get("priority") else NORMAL_PRIORITY
-    await _queue.put((priority, item))
+    _queue_item(item, priority, time.time() + delay)
+
+
+def _resolve_bot(interface: str | None):
+    """Find the bot object for items replayed from the journal."""
+    target = INTERFACE_REGISTRY.get(interface) if interface else None
+    if target is None:
+        return None
+    return getattr(target, "bot", None) or getattr(target, "client", None) or target
+
+
+def _replay_journal() -> int:
+    """Load the journal and queue every item it still holds."""
+    count = 0
+    for record in _journal.load():
+        try:
+            item = deserialize_item(record["item"])
+        except Exception as e:
+            log_warning(f"[QUEUE] Dropping unreadable journal record {record.get('id')}: {e}")
+            _journal.ack(record.get("id"))
+            continue
+        item["journal_id"] = record["id"]
+        priority = record.get("priority", NORMAL_PRIORITY)
+        due_at = record.get("due_at")
+        if due_at is None:
+            _queue.put_nowait(item, priority)
+        else:
+            _queue.put_later(item, priority, due_at)
+        count += 1
+    return count
 
 
 async def enqueue(bot, message, context_memory, priority: bool = False, interface_id: str = None, skip_mention_check: bool = False, original_message=None) -> None:
@@ -57,59 +431,52 @@ async def enqueue(bot, message, context_memory, priority: bool = False, interfac
     message_text = getattr(message, 'text', '')
     user_id = getattr(message.from_user, 'id', 'unknown') if message.from_user else 'unknown'
     chat_id = getattr(message, 'chat_id', 'unknown')
-    log_debug(f"[QUEUE] DEBUG: enqueue() called with interface_id='{interface_id}', skip_mention_check={skip_mention_check}, message='{message_text}', user_id={user_id}, chat_id={chat_id}")
-    log_debug(f"[QUEUE] Processing message: '{message_text}' from user {user_id} in chat {chat_id}")
+    log_debug(
+        "[QUEUE] DEBUG: enqueue() called with interface_id='%s', skip_mention_check=%s, message='%s', user_id=%s, chat_id=%s",
+        interface_id, skip_mention_check, message_text, user_id, chat_id,
+    )
+    log_debug("[QUEUE] Processing message: '%s' from user %s in chat %s", message_text, user_id, chat_id)
     
     # Check if message is directed to bot (skip for 1:1 interfaces like ollama, webui)
     if not skip_mention_check:
-        log_debug(f"[QUEUE] DEBUG: Checking if message is for bot - calling is_message_for_bot")
+        log_debug("[QUEUE] DEBUG: Checking if message is for bot - calling is_message_for_bot")
         
         human_count = getattr(message, "human_count", None)
         if human_count is None and hasattr(message, "chat"):
             human_count = getattr(message.chat, "human_count", None)
 
-        log_debug(f"[QUEUE] DEBUG: human_count={human_count}, message.chat.type={getattr(message.chat, 'type', 'unknown')}")
-        
-        # Get bot username for mention detection
-        bot_username = None
-        try:
-            if bot and hasattr(bot, 'get_me'):
-                bot_info = await bot.get_me()
-                bot_username = bot_info.username if bot_info else None
-                log_debug(f"[QUEUE] Bot username: {bot_username}")
-        except Exception as e:
-            log_debug(f"[QUEUE] Error getting bot username: {e}")
+        log_debug("[QUEUE] DEBUG: human_count=%s, message.chat.type=%s", human_count, getattr(message.chat, 'type', 'unknown'))
         
         directed, reason = await is_message_for_bot(
-            message, bot, bot_username=bot_username, human_count=human_count
+            message, bot, human_count=human_count, interface_id=interface_id
         )
-        log_debug(f"[QUEUE] DEBUG: is_message_for_bot returned directed={directed}, reason='{reason}'")
+        log_debug("[QUEUE] DEBUG: is_message_for_bot returned directed=%s, reason='%s'", directed, reason)
         
         if not directed:
-            log_debug(f"[QUEUE] DEBUG: Message not directed to bot - ignoring")
+            log_debug("[QUEUE] DEBUG: Message not directed to bot - ignoring")
             if reason == "missing_human_count":
                 log_debug("[QUEUE] DEBUG: Reason: missing_human_count")
             elif reason == "multiple_humans":
                 log_debug("[QUEUE] DEBUG: Reason: multiple_humans")
             else:
-                log_debug(f"[QUEUE] DEBUG: Reason: {reason or 'not directed to bot'}")
+                log_debug("[QUEUE] DEBUG: Reason: %s", reason or 'not directed to bot')
             return
 
-        log_debug(f"[QUEUE] DEBUG: Message is directed to bot - continuing processing")
+        log_debug("[QUEUE] DEBUG: Message is directed to bot - continuing processing")
         
         # Add reaction if configured (REACT_WHEN_MENTIONED)
         try:
             emoji = get_reaction_emoji()
-            log_debug(f"[QUEUE] get_reaction_emoji returned: '{emoji}'")
-            log_debug(f"[QUEUE] About to check emoji: '{emoji}' (bool: {bool(emoji)})")
+            log_debug("[QUEUE] get_reaction_emoji returned: '%s'", emoji)
+            log_debug("[QUEUE] About to check emoji: '%s' (bool: %s)", emoji, bool(emoji))
             if emoji:
                 log_debug("[QUEUE] About to get interface registry")
                 interface = INTERFACE_REGISTRY.get(interface_id)
-                log_debug(f"[QUEUE] Interface for {interface_id}: {interface}")
-                log_debug(f"[QUEUE] Interface type: {type(interface)}")
-                log_debug(f"[QUEUE] original_message is None: {original_message is None}")
+                log_debug("[QUEUE] Interface for %s: %s", interface_id, interface)
+                log_debug("[QUEUE] Interface type: %s", type(interface))
+                log_debug("[QUEUE] original_message is None: %s", original_message is None)
                 if interface:
-                    log_debug(f"[QUEUE] Adding reaction '{emoji}' via interface {interface_id}")
+                    log_debug("[QUEUE] Adding reaction '%s' via interface %s", emoji, interface_id)
                     await react_when_mentioned(interface, original_message or message, emoji)
                 else:
                     log_warning(f"[QUEUE] No interface found for {interface_id}")
@@ -117,22 +484,22 @@ async def enqueue(bot, message, context_memory, priority: bool = False, interfac
                 log_debug("[QUEUE] No reaction emoji configured")
         except Exception as e:
             log_error(f"[QUEUE] Error adding reaction: {e}")
-            log_debug(f"[QUEUE] Reaction traceback: {traceback.format_exc()}")
+            log_debug("[QUEUE] Reaction traceback: %s", traceback.format_exc())
     else:
-        log_debug(f"[QUEUE] DEBUG: skip_mention_check=True - bypassing is_message_for_bot check (1:1 interface)")
+        log_debug("[QUEUE] DEBUG: skip_mention_check=True - bypassing is_message_for_bot check (1:1 interface)")
     
     # Check if user is blocked (but allow trainers)
     user_id = message.from_user.id if message.from_user else 0
     registry = get_interface_registry()
     is_trainer = registry.is_trainer(interface_id, user_id) if interface_id else False
     
-    log_debug(f"[QUEUE] DEBUG: Checking blocklist - user_id={user_id}, interface_id='{interface_id}', is_trainer={is_trainer}")
+    log_debug("[QUEUE] DEBUG: Checking blocklist - user_id=%s, interface_id='%s', is_trainer=%s", user_id, interface_id, is_trainer)
     
     if not is_trainer and await is_user_blocked(user_id):
-        log_debug(f"[QUEUE] DEBUG: User {user_id} is blocked - ignoring message")
+        log_debug("[QUEUE] DEBUG: User %s is blocked - ignoring message", user_id)
         return
     
-    log_debug(f"[QUEUE] DEBUG: User {user_id} is not blocked or is trainer, continuing processing")
+    log_debug("[QUEUE] DEBUG: User %s is not blocked or is trainer, continuing processing", user_id)
     
     plugin = plugin_instance.get_plugin()
     if not plugin:
@@ -148,37 +515,39 @@ async def enqueue(bot, message, context_memory, priority: bool = False, interfac
     chat_id = message.chat_id
     llm_name = plugin.__class__.__module__.split(".")[-1]
 
-    if (
-        not is_trainer
-        and not rate_limit.is_allowed(
-            llm_name, user_id, interface_id or "unknown", max_messages, window_seconds, trainer_fraction, consume=False
-        )
-    ):
-        log_debug(f"[RATE LIMIT] Delaying user {user_id} by {delay} seconds (quota exceeded)")
+    allowed, delay = (True, 0.0) if is_trainer else await rate_limit.check(
+        llm_name, user_id, interface_id or "unknown", max_messages, window_seconds, trainer_fraction,
+        consume=False, is_trainer=False,
+    )
+    if not allowed:
+        log_debug("[RATE LIMIT] Delaying user %s by %.1f seconds (quota exceeded)", user_id, delay)
         item = {
             "bot": bot,
             "message": message,
             "chat_id": chat_id,
+            "thread_id": getattr(message, "thread_id", None),
+            "interface": interface_id,
             "timestamp": time.time(),
             "context": context_memory,
             "priority": priority,
         }
-        asyncio.create_task(_delayed_put(item, delay))
+        _defer(item, delay)
         return
 
-    log_debug(f"[QUEUE] Rate limit check passed - continuing to enqueue message")
+    log_debug("[QUEUE] Rate limit check passed - continuing to enqueue message")
 
     meta = message.chat.title or message.chat.username or message.chat.first_name
-    await recent_chats.track_chat(chat_id, meta)
+    await recent_chats.track_chat(chat_id, interface_id, meta)
 
     # Extract thread_id - unified field name, check both Telegram and generic names
     # DEBUG: let's see what telegram message actually contains
-    thread_attrs = [attr for attr in dir(message) if 'thread' in attr.lower()]
-    log_debug(f"[QUEUE] Available thread attributes in message: {thread_attrs}")
+    if is_debug_enabled():
+        thread_attrs = [attr for attr in dir(message) if 'thread' in attr.lower()]
+        log_debug("[QUEUE] Available thread attributes in message: %s", thread_attrs)
     
     # Use only thread_id, message_thread_id is legacy and deprecated
     thread_id_val = getattr(message, "thread_id", None)
-    log_debug(f"[QUEUE] message.thread_id = {thread_id_val}")
+    log_debug("[QUEUE] message.thread_id = %s", thread_id_val)
     
     thread_id = thread_id_val
     interface = interface_id if interface_id else (
@@ -191,19 +560,13 @@ async def enqueue(bot, message, context_memory, priority: bool = False, interfac
     chat_name = None
     message_thread_name = None
     try:
-        store = ChatLinkStore()
-        resolver = store.get_name_resolver(interface)
-        if resolver:
-            log_debug(f"[QUEUE] Resolving names for chat {chat_id}, thread {thread_id}")
-            names = await resolver(chat_id, thread_id, bot)
-            if names:
-                chat_name = names.get("chat_name")
-                message_thread_name = names.get("message_thread_name")
-                log_debug(f"[QUEUE] Resolved names: chat='{chat_name}', thread='{message_thread_name}'")
-            else:
-                log_debug("[QUEUE] Resolver returned no names")
+        names = await ChatLinkStore.resolve_names(interface, chat_id, thread_id, bot)
+        if names:
+            chat_name = names.get("chat_name")
+            message_thread_name = names.get("message_thread_name")
+            log_debug("[QUEUE] Resolved names: chat='%s', thread='%s'", chat_name, message_thread_name)
         else:
-            log_debug(f"[QUEUE] No name resolver for interface '{interface}'")
+            log_debug("[QUEUE] No names resolved for chat %s on '%s'", chat_id, interface)
     except Exception as e:
         log_warning(f"[QUEUE] Failed to resolve chat/thread names: {e}")
 
@@ -221,194 +584,202 @@ async def enqueue(bot, message, context_memory, priority: bool = False, interfac
     }
 
     priority_val = HIGH_PRIORITY if priority else NORMAL_PRIORITY
-    await _queue.put((priority_val, item))
-    log_debug(f"[QUEUE] Message successfully put in queue with priority {priority_val}")
+    _queue_item(item, priority_val)
+    log_debug("[QUEUE] Message successfully put in queue with priority %s", priority_val)
     
     if priority:
         log_debug(
-            f"[QUEUE] High-priority message enqueued from {interface} chat {chat_id}"
-            f" thread {thread_id} by user {user_id}"
+            "[QUEUE] High-priority message enqueued from %s chat %s"
+            " thread %s by user %s",
+            interface, chat_id, thread_id, user_id,
         )
     else:
         log_debug(
-            f"[QUEUE] Regular message enqueued from {interface} chat {chat_id}"
-            f" thread {thread_id} by user {user_id}"
+            "[QUEUE] Regular message enqueued from %s chat %s"
+            " thread %s by user %s",
+            interface, chat_id, thread_id, user_id,
         )
 
 
-async def compact_similar_messages(first: dict, limit: int = 5) -> list:
-    """Collect already-queued messages from same chat/thread/interface."""
-    batch = [first]
-    chat_id = first["chat_id"]
-    thread_id = first.get("thread_id")
-    interface = first.get("interface")
-    ts = first["timestamp"]
+def _merge_batch(batch: list) -> dict:
+    """Fold a coalesced batch into a copy of its first item, joining the texts.
 
-    queue_items = list(_queue._queue)
-    for prio, item in queue_items:
-        if len(batch) >= limit:
-            break
-        if (
-            item["chat_id"] == chat_id
-            and item.get("thread_id") == thread_id
-            and item.get("interface") == interface
-            and item["timestamp"] - ts <= 600
-        ):
-            _queue._queue.remove((prio, item))
-            batch.append(item)
+    ``batch`` itself is left untouched so it can be requeued and merged again.
+    """
+    final = dict(batch[0])
+    if len(batch) > 1 and final.get("message"):
+        log_debug("[COMPACT] Compacted %s messages from chat %s", len(batch), final.get('chat_id'))
+        lines = []
+        for b in batch:
+            msg = b.get("message")
+            if not (msg and getattr(msg, "text", None)):
+                continue
+            user = getattr(msg, "from_user", None)
+            if user:
+                if getattr(user, "username", None):
+                    name = f"@{user.username}"
+                elif getattr(user, "full_name", None):
+                    name = user.full_name
+                else:
+                    name = f"user_{getattr(user, 'id', 'unknown')}"
+                lines.append(f"{name}: {msg.text}")
+            else:
+                lines.append(msg.text)
+        base = final["message"]
+        merged = SimpleNamespace(
+            chat_id=getattr(base, "chat_id", None),
+            message_id=getattr(base, "message_id", None),
+            text="\n".join(lines),
+            from_user=SimpleNamespace(id=0, username="group", full_name="group"),
+            date=getattr(base, "date", datetime.utcnow()),
+            thread_id=getattr(base, "thread_id", None),
+            chat=getattr(base, "chat", None),
+            reply_to_message=getattr(base, "reply_to_message", None),
+        )
+        final["message"] = merged
+        final["context"] = batch[-1].get("context", final.get("context"))
+    return final
 
-    batch.sort(key=lambda x: x["timestamp"])
 
-    if len(batch) > 1:
-        log_debug(f"[COMPACT] Compacted {len(batch)} messages from chat {chat_id}")
+async def _process_item(final: dict) -> None:
+    """Deliver one (possibly merged) queue item to the active LLM plugin."""
+    log_debug(
+        "[QUEUE] Processing message from chat %s",
+        final.get('chat_id'),
+    )
 
-    return batch
+    # Ensure chat exists with resolved names
+    chat_name = final.get("chat_name")
+    message_thread_name = final.get("message_thread_name")
+    if chat_name or message_thread_name:
+        try:
+            store = ChatLinkStore()
+            await store.ensure_chat_exists(
+                chat_id=final.get("chat_id"),
+                thread_id=final.get("thread_id"),
+                interface=final.get("interface"),
+                chat_name=chat_name,
+                message_thread_name=message_thread_name
+            )
+            log_debug("[QUEUE] Updated chat record with names: chat='%s', thread='%s'", chat_name, message_thread_name)
+        except Exception as e:
+            log_warning(f"[QUEUE] Failed to update chat names: {e}")
 
+    plugin = plugin_instance.get_plugin()
+    if not plugin:
+        log_error("[QUEUE] No active plugin when dispatching")
+        return
 
-async def _consumer_loop() -> None:
-    """Continuously process queued messages one at a time."""
-    log_info("[QUEUE] Consumer loop started")
-    while True:
+    try:
+        max_messages, window_seconds, trainer_fraction = plugin.get_rate_limit()
+    except Exception as e:  # pragma: no cover - plugin may misbehave
+        log_error(f"[QUEUE] Error obtaining rate limit: {repr(e)}", e)
+        max_messages, window_seconds, trainer_fraction = float("inf"), 1, 1.0
+
+    user_msg = final.get("message")
+    user_id = (
+        user_msg.from_user.id
+        if user_msg is not None and getattr(user_msg, "from_user", None)
+        else 0
+    )
+    llm_name = plugin.__class__.__module__.split(".")[-1]
+
+    # Check if user is trainer for this interface
+    registry = get_interface_registry()
+    interface_id = getattr(user_msg, 'interface_id', 'unknown')
+    is_trainer = registry.is_trainer(interface_id, user_id)
+
+    allowed, delay = (True, 0.0) if is_trainer else await rate_limit.check(
+        llm_name, user_id, interface_id, max_messages, window_seconds, trainer_fraction,
+        consume=True, is_trainer=False,
+    )
+    if not allowed:
+        log_debug(
+            "[RATE LIMIT] Delaying user %s by %.1f seconds (quota exceeded)",
+            user_id, delay,
+        )
+        _defer(final, delay)
+        return
+
+    if final.get("bot") is None:
+        final["bot"] = _resolve_bot(final.get("interface"))
+
+    try:
+        # Check if this is an event prompt
+        if "event_prompt" in final:
+            # Create a mock message object with event_id for events
+            mock_message = SimpleNamespace()
+            mock_message.event_id = final["context"].get("event_id")
+            mock_message.chat_id = "TARDIS/system/events"  
+            mock_message.message_id = f"event_{mock_message.event_id}"
+            
+            # Deliver the structured event prompt using the standard pipeline
+            await plugin_instance.handle_incoming_message(
+                final["bot"], mock_message, final["event_prompt"], final.get("interface")
+            )
+        else:
+            await plugin_instance.handle_incoming_message(
+                final["bot"], final["message"], final["context"], final.get("interface")
+            )
+    except Exception as e:  # pragma: no cover - plugin may misbehave
+        log_error(
+            f"[ERROR] Failed to process message from chat {final['chat_id']}: {e}\n{traceback.format_exc()}",
+        )
+        bot = final.get("bot")
+        chat_id = final.get("chat_id")
+        thread_id = final.get("thread_id")
         try:
-            priority, item = await _queue.get()
-            log_debug(
-                f"[QUEUE] Dequeued message from chat {item.get('chat_id')} (priority={priority})"
+            if bot and chat_id:
+                kwargs = {"chat_id": chat_id, "text": "😵‍💫"}
+                if thread_id:
+                    kwargs["thread_id"] = thread_id
+                reply_msg = final.get("message")
+                reply_id = getattr(reply_msg, "message_id", None)
+                if reply_id:
+                    kwargs["reply_to_message_id"] = reply_id
+                await bot.send_message(**kwargs)
+        except Exception as send_err:  # pragma: no cover - best effort
+            log_warning(
+                f"[QUEUE] Failed to send fallback message: {send_err}"
             )
 
-            async with _lock:
-                batch = await compact_similar_messages(item)
-                final = batch[0]
-                if len(batch) > 1 and final.get("message"):
-                    lines = []
-                    for b in batch:
-                        msg = b.get("message")
-                        if not (msg and getattr(msg, "text", None)):
-                            continue
-                        user = getattr(msg, "from_user", None)
-                        if user:
-                            if getattr(user, "username", None):
-                                name = f"@{user.username}"
-                            elif getattr(user, "full_name", None):
-                                name = user.full_name
-                            else:
-                                name = f"user_{getattr(user, 'id', 'unknown')}"
-                            lines.append(f"{name}: {msg.text}")
-                        else:
-                            lines.append(msg.text)
-                    base = final["message"]
-                    merged = SimpleNamespace(
-                        chat_id=getattr(base, "chat_id", None),
-                        message_id=getattr(base, "message_id", None),
-                        text="\n".join(lines),
-                        from_user=SimpleNamespace(id=0, username="group", full_name="group"),
-                        date=getattr(base, "date", datetime.utcnow()),
-                        thread_id=getattr(base, "thread_id", None),
-                        chat=getattr(base, "chat", None),
-                        reply_to_message=getattr(base, "reply_to_message", None),
-                    )
-                    final["message"] = merged
-                    final["context"] = batch[-1].get("context", final.get("context"))
-                log_debug(
-                    f"[QUEUE] Processing message from chat {final.get('chat_id')}"
-                )
-
-            # Ensure chat exists with resolved names
-            chat_name = final.get("chat_name")
-            message_thread_name = final.get("message_thread_name")
-            if chat_name or message_thread_name:
-                try:
-                    store = ChatLinkStore()
-                    await store.ensure_chat_exists(
-                        chat_id=final.get("chat_id"),
-                        thread_id=final.get("thread_id"),
-                        interface=final.get("interface"),
-                        chat_name=chat_name,
-                        message_thread_name=message_thread_name
-                    )
-                    log_debug(f"[QUEUE] Updated chat record with names: chat='{chat_name}', thread='{message_thread_name}'")
-                except Exception as e:
-                    log_warning(f"[QUEUE] Failed to update chat names: {e}")
-
-            plugin = plugin_instance.get_plugin()
-            if not plugin:
-                log_error("[QUEUE] No active plugin when dispatching")
-                continue
 
-            try:
-                max_messages, window_seconds, trainer_fraction = plugin.get_rate_limit()
-            except Exception as e:  # pragma: no cover - plugin may misbehave
-                log_error(f"[QUEUE] Error obtaining rate limit: {repr(e)}", e)
-                max_messages, window_seconds, trainer_fraction = float("inf"), 1, 1.0
-
-            user_msg = final.get("message")
-            user_id = (
-                user_msg.from_user.id
-                if user_msg is not None and getattr(user_msg, "from_user", None)
-                else 0
+async def _consumer_loop(worker_id: int = 0) -> None:
+    """Serve lane batches; each worker owns a lane until its batch is done."""
+    log_info(f"[QUEUE] Consumer worker {worker_id} started")
+    while True:
+        try:
+            key, priority, batch = await _queue.get_batch()
+            log_debug(
+                "[QUEUE] Worker %s dequeued %s message(s) from chat %s (priority=%s)",
+                worker_id, len(batch), key[1], priority,
             )
-            llm_name = plugin.__class__.__module__.split(".")[-1]
-
-            # Check if user is trainer for this interface
-            registry = get_interface_registry()
-            interface_id = getattr(user_msg, 'interface_id', 'unknown')
-            is_trainer = registry.is_trainer(interface_id, user_id)
-
-            if (
-                not is_trainer
-                and not rate_limit.is_allowed(
-                    llm_name, user_id, interface_id, max_messages, window_seconds, trainer_fraction, consume=True
-                )
-            ):
-                delay = 300
-                log_debug(
-                    f"[RATE LIMIT] Delaying user {user_id} by {delay} seconds (quota exceeded)"
-                )
-                asyncio.create_task(_delayed_put(final, delay))
-                continue
-
+            # Deferred items get a new journal id, so the ones taken here can be acked
+            journal_ids = [b.get("journal_id") for b in batch]
+            started = None
+            processed = False
+            cancelled = False
             try:
-                # Check if this is an event prompt
-                if "event_prompt" in final:
-                    # Create a mock message object with event_id for events
-                    mock_message = SimpleNamespace()
-                    mock_message.event_id = final["context"].get("event_id")
-                    mock_message.chat_id = "TARDIS/system/events"  
-                    mock_message.message_id = f"event_{mock_message.event_id}"
-                    
-                    # Deliver the structured event prompt using the standard pipeline
-                    await plugin_instance.handle_incoming_message(
-                        final["bot"], mock_message, final["event_prompt"], final.get("interface")
-                    )
-                else:
-                    await plugin_instance.handle_incoming_message(
-                        final["bot"], final["message"], final["context"], final.get("interface")
-                    )
-            except Exception as e:  # pragma: no cover - plugin may misbehave
-                log_error(
-                    f"[ERROR] Failed to process message from chat {final['chat_id']}: {e}\n{traceback.format_exc()}",
-                )
-                bot = final.get("bot")
-                chat_id = final.get("chat_id")
-                thread_id = final.get("thread_id")
+                await _acquire_slot()
+                started = time.monotonic()
                 try:
-                    if bot and chat_id:
-                        kwargs = {"chat_id": chat_id, "text": "😵‍💫"}
-                        if thread_id:
-                            kwargs["thread_id"] = thread_id
-                        reply_msg = final.get("message")
-                        reply_id = getattr(reply_msg, "message_id", None)
-                        if reply_id:
-                            kwargs["reply_to_message_id"] = reply_id
-                        await bot.send_message(**kwargs)
-                except Exception as send_err:  # pragma: no cover - best effort
-                    log_warning(
-                        f"[QUEUE] Failed to send fallback message: {send_err}"
-                    )
+                    await _process_item(_merge_batch(batch))
+                    processed = True
+                finally:
+                    _release_slot()
+            except asyncio.CancelledError:
+                if not processed:
+                    cancelled = True
+                    # Not acked: the batch is served again after the restart
+                    _queue.requeue(batch, priority)
+                raise
             finally:
-                for _ in batch:
-                    _queue.task_done()
+                _queue.release(key, time.monotonic() - started if started is not None else None)
+                if _journal is not None and not cancelled:
+                    for journal_id in journal_ids:
+                        _journal.ack(journal_id)
         except asyncio.CancelledError:
-            log_info("[QUEUE] Consumer loop cancelled")
+            log_info(f"[QUEUE] Consumer worker {worker_id} cancelled")
             break
         except Exception as e:
             log_error(
@@ -419,7 +790,7 @@ async def _consumer_loop() -> None:
 async def enqueue_event(bot, prompt_data, event_id: int = None) -> None:
     """Enqueue an event prompt with highest priority."""
     # Debug log to verify the payload content
-    log_debug(f"[QUEUE] Verifying event payload: {prompt_data}")
+    log_debug("[QUEUE] Verifying event payload: %s", prompt_data)
 
     # Check required fields in the payload - adjust for the actual structure
     payload = prompt_data.get("input", {}).get("payload", {})
@@ -440,24 +811,50 @@ async def enqueue_event(bot, prompt_data, event_id: int = None) -> None:
     }
 
     # Check to avoid duplicates in the queue
-    for prio, queued_item in list(_queue._queue):
+    for queued_item in _queue.items():
         if queued_item.get("event_prompt") == prompt_data:
             log_warning("[QUEUE] Duplicate event detected, not added to the queue")
             return
 
-    await _queue.put((HIGH_PRIORITY, item))
-    log_debug(f"[QUEUE] Event added to the queue with priority: {prompt_data}")
-    log_debug(f"[QUEUE] Current queue state: {list(_queue._queue)}")
+    _queue_item(item, HIGH_PRIORITY)
+    log_debug("[QUEUE] Event added to the queue with priority: %s", prompt_data)
+    log_debug("[QUEUE] Current queue depth: %s", _queue.qsize())
 
 
-async def run() -> None:
-    """Convenience wrapper to launch the consumer task if not running."""
-    global _consumer_task
+async def close() -> None:
+    """Stop the consumer pool and write the journal to disk.
 
-    if _consumer_task and not _consumer_task.done():
+    Batches interrupted here stay in the queue and in the journal; :func:`run`
+    serves them again, or they are replayed on the next start.
+    """
+    global _consumer_tasks
+    tasks, _consumer_tasks = _consumer_tasks, []
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if _journal is not None:
+        await _journal.close()
+    log_info("[QUEUE] Consumer pool stopped")
+
+
+async def run() -> None:
+    """Convenience wrapper to launch the consumer pool if not running."""
+    global _consumer_tasks, _journal
+
+    if bool(MESSAGE_QUEUE_PERSIST) and _journal is None:
+        _journal = QueueJournal(str(MESSAGE_QUEUE_JOURNAL))
+        replayed = _replay_journal()
+        if replayed:
+            log_info(f"[QUEUE] Replayed {replayed} pending message(s) from {_journal.path}")
+    if _journal is not None:
+        _journal.start()
+
+    alive = [t for t in _consumer_tasks if not t.done()]
+    if alive:
         log_debug("[QUEUE] Consumer already running")
         return
 
-    _consumer_task = asyncio.create_task(_consumer_loop())
-    log_info("[QUEUE] Consumer task started")
-
+    workers = max(1, int(MESSAGE_QUEUE_WORKERS))
+    _consumer_tasks = [asyncio.create_task(_consumer_loop(i)) for i in range(workers)]
+    log_info(f"[QUEUE] Consumer pool started with {workers} worker(s)")
@@ -22,7 +22,7 @@ from typing import Any, Dict, List, Optional, Callable
 from dataclasses import dataclass, asdict
 
 from core.plugin_base import PluginBase
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 from core.config_manager import config_registry
 
@@ -192,23 +192,17 @@ def _run(coro):
 
 async def _execute(query: str, params: tuple = ()):
     """Execute a query with parameters."""
-    conn = await get_conn()
-    try:
+    async with acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(query, params)
-    finally:
-        conn.close()
 
 
 async def _fetchone(query: str, params: tuple = ()):
     """Fetch one result from a query."""
-    conn = await get_conn()
-    try:
+    async with acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(query, params)
             return await cur.fetchone()
-    finally:
-        conn.close()
 
 
 async def init_persona_table():
@@ -1,14 +1,13 @@
 # core/plugin_instance.py
 
 from core.config import get_active_llm, set_active_llm
-from core.prompt_engine import build_json_prompt
+from core.prompt_engine import build_json_prompt, sanitize_prompt, serialize_prompt
 from core.llm_registry import get_llm_registry
 import asyncio
 from types import SimpleNamespace
 from datetime import datetime
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 from core.action_parser import parse_action
-from core.json_utils import dumps as json_dumps, sanitize_for_json
 from core.image_processor import get_image_processor, process_image_message
 from core.abstract_context import AbstractContext, AbstractUser, AbstractMessage
 from core.mention_utils import is_message_for_bot
@@ -230,16 +229,19 @@ async def handle_incoming_message(bot, message, context_memory_or_prompt, interf
         else:
             prompt = await build_json_prompt(message, context_memory_or_prompt, interface_name, image_data=processed_image_data)
 
-    prompt = sanitize_for_json(prompt)
+    prompt = sanitize_prompt(prompt)
+    prompt_text = None
     log_debug("🌐 JSON PROMPT built for the plugin:")
     try:
-        log_debug(json_dumps(prompt))
+        prompt_text = serialize_prompt(prompt)
+        log_debug(prompt_text)
     except Exception as e:
         log_error(f"Failed to serialize prompt: {e}")
 
     # Trace handoff to LLM plugin
     try:
-        log_info(f"[flow] -> LLM plugin: handing off chat_id={getattr(message, 'chat_id', None)} interface={interface} prompt_len={len(json_dumps(prompt)) if isinstance(prompt, (dict, list)) else len(str(prompt))}")
+        prompt_len = len(prompt_text) if prompt_text is not None else len(str(prompt))
+        log_info(f"[flow] -> LLM plugin: handing off chat_id={getattr(message, 'chat_id', None)} interface={interface} prompt_len={prompt_len}")
     except Exception:
         log_info(f"[flow] -> LLM plugin: handing off chat_id={getattr(message, 'chat_id', None)} interface={interface}")
 
@@ -2,7 +2,7 @@
 
 from core.synth_tagging import extract_tags, expand_tags
 import aiomysql
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 from core.json_utils import dumps as json_dumps
 from core.config_manager import config_registry
@@ -194,28 +194,18 @@ async def build_json_prompt(message, context_memory, interface_name: str | None
     log_debug("[json_prompt] context = " + json_dumps(context_section))
     log_debug("[json_prompt] input = " + json_dumps(input_section))
 
-    # Add JSON instructions to the prompt
-    json_instructions = load_json_instructions()
-    
+    # Static instructions and actions come first so the serialized prompt
+    # starts with the cached, pre-encoded block (see serialize_prompt).
     # Interface-specific instructions are provided via the available actions block
     # No hardcoded interface references - plugins define their own instructions
-
+    static_block = get_static_prompt_block()
     prompt_with_instructions = {
+        "instructions": static_block.instructions,
+        "actions": static_block.actions,
         "context": context_section,
         "input": input_section,
-        "instructions": json_instructions,
     }
 
-    # Include unified actions metadata from the initializer
-    try:
-        from core.core_initializer import core_initializer
-        prompt_with_instructions["actions"] = core_initializer.actions_block.get(
-            "available_actions", {}
-        )
-    except Exception as e:
-        log_warning(f"[prompt_engine] Failed to inject actions block: {e}")
-        prompt_with_instructions["actions"] = {}
-
     # === Final check: Reduce prompt if it exceeds LLM character limits ===
     try:
         # Get max prompt chars from active LLM
@@ -273,17 +263,15 @@ async def search_memories(tags=None, scope=None, limit=5):
     log_debug(query)
     log_debug(f"Parameters: {params}")
 
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(query, params)
-            rows = await cur.fetchall()
-            return [row[0] for row in rows]
-    except Exception as e:
-        log_error(f"Query failed: {repr(e)}")
-        return []
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                rows = await cur.fetchall()
+                return [row[0] for row in rows]
+        except Exception as e:
+            log_error(f"Query failed: {repr(e)}")
+            return []
 
 async def build_prompt(
     user_text: str,
@@ -379,6 +367,126 @@ The JSON is just a wrapper — speak naturally in the "text" field as you always
 """
 
 
+class StaticPromptBlock:
+    """Pre-serialized ``instructions`` and ``actions`` sections of the prompt.
+
+    Both sections are large and only change when the actions block is
+    rebuilt, so they are sanitized and encoded once per ``version`` and the
+    resulting JSON fragment is reused for every prompt.
+    """
+
+    __slots__ = ("version", "source", "instructions", "actions", "fragment", "sizes")
+
+    def __init__(self, version: int, source, instructions: str, actions: dict):
+        self.version = version
+        self.source = source
+        self.instructions = instructions
+        self.actions = actions
+        encoded_instructions = json_dumps(instructions)
+        encoded_actions = json_dumps(actions)
+        # '"instructions": ..., "actions": ...' without the enclosing braces
+        self.fragment = f'"instructions": {encoded_instructions}, "actions": {encoded_actions}'
+        self.sizes = {
+            "instructions": len(encoded_instructions),
+            "actions": len(encoded_actions),
+        }
+
+    def matches(self, prompt: dict) -> bool:
+        """True when ``prompt`` starts with this block's own section objects."""
+        keys = iter(prompt)
+        return (
+            next(keys, None) == "instructions"
+            and next(keys, None) == "actions"
+            and prompt["instructions"] is self.instructions
+            and prompt["actions"] is self.actions
+        )
+
+
+_static_block: StaticPromptBlock | None = None
+_static_block_version = 0
+
+
+def invalidate_static_prompt_block() -> None:
+    """Drop the cached static block; called whenever the actions block is rebuilt."""
+    global _static_block, _static_block_version
+    _static_block_version += 1
+    _static_block = None
+    log_debug(f"[prompt_engine] Static prompt block invalidated (version {_static_block_version})")
+
+
+def get_static_prompt_block() -> StaticPromptBlock:
+    """Return the cached static block, building it if the actions changed."""
+    global _static_block
+    source = {}
+    try:
+        from core.core_initializer import core_initializer
+        source = core_initializer.actions_block.get("available_actions", {})
+    except Exception as e:  # pragma: no cover - defensive
+        log_warning(f"[prompt_engine] Failed to load actions block: {e}")
+
+    block = _static_block
+    if block is not None and block.source is source and block.version == _static_block_version:
+        return block
+
+    from core.json_utils import sanitize_for_json
+
+    block = StaticPromptBlock(
+        _static_block_version,
+        source,
+        load_json_instructions(),
+        sanitize_for_json(source),
+    )
+    _static_block = block
+    log_debug(
+        f"[prompt_engine] Static prompt block built (version {block.version}, "
+        f"{len(block.fragment)} chars, {len(block.actions)} actions)"
+    )
+    return block
+
+
+def serialize_prompt_parts(prompt) -> tuple[str, str]:
+    """Split the serialized ``prompt`` into a static prefix and a dynamic suffix.
+
+    When the prompt carries the cached static block, the prefix is that
+    block's pre-encoded fragment and only the remaining sections are
+    serialized. Otherwise the prefix is empty and the suffix holds the whole
+    prompt. ``prefix + suffix`` always equals ``json_dumps(prompt)``.
+    """
+    block = _static_block
+    if not isinstance(prompt, dict) or block is None or not block.matches(prompt):
+        return "", json_dumps(prompt)
+
+    dynamic = {k: v for k, v in prompt.items() if k not in ("instructions", "actions")}
+    prefix = "{" + block.fragment
+    if not dynamic:
+        return prefix, "}"
+    return prefix, ", " + json_dumps(dynamic)[1:]
+
+
+def serialize_prompt(prompt) -> str:
+    """Serialize ``prompt`` to JSON, reusing the cached static block if present."""
+    prefix, suffix = serialize_prompt_parts(prompt)
+    return prefix + suffix
+
+
+def sanitize_prompt(prompt):
+    """``sanitize_for_json`` that leaves the cached static block untouched.
+
+    The static sections were sanitized when the block was built; keeping the
+    same objects lets :func:`serialize_prompt` reuse the encoded fragment.
+    """
+    from core.json_utils import sanitize_for_json
+
+    block = _static_block
+    if not isinstance(prompt, dict) or block is None or not block.matches(prompt):
+        return sanitize_for_json(prompt)
+    sanitized = {"instructions": block.instructions, "actions": block.actions}
+    for key, value in prompt.items():
+        if key not in sanitized:
+            sanitized[key] = sanitize_for_json(value)
+    return sanitized
+
+
 def build_full_json_instructions() -> dict:
     """Return combined JSON instructions and available actions block.
 
@@ -386,14 +494,113 @@ def build_full_json_instructions() -> dict:
     every capability, preserving flexibility and avoiding accidental action
     masking.
     """
-    instructions = load_json_instructions()
-    actions = {}
+    block = get_static_prompt_block()
+    return {"instructions": block.instructions, "actions": block.actions}
+
+def _json_len(value) -> int:
+    """Length of ``value`` once serialized with :func:`core.json_utils.dumps`."""
+    return len(json_dumps(value))
+
+
+def _container_len(item_sizes) -> int:
+    """Serialized length of a list or dict whose members have ``item_sizes``.
+
+    ``json_dumps`` uses the default ``", "`` separator, so a container is its
+    two brackets, its members and two characters between each pair of them.
+    """
+    count = len(item_sizes)
+    if not count:
+        return 2
+    return 2 + sum(item_sizes) + 2 * (count - 1)
+
+
+def _member_len(key: str, value_size: int) -> int:
+    """Serialized length of ``"key": value`` inside a dict."""
+    return _json_len(key) + 2 + value_size
+
+
+def _fit_prefix(item_sizes: list, budget: int) -> int:
+    """Largest ``k`` such that a list of the first ``k`` items fits in ``budget``."""
+    total = 2
+    for index, size in enumerate(item_sizes):
+        total += size + (2 if index else 0)
+        if total > budget:
+            return index
+    return len(item_sizes)
+
+
+class _PromptSizes:
+    """Serialized size of a prompt, tracked per section.
+
+    Every top-level section and every ``context`` member is measured once;
+    the total is derived from those figures, so removing a section or
+    trimming a list only costs a re-measure of the part that changed.
+    """
+
+    def __init__(self, prompt: dict):
+        self.top = {}
+        self.context = {}
+        block = _static_block
+        static_sizes = block.sizes if block is not None and block.matches(prompt) else {}
+        for key, value in prompt.items():
+            if key in static_sizes:
+                self.top[key] = _member_len(key, static_sizes[key])
+            elif key == "context" and isinstance(value, dict):
+                for ctx_key, ctx_value in value.items():
+                    self.context[ctx_key] = _member_len(ctx_key, _json_len(ctx_value))
+                self.top[key] = None
+            else:
+                self.top[key] = _member_len(key, _json_len(value))
+
+    def set_context(self, key: str, value_size: int) -> None:
+        self.context[key] = _member_len(key, value_size)
+
+    def drop_context(self, key: str) -> None:
+        self.context.pop(key, None)
+
+    def set_top(self, key: str, value_size: int) -> None:
+        self.top[key] = _member_len(key, value_size)
+
+    def drop_top(self, key: str) -> None:
+        self.top.pop(key, None)
+        if key == "context":
+            self.context.clear()
+
+    def total(self) -> int:
+        sizes = []
+        for key, size in self.top.items():
+            if size is None:
+                size = _member_len(key, _container_len(list(self.context.values())))
+            sizes.append(size)
+        return _container_len(sizes)
+
+    def without_context(self, *keys: str) -> int:
+        """Total size with the context members ``keys`` left out."""
+        saved = {key: self.context.pop(key) for key in keys if key in self.context}
+        try:
+            return self.total()
+        finally:
+            self.context.update(saved)
+
+    def breakdown(self) -> dict:
+        """Per-section sizes, with context members listed individually."""
+        report = {"total": self.total()}
+        for key, size in self.top.items():
+            if size is None:
+                report["context"] = dict(self.context)
+            else:
+                report[key] = size
+        return report
+
+
+def _diary_len(entries: list) -> int | None:
+    """Serialized length of the diary text built from ``entries``."""
     try:
-        from core.core_initializer import core_initializer
-        actions = core_initializer.actions_block.get("available_actions", {})
-    except Exception as e:  # pragma: no cover - defensive
-        log_warning(f"[prompt_engine] Failed to load actions block: {e}")
-    return {"instructions": instructions, "actions": actions}
+        from plugins.ai_diary import format_diary_for_injection
+        return _json_len(format_diary_for_injection(entries))
+    except Exception:
+        return None
+
 
 def reduce_prompt_for_llm_limit(prompt: dict, max_chars: int) -> dict:
     """Reduce the prompt if it exceeds the LLM character limit by removing low-priority sections.
@@ -405,6 +612,11 @@ def reduce_prompt_for_llm_limit(prompt: dict, max_chars: int) -> dict:
     4. context.chat_history (remove oldest messages)
     5. context.memories (remove oldest)
     6. context.diary (remove oldest entries)
+
+    Each section and list item is serialized once; the number of items to
+    keep is worked out from those sizes rather than by re-serializing the
+    prompt after every removal. The per-section breakdown is logged at
+    debug level before and after the reduction.
     
     Args:
         prompt: The JSON prompt dictionary
@@ -413,89 +625,115 @@ def reduce_prompt_for_llm_limit(prompt: dict, max_chars: int) -> dict:
     Returns:
         Reduced prompt that fits within limits
     """
-    import copy
-    from core.json_utils import dumps as json_dumps
-    
-    # Make a copy to avoid modifying the original
-    reduced_prompt = copy.deepcopy(prompt)
-    
-    # Check current size
-    current_size = len(json_dumps(reduced_prompt))
+    # Only the containers that get trimmed are copied, the rest is shared
+    reduced_prompt = dict(prompt)
+    context = reduced_prompt.get("context")
+    if isinstance(context, dict):
+        context = dict(context)
+        reduced_prompt["context"] = context
+    else:
+        context = None
+
+    sizes = _PromptSizes(reduced_prompt)
+    current_size = sizes.total()
     if current_size <= max_chars:
         log_debug(f"[reduce_prompt] Prompt size {current_size} <= {max_chars}, no reduction needed")
         return reduced_prompt
-    
+
     log_warning(f"[reduce_prompt] Prompt size {current_size} exceeds limit {max_chars}, reducing...")
-    
+    log_debug("[reduce_prompt] size breakdown before: " + json_dumps(sizes.breakdown()))
+
+    def _done(stage: str) -> dict:
+        log_debug(f"[reduce_prompt] Reduced {stage}, now {current_size} <= {max_chars}")
+        log_debug("[reduce_prompt] size breakdown after: " + json_dumps(sizes.breakdown()))
+        return reduced_prompt
+
     # Priority 6: Reduce diary (lowest priority) - remove entries from oldest to newest
-    if "context" in reduced_prompt and "diary_entries" in reduced_prompt["context"]:
-        diary_entries = reduced_prompt["context"]["diary_entries"]
-        if diary_entries:
-            # Remove oldest entries first (they're at the end of the list since ordered by timestamp DESC)
-            while diary_entries and current_size > max_chars:
-                removed_entry = diary_entries.pop()
-                # Reformat diary with remaining entries
-                try:
-                    from plugins.ai_diary import format_diary_for_injection
-                    new_diary_content = format_diary_for_injection(diary_entries)
-                    reduced_prompt["context"]["diary"] = new_diary_content
-                except Exception:
-                    # Fallback: remove diary if formatting fails
-                    if "diary" in reduced_prompt["context"]:
-                        del reduced_prompt["context"]["diary"]
-                
-                current_size = len(json_dumps(reduced_prompt))
-                log_debug(f"[reduce_prompt] Removed diary entry, now {current_size} chars")
-            
-            if current_size <= max_chars:
-                log_debug(f"[reduce_prompt] Reduced diary entries, now {current_size} <= {max_chars}")
-                return reduced_prompt
-    
+    diary_entries = context.get("diary_entries") if context is not None else None
+    if diary_entries:
+        # Oldest entries are at the end of the list (ordered by timestamp DESC).
+        # Both the raw entries and the formatted diary shrink with every entry
+        # dropped, so the largest fitting prefix is found by binary search.
+        entry_sizes = [_json_len(entry) for entry in diary_entries]
+        base = sizes.without_context("diary_entries", "diary")
+        entries_member = _json_len("diary_entries") + 2
+        diary_member = _json_len("diary") + 2
+        others = len(sizes.context) - ("diary_entries" in sizes.context) - ("diary" in sizes.context)
+
+        def _size_with(keep: int):
+            diary_size = _diary_len(diary_entries[:keep])
+            members = [entries_member + _container_len(entry_sizes[:keep])]
+            if diary_size is not None:
+                members.append(diary_member + diary_size)
+            # Each added context member brings a ", " separator unless it is alone
+            extra = sum(members) + 2 * (len(members) - (0 if others else 1))
+            return base + extra, diary_size
+
+        low, high = 0, len(diary_entries)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if _size_with(mid)[0] <= max_chars:
+                low = mid
+            else:
+                high = mid - 1
+
+        kept = diary_entries[:low]
+        context["diary_entries"] = kept
+        sizes.set_context("diary_entries", _container_len(entry_sizes[:low]))
+        try:
+            from plugins.ai_diary import format_diary_for_injection
+            diary_text = format_diary_for_injection(kept)
+            context["diary"] = diary_text
+            sizes.set_context("diary", _json_len(diary_text))
+        except Exception:
+            # Fallback: remove diary if formatting fails
+            context.pop("diary", None)
+            sizes.drop_context("diary")
+
+        current_size = sizes.total()
+        log_debug(
+            f"[reduce_prompt] Removed {len(diary_entries) - low} diary entries, now {current_size} chars"
+        )
+        if current_size <= max_chars:
+            return _done("diary entries")
+
     # If diary still too big or no entries, remove diary entirely
-    if "context" in reduced_prompt and "diary" in reduced_prompt["context"] and current_size > max_chars:
-        del reduced_prompt["context"]["diary"]
-        if "diary_entries" in reduced_prompt["context"]:
-            del reduced_prompt["context"]["diary_entries"]
-        current_size = len(json_dumps(reduced_prompt))
+    if context is not None and "diary" in context and current_size > max_chars:
+        del context["diary"]
+        context.pop("diary_entries", None)
+        sizes.drop_context("diary")
+        sizes.drop_context("diary_entries")
+        current_size = sizes.total()
         log_debug(f"[reduce_prompt] Removed entire diary, now {current_size} chars")
         if current_size <= max_chars:
-            return reduced_prompt
-    
-    # Priority 5: Reduce memories
-    if "context" in reduced_prompt and "memories" in reduced_prompt["context"]:
-        memories = reduced_prompt["context"]["memories"]
-        if memories:
-            # Remove oldest memories first (they're at the end of the list)
-            while memories and current_size > max_chars:
-                removed = memories.pop()
-                current_size = len(json_dumps(reduced_prompt))
-                log_debug(f"[reduce_prompt] Removed memory, now {current_size} chars")
-            if current_size <= max_chars:
-                log_debug(f"[reduce_prompt] Reduced memories, now {current_size} <= {max_chars}")
-                return reduced_prompt
-    
-    # Priority 4: Reduce chat_history
-    if "context" in reduced_prompt and "chat_history" in reduced_prompt["context"]:
-        chat_history = reduced_prompt["context"]["chat_history"]
-        if chat_history:
-            # Remove oldest messages first (they're at the end of the list)
-            while chat_history and current_size > max_chars:
-                removed = chat_history.pop()
-                current_size = len(json_dumps(reduced_prompt))
-                log_debug(f"[reduce_prompt] Removed chat message, now {current_size} chars")
-            if current_size <= max_chars:
-                log_debug(f"[reduce_prompt] Reduced chat_history, now {current_size} <= {max_chars}")
-                return reduced_prompt
-    
+            return _done("diary")
+
+    # Priority 5: Reduce memories, then priority 4: chat_history.
+    # Oldest items are at the end of each list.
+    for key, label in (("memories", "memories"), ("chat_history", "chat_history")):
+        items = context.get(key) if context is not None else None
+        if not items or not isinstance(items, list):
+            continue
+        item_sizes = [_json_len(item) for item in items]
+        list_size = sizes.context[key] - _member_len(key, 0)
+        keep = _fit_prefix(item_sizes, max_chars - current_size + list_size)
+        context[key] = items[:keep]
+        sizes.set_context(key, _container_len(item_sizes[:keep]))
+        current_size = sizes.total()
+        log_debug(f"[reduce_prompt] Removed {len(items) - keep} {label} items, now {current_size} chars")
+        if current_size <= max_chars:
+            return _done(label)
+
     # If still too big, log error and return as-is (should not happen with proper limits)
-    final_size = len(json_dumps(reduced_prompt))
+    final_size = current_size
     if final_size > max_chars:
         log_error(f"[reduce_prompt] Could not reduce prompt below {max_chars} chars, final size: {final_size}")
         
         # Try removing entire context sections if desperate
         if "context" in reduced_prompt:
             del reduced_prompt["context"]
-            final_size = len(json_dumps(reduced_prompt))
+            sizes.drop_top("context")
+            final_size = sizes.total()
             log_warning(f"[reduce_prompt] Removed entire context, final size: {final_size}")
         
         # If STILL too big, try reducing actions (keep only essential ones)
@@ -507,7 +745,8 @@ def reduce_prompt_for_llm_limit(prompt: dict, max_chars: int) -> dict:
                 reduced_actions = {k: v for k, v in original_actions.items() if k in essential_actions}
                 if reduced_actions:  # Only replace if we have at least one action
                     reduced_prompt["actions"] = reduced_actions
-                    final_size = len(json_dumps(reduced_prompt))
+                    sizes.set_top("actions", _json_len(reduced_actions))
+                    final_size = sizes.total()
                     log_warning(f"[reduce_prompt] Reduced actions to essentials ({len(reduced_actions)} actions), final size: {final_size}")
         
         # Last resort: simplify instructions
@@ -518,18 +757,18 @@ def reduce_prompt_for_llm_limit(prompt: dict, max_chars: int) -> dict:
                 "rules": ["Always respond with valid JSON", "Use available actions only", "Be concise"]
             }
             reduced_prompt["instructions"] = simplified_instructions
-            final_size = len(json_dumps(reduced_prompt))
+            simplified_size = _json_len(simplified_instructions)
+            sizes.set_top("instructions", simplified_size)
+            final_size = sizes.total()
             log_warning(f"[reduce_prompt] Simplified instructions, final size: {final_size}")
-            log_debug(f"[reduce_prompt] Original instructions size: {len(json_dumps(original_instructions))}, new size: {len(json_dumps(simplified_instructions))}")
+            log_debug(f"[reduce_prompt] Original instructions size: {_json_len(original_instructions)}, new size: {simplified_size}")
         
         # If STILL exceeding, at least log what remains
         if final_size > max_chars:
             log_error(f"[reduce_prompt] CRITICAL: Prompt still {final_size} chars after all reductions! Max is {max_chars}")
-            log_error(f"[reduce_prompt] Remaining sections: {list(reduced_prompt.keys())}")
-            for key, value in reduced_prompt.items():
-                section_size = len(json_dumps({key: value}))
-                log_error(f"[reduce_prompt]   - {key}: {section_size} chars")
-    
+            log_error("[reduce_prompt] Remaining sections: " + json_dumps(sizes.breakdown()))
+
+    log_debug("[reduce_prompt] size breakdown after: " + json_dumps(sizes.breakdown()))
     return reduced_prompt
 
 
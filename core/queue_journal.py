@@ -0,0 +1,329 @@
+# core/queue_journal.py
+"""Append-only on-disk journal backing the message queue.
+
+Every queued item is written as a ``put`` record and removed with an ``ack``
+record once it has been processed. Records are buffered in memory and
+written by a background task, so an ``enqueue`` only pays for a list append;
+the file is flushed and fsynced once per batch. On startup the journal is
+read back, the items still pending are returned for replay and the file is
+rewritten with only those records.
+
+Live telegram/discord objects cannot be stored, so messages are reduced to a
+plain snapshot (:func:`snapshot_message`) and rebuilt as ``SimpleNamespace``
+objects on replay (:func:`restore_message`).
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from core.logging_utils import log_debug, log_error, log_info, log_warning
+
+FLUSH_INTERVAL = 0.2
+FLUSH_BATCH = 64
+# Rewrite the file once this many records were appended since the last compaction
+COMPACT_AFTER = 5000
+
+# Item fields that are stored as-is; "bot" is resolved again on replay
+_ITEM_FIELDS = (
+    "chat_id",
+    "thread_id",
+    "interface",
+    "chat_name",
+    "message_thread_name",
+    "timestamp",
+    "priority",
+    "event_prompt",
+)
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (deque, set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def snapshot_message(message) -> Optional[Dict[str, Any]]:
+    """Reduce an interface message object to JSON-friendly fields."""
+    if message is None:
+        return None
+    snap: Dict[str, Any] = {
+        "message_id": getattr(message, "message_id", None),
+        "chat_id": getattr(message, "chat_id", None),
+        "text": getattr(message, "text", None),
+        "thread_id": getattr(message, "thread_id", None),
+    }
+    date = getattr(message, "date", None)
+    if isinstance(date, datetime):
+        snap["date"] = date.isoformat()
+    interface_id = getattr(message, "interface_id", None)
+    if interface_id is not None:
+        snap["interface_id"] = interface_id
+    user = getattr(message, "from_user", None)
+    if user is not None:
+        snap["from_user"] = {
+            "id": getattr(user, "id", None),
+            "username": getattr(user, "username", None),
+            "first_name": getattr(user, "first_name", None),
+            "full_name": getattr(user, "full_name", None),
+        }
+    chat = getattr(message, "chat", None)
+    if chat is not None:
+        snap["chat"] = {
+            "id": getattr(chat, "id", None),
+            "type": getattr(chat, "type", None),
+            "title": getattr(chat, "title", None),
+            "username": getattr(chat, "username", None),
+            "first_name": getattr(chat, "first_name", None),
+        }
+    return snap
+
+
+def restore_message(snap: Optional[Dict[str, Any]]):
+    """Rebuild a message object from :func:`snapshot_message` output."""
+    if snap is None:
+        return None
+    data = dict(snap)
+    date = data.pop("date", None)
+    try:
+        data["date"] = datetime.fromisoformat(date) if date else datetime.utcnow()
+    except ValueError:
+        data["date"] = datetime.utcnow()
+    user = data.pop("from_user", None)
+    data["from_user"] = SimpleNamespace(**user) if user is not None else None
+    chat = data.pop("chat", None)
+    data["chat"] = SimpleNamespace(**chat) if chat is not None else None
+    data["reply_to_message"] = None
+    data["replayed"] = True
+    return SimpleNamespace(**data)
+
+
+def serialize_item(item: dict) -> Dict[str, Any]:
+    """Return the storable part of a queue item.
+
+    Interfaces pass their memory of every chat as the context; only the
+    history of the item's own chat is kept, as a separate ``history`` list.
+    """
+    data = {field: item[field] for field in _ITEM_FIELDS if field in item}
+    data["message"] = snapshot_message(item.get("message"))
+    context = item.get("context") or {}
+    data["context"] = {key: value for key, value in context.items() if not isinstance(value, deque)}
+    history = context.get(item.get("chat_id"))
+    if isinstance(history, deque):
+        data["history"] = list(history)
+    return data
+
+
+def deserialize_item(data: Dict[str, Any]) -> dict:
+    """Rebuild a queue item; ``bot`` is left for the queue to resolve."""
+    item = dict(data)
+    item["message"] = restore_message(data.get("message"))
+    item["bot"] = None
+    context = dict(data.get("context") or {})
+    history = item.pop("history", None)
+    if history is not None:
+        # JSON object keys are strings, so the chat's key is restored here
+        context[data.get("chat_id")] = deque(history)
+    item["context"] = context
+    return item
+
+
+class QueueJournal:
+    """Write-behind JSON-lines journal of queued and acknowledged items."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ids = itertools.count(1)
+        self._live: Dict[int, str] = {}
+        self._buffer: List[str] = []
+        self._appended = 0
+        self._pending = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        # File write running on a helper thread; later writes wait for it
+        self._inflight: Optional[asyncio.Future] = None
+        self._io_lock = threading.Lock()
+        self._stats = {"puts": 0, "acks": 0, "flushes": 0, "errors": 0}
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Read the journal and return the pending ``put`` records in order."""
+        live: Dict[int, Dict[str, Any]] = {}
+        last_id = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line after a crash is expected
+                        log_debug("[queue_journal] Skipping unreadable journal line")
+                        continue
+                    rid = int(record.get("id", 0))
+                    last_id = max(last_id, rid)
+                    if record.get("op") == "put":
+                        live[rid] = record
+                    elif record.get("op") == "ack":
+                        live.pop(rid, None)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log_error(f"[queue_journal] Failed to read {self.path}: {e}")
+
+        self._ids = itertools.count(last_id + 1)
+        self._live = {rid: json.dumps(rec, default=_json_default) for rid, rec in live.items()}
+        self._rewrite()
+        self._appended = 0
+        if live:
+            log_info(f"[queue_journal] {len(live)} pending item(s) found in {self.path}")
+        return [live[rid] for rid in sorted(live)]
+
+    def put(self, item: dict, priority: int, due_at: Optional[float] = None) -> int:
+        """Record ``item`` and return its journal id."""
+        rid = next(self._ids)
+        record = {
+            "op": "put",
+            "id": rid,
+            "priority": priority,
+            "due_at": due_at,
+            "item": serialize_item(item),
+        }
+        try:
+            line = json.dumps(record, default=_json_default)
+        except Exception as e:
+            self._stats["errors"] += 1
+            log_warning(f"[queue_journal] Could not serialize queue item: {e}")
+            return rid
+        self._live[rid] = line
+        self._append(line)
+        self._stats["puts"] += 1
+        return rid
+
+    def ack(self, rid: Optional[int]) -> None:
+        """Mark the item ``rid`` as processed."""
+        if rid is None or self._live.pop(rid, None) is None:
+            return
+        self._append(json.dumps({"op": "ack", "id": rid}))
+        self._stats["acks"] += 1
+
+    def _append(self, line: str) -> None:
+        self._buffer.append(line)
+        self._appended += 1
+        self._pending.set()
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop."""
+        if self._flush_task is None or self._flush_task.done():
+            self._pending = asyncio.Event()
+            if self._buffer:
+                self._pending.set()
+            self._flush_task = asyncio.create_task(self._flusher())
+
+    async def _flusher(self) -> None:
+        while True:
+            try:
+                await self._pending.wait()
+                # Give concurrent enqueues a moment to join this batch
+                if len(self._buffer) < FLUSH_BATCH:
+                    await asyncio.sleep(FLUSH_INTERVAL)
+                self._pending.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                # The thread of a cancelled flush keeps running; let it finish
+                # before appending, or a compaction could replace these records
+                await self._drain()
+                self._write(self._take_buffer())
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                log_error(f"[queue_journal] Flush failed: {e}")
+
+    async def close(self) -> None:
+        """Stop the flusher and write every buffered record."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def _take_buffer(self) -> List[str]:
+        lines, self._buffer = self._buffer, []
+        return lines
+
+    async def _drain(self) -> None:
+        """Wait for the file write in flight, if any, without raising its error."""
+        while self._inflight is not None and not self._inflight.done():
+            await asyncio.wait({self._inflight})
+
+    async def _run_io(self, fn, *args, on_done=None) -> None:
+        """Run ``fn`` on a thread after the previous write, surviving cancellation."""
+        await self._drain()
+        self._inflight = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        if on_done is not None:
+            self._inflight.add_done_callback(on_done)
+        await asyncio.shield(self._inflight)
+
+    async def flush(self) -> None:
+        """Write buffered records and fsync, compacting when the file has grown."""
+        if self._appended >= COMPACT_AFTER:
+            # The live set already reflects every buffered record
+            self._buffer.clear()
+            compacted = self._appended
+
+            def done(fut: asyncio.Future) -> None:
+                # Records appended during the rewrite still count
+                if not fut.cancelled() and fut.exception() is None:
+                    self._appended -= compacted
+
+            await self._run_io(self._rewrite, list(self._live.values()), on_done=done)
+            return
+        lines = self._take_buffer()
+        if lines:
+            await self._run_io(self._write, lines)
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        with self._io_lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+        self._stats["flushes"] += 1
+
+    def _rewrite(self, lines: Optional[List[str]] = None) -> None:
+        """Replace the file with the pending records only."""
+        if lines is None:
+            lines = list(self._live.values())
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with self._io_lock:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for line in lines:
+                    fh.write(line + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.path)
+        log_debug(f"[queue_journal] Compacted journal to {len(lines)} record(s)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "pending": len(self._live),
+            "buffered": len(self._buffer),
+            **self._stats,
+        }
@@ -1,32 +1,219 @@
+"""Per-user message quotas enforced with the generic cell rate algorithm.
+
+Each ``(llm, user)`` bucket stores a single timestamp, the theoretical
+arrival time (TAT) of the next message, instead of a log of past messages.
+A quota of ``n`` messages per ``window`` seconds lets ``n`` messages through
+in a burst and then one every ``window / n`` seconds. A bucket whose TAT lies
+in the past is indistinguishable from a fresh one, so idle buckets are
+evicted periodically.
+
+The state lives in a pluggable backend. :class:`MemoryBackend` is the
+default; :class:`DatabaseBackend` keeps the buckets in MariaDB so several
+bot instances share one quota (``RATE_LIMIT_BACKEND=database``).
+"""
+
+import math
 import time
-from collections import defaultdict, deque
+from typing import Dict, Optional, Tuple, Union
+
+from core.config_manager import config_registry
 from core.interfaces_registry import get_interface_registry
-from typing import Union
+from core.logging_utils import log_debug, log_info, log_warning
+
+# Seconds between sweeps of idle buckets
+EVICT_INTERVAL = 60.0
+
+RATE_LIMIT_BACKEND = config_registry.get_var(
+    "RATE_LIMIT_BACKEND",
+    "memory",
+    label="Rate Limit Backend",
+    description=(
+        "Where rate limit buckets are stored: 'memory' for this process only, or "
+        "'database' to share one quota between bot instances using the same database."
+    ),
+    group="core",
+    component="rate_limit",
+    advanced=True,
+)
+
+
+def _gcra(tat: Optional[float], now: float, emission: float, window: float) -> Tuple[bool, float, float]:
+    """Return ``(allowed, retry_after, new_tat)`` for one request at ``now``."""
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + emission
+    allow_at = new_tat - window
+    if now < allow_at:
+        return False, allow_at - now, tat
+    return True, 0.0, new_tat
+
+
+class MemoryBackend:
+    """Buckets held in a dict of ``bucket -> TAT``."""
+
+    def __init__(self):
+        self._tat: Dict[tuple, float] = {}
+        self._next_sweep = 0.0
+
+    def update(self, bucket: tuple, now: float, emission: float, window: float, consume: bool) -> Tuple[bool, float]:
+        if now >= self._next_sweep:
+            self.evict_idle(now)
+        allowed, retry_after, new_tat = _gcra(self._tat.get(bucket), now, emission, window)
+        if allowed and consume:
+            self._tat[bucket] = new_tat
+        return allowed, retry_after
+
+    async def update_async(self, bucket: tuple, now: float, emission: float, window: float, consume: bool) -> Tuple[bool, float]:
+        return self.update(bucket, now, emission, window, consume)
+
+    def evict_idle(self, now: float) -> int:
+        """Drop buckets that have fully refilled."""
+        idle = [bucket for bucket, tat in self._tat.items() if tat <= now]
+        for bucket in idle:
+            del self._tat[bucket]
+        self._next_sweep = now + EVICT_INTERVAL
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class DatabaseBackend:
+    """Buckets stored in MariaDB and updated under a row lock.
+
+    Errors fall back to the in-memory backend so a database hiccup degrades
+    to a per-process quota rather than blocking every message.
+    """
+
+    TABLE = "rate_limit_buckets"
+
+    def __init__(self, fallback: MemoryBackend):
+        self._fallback = fallback
+        self._table_ready = False
+        self._next_sweep = 0.0
+
+    async def _ensure_table(self, cur) -> None:
+        if self._table_ready:
+            return
+        await cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                bucket_key VARCHAR(255) PRIMARY KEY,
+                tat DOUBLE NOT NULL
+            )
+            """
+        )
+        self._table_ready = True
+
+    def update(self, bucket: tuple, now: float, emission: float, window: float, consume: bool) -> Tuple[bool, float]:
+        # Synchronous callers cannot wait for the database
+        return self._fallback.update(bucket, now, emission, window, consume)
+
+    async def update_async(self, bucket: tuple, now: float, emission: float, window: float, consume: bool) -> Tuple[bool, float]:
+        from core.db import acquire
+
+        key = "|".join(str(part) for part in bucket)[:255]
+        try:
+            async with acquire() as conn:
+                async with conn.cursor() as cur:
+                    await self._ensure_table(cur)
+                    if now >= self._next_sweep:
+                        self._next_sweep = now + EVICT_INTERVAL
+                        await cur.execute(f"DELETE FROM {self.TABLE} WHERE tat <= %s", (now,))
+                    await conn.begin()
+                    try:
+                        await cur.execute(
+                            f"SELECT tat FROM {self.TABLE} WHERE bucket_key = %s FOR UPDATE",
+                            (key,),
+                        )
+                        row = await cur.fetchone()
+                        allowed, retry_after, new_tat = _gcra(row[0] if row else None, now, emission, window)
+                        if allowed and consume:
+                            await cur.execute(
+                                f"INSERT INTO {self.TABLE} (bucket_key, tat) VALUES (%s, %s) "
+                                "ON DUPLICATE KEY UPDATE tat = VALUES(tat)",
+                                (key, new_tat),
+                            )
+                        await conn.commit()
+                    except Exception:
+                        await conn.rollback()
+                        raise
+            return allowed, retry_after
+        except Exception as e:
+            log_warning(f"[rate_limit] Shared backend unavailable, using local buckets: {e}")
+            return self._fallback.update(bucket, now, emission, window, consume)
 
 
 class _RateLimiter:
     def __init__(self):
-        self.records = defaultdict(deque)
+        self.memory = MemoryBackend()
+        self.backend: Union[MemoryBackend, DatabaseBackend] = self.memory
+        self._backend_name = "memory"
 
-    def is_allowed(self, key: str, user_id: Union[int, str], interface_name: str, max_messages: int, window_seconds: int, trainer_fraction: float, consume: bool = True) -> bool:
-        now = time.time()
-        dq = self.records[(key, user_id)]
-        while dq and now - dq[0] > window_seconds:
-            dq.popleft()
+    def _select_backend(self):
+        name = str(RATE_LIMIT_BACKEND).strip().lower() or "memory"
+        if name != self._backend_name:
+            if name == "database":
+                self.backend = DatabaseBackend(self.memory)
+            else:
+                if name != "memory":
+                    log_warning(f"[rate_limit] Unknown backend '{name}', using memory")
+                self.backend = self.memory
+            self._backend_name = name
+            log_info(f"[rate_limit] Using {self._backend_name} backend")
+        return self.backend
 
+    @staticmethod
+    def _params(
+        key: str,
+        user_id: Union[int, str],
+        interface_name: str,
+        max_messages: float,
+        window_seconds: float,
+        trainer_fraction: float,
+        is_trainer: Optional[bool],
+    ):
+        """Return ``(bucket, emission, window)``, or ``None`` when unlimited."""
+        if max_messages is None or math.isinf(max_messages):
+            return None
         quota_trainer = int(max_messages * trainer_fraction)
-        quota_other = max_messages - quota_trainer
-        
-        # Controlla se l'utente è un trainer per questa interfaccia
-        registry = get_interface_registry()
-        is_trainer = registry.is_trainer(interface_name, user_id)
+        quota_other = int(max_messages) - quota_trainer
+
+        if is_trainer is None:
+            # Controlla se l'utente è un trainer per questa interfaccia
+            is_trainer = get_interface_registry().is_trainer(interface_name, user_id)
         quota = quota_trainer if is_trainer else quota_other
+        window = float(window_seconds)
+        if quota <= 0:
+            # Nothing is ever allowed; report the whole window as the wait
+            return (key, user_id), math.inf, window
+        return (key, user_id), window / quota, window
+
+    def check(self, key, user_id, interface_name, max_messages, window_seconds, trainer_fraction,
+              consume: bool = True, is_trainer: Optional[bool] = None) -> Tuple[bool, float]:
+        params = self._params(key, user_id, interface_name, max_messages, window_seconds, trainer_fraction, is_trainer)
+        if params is None:
+            return True, 0.0
+        bucket, emission, window = params
+        if math.isinf(emission):
+            return False, window
+        return self._select_backend().update(bucket, time.time(), emission, window, consume)
 
-        if len(dq) < quota:
-            if consume:
-                dq.append(now)
-            return True
-        return False
+    async def check_async(self, key, user_id, interface_name, max_messages, window_seconds, trainer_fraction,
+                          consume: bool = True, is_trainer: Optional[bool] = None) -> Tuple[bool, float]:
+        params = self._params(key, user_id, interface_name, max_messages, window_seconds, trainer_fraction, is_trainer)
+        if params is None:
+            return True, 0.0
+        bucket, emission, window = params
+        if math.isinf(emission):
+            return False, window
+        backend = self._select_backend()
+        allowed, retry_after = await backend.update_async(bucket, time.time(), emission, window, consume)
+        if not allowed:
+            log_debug(f"[rate_limit] {bucket} over quota, retry in {retry_after:.1f}s")
+        return allowed, retry_after
+
+    def is_allowed(self, key: str, user_id: Union[int, str], interface_name: str, max_messages: int, window_seconds: int, trainer_fraction: float, consume: bool = True) -> bool:
+        return self.check(key, user_id, interface_name, max_messages, window_seconds, trainer_fraction, consume)[0]
 
 
 _limiter = _RateLimiter()
@@ -36,3 +223,27 @@ def is_allowed(key: str, user_id: Union[int, str], interface_name: str, max_mess
     """Check if a message from ``user_id`` is allowed."""
     return _limiter.is_allowed(key, user_id, interface_name, max_messages, window_seconds, trainer_fraction, consume)
 
+
+async def check(
+    key: str,
+    user_id: Union[int, str],
+    interface_name: str,
+    max_messages: int,
+    window_seconds: int,
+    trainer_fraction: float,
+    consume: bool = True,
+    is_trainer: Optional[bool] = None,
+) -> Tuple[bool, float]:
+    """Check a message against the configured backend.
+
+    Returns ``(allowed, retry_after)`` where ``retry_after`` is the number of
+    seconds until the message would be accepted. Pass ``is_trainer`` when the
+    caller already knows it to skip the registry lookup.
+    """
+    return await _limiter.check_async(
+        key, user_id, interface_name, max_messages, window_seconds, trainer_fraction, consume, is_trainer
+    )
+
+
+def get_stats() -> dict:
+    return {"backend": _limiter._backend_name, "local_buckets": len(_limiter.memory)}
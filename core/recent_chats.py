@@ -1,9 +1,14 @@
-from core.db import get_conn
+import asyncio
+import atexit
+import os
+import threading
+from core.db import acquire, safe_db_execute
 from core.db import ensure_core_tables
 import aiomysql
 import time
 import re
 from core.logging_utils import log_debug, log_info, log_warning, log_error
+from core.config_manager import config_registry
 import json
 from pathlib import Path
 from core.interfaces_registry import get_interface_registry
@@ -15,15 +20,96 @@ _metadata = {}
 chat_path_map = {}
 
 _CHAT_MAP_PATH = Path(__file__).with_name("chat_paths.json")
+# Coalesce bursts of chat path changes into one file write
+CHAT_PATH_SAVE_DELAY = 1.0
 
-def _save_chat_paths():
+RECENT_CHATS_FLUSH_INTERVAL = config_registry.get_var(
+    "RECENT_CHATS_FLUSH_INTERVAL",
+    5,
+    value_type=int,
+    label="Recent Chats Flush Interval",
+    description=(
+        "Seconds between writes of chat activity to the database. Activity is "
+        "tracked in memory and flushed as one batch; pending updates are also "
+        "written at shutdown."
+    ),
+    group="core",
+    component="recent_chats",
+    advanced=True,
+)
+
+# In-memory activity table: chat_id (as stored in the DB) -> last_active
+_activity: dict[str, float] = {}
+# Updates not yet written to the database, coalesced per chat
+_pending: dict[str, float] = {}
+_seeded = False
+_flush_task: asyncio.Task | None = None
+
+_path_lock = threading.Lock()
+# Serializes file writes so the timer and flush_chat_paths never share the .tmp file
+_path_write_lock = threading.Lock()
+_path_timer: threading.Timer | None = None
+_paths_dirty = False
+
+
+def _write_chat_paths(data: dict) -> None:
+    tmp = _CHAT_MAP_PATH.with_name(_CHAT_MAP_PATH.name + ".tmp")
     try:
-        with _CHAT_MAP_PATH.open("w", encoding="utf-8") as f:
-            json.dump(chat_path_map, f)
-        log_debug(f"[recent_chats] Saved chat path map with {len(chat_path_map)} entries")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, _CHAT_MAP_PATH)
+        log_debug(f"[recent_chats] Saved chat path map with {len(data)} entries")
     except Exception as e:  # pragma: no cover - best effort
         log_warning(f"[recent_chats] Failed to save chat path map: {e}")
 
+
+def _save_chat_paths():
+    """Write the chat path map atomically (temp file + rename).
+
+    Changes made while writing are picked up by another pass before the
+    pending timer is released, so none of them waits for the next change.
+    """
+    global _paths_dirty, _path_timer
+    with _path_write_lock:
+        while True:
+            with _path_lock:
+                if not _paths_dirty:
+                    if _path_timer is threading.current_thread():
+                        _path_timer = None
+                    return
+                data = {str(k): v for k, v in chat_path_map.items()}
+                _paths_dirty = False
+            _write_chat_paths(data)
+
+
+def _schedule_chat_path_save():
+    """Save the chat path map shortly, once for a burst of changes."""
+    global _path_timer, _paths_dirty
+    with _path_lock:
+        _paths_dirty = True
+        # A pending timer re-checks the dirty flag before it lets go
+        if _path_timer is not None:
+            return
+        # Engines change paths from their own threads, so use a timer thread
+        _path_timer = threading.Timer(CHAT_PATH_SAVE_DELAY, _save_chat_paths)
+        _path_timer.daemon = True
+        _path_timer.start()
+
+
+def flush_chat_paths():
+    """Write pending chat path changes now."""
+    global _path_timer
+    with _path_lock:
+        timer, _path_timer = _path_timer, None
+    if timer is not None:
+        timer.cancel()
+    _save_chat_paths()
+
+
+atexit.register(flush_chat_paths)
+
 if _CHAT_MAP_PATH.exists():
     try:
         with _CHAT_MAP_PATH.open("r", encoding="utf-8") as f:
@@ -34,74 +120,168 @@ if _CHAT_MAP_PATH.exists():
     except Exception as e:  # pragma: no cover - best effort
         log_warning(f"[recent_chats] Failed to load chat path map: {e}")
 
+
+def _remember_activity(chat_id: str, last_active: float) -> None:
+    if last_active > _activity.get(chat_id, 0.0):
+        _activity[chat_id] = last_active
+    if len(_activity) > MAX_ENTRIES * 2:
+        # Keep the most recent chats; older ones are still in the database
+        keep = sorted(_activity.items(), key=lambda kv: kv[1], reverse=True)[:MAX_ENTRIES]
+        _activity.clear()
+        _activity.update(keep)
+
+
+def _ensure_flusher() -> None:
+    global _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        return
+    try:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_loop())
+    except RuntimeError:
+        pass
+
+
+async def _flush_loop() -> None:
+    try:
+        while True:
+            await asyncio.sleep(max(1, int(RECENT_CHATS_FLUSH_INTERVAL)))
+            await flush_activity()
+    except asyncio.CancelledError:
+        # Shutdown: write whatever is still pending
+        await flush_activity()
+        raise
+
+
+async def _ensure_recent_chats_table():
+    from plugins.recent_chats import init_recent_chats_table
+
+    await init_recent_chats_table()
+
+
+async def flush_activity() -> int:
+    """Write coalesced activity updates in one multi-row upsert."""
+    global _pending
+    if not _pending:
+        return 0
+    batch, _pending = _pending, {}
+    rows = list(batch.items())
+    try:
+        await ensure_core_tables()
+        async with acquire() as conn:
+            async with conn.cursor() as cur:
+                placeholders = ", ".join(["(%s, %s)"] * len(rows))
+                params = [value for row in rows for value in row]
+                await safe_db_execute(
+                    cur,
+                    f"""
+                    INSERT INTO recent_chats (chat_id, last_active)
+                    VALUES {placeholders}
+                    ON DUPLICATE KEY UPDATE last_active = GREATEST(last_active, VALUES(last_active))
+                    """,
+                    params,
+                    ensure_fn=_ensure_recent_chats_table,
+                )
+                await conn.commit()
+    except Exception as e:
+        # Put the batch back, keeping any newer activity recorded meanwhile
+        for chat_id, last_active in rows:
+            if last_active > _pending.get(chat_id, 0.0):
+                _pending[chat_id] = last_active
+        log_warning(f"[recent_chats] Failed to flush {len(rows)} chat activity update(s): {e}")
+        return 0
+    log_debug(f"[recent_chats] Flushed activity for {len(rows)} chat(s)")
+    return len(rows)
+
+
+async def shutdown() -> None:
+    """Stop the background flusher and write everything still pending."""
+    global _flush_task
+    task, _flush_task = _flush_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # The task may have been cancelled before it ever ran
+    await flush_activity()
+    flush_chat_paths()
+
+
 async def track_chat(chat_id: Union[int, str], interface_name: str, metadata=None):
-    await ensure_core_tables()
+    """Record activity for ``chat_id``; the database is updated in batches."""
+    # Convert chat_id to string to handle both int and str uniformly
+    chat_id_str = str(chat_id)
     now = time.time()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            # Convert chat_id to string to handle both int and str uniformly
-            chat_id_str = str(chat_id)
-            await cur.execute(
-                """
-                INSERT INTO recent_chats (chat_id, last_active)
-                VALUES (%s, %s)
-                ON DUPLICATE KEY UPDATE last_active = VALUES(last_active)
-                """,
-                (chat_id_str, now),
-            )
-            await conn.commit()
-    finally:
-        conn.close()
+    _remember_activity(chat_id_str, now)
+    _pending[chat_id_str] = now
+    _ensure_flusher()
     if metadata:
-        _metadata[chat_id] = metadata
+        _metadata[chat_id_str] = metadata
 
-async def reset_chat(chat_id: Union[int, str], interface_name: str):
+async def reset_chat(chat_id: Union[int, str], interface_name: str = None):
     await ensure_core_tables()
-    conn = await get_conn()
-    try:
+    chat_id_str = str(chat_id)
+    _activity.pop(chat_id_str, None)
+    _pending.pop(chat_id_str, None)
+    async with acquire() as conn:
         async with conn.cursor() as cur:
-            chat_id_str = str(chat_id)
             await cur.execute("DELETE FROM recent_chats WHERE chat_id = %s", (chat_id_str,))
             await conn.commit()
-    finally:
-        conn.close()
-    _metadata.pop(chat_id, None)
-    if chat_path_map.pop(chat_id, None) is not None:
-        _save_chat_paths()
+    _metadata.pop(chat_id_str, None)
+    with _path_lock:
+        removed = chat_path_map.pop(chat_id, None)
+    if removed is not None:
+        _schedule_chat_path_save()
 
 def set_chat_path(chat_id: Union[int, str], chat_path: str) -> None:
-    chat_path_map[chat_id] = chat_path
-    _save_chat_paths()
+    with _path_lock:
+        if chat_path_map.get(chat_id) == chat_path:
+            return
+        chat_path_map[chat_id] = chat_path
+    _schedule_chat_path_save()
 
 def get_chat_path(chat_id: Union[int, str]) -> str | None:
     return chat_path_map.get(chat_id)
 
 def clear_chat_path(chat_id: Union[int, str]) -> None:
     """Remove chat path mapping for the given chat_id."""
-    if chat_id in chat_path_map:
-        del chat_path_map[chat_id]
-        _save_chat_paths()
+    with _path_lock:
+        removed = chat_path_map.pop(chat_id, None)
+    if removed is not None:
+        _schedule_chat_path_save()
         log_info(f"[recent_chats] Cleared chat path for chat_id: {chat_id}")
     else:
         log_debug(f"[recent_chats] No chat path found for chat_id: {chat_id}")
 
-async def get_last_active_chats(n=10):
-    conn = await get_conn()
+async def _seed_activity() -> None:
+    """Load the most recent chats from the database once per process."""
+    global _seeded
     try:
-        async with conn.cursor(aiomysql.DictCursor) as cur:
-            await cur.execute(
-                """
-                SELECT chat_id FROM recent_chats
-                ORDER BY last_active DESC
-                LIMIT %s
-                """,
-                (n,),
-            )
-            rows = await cur.fetchall()
-            return [row["chat_id"] for row in rows]
-    finally:
-        conn.close()
+        async with acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(
+                    """
+                    SELECT chat_id, last_active FROM recent_chats
+                    ORDER BY last_active DESC
+                    LIMIT %s
+                    """,
+                    (MAX_ENTRIES,),
+                )
+                rows = await cur.fetchall()
+    except Exception as e:
+        log_warning(f"[recent_chats] Could not load recent chats: {e}")
+        return
+    for row in rows:
+        _remember_activity(str(row["chat_id"]), float(row["last_active"]))
+    _seeded = True
+
+async def get_last_active_chats(n=10):
+    """Return the ids of the ``n`` most recently active chats, newest first."""
+    if not _seeded:
+        await _seed_activity()
+    ordered = sorted(_activity.items(), key=lambda kv: kv[1], reverse=True)
+    return [chat_id for chat_id, _ in ordered[:n]]
 
 def format_chat_entry_generic(chat_id: Union[int, str], chat_name: Optional[str] = None):
     """Generic format for chat entries."""
@@ -0,0 +1,171 @@
+# core/reply_stream.py
+"""Forward replies to interfaces while the LLM is still writing them.
+
+Browser-driven engines see a reply grow on the page long before it is
+complete. An interface that can show partial text (the Ollama-compatible
+server, the WebUI) subscribes to its chats here. An engine calls
+:meth:`ReplyStream.begin` when it sends a prompt and feeds the returned
+sink with snapshots of the reply text.
+
+A reply is the JSON the action parser receives, not text for the user.
+For every snapshot the stream takes the ``text`` of the first
+``message_<interface>`` action, decodes as much of it as has arrived,
+and passes the part not delivered before to the subscriber. Actions are
+still parsed and run on the final text. The interface receives that text
+through ``send_message`` as usual and drops the prefix it already
+streamed.
+
+While the corrector regenerates a malformed reply the chat is paused
+(:meth:`ReplyStream.pause`): the regenerated text must not be appended to
+the preview the interface already shows.
+"""
+
+import asyncio
+import re
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from core.logging_utils import log_debug
+
+_TYPE_KEY = re.compile(r'"type"\s*:\s*"([^"\\]*)"')
+_TEXT_KEY = re.compile(r'"text"\s*:\s*"')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _decode_partial(raw: str, start: int) -> str:
+    """Decode the JSON string starting at ``start`` up to its end or the end of ``raw``."""
+    out = []
+    i, n = start, len(raw)
+    while i < n:
+        ch = raw[i]
+        if ch == '"':
+            break
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= n:
+            break
+        escape = raw[i + 1]
+        if escape == "u":
+            code = raw[i + 2:i + 6]
+            if len(code) < 4:
+                break
+            try:
+                out.append(chr(int(code, 16)))
+            except ValueError:
+                break
+            i += 6
+            continue
+        out.append(_ESCAPES.get(escape, escape))
+        i += 2
+    if out and "\ud800" <= out[-1] <= "\udbff":
+        # First half of a surrogate pair; wait for the second
+        out.pop()
+    return "".join(out).encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+
+def partial_action_text(raw: str, action_type: str) -> str:
+    """Text of the first ``action_type`` action in a reply that may still be incomplete."""
+    for match in _TYPE_KEY.finditer(raw):
+        if match.group(1) == action_type:
+            break
+    else:
+        return ""
+    text_key = _TEXT_KEY.search(raw, match.end())
+    if text_key is None:
+        return ""
+    return _decode_partial(raw, text_key.end())
+
+
+class _Subscription:
+    __slots__ = ("key", "loop", "callback", "action_type", "raw", "text")
+
+    def __init__(
+        self,
+        key: Tuple[str, str],
+        loop: asyncio.AbstractEventLoop,
+        callback: Callable[[str], None],
+        action_type: str,
+    ):
+        self.key = key
+        self.loop = loop
+        self.callback = callback
+        self.action_type = action_type
+        self.raw = ""
+        self.text = ""
+
+
+class ReplyStream:
+    """Subscriptions of interfaces to the replies of their chats."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[Tuple[str, str], _Subscription] = {}
+        # Chats whose previews are stopped, with the number of pauses held
+        self._paused: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, interface: str, chat_id, callback: Callable[[str], None]) -> None:
+        """Call ``callback(delta)`` with the text a reply to ``chat_id`` gains.
+
+        The callback runs on the event loop that subscribed, whichever
+        thread the engine feeds from. A later subscription for the same
+        chat replaces this one.
+        """
+        key = (interface, str(chat_id))
+        subscription = _Subscription(key, asyncio.get_running_loop(), callback, f"message_{interface}")
+        with self._lock:
+            self._subscriptions[key] = subscription
+
+    def unsubscribe(self, interface: str, chat_id) -> None:
+        with self._lock:
+            self._subscriptions.pop((interface, str(chat_id)), None)
+
+    def begin(self, interface: str, chat_id) -> Optional[Callable[[str], None]]:
+        """Start a reply to ``chat_id``.
+
+        Returns the sink to feed with snapshots of the reply text, or
+        ``None`` when nobody listens so the engine can skip reading them.
+        """
+        with self._lock:
+            if str(chat_id) in self._paused:
+                return None
+            subscription = self._subscriptions.get((interface, str(chat_id)))
+        if subscription is None:
+            return None
+        subscription.raw = ""
+        subscription.text = ""
+        return lambda snapshot: self._feed(subscription, snapshot)
+
+    def pause(self, chat_id) -> None:
+        """Stop previews of ``chat_id`` on every interface until :meth:`resume`.
+
+        Snapshots of a reply already being fed are dropped and engines
+        get no sink for new replies. Pauses nest.
+        """
+        with self._lock:
+            self._paused[str(chat_id)] = self._paused.get(str(chat_id), 0) + 1
+
+    def resume(self, chat_id) -> None:
+        with self._lock:
+            count = self._paused.pop(str(chat_id), 0) - 1
+            if count > 0:
+                self._paused[str(chat_id)] = count
+
+    def _feed(self, subscription: _Subscription, snapshot: str) -> None:
+        if not snapshot or snapshot == subscription.raw or subscription.key[1] in self._paused:
+            return
+        subscription.raw = snapshot
+        text = partial_action_text(snapshot, subscription.action_type)
+        if len(text) <= len(subscription.text) or not text.startswith(subscription.text):
+            return
+        delta = text[len(subscription.text):]
+        subscription.text = text
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.callback, delta)
+        except RuntimeError as e:
+            # The subscriber's loop is gone
+            log_debug(f"[reply_stream] Dropped {len(delta)} chars: {e}")
+
+
+reply_stream = ReplyStream()
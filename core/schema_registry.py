@@ -0,0 +1,131 @@
+# core/schema_registry.py
+"""Process-wide record of table columns.
+
+Stores used to create their table and query ``INFORMATION_SCHEMA`` from a
+per-instance ``_ensure_table``, and many of them are created per message.
+The registry does that work once per table and process: the table is
+created, its columns read with a single query, missing columns added, and
+the result shared by every store. SQL that depends on the column set is
+built once and cached with :meth:`SchemaRegistry.statement`.
+
+Call :meth:`SchemaRegistry.invalidate` after changing a table outside the
+registry so the next caller introspects it again.
+"""
+
+import asyncio
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from core.logging_utils import log_debug, log_info, log_warning
+
+_COLUMNS_QUERY = """
+    SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+
+class SchemaRegistry:
+    """Known columns and cached statements per table."""
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, FrozenSet[str]] = {}
+        self._statements: Dict[Tuple[str, object], str] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+
+    def _lock(self, table: str) -> asyncio.Lock:
+        # asyncio locks belong to one loop; engine threads run their own
+        key = (table, id(asyncio.get_running_loop()))
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def columns(self, table: str) -> Optional[FrozenSet[str]]:
+        """Columns of ``table`` if it has been ensured, else ``None``."""
+        return self._columns.get(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self._columns.get(table, ())
+
+    async def ensure_table(
+        self,
+        table: str,
+        create_sql: Optional[str] = None,
+        columns: Iterable[Tuple[str, str]] = (),
+    ) -> FrozenSet[str]:
+        """Create ``table`` and add missing ``(name, definition)`` columns once.
+
+        Later calls return the cached column set without touching the
+        database. Extra columns can be requested later by another store;
+        only those not yet known trigger an ``ALTER TABLE``.
+        """
+        columns = list(columns)
+        known = self._columns.get(table)
+        if known is not None and all(name in known for name, _ in columns):
+            return known
+
+        async with self._lock(table):
+            known = self._columns.get(table)
+            if known is not None and all(name in known for name, _ in columns):
+                return known
+
+            from core.db import acquire
+
+            async with acquire() as conn:
+                async with conn.cursor() as cursor:
+                    if known is None:
+                        if create_sql:
+                            await cursor.execute(create_sql)
+                        await cursor.execute(_COLUMNS_QUERY, (table,))
+                        known = frozenset(row[0] for row in await cursor.fetchall())
+                        if not known:
+                            # Table missing and nothing to create it with yet
+                            return known
+
+                    added = set()
+                    for name, definition in columns:
+                        if name in known:
+                            continue
+                        try:
+                            await cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                            added.add(name)
+                            log_info(f"[schema] Added column {table}.{name}")
+                        except Exception as e:
+                            # Not fatal: stores check has_column() before using it
+                            log_warning(f"[schema] Could not add column {table}.{name}: {e}")
+                    await conn.commit()
+
+            known = known | added
+            self._columns[table] = known
+            self._drop_statements(table)
+            log_debug(f"[schema] {table}: {sorted(known)}")
+            return known
+
+    async def ensure_column(self, table: str, column: str, definition: str) -> bool:
+        """Make sure one column exists; return whether it does."""
+        known = await self.ensure_table(table, columns=[(column, definition)])
+        return column in known
+
+    def statement(self, table: str, key: object, build: Callable[[FrozenSet[str]], str]) -> str:
+        """Return the SQL ``build(columns)`` produced for ``key``, building it once."""
+        cache_key = (table, key)
+        sql = self._statements.get(cache_key)
+        if sql is None:
+            sql = build(self._columns.get(table, frozenset()))
+            self._statements[cache_key] = sql
+        return sql
+
+    def _drop_statements(self, table: str) -> None:
+        for cache_key in [k for k in self._statements if k[0] == table]:
+            del self._statements[cache_key]
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Forget what is known about ``table`` (or all tables)."""
+        if table is None:
+            self._columns.clear()
+            self._statements.clear()
+        else:
+            self._columns.pop(table, None)
+            self._drop_statements(table)
+
+
+schema_registry = SchemaRegistry()
@@ -0,0 +1,166 @@
+# core/tab_pool.py
+"""Browser tabs shared between conversations of a Selenium engine.
+
+A Selenium engine drives one logged-in browser. Instead of funnelling every
+conversation through a single tab, the engine leases a tab per chatlink
+conversation from a :class:`TabPool`. A tab stays pinned to its
+conversation while busy and keeps the pin afterwards, so the next message
+of the same chat finds its page already open. When every tab is busy new
+conversations wait; when the pool is full, the least recently used idle
+tab is reassigned.
+
+The pool only does the bookkeeping. Opening, focusing and closing windows
+is left to the engine, which does it on its browser worker thread.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+from core.config_manager import config_registry
+from core.logging_utils import log_debug
+
+SELENIUM_TAB_POOL_SIZE = config_registry.get_var(
+    "SELENIUM_TAB_POOL_SIZE",
+    1,
+    value_type=int,
+    label="Selenium Tab Pool Size",
+    description=(
+        "Browser tabs a Selenium engine may use at once. Each busy tab serves one "
+        "conversation, so up to this many chats generate replies in parallel."
+    ),
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+SELENIUM_TAB_MAX_USES = config_registry.get_var(
+    "SELENIUM_TAB_MAX_USES",
+    100,
+    value_type=int,
+    label="Selenium Tab Recycle After",
+    description="Close and reopen a browser tab after it has served this many prompts.",
+    group="llm",
+    component="selenium",
+    advanced=True,
+)
+
+
+class Tab:
+    """One browser tab; ``handle`` is set by the engine when the window exists."""
+
+    __slots__ = ("handle", "key", "busy", "uses", "last_used")
+
+    def __init__(self):
+        self.handle: Optional[str] = None
+        self.key: Optional[Hashable] = None
+        self.busy = False
+        self.uses = 0
+        self.last_used = 0.0
+
+    def __repr__(self) -> str:
+        return f"Tab(handle={self.handle!r}, key={self.key!r}, busy={self.busy})"
+
+
+class TabPool:
+    """Lease tabs to conversations, at most ``size`` at a time."""
+
+    def __init__(self, size: Optional[int] = None, max_uses: Optional[int] = None):
+        self._size = size
+        self._max_uses = max_uses
+        self._tabs: List[Tab] = []
+        self._changed: Optional[asyncio.Condition] = None
+        self._waiting = 0
+
+    @property
+    def size(self) -> int:
+        size = self._size if self._size is not None else int(SELENIUM_TAB_POOL_SIZE)
+        return max(1, size)
+
+    @property
+    def max_uses(self) -> int:
+        max_uses = self._max_uses if self._max_uses is not None else int(SELENIUM_TAB_MAX_USES)
+        return max(1, max_uses)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _pick(self, key: Hashable) -> Optional[Tab]:
+        for tab in self._tabs:
+            if tab.key == key:
+                # The conversation's own tab; wait for it rather than open a second one
+                return None if tab.busy else tab
+        if len(self._tabs) < self.size:
+            tab = Tab()
+            self._tabs.append(tab)
+            return tab
+        idle = [tab for tab in self._tabs if not tab.busy]
+        if not idle:
+            return None
+        return min(idle, key=lambda tab: tab.last_used)
+
+    async def acquire(self, key: Hashable) -> Tab:
+        """Wait for a tab for conversation ``key`` and mark it busy."""
+        changed = self._condition()
+        async with changed:
+            self._waiting += 1
+            try:
+                tab = self._pick(key)
+                while tab is None:
+                    await changed.wait()
+                    tab = self._pick(key)
+            finally:
+                self._waiting -= 1
+            if tab.key is not None and tab.key != key:
+                log_debug(f"[tab_pool] Tab {tab.handle} reassigned from {tab.key} to {key}")
+            tab.key = key
+            tab.busy = True
+            return tab
+
+    async def release(self, tab: Tab, ok: bool = True) -> bool:
+        """Return ``tab`` to the pool.
+
+        Returns ``True`` when the tab was dropped and the caller should close
+        its window: after a failed prompt, after ``max_uses`` prompts, or
+        when the pool was shrunk.
+        """
+        changed = self._condition()
+        async with changed:
+            tab.busy = False
+            tab.uses += 1
+            tab.last_used = time.monotonic()
+            recycle = not ok or tab.uses >= self.max_uses or len(self._tabs) > self.size
+            if recycle:
+                self.remove(tab)
+            changed.notify_all()
+        return recycle
+
+    def pinned(self, key: Hashable) -> Optional[Tab]:
+        """The tab pinned to conversation ``key``, busy or not."""
+        for tab in self._tabs:
+            if tab.key == key:
+                return tab
+        return None
+
+    def remove(self, tab: Tab) -> None:
+        if tab in self._tabs:
+            self._tabs.remove(tab)
+
+    def handles(self) -> List[str]:
+        """Window handles currently owned by a tab."""
+        return [tab.handle for tab in self._tabs if tab.handle]
+
+    def reset(self) -> None:
+        """Forget every window, e.g. after the browser was restarted."""
+        for tab in self._tabs:
+            tab.handle = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "tabs": len(self._tabs),
+            "busy": sum(1 for tab in self._tabs if tab.busy),
+            "waiting": self._waiting,
+        }
@@ -5,9 +5,12 @@ import json
 import re
 import asyncio
 import contextvars
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 from types import SimpleNamespace
-from core.logging_utils import log_debug, log_warning, log_error, log_info
+from core.logging_utils import is_debug_enabled, log_debug, log_warning, log_error, log_info
+from core.llm_reply import LLMReply
 
 # Interface-specific utilities are loaded dynamically by interfaces.
 # The transport layer provides generic messaging functionality only.
@@ -40,7 +43,7 @@ def _cleanup_expired_system_replies():
     ]
     for chat_id in expired_keys:
         del _EXPECTING_SYSTEM_REPLY[chat_id]
-        log_debug(f"[transport] Removed expired system reply expectation for chat_id={chat_id} (timeout={timeout}s)")
+        log_debug("[transport] Removed expired system reply expectation for chat_id=%s (timeout=%ss)", chat_id, timeout)
 
 
 def _add_system_reply_expectation(chat_id: str):
@@ -75,12 +78,164 @@ def _format_json_error(text: str, err: json.JSONDecodeError) -> str:
     )
 
 
+# Memo of recent extraction results keyed by reply text. Only the location of
+# the JSON span and the metadata are stored; hits re-decode that exact span so
+# every caller still receives its own fresh objects.
+_EXTRACT_CACHE: "OrderedDict[str, tuple[Optional[tuple[int, int]], dict]]" = OrderedDict()
+_EXTRACT_CACHE_SIZE = 32
+_EXTRACT_CACHE_LOCK = threading.Lock()
+_JSON_DECODER = json.JSONDecoder()
+
+
+_JSON_STRUCT_RE = re.compile(r'[{}\[\]"]')
+_JSON_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_CLOSERS = {"}": "{", "]": "["}
+
+
+def _pair_brackets(text: str, start: int, hi: int, closers: dict[int, int], stop_when_closed: bool = False) -> None:
+    """Record the closing index of every opener reached from ``start`` in ``closers``.
+
+    Openers that can never be closed are recorded as ``-1``. String literals
+    are only tracked inside brackets, so quotes in surrounding prose do not
+    matter. For every opener recorded here the result is exactly what a scan
+    starting at that opener would produce, which means a JSON value opened
+    there can only end at its recorded closer. Openers that fall inside a
+    string literal are not recorded; they need their own scan.
+    """
+    stack: list[int] = []
+    pos = start
+    while True:
+        m = _JSON_STRUCT_RE.search(text, pos, hi)
+        if m is None:
+            break
+        i = m.start()
+        ch = text[i]
+        pos = i + 1
+        if ch == '"':
+            if not stack:
+                continue
+            tail = _JSON_STRING_TAIL_RE.match(text, pos, hi)
+            if tail is None:
+                # Unterminated string: nothing still open can close
+                for opener in stack:
+                    closers[opener] = -1
+                stack.clear()
+                if stop_when_closed:
+                    return
+                continue
+            pos = tail.end()
+        elif ch == "{" or ch == "[":
+            stack.append(i)
+        elif stack:
+            if text[stack[-1]] == _CLOSERS[ch]:
+                closers[stack.pop()] = i
+            else:
+                # Mismatched closer ends every open value as invalid
+                for opener in stack:
+                    closers[opener] = -1
+                stack.clear()
+            if stop_when_closed and not stack:
+                return
+    for opener in stack:
+        closers[opener] = -1
+
+
+def _note_extra_text(text: str, lo: int, hi: int, start: int, end: int, kind: str, metadata: dict) -> None:
+    """Record prose around a decoded span in ``metadata``."""
+    prefix = text[lo:start].strip()
+    suffix = text[end:hi].strip()
+    if prefix or suffix:
+        metadata['had_extra_text'] = True
+        log_info(f"[extract_json_from_text] ✅ Extracted {kind} from text with extra content (prefix: {len(prefix)} chars, suffix: {len(suffix)} chars)")
+        if prefix:
+            log_debug("[extract_json_from_text] Prefix text: %s...", prefix[:100])
+        if suffix:
+            log_debug("[extract_json_from_text] Suffix text: %s...", suffix[:100])
+        # Check if suffix looks like it could be corrupted JSON
+        if suffix and ('{' in suffix or '"type"' in suffix or '"actions"' in suffix):
+            metadata['unparsed_content'] = suffix
+            metadata['recovered'] = True
+            log_warning(f"[extract_json_from_text] ⚠️ Corrupted JSON detected - unparsed content contains JSON-like structures")
+
+
+def _locate_json(text: str, lo: int, hi: int, metadata: dict) -> tuple[Optional[tuple[int, int]], Any]:
+    """Find the first decodable JSON value in ``text[lo:hi]``.
+
+    One pass pairs the brackets; each candidate is then decoded only over its
+    own bracketed region, and candidates that cannot close are counted as
+    failures without decoding. Returns the ``(start, end)`` span and the
+    decoded value, or ``(None, None)``.
+    """
+    if text.find('{', lo, hi) == -1:
+        # Arrays are only considered when the reply contains an object brace
+        log_debug("[extract_json_from_text] No starting braces found in text variant")
+        return None, None
+
+    closers: dict[int, int] = {}
+    _pair_brackets(text, lo, hi, closers)
+
+    # Objects take precedence over arrays; the first value that decodes wins
+    for opener, kind in (("{", "JSON"), ("[", "JSON array")):
+        found: Optional[tuple[int, int, Any]] = None
+        start = text.find(opener, lo, hi)
+        while start != -1:
+            if start not in closers:
+                # Sits inside a string literal of an enclosing region that
+                # failed to decode, so pair it on its own
+                _pair_brackets(text, start, hi, closers, stop_when_closed=True)
+            close = closers[start]
+            if close != -1:
+                try:
+                    obj, end = _JSON_DECODER.raw_decode(text[start:close + 1])
+                    found = (start, start + end, obj)
+                    break
+                except json.JSONDecodeError as e:
+                    log_debug("[extract_json_from_text] JSON decode error at position %s: %s", start - lo, e)
+            else:
+                log_debug("[extract_json_from_text] Unclosed %s at position %s", opener, start - lo)
+            metadata['had_errors'] = True
+            metadata['error_count'] += 1
+            start = text.find(opener, start + 1, hi)
+        if found is None:
+            continue
+        _note_extra_text(text, lo, hi, found[0], found[1], kind, metadata)
+        log_debug("[extract_json_from_text] Found valid %s: %s", kind, type(found[2]))
+        if found[2]:
+            return (found[0], found[1]), found[2]
+        # Empty containers end this pass without being returned, matching the old scan
+    return None, None
+
+
+def _strip_code_fence(text: str) -> tuple[int, int]:
+    """Return ``(lo, hi)`` bounds of ``text`` without whitespace and markdown fences."""
+    lo, hi = 0, len(text)
+    while lo < hi and text[lo].isspace():
+        lo += 1
+    while hi > lo and text[hi - 1].isspace():
+        hi -= 1
+    if text.startswith('```', lo):
+        lo += 7 if text.startswith('```json', lo) else 3
+        if hi - lo >= 3 and text.endswith('```', lo, hi):
+            hi -= 3
+        while lo < hi and text[lo].isspace():
+            lo += 1
+        while hi > lo and text[hi - 1].isspace():
+            hi -= 1
+    return lo, hi
+
+
 def extract_json_from_text(text: str, return_metadata: bool = False) -> Optional[Dict]:
     """Extract the first valid JSON object or array from text.
     
     This function is smart enough to extract JSON even when LLMs (like Gemini) 
     add extra text before or after the JSON structure. It scans the entire text
     looking for valid JSON objects or arrays, ignoring any surrounding text.
+
+    Brackets are paired in a single pass, so each candidate is decoded only
+    over its own region and unclosable openers are rejected without decoding;
+    the cost stays linear in the reply length. Results are memoized per reply
+    text: later pipeline stages that extract from the same reply reuse the
+    located span instead of rescanning.
     
     Args:
         text: The text to parse
@@ -108,117 +263,43 @@ def extract_json_from_text(text: str, return_metadata: bool = False) -> Optional
     
     if not text:
         return (None, metadata) if return_metadata else None
-    
-    # Try to clean up common markdown/formatting issues
-    cleaned_text = text.strip()
-    
-    # Remove markdown code blocks if present
-    if cleaned_text.startswith('```json'):
-        cleaned_text = cleaned_text[7:]  # Remove ```json
-        if cleaned_text.endswith('```'):
-            cleaned_text = cleaned_text[:-3]  # Remove ```
-        cleaned_text = cleaned_text.strip()
-    elif cleaned_text.startswith('```'):
-        cleaned_text = cleaned_text[3:]  # Remove ```
-        if cleaned_text.endswith('```'):
-            cleaned_text = cleaned_text[:-3]  # Remove ```
-        cleaned_text = cleaned_text.strip()
-    
-    # Also try original text in case cleaning broke something
-    texts_to_try = [cleaned_text, text.strip()]
-    
-    decoder = json.JSONDecoder()
-    found_json = None
-    
-    for text_variant in texts_to_try:
-        log_debug(f"[extract_json_from_text] Trying text variant (length: {len(text_variant)})")
-        
-        # Scan for JSON objects starting from each '{'
-        object_start_indices = [i for i, char in enumerate(text_variant) if char == '{']
-        if not object_start_indices:
-            log_debug("[extract_json_from_text] No starting braces found in text variant")
-            continue
-            
-        for start in object_start_indices:
-            try:
-                obj, obj_end = decoder.raw_decode(text_variant[start:])
-                obj_end += start
-                prefix = text_variant[:start].strip()
-                suffix = text_variant[obj_end:].strip()
-                if prefix or suffix:
-                    metadata['had_extra_text'] = True
-                    log_info(f"[extract_json_from_text] ✅ Extracted JSON from text with extra content (prefix: {len(prefix)} chars, suffix: {len(suffix)} chars)")
-                    if prefix:
-                        log_debug(f"[extract_json_from_text] Prefix text: {prefix[:100]}...")
-                    if suffix:
-                        log_debug(f"[extract_json_from_text] Suffix text: {suffix[:100]}...")
-                    # Check if suffix looks like it could be corrupted JSON
-                    if suffix and ('{' in suffix or '"type"' in suffix or '"actions"' in suffix):
-                        metadata['unparsed_content'] = suffix
-                        metadata['recovered'] = True
-                        log_warning(f"[extract_json_from_text] ⚠️ Corrupted JSON detected - unparsed content contains JSON-like structures")
-                # Return JSON even if there's extra content - actions can still be executed
-                log_debug(f"[extract_json_from_text] Found valid JSON object: {type(obj)}")
-                found_json = obj
-                break
-            except json.JSONDecodeError as e:
-                log_debug(f"[extract_json_from_text] JSON decode error at position {start}: {e}")
-                metadata['had_errors'] = True
-                metadata['error_count'] += 1
-                continue
-        
-        if found_json:
-            break
-            
-        # Scan for JSON arrays starting from each '['
-        array_start_indices = [i for i, char in enumerate(text_variant) if char == '[']
-        for start in array_start_indices:
-            try:
-                obj, obj_end = decoder.raw_decode(text_variant[start:])
-                obj_end += start
-                prefix = text_variant[:start].strip()
-                suffix = text_variant[obj_end:].strip()
-                if prefix or suffix:
-                    metadata['had_extra_text'] = True
-                    log_info(f"[extract_json_from_text] ✅ Extracted JSON array from text with extra content (prefix: {len(prefix)} chars, suffix: {len(suffix)} chars)")
-                    if prefix:
-                        log_debug(f"[extract_json_from_text] Prefix text: {prefix[:100]}...")
-                    if suffix:
-                        log_debug(f"[extract_json_from_text] Suffix text: {suffix[:100]}...")
-                    if suffix and ('{' in suffix or '"type"' in suffix or '"actions"' in suffix):
-                        metadata['unparsed_content'] = suffix
-                        metadata['recovered'] = True
-                        log_warning(f"[extract_json_from_text] ⚠️ Corrupted JSON detected - unparsed content contains JSON-like structures")
-                # Return JSON even if there's extra content - actions can still be executed
-                log_debug(f"[extract_json_from_text] Found valid JSON array: {type(obj)}")
-                found_json = obj
-                break
-            except json.JSONDecodeError as e:
-                log_debug(f"[extract_json_from_text] JSON decode error at position {start}: {e}")
-                metadata['had_errors'] = True
-                metadata['error_count'] += 1
-                continue
-        
-        if found_json:
-            break
-    
-    if not found_json:
+
+    with _EXTRACT_CACHE_LOCK:
+        cached = _EXTRACT_CACHE.get(text)
+        if cached is not None:
+            _EXTRACT_CACHE.move_to_end(text)
+    if cached is not None:
+        span, cached_metadata = cached
+        metadata = dict(cached_metadata)
+        found_json = _JSON_DECODER.raw_decode(text, span[0])[0] if span else None
+        return (found_json, metadata) if return_metadata else found_json
+
+    # Markdown fences and surrounding whitespace are skipped through bounds
+    # rather than by slicing. Fence markers contain no brackets, so scanning
+    # the unfenced text as a second variant could never find anything new.
+    lo, hi = _strip_code_fence(text)
+    log_debug("[extract_json_from_text] Trying text variant (length: %s)", hi - lo)
+    # Return JSON even if there's extra content - actions can still be executed
+    span, found_json = _locate_json(text, lo, hi, metadata)
+    if not span:
         log_debug("[extract_json_from_text] No valid JSON found in text")
-        log_debug(f"[extract_json_from_text] Text content (first 500 chars): {text[:500]}")
-        log_debug(f"[extract_json_from_text] Text content (last 500 chars): {text[-500:]}")
-        return (None, metadata) if return_metadata else None
-    
+        log_debug("[extract_json_from_text] Text content (first 500 chars): %s", text[:500])
+        log_debug("[extract_json_from_text] Text content (last 500 chars): %s", text[-500:])
+
     # If we had errors but found JSON, it means we recovered from corruption
-    if metadata['had_errors'] and found_json:
+    if metadata['had_errors'] and span:
         metadata['recovered'] = True
         log_warning(f"[extract_json_from_text] ⚠️ JSON recovered after {metadata['error_count']} parsing errors - may be incomplete")
-    
-    return (found_json, metadata) if return_metadata else found_json
 
+    with _EXTRACT_CACHE_LOCK:
+        _EXTRACT_CACHE[text] = (span, dict(metadata))
+        while len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE:
+            _EXTRACT_CACHE.popitem(last=False)
 
+    return (found_json, metadata) if return_metadata else found_json
 
 
-async def universal_send(interface_send_func, *args, text: str = None, **kwargs):
+async def universal_send(interface_send_func, *args, text: str = None, reply: Optional[LLMReply] = None, **kwargs):
     """
     Universal send function that intercepts JSON actions and parses them.
     
@@ -226,17 +307,21 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
         interface_send_func: The actual send function of the interface (e.g., bot.send_message)
         *args: Positional arguments for the interface send function
         text: The text to send (required parameter)
+        reply: Envelope already built for ``text`` upstream; reused instead of re-parsing
         **kwargs: Additional keyword arguments for the interface send function
     """
     if text is None:
         text = ""
+    if reply is None or reply.text != text:
+        reply = LLMReply(text, chat_id=kwargs.get('chat_id'), thread_id=kwargs.get('thread_id'))
 
     # Diagnostic: log interface function and runtime send parameters
-    try:
-        bot_self = getattr(interface_send_func, '__self__', None)
-        log_debug(f"[transport] universal_send called: interface_send_func={interface_send_func} bot_self={bot_self} args={args} kwargs_keys={list(kwargs.keys())}")
-    except Exception as _:
-        log_debug("[transport] universal_send diagnostic logging failed to inspect interface_send_func")
+    if is_debug_enabled():
+        try:
+            bot_self = getattr(interface_send_func, '__self__', None)
+            log_debug("[transport] universal_send called: interface_send_func=%s bot_self=%s args=%s kwargs_keys=%s", interface_send_func, bot_self, args, list(kwargs.keys()))
+        except Exception as _:
+            log_debug("[transport] universal_send diagnostic logging failed to inspect interface_send_func")
 
     # Log LLM response for debugging
     if text:
@@ -244,30 +329,20 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
         log_info(f"[transport] 🤖 LLM Response: {preview}")
     # Flow trace: record that transport received LLM output
     try:
-        log_debug(f"[flow] transport.received -> text_len={len(text)}")
+        log_debug("[flow] transport.received -> text_len=%s", len(text))
     except Exception:
         pass
 
-    # Extract JSON from text
-    json_data = extract_json_from_text(text)
+    # JSON is extracted once per reply by the envelope
+    json_data = reply.payload
     if json_data:
-        log_debug(f"[transport] Detected JSON data, parsing: {json_data}")
+        log_debug("[transport] Detected JSON data, parsing: %s", json_data)
         try:
-            log_debug(f"[flow] transport.detects_json -> will attempt run_actions")
-            # Handle new nested actions format
-            if isinstance(json_data, dict) and "actions" in json_data:
-                actions = json_data["actions"]
-                if not isinstance(actions, list):
-                    log_warning("[transport] actions field must be a list")
-                    return await interface_send_func(*args, text=text, **kwargs)
-            # Fallback to legacy array format
-            elif isinstance(json_data, list):
-                actions = json_data
-            # Fallback to legacy single action format
-            elif isinstance(json_data, dict) and "type" in json_data:
-                actions = [json_data]
-            else:
-                log_warning(f"[transport] Unrecognized JSON structure: {json_data}")
+            log_debug("[flow] transport.detects_json -> will attempt run_actions")
+            # Nested "actions", legacy array and legacy single action formats
+            actions = reply.actions
+            if actions is None:
+                log_warning(f"[transport] {reply.actions_error}")
                 return await interface_send_func(*args, text=text, **kwargs)
 
             bot = getattr(interface_send_func, '__self__', None) or (
@@ -279,7 +354,6 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                 return await interface_send_func(*args, text=text, **kwargs)
 
             # Create message context for actions
-            message = SimpleNamespace()
             chat_id_value = kwargs.get('chat_id') or (args[0] if args else None)
 
             # Accept int or numeric string chat IDs (some interfaces provide strings)
@@ -295,12 +369,8 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                     # Keep as string if coercion fails
                     pass
 
+            message = reply.as_message(from_llm=False)
             message.chat_id = chat_id_value
-            message.text = ""
-            message.original_text = text
-            message.thread_id = kwargs.get('thread_id')
-            from datetime import datetime
-            message.date = datetime.utcnow()
 
             # Use centralized action system for all action types.  The action
             # parser is optional, so import it lazily and fall back to sending
@@ -312,12 +382,12 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                 return await interface_send_func(*args, text=text, **kwargs)
 
             # Determine current interface from bot
-            current_interface = "unknown"  # default fallback
-            if hasattr(bot, 'get_interface_id'):
+            current_interface = reply.interface or "unknown"  # default fallback
+            if not reply.interface and hasattr(bot, 'get_interface_id'):
                 try:
                     current_interface = bot.get_interface_id()
                 except Exception as e:
-                    log_debug(f"[transport] Could not get interface_id from bot: {e}")
+                    log_debug("[transport] Could not get interface_id from bot: %s", e)
             
             context = {
                 "interface": current_interface,
@@ -340,7 +410,7 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                     current_interface_actions.append(action)
                 else:
                     cross_interface_actions.append(action)
-                    log_debug(f"[transport] Skipping cross-interface action {action_type} (current: {current_interface})")
+                    log_debug("[transport] Skipping cross-interface action %s (current: %s)", action_type, current_interface)
             
             if cross_interface_actions:
                 log_info(f"[transport] Filtered {len(cross_interface_actions)} cross-interface actions, processing {len(current_interface_actions)} for {current_interface}")
@@ -354,7 +424,7 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                     log_warning(f"[transport] Failed to process actions: {e}")
                     processed_actions = []
                 finally:
-                    log_debug(f"[flow] transport.after_run_actions -> processed_count={len(processed_actions)}")
+                    log_debug("[flow] transport.after_run_actions -> processed_count=%s", len(processed_actions))
 
                 log_info(
                     f"[transport] Processed {len(processed_actions)} unique JSON actions via plugin system"
@@ -362,7 +432,7 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
                 return
             else:
                 # No actions for current interface, send as plain text
-                log_debug(f"[transport] No actions for current interface {current_interface}, sending as plain text")
+                log_debug("[transport] No actions for current interface %s, sending as plain text", current_interface)
                 return await interface_send_func(*args, text=text, **kwargs)
 
         except Exception as e:
@@ -370,11 +440,11 @@ async def universal_send(interface_send_func, *args, text: str = None, **kwargs)
 
     # Non-JSON plain text — forward directly. Corrector is only run in llm_to_interface.
     if text and not text.startswith(("[ERROR]", "[WARNING]", "[INFO]", "[DEBUG]")):
-        log_debug(f"[flow] transport.non_json -> forwarding plain text (no in-line corrector) chat_id={kwargs.get('chat_id')}")
+        log_debug("[flow] transport.non_json -> forwarding plain text (no in-line corrector) chat_id=%s", kwargs.get('chat_id'))
         return await interface_send_func(*args, text=text, **kwargs)
 
     # Send as normal text
-    log_debug(f"[flow] transport.forward_plain -> calling interface_send_func for chat_id={kwargs.get('chat_id')}")
+    log_debug("[flow] transport.forward_plain -> calling interface_send_func for chat_id=%s", kwargs.get('chat_id'))
     return await interface_send_func(*args, text=text, **kwargs)
 
 
@@ -447,9 +517,9 @@ async def run_corrector_middleware(text: str, bot=None, context: dict = None, ch
             # Log plugin discovery
             try:
                 if llm_plugin is None:
-                    log_debug(f"[corrector_middleware] attempt {attempt}: no active LLM plugin found")
+                    log_debug("[corrector_middleware] attempt %s: no active LLM plugin found", attempt)
                 else:
-                    log_debug(f"[corrector_middleware] attempt {attempt}: using LLM plugin {getattr(llm_plugin, '__class__', llm_plugin)}")
+                    log_debug("[corrector_middleware] attempt %s: using LLM plugin %s", attempt, getattr(llm_plugin, '__class__', llm_plugin))
             except Exception:
                 pass
 
@@ -504,7 +574,7 @@ async def run_corrector_middleware(text: str, bot=None, context: dict = None, ch
             correction_message.from_user = None
             correction_message.chat = SimpleNamespace(id=correction_message.chat_id, type='private')
 
-            log_debug(f"[corrector_middleware] Requesting correction from LLM (attempt {attempt}/{max_retries})")
+            log_debug("[corrector_middleware] Requesting correction from LLM (attempt %s/%s)", attempt, max_retries)
 
             # Mark that we are expecting a system reply for this chat_id so llm_to_interface can
             # consume it without forwarding and avoid re-entry loops.
@@ -523,12 +593,12 @@ async def run_corrector_middleware(text: str, bot=None, context: dict = None, ch
 
             # Log corrected result type/length
             try:
-                log_debug(f"[corrector_middleware] LLM returned type={type(corrected)} len={(len(corrected) if isinstance(corrected, str) else 'N/A')}")
+                log_debug("[corrector_middleware] LLM returned type=%s len=%s", type(corrected), len(corrected) if isinstance(corrected, str) else 'N/A')
             except Exception:
                 pass
 
             if corrected and isinstance(corrected, str):
-                log_debug(f"[corrector_middleware] LLM returned text len={len(corrected)}")
+                log_debug("[corrector_middleware] LLM returned text len=%s", len(corrected))
                 # If corrected contains valid JSON, return it (do not echo to chat)
                 try:
                     if extract_json_from_text(corrected):
@@ -576,10 +646,8 @@ async def interface_to_llm(send_to_llm_func, *args, text: str = None, **kwargs):
     LLM-facing send function provided by a plugin. It does NOT run the
     corrector.
     """
-    try:
-        log_debug(f"[chain] interface_to_llm called -> send_to_llm_func={send_to_llm_func} kwargs_keys={list(kwargs.keys())}")
-    except Exception:
-        pass
+    if is_debug_enabled():
+        log_debug("[chain] interface_to_llm called -> send_to_llm_func=%s kwargs_keys=%s", send_to_llm_func, list(kwargs.keys()))
     return await send_to_llm_func(*args, text=text, **kwargs)
 
 
@@ -590,19 +658,22 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
     - Ensure a single LLM->interface path for all model outputs (centralized diagnostics)
     - Run the corrector middleware (with retries) only for LLM outputs that are non-empty
     - Forward the (possibly corrected) text into the transport via `universal_send`
+
+    The reply is wrapped once in an :class:`~core.llm_reply.LLMReply` that is
+    handed to every downstream stage, so it is parsed a single time.
     """
     if text is None:
         text = ""
 
-    # Extract chat_id for logging
-    chat_id = kwargs.get('chat_id')
-    if chat_id is None and args:
-        maybe = args[1] if len(args) > 1 else None
-        chat_id = maybe if isinstance(maybe, (int, str)) else None
+    reply = LLMReply.from_send_args(interface_send_func, args, kwargs, text)
+    chat_id = reply.chat_id
 
     try:
-        log_debug(f"[llm_to_interface] Delivering message to chat_id={chat_id}")
-        log_debug(f"[llm_to_interface] Message preview: {text[:100]}..." if len(str(text)) > 100 else f"[llm_to_interface] Message: {text}")
+        log_debug("[llm_to_interface] Delivering message to chat_id=%s", chat_id)
+        if len(str(text)) > 100:
+            log_debug("[llm_to_interface] Message preview: %s...", text[:100])
+        else:
+            log_debug("[llm_to_interface] Message: %s", text)
     except Exception:
         pass
 
@@ -610,7 +681,7 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
     _cleanup_expired_system_replies()
 
     try:
-        log_debug(f"[chain] llm_to_interface called -> interface_send_func={interface_send_func}")
+        log_debug("[chain] llm_to_interface called -> interface_send_func=%s", interface_send_func)
     except Exception:
         pass
 
@@ -630,54 +701,32 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
     # If the LLM sent a JSON-like payload that looks like a correction/system message,
     # handle it via the parser orchestrator to avoid echoing it back into the interfaces
     try:
-        json_payload = None
-        json_metadata = None
-        if text and text.strip():
-            try:
-                json_payload, json_metadata = extract_json_from_text(text, return_metadata=True)
-            except Exception:
-                json_payload = None
-                json_metadata = None
+        json_payload = reply.payload
+        json_metadata = reply.metadata
 
         # Check if JSON was corrupted during parsing
-        is_corrupted = json_metadata and (json_metadata.get('recovered', False) or json_metadata.get('unparsed_content', ''))
+        is_corrupted = reply.is_corrupted
         
         if is_corrupted:
             log_warning(f"[llm_to_interface] 🔧 Corrupted JSON detected - activating corrector to regenerate damaged actions")
-            log_debug(f"[llm_to_interface] Unparsed content ({len(json_metadata.get('unparsed_content', ''))} chars): {json_metadata.get('unparsed_content', '')[:200]}...")
+            log_debug("[llm_to_interface] Unparsed content (%s chars): %s...", len(json_metadata.get('unparsed_content', '')), json_metadata.get('unparsed_content', '')[:200])
         
         # Detect correction/system payloads (top-level "system_message") OR corrupted JSON
-        if (isinstance(json_payload, dict) and 'system_message' in json_payload) or is_corrupted:
+        if reply.is_system_message or is_corrupted:
             try:
                 # Determine bot instance from args if present
                 bot = args[0] if args and len(args) > 0 else None
 
-                # Attempt to determine chat_id from kwargs or positional args
-                chat_id = kwargs.get('chat_id')
-                if chat_id is None and len(args) > 1:
-                    maybe = args[1]
-                    if isinstance(maybe, (int, str)):
-                        chat_id = maybe
-
-                # Build lightweight message and context objects for orchestrator
-                from types import SimpleNamespace
-                from datetime import datetime
-
-                message = SimpleNamespace()
-                message.chat_id = chat_id
-                message.text = ""
-                message.original_text = text
-                message.thread_id = kwargs.get('thread_id')
-                # Mark this message as originating from the LLM so the orchestrator
-                # will process it. This complements the is_llm_response flag.
-                message.from_llm = True
-                message.date = datetime.utcnow()
-
-                current_interface = kwargs.get('interface') or (getattr(bot, 'get_interface_id', lambda: 'unknown')() if bot else 'unknown')
+                # Build lightweight message and context objects for orchestrator.
+                # The message is marked as originating from the LLM so the
+                # orchestrator will process it; this complements is_llm_response.
+                message = reply.as_message()
+
+                current_interface = reply.interface or 'unknown'
                 corrector_context = {
                     'interface': current_interface,
                     'original_chat_id': chat_id,
-                    'original_thread_id': kwargs.get('thread_id'),
+                    'original_thread_id': reply.thread_id,
                     'original_text': text[:500] if text else ''
                 }
                 
@@ -687,7 +736,7 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
                     log_info("[llm_to_interface] Extracting completed actions from corrupted JSON")
                     # Extract actions from recovered JSON
                     if isinstance(json_payload, dict) and "actions" in json_payload:
-                        recovered_actions = json_payload.get("actions", [])
+                        recovered_actions = reply.actions
                         if isinstance(recovered_actions, list):
                             completed_actions = [a.get('type') for a in recovered_actions if isinstance(a, dict) and 'type' in a]
                             log_info(f"[llm_to_interface] Found {len(completed_actions)} actions in recovered JSON: {completed_actions}")
@@ -699,7 +748,8 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
                     corrector_context, 
                     bot, 
                     message,
-                    completed_actions=completed_actions if is_corrupted else None
+                    completed_actions=completed_actions if is_corrupted else None,
+                    reply=reply,
                 )
 
                 if orchestrator_result is True:
@@ -726,20 +776,8 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
         from core.message_chain import handle_incoming_message
         # Determine source: if this path was called from llm_to_interface we set is_llm_response
         source = 'llm' if kwargs.get('is_llm_response', False) else 'interface'
-        # Build a message object compatible with message_chain
-        from types import SimpleNamespace
-        from datetime import datetime
-        message = SimpleNamespace()
-        # Try to extract chat_id from kwargs/args
-        chat_id = kwargs.get('chat_id')
-        if chat_id is None and args:
-            maybe = args[1] if len(args) > 1 else None
-            chat_id = maybe if isinstance(maybe, (int, str)) else None
-        message.chat_id = chat_id
-        message.text = ""
-        message.original_text = text
-        message.thread_id = kwargs.get('thread_id')
-        message.date = datetime.utcnow()
+        # Build a message object compatible with message_chain; origin is set by the chain
+        message = reply.as_message(from_llm=False)
         # If this chat_id is marked as expecting a system/LLM reply from the
         # corrector middleware, consume it here and do not re-enter the message
         # chain. This avoids infinite correction/forwarding loops.
@@ -758,7 +796,7 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
                 
                 if is_correction_response:
                     _remove_system_reply_expectation(str(chat_id))
-                    log_debug(f"[llm_to_interface] Consuming expected system reply for chat_id={chat_id}; not forwarding to message_chain")
+                    log_debug("[llm_to_interface] Consuming expected system reply for chat_id=%s; not forwarding to message_chain", chat_id)
                     return None
                 else:
                     # This doesn't look like a correction response, might be a normal message
@@ -768,7 +806,7 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
         except Exception:
             pass
         # Pass through to message chain
-        result = await handle_incoming_message(bot=getattr(interface_send_func, '__self__', None) or None, message=message, text=text, source=source, context=kwargs.get('context', None), **kwargs)
+        result = await handle_incoming_message(bot=getattr(interface_send_func, '__self__', None) or None, message=message, text=text, source=source, context=kwargs.get('context', None), reply=reply, **kwargs)
         if result == 'ACTIONS_EXECUTED' or result == 'BLOCKED':
             # Orchestrator handled or blocked: nothing to forward
             return None
@@ -776,7 +814,9 @@ async def llm_to_interface(interface_send_func, *args, text: str = None, **kwarg
             # LLM failed and fallback message was already sent: nothing more to forward
             return None
         # Else forward as usual
-        return await universal_send(interface_send_func, *args, text=text, **kwargs)
+        return await universal_send(interface_send_func, *args, text=text, reply=reply, **kwargs)
     except Exception as e:
         log_warning(f"[transport] message_chain delegation failed: {e}")
-        return await universal_send(interface_send_func, *args, text=text, **kwargs)
+        return await universal_send(interface_send_func, *args, text=text, reply=reply, **kwargs)
+    finally:
+        log_debug("[llm_to_interface] Reply timings for chat_id=%s: total=%.1fms parse=%.1fms", chat_id, reply.mark('delivered') * 1000, reply.timings.get('parse', 0.0) * 1000)
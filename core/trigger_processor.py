@@ -1,6 +1,6 @@
 # core/trigger_processor.py
 
-from core.db import get_conn
+from core.db import acquire
 from datetime import datetime, timedelta, timezone
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 import aiomysql
@@ -24,14 +24,11 @@ async def process_triggers_for_emotion(emotion: dict) -> int:
         WHERE timestamp >= %s AND scope = %s
         ORDER BY timestamp DESC
     """
-    conn = await get_conn()
-    try:
+    async with acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(query, (since.isoformat(), scope))
             rows = await cur.fetchall()
             contents = [row[0] for row in rows]
-    finally:
-        conn.close()
 
     # Simple heuristic: look for reinforcing or softening keywords
     reinforce_keywords = {
@@ -102,6 +102,10 @@ class ValidationRegistry:
         """Get all action types that have validation rules."""
         return set(self._rules.keys())
     
+    def supports_action_type(self, action_type: str) -> bool:
+        """Return True if validation rules exist for ``action_type``."""
+        return action_type in self._rules
+    
     def get_registered_components(self) -> Set[str]:
         """Get all registered component names."""
         return self._registered_components.copy()
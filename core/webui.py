@@ -40,6 +40,7 @@ from core.logging_utils import _LOG_FILE, log_debug, log_error, log_info, log_wa
 from core.config_manager import config_registry
 from core.message_chain import get_failed_message_text, RESPONSE_TIMEOUT, FAILED_MESSAGE_TEXT
 import core.plugin_instance as plugin_instance
+from core.reply_stream import reply_stream
 from core.animation_handler import get_animation_handler, AnimationState
 import mimetypes
 
@@ -69,6 +70,8 @@ class SynthWebUIInterface:
         self.connections: Dict[str, WebSocket] = {}
         self.message_history: Dict[str, Deque[dict]] = {}
         self.max_history = 100
+        # Partial reply shown per session while the engine is still writing it
+        self._streaming: Dict[str, str] = {}
 
         self.host = config_registry.get_value(
             "WEBUI_HOST",
@@ -446,8 +449,45 @@ class SynthWebUIInterface:
         return JSONResponse({"status": "ok", "time": datetime.utcnow().isoformat()})
 
     async def stats(self):
+        from core.db import get_pool_stats
+
         uptime = int((datetime.utcnow() - self.start_time).total_seconds())
-        return JSONResponse({"uptime": uptime, "sessions": len(self.connections)})
+        payload = {
+            "uptime": uptime,
+            "sessions": len(self.connections),
+            "db_pool": get_pool_stats(),
+        }
+        try:
+            from plugins.bio_manager import get_bio_cache_stats
+
+            payload["bio_cache"] = get_bio_cache_stats()
+        except Exception as exc:
+            log_debug(f"{LOG_PREFIX} bio cache stats unavailable: {exc}")
+        try:
+            from plugins.chat_link import ChatLinkStore
+
+            payload["chat_name_cache"] = ChatLinkStore.name_cache_stats()
+        except Exception as exc:
+            log_debug(f"{LOG_PREFIX} chat name cache stats unavailable: {exc}")
+        try:
+            from core.message_queue import get_queue_stats
+
+            payload["message_queue"] = get_queue_stats()
+        except Exception as exc:
+            log_debug(f"{LOG_PREFIX} message queue stats unavailable: {exc}")
+        try:
+            from core.rate_limit import get_stats as get_rate_limit_stats
+
+            payload["rate_limit"] = get_rate_limit_stats()
+        except Exception as exc:
+            log_debug(f"{LOG_PREFIX} rate limit stats unavailable: {exc}")
+        try:
+            from core.browser_worker import get_stats as get_browser_stats
+
+            payload["browser_workers"] = get_browser_stats()
+        except Exception as exc:
+            log_debug(f"{LOG_PREFIX} browser worker stats unavailable: {exc}")
+        return JSONResponse(payload)
 
     async def logs_page(self):
         html = self._render_logs()
@@ -499,6 +539,9 @@ class SynthWebUIInterface:
         self.message_history.setdefault(session_id, deque(maxlen=self.max_history))
         await websocket.send_json({"type": "session", "session_id": session_id})
         await self._replay_history(session_id)
+        reply_stream.subscribe(
+            INTERFACE_NAME, session_id, lambda delta: self._stream_preview(session_id, delta)
+        )
         log_info(f"{LOG_PREFIX} Client connected: {session_id}")
 
         try:
@@ -519,6 +562,8 @@ class SynthWebUIInterface:
         except Exception as exc:  # pragma: no cover - runtime issues
             log_error(f"{LOG_PREFIX} websocket error: {exc}")
         finally:
+            reply_stream.unsubscribe(INTERFACE_NAME, session_id)
+            self._streaming.pop(session_id, None)
             self.connections.pop(session_id, None)
             self.message_history.pop(session_id, None)
 
@@ -673,6 +718,22 @@ class SynthWebUIInterface:
         if response:
             await self.send_message(session_id, text=response)
 
+    def _stream_preview(self, session_id: str, delta: str) -> None:
+        """Show the reply the engine is still writing (see core.reply_stream)."""
+        text = self._streaming.get(session_id, "") + delta
+        self._streaming[session_id] = text
+        asyncio.ensure_future(self._send_stream(session_id, text))
+
+    async def _send_stream(self, session_id: str, text: str) -> None:
+        websocket = self.connections.get(session_id)
+        if not websocket or session_id not in self._streaming:
+            return
+        try:
+            # The whole text each time, so a late update only lags behind
+            await websocket.send_json({"type": "stream", "sender": "synth", "text": text})
+        except Exception as exc:  # pragma: no cover - runtime issues
+            log_debug(f"{LOG_PREFIX} stream update failed for {session_id}: {exc}")
+
     async def _replay_history(self, session_id: str) -> None:
         history = self.message_history.get(session_id)
         if not history:
@@ -716,6 +777,7 @@ class SynthWebUIInterface:
             log_warning(f"{LOG_PREFIX} no active websocket for session {chat_id}")
             return
 
+        self._streaming.pop(str(chat_id), None)
         await websocket.send_json({"type": "message", "sender": "synth", "text": text})
         await self._append_history(str(chat_id), "synth", text)
 
@@ -1086,10 +1148,9 @@ class SynthWebUIInterface:
 
         try:
             # Get total count first
-            from core.db import get_conn
+            from core.db import acquire
             
-            conn = await get_conn()
-            try:
+            async with acquire() as conn:
                 async with conn.cursor() as cur:
                     if include_archived:
                         await cur.execute("SELECT COUNT(*) FROM ai_diary")
@@ -1101,8 +1162,6 @@ class SynthWebUIInterface:
                         await cur.execute("SELECT COUNT(*) FROM ai_diary")
                         result = await cur.fetchone()
                         total_count = result[0] if result else 0
-            finally:
-                conn.close()
             
             payload["total_count"] = total_count
             payload["total_pages"] = (total_count + per_page - 1) // per_page if per_page != 'unlimited' else 1
@@ -1116,8 +1175,7 @@ class SynthWebUIInterface:
                 limit = per_page
             
             # Fetch paginated entries
-            conn = await get_conn()
-            try:
+            async with acquire() as conn:
                 async with conn.cursor() as cur:
                     if include_archived:
                         # Get entries from both tables, ordered by timestamp DESC
@@ -1145,8 +1203,6 @@ class SynthWebUIInterface:
                         """, (limit, offset))
                     
                     rows = await cur.fetchall()
-            finally:
-                conn.close()
             
             # Convert rows to entries format
             entries = []
@@ -12,6 +12,7 @@ except Exception:  # pragma: no cover - graceful fallback for tests without inst
     discord = None
 
 from core.logging_utils import log_debug, log_error, log_info, log_warning
+from core.mention_utils import set_bot_identity
 from core.transport_layer import universal_send
 from core.core_initializer import register_interface
 from core.command_registry import execute_command
@@ -43,6 +44,10 @@ class DiscordInterface:
 
             @self.client.event
             async def on_ready():
+                # Fired again after every reconnect, which refreshes the identity
+                user = self.client.user
+                if user is not None:
+                    set_bot_identity("discord_bot", user.name, user.id)
                 log_info(f"[discord_interface] Discord client ready as {self.client.user}")
 
             @self.client.event
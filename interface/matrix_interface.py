@@ -22,6 +22,7 @@ from core.command_registry import execute_command
 from core.core_initializer import register_interface
 from core.interfaces_registry import get_interface_registry
 from core.logging_utils import log_debug, log_error, log_info, log_warning
+from core.mention_utils import set_bot_identity
 from core.config_manager import config_registry
 from core.config import get_trainer_id as core_get_trainer_id
 from plugins.chat_link import ChatLinkStore
@@ -321,6 +322,7 @@ class MatrixInterface:
             if response.device_id:
                 self.client.device_id = response.device_id
             self.username = _extract_username(self.client.user_id)
+            set_bot_identity(INTERFACE_NAME, self.username, self.client.user_id)
             log_info(f"[matrix_interface] Logged in as {self.client.user_id}")
         else:  # pragma: no cover - unexpected response
             raise RuntimeError(f"Unexpected login response: {response}")
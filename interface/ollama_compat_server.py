@@ -16,6 +16,7 @@ from fastapi.responses import JSONResponse, StreamingResponse
 
 from core.core_initializer import register_interface
 from core.logging_utils import log_debug, log_error, log_info, log_warning
+from core.reply_stream import reply_stream
 import core.plugin_instance as plugin_instance
 
 
@@ -49,6 +50,8 @@ class OllamaCompatServer:
         self._response_buffers: Dict[str, list[str]] = {}
         self._completion_events: Dict[str, asyncio.Event] = {}
         self._request_start: Dict[str, float] = {}
+        # Text already streamed while the engine was still generating
+        self._streamed: Dict[str, str] = {}
 
         # Map external conversation identifiers to internal chat ids used by
         # the core. When no identifier is provided we still create a temporary
@@ -165,6 +168,11 @@ class OllamaCompatServer:
         completion_event = asyncio.Event()
         self._completion_events[chat_id] = completion_event
         self._request_start[chat_id] = time.monotonic()
+        reply_stream.subscribe(
+            self.interface_id,
+            chat_id,
+            lambda delta: self._stream_preview(chat_id, model, conversation_id, delta),
+        )
 
         log_debug(
             f"[ollama_serve] Received chat request chat_id={chat_id} conv_id={conversation_id} "
@@ -197,11 +205,10 @@ class OllamaCompatServer:
         if final_chunk.get("error"):
             return JSONResponse(final_chunk, status_code=500)
 
-        aggregated_response = "".join(
+        # final_response holds the final text even when it replaced the preview
+        aggregated_response = final_chunk.get("final_response") or "".join(
             chunk.get("response", "") for chunk in result_chunks if not chunk.get("done")
         )
-        if not aggregated_response:
-            aggregated_response = final_chunk.get("final_response", "")
 
         payload = {
             "model": final_chunk.get("model", model or self.default_model_name),
@@ -297,6 +304,8 @@ class OllamaCompatServer:
                             f"(waited ~{waited:.1f}s, timeout={timeout}s)"
                         )
         finally:
+            reply_stream.unsubscribe(self.interface_id, chat_id)
+            self._streamed.pop(chat_id, None)
             self._pending_streams.pop(chat_id, None)
             self._response_buffers.pop(chat_id, None)
             self._completion_events.pop(chat_id, None)
@@ -463,6 +472,20 @@ class OllamaCompatServer:
             log_warning(f"[ollama_serve] No active stream found for chat_id={chat_id}")
             return
 
+        streamed = self._streamed.pop(chat_id, "")
+        if streamed:
+            if not text.startswith(streamed):
+                # Streamed deltas cannot be taken back: the final text replaces
+                # the preview in final_response instead of being appended to it
+                log_warning(
+                    f"[ollama_serve] Final text for chat_id={chat_id} differs from the streamed preview"
+                )
+                self._response_buffers[chat_id] = [text]
+                return
+            text = text[len(streamed):]
+            if not text:
+                return
+
         self._response_buffers.setdefault(chat_id, []).append(text)
         await self._publish_chunk(
             chat_id,
@@ -475,6 +498,31 @@ class OllamaCompatServer:
             },
         )
 
+    def _stream_preview(
+        self,
+        chat_id: str,
+        model: Optional[str],
+        conversation_id: Optional[str],
+        delta: str,
+    ) -> None:
+        """Forward text the engine is still generating (see core.reply_stream)."""
+        if chat_id not in self._pending_streams:
+            return
+        self._streamed[chat_id] = self._streamed.get(chat_id, "") + delta
+        self._response_buffers.setdefault(chat_id, []).append(delta)
+        asyncio.ensure_future(
+            self._publish_chunk(
+                chat_id,
+                {
+                    "model": model,
+                    "message": {"role": "assistant", "content": delta},
+                    "done": False,
+                    "conversation_id": conversation_id,
+                    "response": delta,
+                },
+            )
+        )
+
     async def _finalize_stream(
         self,
         *,
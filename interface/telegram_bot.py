@@ -23,7 +23,7 @@ from core import response_proxy
 from core import say_proxy, message_queue
 from core.context import context_command
 from core import recent_chats  # For command functions only, not for tracking
-from core.mention_utils import is_message_for_bot
+from core.mention_utils import get_bot_identity, is_message_for_bot
 from collections import deque
 import json
 from core.logging_utils import log_debug, log_info, log_warning, log_error
@@ -78,7 +78,7 @@ BOTFATHER_TOKEN = config_registry.get_var(
     sensitive=True,
 )
 
-# Bot username will be fetched dynamically using bot.get_me()
+# Bot username is cached by core.mention_utils when the application starts
 BOT_USERNAME = None
 
 # Parse trainer ID from TRAINER_IDS configuration
@@ -467,16 +467,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     log_debug(f"human_count={human_count}, message.chat.type={message.chat.type}")
     
-    # Get bot username for mention checking
-    bot_username = None
-    try:
-        bot_info = await context.bot.get_me()
-        bot_username = bot_info.username if bot_info else None
-        log_debug(f"Bot username: {bot_username}")
-    except Exception as e:
-        log_debug(f"Could not get bot username: {e}")
-    
-    directed, reason = await is_message_for_bot(message, context.bot, bot_username=bot_username, human_count=human_count)
+    directed, reason = await is_message_for_bot(
+        message, context.bot, human_count=human_count, interface_id="telegram_bot"
+    )
     log_debug(f"is_message_for_bot returned directed={directed}, reason='{reason}'")
     
     if not directed:
@@ -965,6 +958,9 @@ async def start_bot():
         telegram_interface.disabled_reason = None
         log_debug("[telegram_bot] Bot instance assigned to telegram_interface")
 
+        # Application.initialize() already fetched the bot account
+        await get_bot_identity(app.bot, "telegram_bot", refresh=True)
+
         # Rebuild action schemas (summary will be shown later by main initialization)
         from core.core_initializer import core_initializer
         await core_initializer.refresh_actions_block()
@@ -17,6 +17,7 @@ MANUAL_CONFIG = {
     "max_response_chars": 2000,
     "supports_images": False,
     "supports_functions": False,
+    "max_concurrent_requests": 4,  # Forwarding to the trainer does not block
     "model_name": "manual",
     "default_model": "manual",
     "log_throttle_sec": 5,
@@ -51,6 +52,7 @@ def get_interface_limits() -> dict:
         "max_response_chars": MANUAL_CONFIG["max_response_chars"],
         "supports_images": MANUAL_CONFIG["supports_images"],
         "supports_functions": MANUAL_CONFIG["supports_functions"],
+        "max_concurrent_requests": MANUAL_CONFIG["max_concurrent_requests"],
         "model_name": MANUAL_CONFIG["model_name"]
     }
 
@@ -89,6 +91,7 @@ class ManualAIPlugin(AIPluginBase):
             "max_response_chars": MANUAL_CONFIG["max_response_chars"],
             "supports_images": MANUAL_CONFIG["supports_images"],
             "supports_functions": MANUAL_CONFIG["supports_functions"],
+            "max_concurrent_requests": MANUAL_CONFIG["max_concurrent_requests"],
             "model_name": MANUAL_CONFIG["model_name"]
         }
 
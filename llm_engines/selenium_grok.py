@@ -14,7 +14,7 @@ import requests
 import base64
 import traceback
 from collections import defaultdict
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, Generator
 from pathlib import Path
 import subprocess
 try:
@@ -39,6 +39,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from urllib3.exceptions import ReadTimeoutError
 from core.transport_layer import llm_to_interface
+from core.prompt_engine import serialize_prompt
 
 
 # Local functions and classes
@@ -47,6 +48,11 @@ from core.notifier import set_notifier
 from core.config_manager import config_registry
 import core.recent_chats as recent_chats
 from core.ai_plugin_base import AIPluginBase
+from core.browser_worker import BrowserWorker, mark, run_steps, set_reference
+from core.tab_pool import TabPool
+from core.completion_watch import watch_steps
+from core.reply_stream import reply_stream
+from core.browser_supervisor import WarmStandby, probe_interval
 
 # === Register CHROMIUM_HEADLESS in config_registry (lazy init) ===
 CHROMIUM_HEADLESS = 0
@@ -88,6 +94,7 @@ SELENIUM_CONFIG = {
     "max_response_chars": 4000,
     "supports_images": True,
     "supports_functions": False,  # Browser-based doesn't support functions
+    "max_concurrent_requests": 1,  # One browser session drives every conversation
     "model_name": "grok-beta",
     "default_model": "grok-beta",
     "browser_timeout": 30,
@@ -171,6 +178,7 @@ def get_interface_limits() -> dict:
         "max_response_chars": SELENIUM_CONFIG["max_response_chars"],
         "supports_images": SELENIUM_CONFIG["supports_images"],
         "supports_functions": SELENIUM_CONFIG["supports_functions"],
+        "max_concurrent_requests": SELENIUM_CONFIG["max_concurrent_requests"],
         "model_name": model_name
     }
 
@@ -179,8 +187,9 @@ load_dotenv()
 
 # ChatLinkStore: manages mapping between interface chats and ChatGPT conversations
 from plugins.chat_link import ChatLinkStore
+from core.schema_registry import schema_registry
 from interface.telegram_utils import safe_send
-from core.db import get_conn
+from core.db import acquire
 
 # Fallback for notify_trainer when core.notifier module is unavailable
 def notify_trainer(message: str) -> None:
@@ -197,6 +206,8 @@ def notify_trainer(message: str) -> None:
 
 GRACE_PERIOD_SECONDS = 3
 MAX_WAIT_TIMEOUT_SECONDS = 5 * 60  # hard ceiling
+# How long stop() waits for the browser worker before quitting from a helper thread
+BROWSER_SHUTDOWN_TIMEOUT = 30
 
 # Cache the last response per chat to avoid duplicates
 previous_responses: Dict[str, str] = {}
@@ -206,39 +217,14 @@ response_cache_lock = threading.Lock()
 class GrokLinkStore(ChatLinkStore):
     """Extends ChatLinkStore to handle ChatGPT-specific link management."""
     
-    def __init__(self):
-        super().__init__()
-        self.grok_link_initialized = False
-    
     async def ensure_grok_link_column(self):
         """Ensure the grok_link column exists in the chatlink table."""
-        if self.grok_link_initialized:
+        if schema_registry.has_column("chatlink", "grok_link"):
             return
-            
+
         try:
-            connection = await get_conn()
-            async with connection.cursor() as cursor:
-                # Check if grok_link column exists
-                await cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM information_schema.COLUMNS 
-                    WHERE TABLE_SCHEMA = DATABASE() 
-                    AND TABLE_NAME = 'chatlink' 
-                    AND COLUMN_NAME = 'grok_link'
-                """)
-                result = await cursor.fetchone()
-                
-                if result[0] == 0:
-                    # Add grok_link column
-                    await cursor.execute("""
-                        ALTER TABLE chatlink 
-                        ADD COLUMN grok_link VARCHAR(255) NULL
-                    """)
-                    await connection.commit()
-                    log_info("[selenium_grok] Added grok_link column to chatlink table")
-                
-            await connection.ensure_closed()
-            self.grok_link_initialized = True
+            await self._ensure_table()
+            await schema_registry.ensure_column("chatlink", "grok_link", "VARCHAR(255) NULL")
         except Exception as e:
             log_error(f"[selenium_grok] Failed to ensure grok_link column: {e}")
     
@@ -250,25 +236,24 @@ class GrokLinkStore(ChatLinkStore):
         await self.ensure_chat_exists(chat_id, thread_id, interface)
         
         try:
-            connection = await get_conn()
-            async with connection.cursor() as cursor:
-                if thread_id:
-                    await cursor.execute("""
-                        SELECT grok_link 
-                        FROM chatlink 
-                        WHERE chat_id = %s AND thread_id = %s AND interface = %s
-                    """, (str(chat_id), str(thread_id), interface))
-                else:
-                    await cursor.execute("""
-                        SELECT grok_link 
-                        FROM chatlink 
-                        WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
-                    """, (str(chat_id), interface))
+            async with acquire() as connection:
+                async with connection.cursor() as cursor:
+                    if thread_id:
+                        await cursor.execute("""
+                            SELECT grok_link 
+                            FROM chatlink 
+                            WHERE chat_id = %s AND thread_id = %s AND interface = %s
+                        """, (str(chat_id), str(thread_id), interface))
+                    else:
+                        await cursor.execute("""
+                            SELECT grok_link 
+                            FROM chatlink 
+                            WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
+                        """, (str(chat_id), interface))
                 
-                result = await cursor.fetchone()
-                await connection.ensure_closed()
+                    result = await cursor.fetchone()
                 
-                return result[0] if result and result[0] else None
+                    return result[0] if result and result[0] else None
         except Exception as e:
             log_error(f"[selenium_grok] Failed to get ChatGPT link: {e}")
             return None
@@ -281,25 +266,24 @@ class GrokLinkStore(ChatLinkStore):
         await self.ensure_chat_exists(chat_id, thread_id, interface, chat_name=chat_name)
         
         try:
-            connection = await get_conn()
-            async with connection.cursor() as cursor:
-                if thread_id:
-                    await cursor.execute("""
-                        UPDATE chatlink 
-                        SET grok_link = %s 
-                        WHERE chat_id = %s AND thread_id = %s AND interface = %s
-                    """, (grok_link, str(chat_id), str(thread_id), interface))
-                else:
-                    await cursor.execute("""
-                        UPDATE chatlink 
-                        SET grok_link = %s 
-                        WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
-                    """, (grok_link, str(chat_id), interface))
+            async with acquire() as connection:
+                async with connection.cursor() as cursor:
+                    if thread_id:
+                        await cursor.execute("""
+                            UPDATE chatlink 
+                            SET grok_link = %s 
+                            WHERE chat_id = %s AND thread_id = %s AND interface = %s
+                        """, (grok_link, str(chat_id), str(thread_id), interface))
+                    else:
+                        await cursor.execute("""
+                            UPDATE chatlink 
+                            SET grok_link = %s 
+                            WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
+                        """, (grok_link, str(chat_id), interface))
                 
-                await connection.commit()
-                await connection.ensure_closed()
-                log_debug(f"[selenium_grok] Stored ChatGPT link: {grok_link} for chat {chat_id}")
-                return True
+                    await connection.commit()
+                    log_debug(f"[selenium_grok] Stored ChatGPT link: {grok_link} for chat {chat_id}")
+                    return True
         except Exception as e:
             log_error(f"[selenium_grok] Failed to store ChatGPT link: {e}")
             return False
@@ -309,25 +293,24 @@ class GrokLinkStore(ChatLinkStore):
         await self.ensure_grok_link_column()
         
         try:
-            connection = await get_conn()
-            async with connection.cursor() as cursor:
-                if thread_id:
-                    await cursor.execute("""
-                        UPDATE chatlink 
-                        SET grok_link = NULL 
-                        WHERE chat_id = %s AND thread_id = %s AND interface = %s
-                    """, (str(chat_id), str(thread_id), interface))
-                else:
-                    await cursor.execute("""
-                        UPDATE chatlink 
-                        SET grok_link = NULL 
-                        WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
-                    """, (str(chat_id), interface))
+            async with acquire() as connection:
+                async with connection.cursor() as cursor:
+                    if thread_id:
+                        await cursor.execute("""
+                            UPDATE chatlink 
+                            SET grok_link = NULL 
+                            WHERE chat_id = %s AND thread_id = %s AND interface = %s
+                        """, (str(chat_id), str(thread_id), interface))
+                    else:
+                        await cursor.execute("""
+                            UPDATE chatlink 
+                            SET grok_link = NULL 
+                            WHERE chat_id = %s AND thread_id IS NULL AND interface = %s
+                        """, (str(chat_id), interface))
                 
-                await connection.commit()
-                await connection.ensure_closed()
-                log_debug(f"[selenium_grok] Removed ChatGPT link for chat {chat_id}")
-                return True
+                    await connection.commit()
+                    log_debug(f"[selenium_grok] Removed ChatGPT link for chat {chat_id}")
+                    return True
         except Exception as e:
             log_error(f"[selenium_grok] Failed to remove ChatGPT link: {e}")
             return False
@@ -374,7 +357,7 @@ async def _download_telegram_image(bot, file_id: str, temp_dir: str) -> Optional
         log_debug(f"[selenium] Downloading from URL: {file_url}")
         
         # Download the file
-        response = requests.get(file_url, timeout=30)
+        response = await asyncio.to_thread(requests.get, file_url, timeout=30)
         response.raise_for_status()
         
         # Save to temp file
@@ -863,12 +846,17 @@ config_registry.add_listener("AWAIT_RESPONSE_TIMEOUT", _update_await_timeout)
 config_registry.add_listener("CORRECTOR_RETRIES", _update_corrector_retries)
 
 
-def wait_until_response_stabilizes(
+# Elements the DOM watcher follows to notice the end of a reply
+_STOP_SELECTOR = 'button[aria-label="Stop model response"]'
+_RESPONSE_SELECTOR = "div.message-bubble.prose"
+
+
+def _stabilize_steps(
     driver: webdriver.Remote,
     max_total_wait: int = AWAIT_RESPONSE_TIMEOUT,
     no_change_grace: float = 3.5,
-) -> str:
-    """Return the last markdown text once its length stops growing."""
+) -> Generator[float, None, str]:
+    """Steps of :func:`wait_until_response_stabilizes`; yields the pause between polls."""
     selector = "div.message-bubble.prose"
     start = time.time()
     last_len = -1
@@ -886,7 +874,7 @@ def wait_until_response_stabilizes(
             if buttons:
                 try:
                     buttons[0].click()
-                    time.sleep(1)
+                    yield 1
                     log_debug(
                         "[selenium] Dismissed prefer-response dialog"
                     )
@@ -906,16 +894,16 @@ def wait_until_response_stabilizes(
         try:
             elems = driver.find_elements(By.CSS_SELECTOR, selector)
             if not elems:
-                time.sleep(0.5)
+                yield 0.5
                 continue
             text = elems[-1].text or ""
         except StaleElementReferenceException:
             log_debug("[selenium] Response element became stale, retrying...")
-            time.sleep(0.5)
+            yield 0.5
             continue
         except Exception as e:  # pragma: no cover - best effort
             log_warning(f"[selenium] Response wait error: {e}")
-            time.sleep(0.5)
+            yield 0.5
             continue
 
         current_len = len(text)
@@ -923,9 +911,12 @@ def wait_until_response_stabilizes(
         log_debug(f"[DEBUG] len={current_len} changed={changed}")
 
         if current_len > 0 and changed:
+            mark("first_token")
             last_len = current_len
             last_change = time.time()
             final_text = text
+            if no_change_grace <= 0:
+                return text
         elif current_len > 0 and time.time() - last_change >= no_change_grace:
             elapsed = time.time() - start
             log_debug(
@@ -933,7 +924,16 @@ def wait_until_response_stabilizes(
             )
             return text
 
-        time.sleep(0.5)
+        yield 0.5
+
+
+def wait_until_response_stabilizes(
+    driver: webdriver.Remote,
+    max_total_wait: int = AWAIT_RESPONSE_TIMEOUT,
+    no_change_grace: float = 3.5,
+) -> str:
+    """Return the last markdown text once its length stops growing."""
+    return run_steps(_stabilize_steps(driver, max_total_wait, no_change_grace))
 
 
 def _wait_for_button_state(driver, state: str, timeout: int) -> bool:
@@ -975,9 +975,9 @@ def _wait_for_button_state(driver, state: str, timeout: int) -> bool:
     return False
 
 
-def wait_for_chatgpt_idle(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> bool:
-    """Wait until ChatGPT is ready for a new prompt (textarea is available and no stop button)."""
-    if not wait_for_response_completion(driver, timeout):
+def _idle_steps(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> Generator[float, None, bool]:
+    """Steps of :func:`wait_for_chatgpt_idle`."""
+    if not (yield from _completion_steps(driver, timeout)):
         log_warning("[selenium] ChatGPT may still be generating during idle wait")
 
     try:
@@ -991,8 +991,13 @@ def wait_for_chatgpt_idle(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> bool
         return False
 
 
-def wait_for_response_completion(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> bool:
-    """Wait until the current response finishes streaming."""
+def wait_for_chatgpt_idle(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> bool:
+    """Wait until ChatGPT is ready for a new prompt (textarea is available and no stop button)."""
+    return run_steps(_idle_steps(driver, timeout))
+
+
+def _completion_steps(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> Generator[float, None, bool]:
+    """Steps of :func:`wait_for_response_completion`; yields the pause between polls."""
     start_time = time.time()
     end_time = start_time + timeout
 
@@ -1019,7 +1024,7 @@ def wait_for_response_completion(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT)
                     f"[selenium] {elapsed} seconds passed, stop button still present"
                 )
                 last_report = elapsed
-            time.sleep(1)
+            yield 1
             continue
         except NoSuchElementException:
             elapsed = int(time.time() - start_time)
@@ -1029,12 +1034,16 @@ def wait_for_response_completion(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT)
             return True
         except (ReadTimeoutError, WebDriverException) as e:
             log_warning(f"[selenium] Polling error while waiting for completion: {e}")
-            time.sleep(1)
+            yield 1
 
     log_warning("[selenium] Timeout waiting for response completion")
     return False
 
 
+def wait_for_response_completion(driver, timeout: int = AWAIT_RESPONSE_TIMEOUT) -> bool:
+    """Wait until the current response finishes streaming."""
+    return run_steps(_completion_steps(driver, timeout))
+
 
 def _send_prompt_with_confirmation(textarea, prompt_text: str) -> None:
     """Send text and wait for ChatGPT's reply to finish."""
@@ -1227,10 +1236,20 @@ def is_chat_archived(driver, chat_id: str) -> bool:
         return False
 
 # Update process_prompt_in_chat to use the new functions
-def process_prompt_in_chat(
-    driver, chat_id: str | None, prompt_text: str, previous_text: str, image_path: str | None = None
-) -> Optional[str]:
-    """Send a prompt to a ChatGPT chat and return the newly generated text."""
+def prompt_steps(
+    driver,
+    chat_id: str | None,
+    prompt_text: str,
+    previous_text: str,
+    image_path: str | None = None,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> Generator[float, None, Optional[str]]:
+    """:func:`process_prompt_in_chat` as a step command for the browser worker.
+
+    Every wait yields instead of sleeping, so the worker can serve other
+    tabs while the reply is generated. ``on_text`` receives snapshots of
+    the reply while it grows (see :mod:`core.reply_stream`).
+    """
     if chat_id and is_chat_archived(driver, chat_id):
         chat_id = None  # Mark chat as invalid
 
@@ -1258,7 +1277,7 @@ def process_prompt_in_chat(
             )
         )
         prefer_btn.click()
-        time.sleep(2)
+        yield 2
     except TimeoutException:
         pass
     except Exception as e:  # pragma: no cover - best effort
@@ -1275,11 +1294,13 @@ def process_prompt_in_chat(
     start = time.time()
     attempt = 0
     repeat_failures = 0
+    mark("textarea_ready")
+    set_reference()
     last_response: Optional[str] = None
     while attempt < CORRECTOR_RETRIES and time.time() - start < AWAIT_RESPONSE_TIMEOUT:
         attempt += 1
         try:
-            wait_for_chatgpt_idle(driver)
+            yield from _idle_steps(driver)
             
             try:
                 paste_and_send(textarea, prompt_text)
@@ -1305,7 +1326,7 @@ def process_prompt_in_chat(
             except Exception as check_error:
                 log_error(f"[selenium] Error checking textarea content: {check_error}")
                 # Continue anyway, the paste might have worked
-                time.sleep(1)
+                yield 1
                 continue
 
             candidate = final_value.strip()
@@ -1317,7 +1338,7 @@ def process_prompt_in_chat(
                 json.loads(candidate)
             except Exception:
                 log_warning("[selenium] JSON invalid after paste; retrying")
-                time.sleep(1)
+                yield 1
                 continue
             try:
                 send_btn = WebDriverWait(driver, 3).until(
@@ -1333,19 +1354,32 @@ def process_prompt_in_chat(
                 log_debug("[selenium][STEP] Sent ENTER key as fallback")
         except ElementNotInteractableException as e:
             log_warning(f"[selenium][retry] Element not interactable: {e}")
-            time.sleep(2)
+            yield 2
             continue
         except Exception as e:
             log_error(f"[selenium][ERROR] Failed to send prompt: {repr(e)}")
             return None
 
+        mark("send")
+        set_reference()
         log_debug("🔍 Waiting for response...")
-        if not wait_for_response_completion(driver):
+        watched = yield from watch_steps(
+            driver, _STOP_SELECTOR, _RESPONSE_SELECTOR, AWAIT_RESPONSE_TIMEOUT, on_text=on_text
+        )
+        if watched is None:
+            completed = yield from _completion_steps(driver)
+        else:
+            completed = watched
+        if not completed:
             repeat_failures += 1
             log_warning("[selenium][retry] Response did not complete")
         else:
             try:
-                response_text = wait_until_response_stabilizes(driver, max_total_wait=5)
+                # When the watcher saw the text settle there is nothing left to wait for
+                response_text = yield from _stabilize_steps(
+                    driver, max_total_wait=5, no_change_grace=0 if watched else 3.5
+                )
+                mark("stabilized")
             except TimeoutException:
                 log_warning("[selenium][WARN] Timeout while waiting for response")
                 response_text = None
@@ -1372,7 +1406,7 @@ def process_prompt_in_chat(
         log_warning(f"[selenium][retry] Empty response attempt {attempt}")
         remaining = AWAIT_RESPONSE_TIMEOUT - (time.time() - start)
         if remaining > 0:
-            time.sleep(min(5, remaining))
+            yield min(5, remaining)
 
     log_warning(f"[selenium] Aborting after {attempt} attempts")
     screenshots_dir = os.path.join(_LOG_DIR, "screenshots")
@@ -1389,6 +1423,13 @@ def process_prompt_in_chat(
     return None
 
 
+def process_prompt_in_chat(
+    driver, chat_id: str | None, prompt_text: str, previous_text: str, image_path: str | None = None
+) -> Optional[str]:
+    """Send a prompt to a ChatGPT chat and return the newly generated text."""
+    return run_steps(prompt_steps(driver, chat_id, prompt_text, previous_text, image_path))
+
+
 # TODO: Chat renaming logic - currently commented out due to unreliable ChatGPT UI changes
 # This functionality needs to be reimplemented when ChatGPT's interface stabilizes
 # def rename_and_send_prompt(driver, chat_info, prompt_text: str) -> Optional[str]:
@@ -1564,6 +1605,16 @@ class SeleniumGrokPlugin(AIPluginBase):
         # Unique identifier for this instance to isolate Chromium resources
         self.instance_id = os.getenv("SyntH_INSTANCE_ID", str(os.getpid()))
         self.profile_dir: Optional[str] = None
+        # Every WebDriver call runs on this thread, never on the event loop
+        self._browser = BrowserWorker(f"selenium_grok-{self.instance_id}")
+        # Conversations lease browser tabs, so several chats can wait for replies at once
+        self._tabs = TabPool()
+        self._tabs_driver = None
+        self._focused_handle: Optional[str] = None
+        # A logged-in spare browser to switch to when this one dies
+        self._standby = WarmStandby(
+            f"selenium_grok-{self.instance_id}", self._launch_standby, self._prepare_standby
+        )
 
     def get_interface_limits(self):
         """Get the limits and capabilities for Selenium Grok interface.
@@ -1580,13 +1631,12 @@ class SeleniumGrokPlugin(AIPluginBase):
             "max_response_chars": SELENIUM_CONFIG["max_response_chars"],
             "supports_images": SELENIUM_CONFIG["supports_images"],
             "supports_functions": SELENIUM_CONFIG["supports_functions"],
+            "max_concurrent_requests": self._tabs.size,
             "model_name": model_name
         }
 
-    def cleanup(self):
-        """Clean up resources when the plugin is stopped."""
-        log_debug("[selenium] Starting cleanup...")
-        
+    def _cancel_pending(self) -> None:
+        """Stop the worker task and drop queued prompts."""
         # Stop the worker task
         if self._worker_task and not self._worker_task.done():
             self._worker_task.cancel()
@@ -1600,8 +1650,9 @@ class SeleniumGrokPlugin(AIPluginBase):
             log_debug("[selenium] Queue cleared")
         except Exception as e:
             log_warning(f"[selenium] Failed to clear queue: {e}")
-        
-        # Close the driver
+
+    def _shutdown_browser(self) -> None:
+        """Quit the driver and remove Chromium leftovers (browser worker only)."""
         if self.driver:
             try:
                 self.driver.quit()
@@ -1611,17 +1662,42 @@ class SeleniumGrokPlugin(AIPluginBase):
             finally:
                 self.driver = None
         
+        self._standby.close()
+
         # Remove any remaining Chromium processes and locks
         self._cleanup_chromium_remnants()
 
+    def cleanup(self):
+        """Clean up resources when the plugin is stopped.
+
+        Synchronous callers cannot await the browser worker, so the shutdown
+        is queued on it and this waits up to ``BROWSER_SHUTDOWN_TIMEOUT``
+        for the thread to finish. Prefer :meth:`stop` on the event loop.
+        """
+        log_debug("[selenium] Starting cleanup...")
+        self._cancel_pending()
+        self._browser.submit(self._shutdown_browser, step="shutdown")
+        self._browser.stop(wait=BROWSER_SHUTDOWN_TIMEOUT)
         log_debug("[selenium] Cleanup completed")
 
     async def stop(self):
-        """Cancel worker task and run cleanup."""  # [FIX]
+        """Cancel the worker task and shut the browser down off the event loop."""
         if self._worker_task:
             self._worker_task.cancel()
             await asyncio.gather(self._worker_task, return_exceptions=True)
-        self.cleanup()
+        self._cancel_pending()
+        try:
+            await self._browser.call(
+                self._shutdown_browser, step="shutdown", timeout=BROWSER_SHUTDOWN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            # The worker is stuck in a command; the browser has to go anyway
+            log_warning("[selenium] Browser worker busy, shutting the browser down from a helper thread")
+            await asyncio.to_thread(self._shutdown_browser)
+        except Exception as e:
+            log_warning(f"[selenium] Browser shutdown failed: {e}")
+        self._browser.stop()
+        log_debug("[selenium] Cleanup completed")
 
     async def start(self):
         """Start the background worker loop."""
@@ -1709,7 +1785,7 @@ class SeleniumGrokPlugin(AIPluginBase):
                 
                 # Initialize driver if needed
                 if not self.driver:
-                    self._init_driver()
+                    await self._browser.call(self._get_driver, step="get_driver")
                 
                 # Process the message directly
                 if is_correction:
@@ -1738,7 +1814,7 @@ class SeleniumGrokPlugin(AIPluginBase):
             
             # Handle both dict and string inputs
             if isinstance(prompt, dict):
-                prompt_text = json.dumps(prompt, ensure_ascii=False)
+                prompt_text = serialize_prompt(prompt)
             else:
                 prompt_text = prompt
             
@@ -1749,7 +1825,7 @@ class SeleniumGrokPlugin(AIPluginBase):
             for attempt in range(max_attempts):
                 try:
                     if not self.driver:
-                        self._init_driver()
+                        await self._browser.call(self._get_driver, step="get_driver")
                     
                     # Get chat ID for ChatGPT conversation
                     chat_id = await chat_link_store.get_grok_link(
@@ -1760,12 +1836,10 @@ class SeleniumGrokPlugin(AIPluginBase):
                     
                     # Process the prompt in ChatGPT with timeout
                     previous_text = get_previous_response(str(message.chat_id))
-                    import asyncio
                     timeout_seconds = 300  # 5 minutes timeout
                     response_text = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None,
-                            lambda: process_prompt_in_chat(self.driver, chat_id, prompt_text, previous_text)
+                        self._prompt_in_tab(
+                            self._tab_key(bot, message), chat_id, prompt_text, previous_text
                         ),
                         timeout=timeout_seconds
                     )
@@ -1795,7 +1869,7 @@ class SeleniumGrokPlugin(AIPluginBase):
             
             # Handle dict input (system_message structure)
             if isinstance(prompt, dict):
-                prompt_text = json.dumps(prompt, ensure_ascii=False)
+                prompt_text = serialize_prompt(prompt)
             else:
                 prompt_text = prompt
             
@@ -1806,7 +1880,7 @@ class SeleniumGrokPlugin(AIPluginBase):
             for attempt in range(max_attempts):
                 try:
                     if not self.driver:
-                        self._init_driver()
+                        await self._browser.call(self._get_driver, step="get_driver")
                     
                     # Get chat ID for ChatGPT conversation
                     chat_id = await chat_link_store.get_grok_link(
@@ -1817,12 +1891,10 @@ class SeleniumGrokPlugin(AIPluginBase):
                     
                     # Process the prompt in ChatGPT with timeout
                     previous_text = get_previous_response(str(message.chat_id))
-                    import asyncio
                     timeout_seconds = 300  # 5 minutes timeout
                     response_text = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None,
-                            lambda: process_prompt_in_chat(self.driver, chat_id, prompt_text, previous_text)
+                        self._prompt_in_tab(
+                            self._tab_key(bot, message), chat_id, prompt_text, previous_text
                         ),
                         timeout=timeout_seconds
                     )
@@ -1846,20 +1918,29 @@ class SeleniumGrokPlugin(AIPluginBase):
             return None
 
     async def _worker_loop(self):
-        """Process messages from the queue sequentially."""
+        """Process queued messages, one per browser tab at a time."""
         log_debug("[selenium] Worker loop started")
+        in_flight: set = set()
         try:
             while True:
                 try:
-                    # Get message from queue
-                    bot, message, prompt = await self._queue.get()
+                    # Get message from queue, checking the browser while idle
+                    try:
+                        bot, message, prompt = await asyncio.wait_for(
+                            self._queue.get(), timeout=probe_interval()
+                        )
+                    except asyncio.TimeoutError:
+                        if not in_flight:
+                            await self._probe_browser()
+                        continue
                     log_debug(f"[selenium] Processing message from queue: chat_id={message.chat_id}")
                     
-                    # Process the message
-                    await self._process_message(bot, message, prompt)
-                    
-                    # Mark task as done
-                    self._queue.task_done()
+                    # With a single tab this is the old sequential loop
+                    while len(in_flight) >= self._tabs.size:
+                        await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    task = asyncio.create_task(self._process_queued(bot, message, prompt))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
                     
                 except asyncio.CancelledError:
                     log_debug("[selenium] Worker loop cancelled")
@@ -1882,16 +1963,37 @@ class SeleniumGrokPlugin(AIPluginBase):
         except Exception as e:
             log_error(f"[selenium] Worker loop crashed: {repr(e)}", e)
         finally:
+            for task in in_flight:
+                task.cancel()
             log_debug("[selenium] Worker loop ended")
 
-    def _apply_driver_timeouts(self) -> None:
+    async def _process_queued(self, bot, message, prompt):
+        try:
+            await self._process_message(bot, message, prompt)
+        except Exception as e:
+            log_error(f"[selenium] Failed to process queued message: {repr(e)}", e)
+        finally:
+            self._queue.task_done()
+
+    async def _probe_browser(self) -> None:
+        """Check the idle browser so a crash is repaired before the next request."""
+        if self.driver is None:
+            return
+        try:
+            await self._browser.call(self._get_driver, step="health_probe")
+        except Exception as e:
+            log_warning(f"[selenium] Browser health check failed: {e}")
+        self._standby.maintain(self.profile_dir)
+
+    def _apply_driver_timeouts(self, driver=None) -> None:
         """Apply environment-based timeouts to the Selenium driver."""
-        if not self.driver:
+        driver = driver or self.driver
+        if not driver:
             return
         try:
-            self.driver.command_executor.set_timeout(AWAIT_RESPONSE_TIMEOUT)
-            self.driver.set_page_load_timeout(AWAIT_RESPONSE_TIMEOUT)
-            self.driver.set_script_timeout(AWAIT_RESPONSE_TIMEOUT)
+            driver.command_executor.set_timeout(AWAIT_RESPONSE_TIMEOUT)
+            driver.set_page_load_timeout(AWAIT_RESPONSE_TIMEOUT)
+            driver.set_script_timeout(AWAIT_RESPONSE_TIMEOUT)
             log_debug(
                 f"[selenium] Driver timeouts set to {AWAIT_RESPONSE_TIMEOUT}s"
             )
@@ -1998,12 +2100,13 @@ class SeleniumGrokPlugin(AIPluginBase):
                 "--disable-client-side-phishing-detection",
             ]
 
-            # Use a shared profile directory to maintain login sessions
+            # Use a shared profile directory to maintain login sessions;
+            # after a standby took over keep using its profile slot
             config_home = os.getenv(
                 "XDG_CONFIG_HOME",
                 os.path.join(os.path.expanduser("~"), ".config"),
             )
-            profile_dir = os.path.join(config_home, "chromium-synth")
+            profile_dir = self.profile_dir or os.path.join(config_home, "chromium-synth")
             self.profile_dir = profile_dir
 
             chromium_binary = self._locate_chromium_binary()
@@ -2019,59 +2122,6 @@ class SeleniumGrokPlugin(AIPluginBase):
                 try:
                     log_debug(f"[selenium] Initialization attempt {attempt + 1}/{max_retries}")
 
-                    # Create Chromium options optimized for container environments
-                    options = uc.ChromeOptions()
-
-                    # Configure Chromium/chromedriver logging based on LOGGING_LEVEL
-                    os.makedirs(_LOG_DIR, exist_ok=True)
-                    log_path = os.path.join(_LOG_DIR, "chromium.log")
-                    service_log_path = os.path.join(_LOG_DIR, "chromedriver.log")
-                    service = Service(log_path=service_log_path, service_args=["--verbose"])
-                    log_debug(
-                        f"[selenium] Chromium log -> {log_path}, chromedriver log -> {service_log_path}"
-                    )
-
-                    logging_level = os.getenv("LOGGING_LEVEL", "ERROR").upper()
-                    level_map = {"DEBUG": 0, "INFO": 0, "WARNING": 1, "ERROR": 2, "CRITICAL": 2}
-                    chromium_level = level_map.get(logging_level, 2)
-
-                    # Essential options for Docker containers
-                    essential_args = [
-                        "--no-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-setuid-sandbox",
-                        "--disable-gpu",
-                        "--disable-software-rasterizer",
-                        "--disable-extensions",
-                        "--disable-web-security",
-                        "--start-maximized",
-                        "--no-first-run",
-                        "--disable-default-apps",
-                        "--disable-popup-blocking",
-                        "--disable-infobars",
-                        "--disable-background-timer-throttling",
-                        "--disable-backgrounding-occluded-windows",
-                        "--disable-renderer-backgrounding",
-                        "--memory-pressure-off",
-                        "--disable-features=VizDisplayCompositor",
-                        "--enable-logging",
-                        f"--log-level={chromium_level}",
-                        f"--log-file={log_path}",
-                        "--remote-debugging-port=0",
-                        "--disable-background-mode",
-                        "--disable-default-browser-check",
-                        "--disable-hang-monitor",
-                        "--disable-prompt-on-repost",
-                        "--disable-sync",
-                        "--metrics-recording-only",
-                        "--no-default-browser-check",
-                        "--safebrowsing-disable-auto-update",
-                        "--disable-client-side-phishing-detection",
-                    ]
-                    for arg in essential_args:
-                        options.add_argument(arg)
-                    options.add_argument(f"--user-data-dir={profile_dir}")
-
                     # Clear any existing driver cache
                     import tempfile
                     import shutil
@@ -2080,25 +2130,8 @@ class SeleniumGrokPlugin(AIPluginBase):
                         shutil.rmtree(uc_cache_dir, ignore_errors=True)
                         log_debug("[selenium] Cleared undetected-chromedriver cache")
 
-                    # Try with explicit Chromium binary
-                    log_debug(
-                        f"[selenium] Calling {chromium_binary} {' '.join(options.arguments)}"
-                    )
-                    headless = bool(CHROMIUM_HEADLESS)
-                    log_debug(
-                        f"[selenium] Headless mode {'enabled' if headless else 'disabled'}"
-                    )
-                    self.driver = uc.Chrome(
-                        options=options,
-                        service=service,
-                        headless=headless,
-                        use_subprocess=True,
-                        version_main=chromium_major,
-                        suppress_welcome=True,
-                        log_level=int(chromium_level),
-                        driver_executable_path=None,  # Let UC handle chromedriver
-                        browser_executable_path=chromium_binary,
-                        user_data_dir=profile_dir
+                    self.driver = self._launch_chromium(
+                        profile_dir, chromium_binary, chromium_major
                     )
                     self._apply_driver_timeouts()
                     log_debug(
@@ -2202,6 +2235,98 @@ class SeleniumGrokPlugin(AIPluginBase):
                                     f"Chromium initialization failed after retries: {e3}"
                                 )
 
+    def _launch_chromium(self, profile_dir: str, chromium_binary: str, chromium_major: Optional[int]):
+        """Start Chromium on ``profile_dir`` and return its driver, without retries."""
+        # Create Chromium options optimized for container environments
+        options = uc.ChromeOptions()
+
+        # Configure Chromium/chromedriver logging based on LOGGING_LEVEL
+        os.makedirs(_LOG_DIR, exist_ok=True)
+        log_path = os.path.join(_LOG_DIR, "chromium.log")
+        service_log_path = os.path.join(_LOG_DIR, "chromedriver.log")
+        service = Service(log_path=service_log_path, service_args=["--verbose"])
+        log_debug(
+            f"[selenium] Chromium log -> {log_path}, chromedriver log -> {service_log_path}"
+        )
+
+        logging_level = os.getenv("LOGGING_LEVEL", "ERROR").upper()
+        level_map = {"DEBUG": 0, "INFO": 0, "WARNING": 1, "ERROR": 2, "CRITICAL": 2}
+        chromium_level = level_map.get(logging_level, 2)
+
+        # Essential options for Docker containers
+        essential_args = [
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-setuid-sandbox",
+            "--disable-gpu",
+            "--disable-software-rasterizer",
+            "--disable-extensions",
+            "--disable-web-security",
+            "--start-maximized",
+            "--no-first-run",
+            "--disable-default-apps",
+            "--disable-popup-blocking",
+            "--disable-infobars",
+            "--disable-background-timer-throttling",
+            "--disable-backgrounding-occluded-windows",
+            "--disable-renderer-backgrounding",
+            "--memory-pressure-off",
+            "--disable-features=VizDisplayCompositor",
+            "--enable-logging",
+            f"--log-level={chromium_level}",
+            f"--log-file={log_path}",
+            "--remote-debugging-port=0",
+            "--disable-background-mode",
+            "--disable-default-browser-check",
+            "--disable-hang-monitor",
+            "--disable-prompt-on-repost",
+            "--disable-sync",
+            "--metrics-recording-only",
+            "--no-default-browser-check",
+            "--safebrowsing-disable-auto-update",
+            "--disable-client-side-phishing-detection",
+        ]
+        for arg in essential_args:
+            options.add_argument(arg)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+        # Try with explicit Chromium binary
+        log_debug(
+            f"[selenium] Calling {chromium_binary} {' '.join(options.arguments)}"
+        )
+        headless = bool(CHROMIUM_HEADLESS)
+        log_debug(
+            f"[selenium] Headless mode {'enabled' if headless else 'disabled'}"
+        )
+        return uc.Chrome(
+            options=options,
+            service=service,
+            headless=headless,
+            use_subprocess=True,
+            version_main=chromium_major,
+            suppress_welcome=True,
+            log_level=int(chromium_level),
+            driver_executable_path=None,  # Let UC handle chromedriver
+            browser_executable_path=chromium_binary,
+            user_data_dir=profile_dir
+        )
+
+    def _launch_standby(self, profile_dir: str):
+        """Start the standby browser (standby worker only)."""
+        chromium_binary = self._locate_chromium_binary()
+        driver = self._launch_chromium(
+            profile_dir, chromium_binary, self._get_chromium_major_version(chromium_binary)
+        )
+        self._apply_driver_timeouts(driver)
+        return driver
+
+    def _prepare_standby(self, driver) -> bool:
+        """Log the standby in and select the model so it can take over at once."""
+        if not self._ensure_logged_in(driver, notify=False):
+            return False
+        ensure_grok_model(driver)
+        return True
+
     def _cleanup_chromium_remnants(self):
         """Clean up Chromium processes and leftover lock files."""
         try:
@@ -2268,17 +2393,16 @@ class SeleniumGrokPlugin(AIPluginBase):
 
     # [FIX] ensure the WebDriver session is alive before use
     def _get_driver(self):
-        """Return a valid WebDriver, recreating it if the session is dead."""
-        if self.driver is None:
-            try:
-                self._init_driver()
-            except Exception as e:
-                log_error(f"[selenium] Failed to initialize driver: {e}")
-                return None
-        else:
+        """Return a valid WebDriver, replacing it if the session is dead.
+
+        A dead browser is replaced by the warm standby when one is ready;
+        otherwise Chromium is restarted here.
+        """
+        if self.driver is not None:
             try:
                 # simple command to verify the session is still alive
                 self.driver.execute_script("return 1")
+                return self.driver
             except Exception as e:
                 log_warning(f"[selenium] WebDriver session error: {e}. Restarting")
                 try:
@@ -2286,38 +2410,163 @@ class SeleniumGrokPlugin(AIPluginBase):
                 except Exception:
                     pass
                 self.driver = None
-                try:
-                    self._init_driver()
-                except Exception as e:
-                    log_error(f"[selenium] Failed to reinitialize driver: {e}")
-                    return None
+        standby = self._standby.take()
+        if standby is not None:
+            self.driver, self.profile_dir = standby
+        else:
+            # A restart kills every Chromium of this process, the standby included
+            self._standby.discard()
+            try:
+                self._init_driver()
+            except Exception as e:
+                log_error(f"[selenium] Failed to initialize driver: {e}")
+                return None
+        if self.driver is not None:
+            self._standby.ensure(self.profile_dir)
         return self.driver
 
-    def _ensure_logged_in(self):
+    def _ensure_logged_in(self, driver=None, notify: bool = True):
+        driver = driver or self.driver
         try:
-            current_url = self.driver.current_url
+            current_url = driver.current_url
         except Exception:
             current_url = ""
         log_debug(f"[selenium] [STEP] Checking login state at {current_url}")
 
         if not current_url.startswith("https://grok.com") and not current_url.startswith("https://chatgpt.com"):
             try:
-                self.driver.get("https://grok.com")
-                current_url = self.driver.current_url
+                driver.get("https://grok.com")
+                current_url = driver.current_url
             except Exception as e:
                 log_warning(f"[selenium] Failed to navigate to ChatGPT home: {e}")
             if not current_url.startswith(("https://grok.com", "https://chatgpt.com")):
-                _notify_gui("🔐 Login or challenge detected. Open UI")
+                if notify:
+                    _notify_gui("🔐 Login or challenge detected. Open UI")
                 return False
 
         if current_url and ("login" in current_url or "auth0" in current_url):
             log_debug("[selenium] Login required, notifying user")
-            _notify_gui("🔐 Login required. Open UI")
+            if notify:
+                _notify_gui("🔐 Login required. Open UI")
             return False
 
         log_debug("[selenium] Logged in and ready")
         return True
 
+    def _open_page(self, driver, url: str, timeout: int) -> None:
+        """Load ``url`` and wait for the prompt textarea (browser worker only)."""
+        driver.get(url)
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.TAG_NAME, "textarea"))
+        )
+
+    async def _current_chat_id(self, driver, tab) -> Optional[str]:
+        """Conversation id from the URL open in ``tab``."""
+        return await self._tab_call(tab, lambda: _extract_chat_id(driver.current_url))
+
+    def _tab_key(self, bot, message) -> tuple:
+        return (
+            self._get_interface_name(bot),
+            str(message.chat_id),
+            str(getattr(message, "thread_id", None)),
+        )
+
+    def _focus_tab(self, tab) -> None:
+        """Switch the driver to ``tab``'s window, opening one if needed (browser worker only)."""
+        driver = self.driver
+        if driver is None:
+            return
+        if driver is not self._tabs_driver:
+            # New browser session: every handle we knew is gone
+            self._tabs.reset()
+            self._tabs_driver = driver
+            self._focused_handle = None
+        if tab.handle is not None:
+            if tab.handle == self._focused_handle:
+                return
+            try:
+                driver.switch_to.window(tab.handle)
+                self._focused_handle = tab.handle
+                return
+            except WebDriverException as e:
+                log_debug(f"[selenium] Tab {tab.handle} is gone, replacing it: {e}")
+                tab.handle = None
+        owned = set(self._tabs.handles())
+        free = [handle for handle in driver.window_handles if handle not in owned]
+        if free:
+            driver.switch_to.window(free[0])
+        else:
+            driver.switch_to.new_window("tab")
+        tab.handle = driver.current_window_handle
+        self._focused_handle = tab.handle
+
+    async def _tab_call(self, tab, fn, *args, step: Optional[str] = None):
+        """Run ``fn(*args)`` on the browser worker with ``tab`` focused."""
+        def in_tab():
+            self._focus_tab(tab)
+            return fn(*args)
+
+        return await self._browser.call(in_tab, step=step)
+
+    async def _tab_steps(self, tab, fn, *args, step: Optional[str] = None, **kwargs):
+        """Run the step command ``fn(*args, **kwargs)`` in ``tab``, refocusing it before every step."""
+        return await self._browser.call_steps(
+            fn, *args, step=step, before=lambda: self._focus_tab(tab), **kwargs
+        )
+
+    async def _release_tab(self, tab, ok: bool) -> None:
+        """Give ``tab`` back to the pool and close its window if the pool dropped it."""
+        if not await self._tabs.release(tab, ok) or tab.handle is None:
+            return
+        handle = tab.handle
+
+        def close():
+            driver = self.driver
+            if driver is None:
+                return
+            handles = driver.window_handles
+            # The last window stays open; the next tab adopts it
+            if handle not in handles or len(handles) <= 1:
+                return
+            driver.switch_to.window(handle)
+            driver.close()
+            self._focused_handle = None
+
+        try:
+            await self._browser.call(close, step="close_tab")
+            log_debug(f"[selenium] Recycled tab {handle}")
+        except Exception as e:
+            log_warning(f"[selenium] Failed to close tab {handle}: {e}")
+
+    async def _prompt_in_tab(self, key, chat_id, prompt_text: str, previous_text: str) -> Optional[str]:
+        """Send a prompt in the tab of conversation ``key``.
+
+        Corrections arrive while the original message still holds its tab,
+        so a busy tab of the same conversation is used without a new lease.
+        """
+        tab = self._tabs.pinned(key)
+        if tab is not None and tab.busy:
+            return await self._tab_steps(
+                tab, prompt_steps, self.driver, chat_id, prompt_text, previous_text, step="prompt"
+            )
+        tab = await self._tabs.acquire(key)
+        answered = False
+        try:
+            response_text = await self._tab_steps(
+                tab, prompt_steps, self.driver, chat_id, prompt_text, previous_text, step="prompt"
+            )
+            answered = True
+            return response_text
+        finally:
+            await self._release_tab(tab, answered)
+
+    def get_browser_stats(self) -> dict:
+        """Mailbox depth and per-step timings of the browser worker, tab usage and the standby."""
+        stats = self._browser.stats()
+        stats["tabs"] = self._tabs.stats()
+        stats["standby"] = self._standby.stats()
+        return stats
+
     async def _send_error_message(self, bot, message, error_text="😵‍💫"):
         """Send an error message to the chat."""
         send_params = {"chat_id": message.chat_id, "text": error_text}
@@ -2357,7 +2606,7 @@ class SeleniumGrokPlugin(AIPluginBase):
         # Check if prompt contains image data
         # Handle both dict and string inputs
         if isinstance(prompt, dict):
-            prompt_text = json.dumps(prompt, ensure_ascii=False)
+            prompt_text = serialize_prompt(prompt)
             image_info = _extract_image_info_from_prompt(prompt)
         else:
             # prompt is already a string
@@ -2388,7 +2637,7 @@ class SeleniumGrokPlugin(AIPluginBase):
                 elif image_data.get('type') == 'attachment' and 'url' in image_data:
                     # Discord attachment or other URL-based image
                     try:
-                        response = requests.get(image_data['url'], timeout=30)
+                        response = await asyncio.to_thread(requests.get, image_data['url'], timeout=30)
                         response.raise_for_status()
                         
                         filename = image_data.get('filename', 'image.jpg')
@@ -2408,32 +2657,49 @@ class SeleniumGrokPlugin(AIPluginBase):
                 log_error(f"[selenium] Error processing image: {e}")
                 temp_image_path = None
 
+        tab = await self._tabs.acquire(self._tab_key(bot, message))
+        delivered = False
+        try:
+            delivered = await self._attempt_message(bot, message, prompt, temp_image_path, tab)
+        finally:
+            await self._release_tab(tab, delivered)
+
+        # Clean up temporary image file
+        if temp_image_path and os.path.exists(temp_image_path):
+            try:
+                os.remove(temp_image_path)
+                log_debug(f"[selenium] Cleaned up temporary image: {temp_image_path}")
+            except Exception as e:
+                log_warning(f"[selenium] Failed to clean up temporary image: {e}")
+
+    async def _attempt_message(self, bot, message, prompt, temp_image_path, tab) -> bool:
+        """Run the prompt in ``tab`` with retries; return whether a reply was delivered."""
         max_attempts = 3
         for attempt in range(max_attempts):
-            driver = self._get_driver()
+            driver = await self._browser.call(self._get_driver, step="get_driver")
             if not driver:
                 log_error("[selenium] WebDriver unavailable, aborting")
                 _notify_gui("\u274c Selenium driver not available. Open UI")
                 await self._send_error_message(bot, message)
-                return
+                return False
             if (
                 not driver.service
                 or not getattr(driver.service, "process", None)
                 or driver.service.process.poll() is not None
             ):
                 log_warning("[selenium] Driver process not running, restarting")
-                driver = self._get_driver()
+                driver = await self._browser.call(self._get_driver, step="get_driver")
                 if not driver:
                     log_error("[selenium] Failed to restart WebDriver")
                     _notify_gui("\u274c Selenium driver not available. Open UI")
                     await self._send_error_message(bot, message)
-                    return
+                    return False
 
-            if not self._ensure_logged_in():
+            if not await self._tab_call(tab, self._ensure_logged_in, step="login_check"):
                 if attempt == max_attempts - 1:
                     await self._send_error_message(bot, message)
-                    return
-                time.sleep(2 * (attempt + 1))
+                    return False
+                await asyncio.sleep(2 * (attempt + 1))
                 continue
 
             log_debug("[selenium][STEP] ensuring ChatGPT is accessible")
@@ -2449,13 +2715,13 @@ class SeleniumGrokPlugin(AIPluginBase):
             chat_id = await chat_link_store.get_grok_link(
                 message.chat_id, thread_id, interface=interface_name
             )
-            prompt_text = json.dumps(prompt, ensure_ascii=False)
+            prompt_text = serialize_prompt(prompt)
             if isinstance(prompt, dict) and "system_message" in prompt:
                 prompt_text = f"```json\n{prompt_text}\n```"
             if not chat_id:
                 path = recent_chats.get_chat_path(message.chat_id)
-                if path and go_to_chat_by_path_with_retries(driver, path):
-                    chat_id = _extract_chat_id(driver.current_url)
+                if path and await self._tab_call(tab, go_to_chat_by_path_with_retries, driver, path):
+                    chat_id = await self._current_chat_id(driver, tab)
                     if chat_id:
                         await chat_link_store.store_grok_link(
                             message.chat_id,
@@ -2471,22 +2737,19 @@ class SeleniumGrokPlugin(AIPluginBase):
                     if path:
                         log_warning(f"[selenium] Chat path {path} no longer accessible (archived/deleted), creating new chat")
                         recent_chats.clear_chat_path(message.chat_id)
-                    _open_new_chat(driver)
+                    await self._tab_call(tab, _open_new_chat, driver, step="new_chat")
             else:
                 chat_url = f"https://grok.com/c/{chat_id}"
                 try:
-                    driver.get(chat_url)
-                    WebDriverWait(driver, 120).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "textarea"))
-                    )
+                    await self._tab_call(tab, self._open_page, driver, chat_url, 120, step="page_ready")
                     log_debug(f"[selenium] Successfully accessed existing chat: {chat_id}")
                 except TimeoutException:
                     log_warning("[selenium] ChatGPT UI not ready after loading existing chat")
                     if attempt == max_attempts - 1:
                         _notify_gui("\u274c ChatGPT UI not ready. Open UI")
                         await self._send_error_message(bot, message)
-                        return
-                    time.sleep(2 * (attempt + 1))
+                        return False
+                    await asyncio.sleep(2 * (attempt + 1))
                     continue
                 except Exception as e:
                     log_warning(f"[selenium] Existing chat {chat_id} no longer accessible: {e}")
@@ -2495,7 +2758,7 @@ class SeleniumGrokPlugin(AIPluginBase):
                         message.chat_id, thread_id, interface=interface_name
                     )
                     recent_chats.clear_chat_path(message.chat_id)
-                    _open_new_chat(driver)
+                    await self._tab_call(tab, _open_new_chat, driver, step="new_chat")
                     chat_id = None
 
             log_debug(f"[selenium][DEBUG] Chat ID from store: {chat_id}")
@@ -2505,41 +2768,38 @@ class SeleniumGrokPlugin(AIPluginBase):
 
             if not chat_id:
                 try:
-                    driver.get("https://grok.com")
-                    WebDriverWait(driver, 180).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "textarea"))
-                    )
+                    await self._tab_call(tab, self._open_page, driver, "https://grok.com", 180, step="page_ready")
                 except TimeoutException:
                     log_warning("[selenium][ERROR] ChatGPT UI failed to become ready")
                     if attempt == max_attempts - 1:
                         _notify_gui("\u274c Selenium error: ChatGPT UI not ready. Open UI")
                         await self._send_error_message(bot, message)
-                        return
-                    time.sleep(2 * (attempt + 1))
+                        return False
+                    await asyncio.sleep(2 * (attempt + 1))
                     continue
                 except Exception:
                     log_warning("[selenium][ERROR] ChatGPT UI failed to load")
                     if attempt == max_attempts - 1:
                         _notify_gui("\u274c Selenium error: ChatGPT UI not ready. Open UI")
                         await self._send_error_message(bot, message)
-                        return
-                    time.sleep(2 * (attempt + 1))
+                        return False
+                    await asyncio.sleep(2 * (attempt + 1))
                     continue
 
             try:
                 # Critical section: process prompt with robust error handling
                 response_text = None
                 try:
-                    import asyncio
                     # Add timeout to prevent blocking the entire system
                     timeout_seconds = 300  # 5 minutes timeout
                     
                     if chat_id:
                         previous = get_previous_response(message.chat_id)
                         response_text = await asyncio.wait_for(
-                            asyncio.get_event_loop().run_in_executor(
-                                None, 
-                                lambda: process_prompt_in_chat(driver, chat_id, prompt_text, previous, temp_image_path)
+                            self._tab_steps(
+                                tab, prompt_steps, driver, chat_id, prompt_text, previous, temp_image_path,
+                                step="prompt",
+                                on_text=reply_stream.begin(interface_name, message.chat_id),
                             ),
                             timeout=timeout_seconds
                         )
@@ -2548,17 +2808,17 @@ class SeleniumGrokPlugin(AIPluginBase):
                     else:
                         previous = get_previous_response(message.chat_id)
                         response_text = await asyncio.wait_for(
-                            asyncio.get_event_loop().run_in_executor(
-                                None,
-                                lambda: process_prompt_in_chat(driver, None, prompt_text, previous, temp_image_path)
+                            self._tab_steps(
+                                tab, prompt_steps, driver, None, prompt_text, previous, temp_image_path,
+                                step="prompt",
+                                on_text=reply_stream.begin(interface_name, message.chat_id),
                             ),
                             timeout=timeout_seconds
                         )
                         if response_text:
                             update_previous_response(message.chat_id, response_text)
-                            new_chat_id = _extract_chat_id(driver.current_url)
+                            new_chat_id = await self._current_chat_id(driver, tab)
                             log_debug(f"[selenium][DEBUG] New chat created, extracted ID: {new_chat_id}")
-                            log_debug(f"[selenium][DEBUG] Current URL: {driver.current_url}")
                             if new_chat_id:
                                 await chat_link_store.store_grok_link(
                                     message.chat_id,
@@ -2580,7 +2840,7 @@ class SeleniumGrokPlugin(AIPluginBase):
                     log_error(f"[selenium] TIMEOUT: process_prompt_in_chat took longer than {timeout_seconds} seconds")
                     _notify_gui("\u23f3 Grok request timed out. Try again")
                     await self._send_error_message(bot, message)
-                    return
+                    return False
                 except Exception as prompt_error:
                     # Critical error in process_prompt_in_chat
                     log_error(f"[selenium] CRITICAL ERROR in process_prompt_in_chat: {repr(prompt_error)}")
@@ -2588,22 +2848,22 @@ class SeleniumGrokPlugin(AIPluginBase):
                     log_error(f"[selenium] Full traceback: {traceback.format_exc()}")
                     response_text = None  # Ensure it's None for fallback handling
 
-                if _check_conversation_full(driver):
-                    current_id = chat_id or _extract_chat_id(driver.current_url)
+                if await self._tab_call(tab, _check_conversation_full, driver):
+                    current_id = chat_id or await self._current_chat_id(driver, tab)
                     global queue_paused
                     queue_paused = True
-                    _open_new_chat(driver)
+                    await self._tab_call(tab, _open_new_chat, driver, step="new_chat")
                     # Process prompt in new chat with timeout
-                    import asyncio
                     timeout_seconds = 300  # 5 minutes timeout
                     response_text = await asyncio.wait_for(
-                        asyncio.get_event_loop().run_in_executor(
-                            None,
-                            lambda: process_prompt_in_chat(driver, None, prompt_text, "", temp_image_path)
+                        self._tab_steps(
+                            tab, prompt_steps, driver, None, prompt_text, "", temp_image_path,
+                            step="prompt",
+                            on_text=reply_stream.begin(interface_name, message.chat_id),
                         ),
                         timeout=timeout_seconds
                     )
-                    new_chat_id = _extract_chat_id(driver.current_url)
+                    new_chat_id = await self._current_chat_id(driver, tab)
                     if new_chat_id:
                         await chat_link_store.store_grok_link(
                             message.chat_id,
@@ -2648,7 +2908,7 @@ class SeleniumGrokPlugin(AIPluginBase):
                 log_debug(
                     f"[selenium][STEP] response forwarded to {message.chat_id}"
                 )
-                break  # Success, exit the retry loop
+                return True
 
             except Exception as e:
                 log_error(f"[selenium][ERROR] failed to process message: {repr(e)}", e)
@@ -2670,15 +2930,9 @@ class SeleniumGrokPlugin(AIPluginBase):
                         )
                     except Exception as fallback_error:
                         log_error(f"[selenium] CRITICAL: Even fallback message failed: {repr(fallback_error)}")
-                    break  # Max attempts reached, exit
+                    return False
                 
-        # Clean up temporary image file
-        if temp_image_path and os.path.exists(temp_image_path):
-            try:
-                os.remove(temp_image_path)
-                log_debug(f"[selenium] Cleaned up temporary image: {temp_image_path}")
-            except Exception as e:
-                log_warning(f"[selenium] Failed to clean up temporary image: {e}")
+        return False
 
     async def clean_chat_link(chat_id: int, interface: str) -> str:
         """Remove the association between a chat and a ChatGPT conversation.
@@ -3,7 +3,7 @@ import signal
 import sys
 import subprocess
 import asyncio
-from core.db import init_db, test_connection, get_conn
+from core.db import init_db, test_connection, acquire, init_pool, close_pool
 # from core.blocklist import init_blocklist_table  # Now handled by blocklist plugin
 from core.logging_utils import (
     log_debug,
@@ -15,6 +15,8 @@ from core.logging_utils import (
 
 # Global restart flag
 _restart_requested = False
+# Set when a signal asks the running application to stop
+_shutdown_requested = False
 _restart_event = None
 # Global flag to preserve dev components state across restarts
 _dev_components_enabled = False
@@ -29,6 +31,15 @@ def request_restart():
         _restart_event.set()
 
 
+def request_shutdown(signum=None):
+    """Request a graceful shutdown of the running application."""
+    global _shutdown_requested
+    log_info(f"[main] Received signal {signum}, shutting down gracefully...")
+    _shutdown_requested = True
+    if _restart_event:
+        _restart_event.set()
+
+
 def set_dev_components_enabled(enabled: bool):
     """Set whether dev components should be loaded (preserved across restarts)."""
     global _dev_components_enabled
@@ -60,6 +71,18 @@ def cleanup_components():
                     log_debug(f"[main] Cleaned up engine: {engine_name}")
             except Exception as e:
                 log_warning(f"[main] Failed to cleanup engine {engine_name}: {e}")
+
+        # Stop plugins so background tasks do not outlive a restart
+        from core.core_initializer import PLUGIN_REGISTRY
+        for plugin_name, plugin_obj in list(PLUGIN_REGISTRY.items()):
+            stop = getattr(plugin_obj, 'stop', None)
+            if not callable(stop) or asyncio.iscoroutinefunction(stop):
+                continue
+            try:
+                stop()
+                log_debug(f"[main] Stopped plugin: {plugin_name}")
+            except Exception as e:
+                log_warning(f"[main] Failed to stop plugin {plugin_name}: {e}")
         
         log_info("[main] Component cleanup completed")
         
@@ -85,20 +108,16 @@ async def initialize_database():
     # Verifica dei permessi dell'utente del database
     async def check_permissions():
         log_debug("[main] Checking database permissions...")
-        conn = None
         try:
-            conn = await get_conn()
-            async with conn.cursor() as cur:
-                await cur.execute("SHOW GRANTS FOR CURRENT_USER()")
-                grants = await cur.fetchall()
-                log_debug("[main] Database permissions check completed")
-                return grants
+            async with acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SHOW GRANTS FOR CURRENT_USER()")
+                    grants = await cur.fetchall()
+                    log_debug("[main] Database permissions check completed")
+                    return grants
         except Exception as e:
             log_error(f"[main] Error checking database permissions: {repr(e)}")
             raise
-        finally:
-            if conn:
-                conn.close()
 
     try:
         grants = await check_permissions()
@@ -182,6 +201,14 @@ if __name__ == "__main__":
     async def start_application():
         """Start the application and handle restart requests."""
         global _restart_requested, _restart_event
+
+        # Stop from inside the loop so async resources can be closed
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, request_shutdown, signum)
+            except (NotImplementedError, RuntimeError):
+                pass  # signal_handler stays in place
         
         while True:
             _restart_requested = False
@@ -189,6 +216,9 @@ if __name__ == "__main__":
             
             # Initialize core components - they will auto-discover and load all interfaces/plugins/engines
             try:
+                # Shared DB pool lives on this loop for the whole process lifetime
+                await init_pool()
+
                 log_info("[main] Initializing core components...")
                 from core.core_initializer import core_initializer
                 
@@ -239,9 +269,22 @@ if __name__ == "__main__":
                 
                 if _restart_requested:
                     log_info("[main] 🔄 Restart requested - cleaning up and restarting...")
+
+                    # Stop the queue consumers; pending messages stay journaled
+                    from core import message_queue
+                    await message_queue.close()
+
+                    # Write buffered chat activity before components go away
+                    from core import recent_chats
+                    await recent_chats.shutdown()
+                    from plugins import bio_manager
+                    await bio_manager.shutdown()
                     
                     # Cleanup components
                     cleanup_components()
+
+                    # Drop pooled connections; the next iteration opens a new pool
+                    await close_pool()
                     
                     # Clear registries
                     from core.core_initializer import INTERFACE_REGISTRY, PLUGIN_REGISTRY
@@ -256,6 +299,17 @@ if __name__ == "__main__":
                     log_info("[main] ✅ Cleanup completed - restarting application...")
                     await asyncio.sleep(1)  # Brief pause before restart
                     continue  # Loop back to restart
+
+                if _shutdown_requested:
+                    from core import message_queue, recent_chats
+                    from plugins import bio_manager
+                    await message_queue.close()
+                    await recent_chats.shutdown()
+                    await bio_manager.shutdown()
+                    cleanup_components()
+                    await close_pool()
+                    log_info("[main] Shutdown complete")
+                    break
                     
             except KeyboardInterrupt:
                 log_info("[main] Received shutdown signal, exiting...")
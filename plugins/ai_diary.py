@@ -17,7 +17,7 @@ import aiomysql
 import threading
 from contextlib import asynccontextmanager
 
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_error, log_info, log_debug, log_warning
 
 # Injection priority for diary entries
@@ -225,19 +225,14 @@ def should_include_diary(interface_name: str, current_prompt_length: int = 0, ma
 
 @asynccontextmanager
 async def get_db():
-    """Context manager for MariaDB database connections."""
-    conn = None
+    """Context manager for pooled MariaDB database connections."""
     try:
-        conn = await get_conn()
-        log_debug("[ai_diary] Opened database connection")
-        yield conn
+        async with acquire() as conn:
+            log_debug("[ai_diary] Acquired database connection")
+            yield conn
     except Exception as e:
         log_error(f"[ai_diary] Database error: {e}")
         raise
-    finally:
-        if conn:
-            conn.close()
-            log_debug("[ai_diary] Connection closed")
 
 
 async def init_diary_table():
@@ -6,11 +6,14 @@ from typing import Any, Callable
 import asyncio
 import aiomysql
 import threading
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_error, log_info, log_debug, log_warning
 from core.core_initializer import core_initializer, register_plugin
+from core.config_manager import config_registry
 
 
 # Injection priority for participant bios
@@ -27,19 +30,107 @@ register_injection_priority()
 
 @asynccontextmanager
 async def get_db():
-    """Context manager for MariaDB database connections."""
-    conn = None
+    """Context manager for pooled MariaDB database connections."""
     try:
-        conn = await get_conn()
-        log_debug("[bio_manager] Opened database connection")
-        yield conn
+        async with acquire() as conn:
+            log_debug("[bio_manager] Acquired database connection")
+            yield conn
     except Exception as e:
         log_error(f"[bio_manager] Database error: {e}")
         raise
-    finally:
-        if conn:
-            conn.close()
-            log_debug("[bio_manager] Connection closed")
+
+
+# Set once init_bio_table() has run so hot paths skip the DDL round-trips
+_table_ready = False
+
+# Deferred last_accessed stamps, flushed in a single bulk upsert
+_pending_access: dict[str, str] = {}
+_access_flush_task: asyncio.Task | None = None
+ACCESS_FLUSH_DELAY = 5.0
+
+
+class _BioCache:
+    """LRU cache of lightweight bios keyed by user id, with a per-entry TTL.
+
+    Cached dicts are shared between callers and must be treated as read-only.
+    An empty dict is cached for users without a bio row so that unknown
+    participants do not cost a query on every prompt either.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # _run() executes coroutines on helper threads, so guard the dict
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or (self.ttl > 0 and time.monotonic() - entry[0] > self.ttl):
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id: str, bio: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), bio)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+    def configure(self, max_size: int | None = None, ttl: float | None = None) -> None:
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+                while len(self._entries) > max(self.max_size, 0):
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            if ttl is not None:
+                self.ttl = ttl
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+_bio_cache = _BioCache()
+
+
+def get_bio_cache_stats() -> dict:
+    """Return hit/miss counters and occupancy of the lightweight bio cache."""
+    return _bio_cache.stats()
+
+
+def invalidate_bio_cache(user_id: str | None = None) -> None:
+    """Drop the cached bio for ``user_id``, or every cached bio when omitted."""
+    _bio_cache.invalidate(user_id)
 
 
 JSON_LIST_FIELDS = {"known_as", "likes", "not_likes", "past_events", "feelings", "social_accounts"}
@@ -68,6 +159,7 @@ DEFAULTS = {
 
 async def init_bio_table():
     """Initialize the bio table if it doesn't exist and ensure all required columns are present."""
+    global _table_ready
     async with get_db() as conn:
         cursor = await conn.cursor()
         
@@ -118,6 +210,7 @@ async def init_bio_table():
                 log_warning(f"[bio_manager] Could not add user_name column: {e}")
         
         await conn.commit()
+        _table_ready = True
         log_info("[bio_manager] Bio table initialized and updated")
 
 
@@ -145,27 +238,52 @@ def _run(coro):
 
 
 async def _execute(query: str, params: tuple = ()) -> None:
-    conn = await get_conn()
-    try:
+    async with acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(query, params)
-    finally:
-        conn.close()
 
 
 async def _fetchone(query: str, params: tuple = ()):
-    conn = await get_conn()
-    try:
+    async with acquire() as conn:
         async with conn.cursor(aiomysql.DictCursor) as cur:
             await cur.execute(query, params)
             return await cur.fetchone()
-    finally:
-        conn.close()
+
+
+async def _resolve_user_row(user_identifier: str) -> tuple[str, str] | None:
+    """Find the bio whose user_name or known_as list matches ``user_identifier``."""
+    async with acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, user_name FROM bio WHERE user_name = %s",
+                (user_identifier,),
+            )
+            result = await cur.fetchone()
+            if result:
+                return (result[0], result[1])
+
+            # Search by known_as (more complex since it's JSON)
+            await cur.execute("SELECT id, user_name, known_as FROM bio")
+            for user_id, user_name, known_as_json in await cur.fetchall():
+                try:
+                    known_as = json.loads(known_as_json) if known_as_json else []
+                    if user_identifier in known_as:
+                        return (user_id, user_name or user_id)
+                except Exception:
+                    continue
+    return None
 
 
 def _ensure_table() -> None:
     """Create the bio table if it doesn't exist."""
-    _run(init_bio_table())
+    if not _table_ready:
+        _run(init_bio_table())
+
+
+async def _ensure_table_async() -> None:
+    """Async counterpart of :func:`_ensure_table` for callers already on a loop."""
+    if not _table_ready:
+        await init_bio_table()
 
 
 def _ensure_user_exists(user_id: str) -> None:
@@ -237,6 +355,7 @@ def _ensure_user_exists(user_id: str) -> None:
             except Exception as e2:
                 log_error(f"[bio_manager] Failed to create bio entry for {user_id}: {e2}")
                 raise
+        _bio_cache.invalidate(user_id)
 
 
 def _load_json_field(value: str | None, key: str, default: Any) -> Any:
@@ -268,7 +387,10 @@ def _save_json_field(user_id: str, key: str, value: Any) -> None:
     
     # Use parameterized query to prevent SQL injection
     query = "UPDATE bio SET {}=%s WHERE id=%s".format(key)
-    _run(_execute(query, (json_value, user_id)))
+    try:
+        _run(_execute(query, (json_value, user_id)))
+    finally:
+        _bio_cache.invalidate(user_id)
 
 
 def _merge_nested_dicts(original: dict, updates: dict) -> dict:
@@ -317,8 +439,50 @@ def _update_json_field(user_id: str, key: str, update_fn: Callable[[Any], Any])
         return
 
 
+def _bio_light_from_values(values: dict) -> dict:
+    """Build the lightweight bio from already decoded field values."""
+    result = {
+        "known_as": values.get("known_as"),
+        "likes": values.get("likes"),
+        "not_likes": values.get("not_likes"),
+        "feelings": values.get("feelings"),
+        "information": values.get("information") or "",
+    }
+
+    # Ensure all expected fields exist and are of correct types
+    if not isinstance(result.get("known_as"), list):
+        result["known_as"] = DEFAULTS["known_as"]
+    if not isinstance(result.get("likes"), list):
+        result["likes"] = DEFAULTS["likes"]
+    if not isinstance(result.get("not_likes"), list):
+        result["not_likes"] = DEFAULTS["not_likes"]
+    if not isinstance(result.get("feelings"), list):
+        result["feelings"] = DEFAULTS["feelings"]
+    if not isinstance(result.get("information"), str):
+        result["information"] = ""
+
+    return result
+
+
+def _parse_bio_light(row: dict) -> dict:
+    """Decode a ``bio`` row into the lightweight representation."""
+    return _bio_light_from_values(
+        {
+            "known_as": _load_json_field(row.get("known_as"), "known_as", DEFAULTS["known_as"]),
+            "likes": _load_json_field(row.get("likes"), "likes", DEFAULTS["likes"]),
+            "not_likes": _load_json_field(row.get("not_likes"), "not_likes", DEFAULTS["not_likes"]),
+            "feelings": _load_json_field(row.get("feelings"), "feelings", DEFAULTS["feelings"]),
+            "information": row.get("information"),
+        }
+    )
+
+
 def get_bio_light(user_id: str) -> dict:
     """Return a lightweight bio for the user."""
+    user_id = str(user_id)
+    cached = _bio_cache.get(user_id)
+    if cached is not None:
+        return cached
     try:
         _ensure_table()
         row = _run(
@@ -327,35 +491,123 @@ def get_bio_light(user_id: str) -> dict:
                 (user_id,),
             )
         )
-        if not row:
-            return {}
-        
-        result = {
-            "known_as": _load_json_field(row.get("known_as"), "known_as", DEFAULTS["known_as"]),
-            "likes": _load_json_field(row.get("likes"), "likes", DEFAULTS["likes"]),
-            "not_likes": _load_json_field(row.get("not_likes"), "not_likes", DEFAULTS["not_likes"]),
-            "feelings": _load_json_field(row.get("feelings"), "feelings", DEFAULTS["feelings"]),
-            "information": row.get("information") or "",
-        }
-        
-        # Ensure all expected fields exist and are of correct types
-        if not isinstance(result.get("known_as"), list):
-            result["known_as"] = DEFAULTS["known_as"]
-        if not isinstance(result.get("likes"), list):
-            result["likes"] = DEFAULTS["likes"]
-        if not isinstance(result.get("not_likes"), list):
-            result["not_likes"] = DEFAULTS["not_likes"]
-        if not isinstance(result.get("feelings"), list):
-            result["feelings"] = DEFAULTS["feelings"]
-        if not isinstance(result.get("information"), str):
-            result["information"] = ""
-            
-        return result
+        bio = _parse_bio_light(row) if row else {}
+        _bio_cache.put(user_id, bio)
+        return bio
     except Exception as e:
         log_error(f"[bio_manager] Error in get_bio_light for user {user_id}: {e}")
         return {}
 
 
+async def get_bios_light(user_ids: list[str]) -> dict[str, dict]:
+    """Return lightweight bios for ``user_ids`` using a single ``IN`` query.
+
+    Cached bios are served without touching the database; only cache misses
+    are queried. Users without a bio row are absent from the returned mapping.
+    """
+    ids = list(dict.fromkeys(str(uid) for uid in user_ids if uid))
+    result: dict[str, dict] = {}
+    missing: list[str] = []
+    for uid in ids:
+        cached = _bio_cache.get(uid)
+        if cached is None:
+            missing.append(uid)
+        elif cached:
+            result[uid] = cached
+    if not missing:
+        return result
+    ids = missing
+    try:
+        await _ensure_table_async()
+        placeholders = ", ".join(["%s"] * len(ids))
+        async with get_db() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(
+                    "SELECT id, known_as, likes, not_likes, feelings, information "
+                    f"FROM bio WHERE id IN ({placeholders})",
+                    tuple(ids),
+                )
+                rows = await cur.fetchall()
+        fetched = {str(row["id"]): _parse_bio_light(row) for row in rows}
+        for uid in ids:
+            _bio_cache.put(uid, fetched.get(uid, {}))
+        result.update(fetched)
+        return result
+    except Exception as e:
+        log_error(f"[bio_manager] Error in get_bios_light for {len(ids)} users: {e}")
+        return result
+
+
+async def flush_last_accessed() -> int:
+    """Write all pending ``last_accessed`` stamps with one bulk upsert.
+
+    Missing users get a default bio row, matching the previous per-user path.
+    Returns the number of rows written.
+    """
+    if not _pending_access:
+        return 0
+    pending = dict(_pending_access)
+    _pending_access.clear()
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(pending))
+    params: list[str] = []
+    for uid, stamp in pending.items():
+        params.extend((uid, stamp, stamp))
+    try:
+        await _ensure_table_async()
+        async with get_db() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    f"INSERT INTO bio (id, created_at, last_accessed) VALUES {placeholders} "
+                    "ON DUPLICATE KEY UPDATE last_accessed = VALUES(last_accessed)",
+                    tuple(params),
+                )
+            await conn.commit()
+        log_debug(f"[bio_manager] Flushed last_accessed for {len(pending)} users")
+        return len(pending)
+    except Exception as e:
+        # Keep the stamps for the next flush unless newer ones arrived meanwhile
+        for uid, stamp in pending.items():
+            _pending_access.setdefault(uid, stamp)
+        log_warning(f"[bio_manager] Failed to flush last_accessed: {e}")
+        return 0
+
+
+async def _flush_last_accessed_later() -> None:
+    await asyncio.sleep(ACCESS_FLUSH_DELAY)
+    await flush_last_accessed()
+
+
+def touch_last_accessed(user_ids, when: str | None = None) -> None:
+    """Queue ``last_accessed`` updates for a deferred bulk write."""
+    global _access_flush_task
+    stamp = when or datetime.utcnow().isoformat()
+    for uid in user_ids:
+        _pending_access[str(uid)] = stamp
+    if not _pending_access:
+        return
+    if _access_flush_task is not None and not _access_flush_task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _run(flush_last_accessed())
+        return
+    _access_flush_task = loop.create_task(_flush_last_accessed_later())
+
+
+async def shutdown() -> None:
+    """Stop the deferred flush and write every pending ``last_accessed`` stamp."""
+    global _access_flush_task
+    task, _access_flush_task = _access_flush_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await flush_last_accessed()
+
+
 def get_bio_full(user_id: str) -> dict:
     """Return the full bio for the user."""
     _ensure_table()
@@ -566,6 +818,9 @@ def update_bio_fields(user_id: str, updates: dict) -> None:
             )
         )
 
+    # Write-through so the next prompt build sees the new values without a query
+    _bio_cache.put(str(user_id), _bio_light_from_values(merged))
+
 
 def update_bio_fields_auto(user_id: str, updates: dict) -> None:
     """Update bio fields automatically without checking update limits (for system operations like last_accessed)."""
@@ -671,6 +926,9 @@ def update_bio_fields_auto(user_id: str, updates: dict) -> None:
             )
         )
 
+    # Write-through so the next prompt build sees the new values without a query
+    _bio_cache.put(str(user_id), _bio_light_from_values(merged))
+
 
 def append_to_bio_list(user_id: str, field: str, value: Any) -> None:
     """Append a value to a list field, supporting dot notation for nesting."""
@@ -737,6 +995,44 @@ class BioPlugin:
 
     def __init__(self):
         self._participants: list[dict[str, Any]] = []
+
+        cache_ttl = config_registry.get_value(
+            "BIO_CACHE_TTL",
+            300,
+            label="Bio Cache TTL",
+            description="Seconds a participant bio stays cached in memory before it is re-read from the database.",
+            value_type=int,
+            group="plugins",
+            component="bio_manager",
+            advanced=True,
+        )
+        cache_size = config_registry.get_value(
+            "BIO_CACHE_MAX_SIZE",
+            1024,
+            label="Bio Cache Size",
+            description="Maximum number of participant bios kept in memory (0 disables the cache).",
+            value_type=int,
+            group="plugins",
+            component="bio_manager",
+            advanced=True,
+        )
+        _bio_cache.configure(max_size=int(cache_size), ttl=float(cache_ttl))
+
+        def _update_cache_ttl(value):
+            try:
+                _bio_cache.configure(ttl=float(value))
+            except (ValueError, TypeError):
+                log_warning(f"[bio_manager] Invalid BIO_CACHE_TTL value: {value}")
+
+        def _update_cache_size(value):
+            try:
+                _bio_cache.configure(max_size=int(value))
+            except (ValueError, TypeError):
+                log_warning(f"[bio_manager] Invalid BIO_CACHE_MAX_SIZE value: {value}")
+
+        config_registry.add_listener("BIO_CACHE_TTL", _update_cache_ttl)
+        config_registry.add_listener("BIO_CACHE_MAX_SIZE", _update_cache_size)
+
         register_plugin("bio_manager", self)
         log_info("[bio_manager] BioPlugin initialized and registered")
 
@@ -855,7 +1151,7 @@ class BioPlugin:
             }
         return {}
 
-    def get_static_injection(self, message=None, context_memory=None) -> dict:
+    async def get_static_injection(self, message=None, context_memory=None) -> dict:
         """Gather participants and inject short bios and feelings."""
         if not message or context_memory is None:
             self._participants = []
@@ -893,14 +1189,10 @@ class BioPlugin:
         if not participants:
             return {}
 
+        bios = await get_bios_light([p["id"] for p in participants])
         data = []
-        now = datetime.utcnow().isoformat()
         for p in participants:
-            bio = get_bio_light(p["id"])
-            # Ensure bio is always a dict to prevent 'str' object has no attribute 'get' error
-            if not isinstance(bio, dict):
-                log_warning(f"[bio_manager] get_bio_light returned non-dict for user {p['id']}: {type(bio)} - {bio}")
-                bio = {}
+            bio = bios.get(p["id"], {})
             short_info = bio.get("information", "")[:200]
             entry = {
                 "id": p["id"],
@@ -910,11 +1202,9 @@ class BioPlugin:
                 "feelings": bio.get("feelings", []),
             }
             data.append(entry)
-            try:
-                update_bio_fields_auto(p["id"], {"last_accessed": now})
-            except Exception as e:
-                log_warning(f"[bio_manager] Failed to update last_accessed for user {p['id']}: {e}")
-                # Continue without failing the entire injection
+
+        # Stamp access time in one deferred write instead of a round-trip per user
+        touch_last_accessed(p["id"] for p in participants)
 
         return {"participants": data}
 
@@ -1062,29 +1352,7 @@ class BioPlugin:
         
         # Search through all users for a match in user_name or known_as
         try:
-            conn = get_conn()
-            cursor = conn.cursor()
-            
-            # Search by user_name
-            cursor.execute("SELECT id, user_name FROM bio WHERE user_name = %s", (user_identifier,))
-            result = cursor.fetchone()
-            if result:
-                return (result[0], result[1])
-            
-            # Search by known_as (more complex since it's JSON)
-            cursor.execute("SELECT id, user_name, known_as FROM bio")
-            for row in cursor.fetchall():
-                user_id, user_name, known_as_json = row
-                try:
-                    known_as = json.loads(known_as_json) if known_as_json else []
-                    if user_identifier in known_as:
-                        return (user_id, user_name or user_id)
-                except:
-                    continue
-                
-            conn.close()
-            return None
-            
+            return _run(_resolve_user_row(user_identifier))
         except Exception as e:
             log_warning(f"[bio_manager] Error resolving user {user_identifier}: {e}")
             return None
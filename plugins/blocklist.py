@@ -2,134 +2,238 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import List, Optional, Dict, Any
 import aiomysql
 
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_debug, log_info, log_warning, log_error
+from core.config_manager import config_registry
 from core.core_initializer import core_initializer, register_plugin
 
+# Blocked user ids mirrored from the blocklist table. ``is_user_blocked`` only
+# reads this set; block_user/unblock_user keep it current and a periodic
+# resync picks up edits made by other processes.
+_blocked_ids: set = set()
+_loaded = False
+_last_sync = 0.0
+_resync_interval = 300.0
+# After a failed load, wait this long before the ingress path tries again
+_LOAD_RETRY_DELAY = 30.0
+_next_load_attempt = 0.0
+# Blocks/unblocks committed while a load is running (user id -> blocked), so
+# a SELECT that started before them cannot undo them when the set is swapped
+_load_changes: Optional[Dict[Any, bool]] = None
+_loads_running = 0
+
+
+def _normalize_user_id(user_id):
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        return user_id
+
+
+def _set_blocked(user_id, blocked: bool) -> None:
+    user_id = _normalize_user_id(user_id)
+    if blocked:
+        _blocked_ids.add(user_id)
+    else:
+        _blocked_ids.discard(user_id)
+    if _load_changes is not None:
+        _load_changes[user_id] = blocked
+
 
 async def init_blocklist_table():
     """Initialize the blocklist table if it doesn't exist."""
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS blocklist (
-                    user_id BIGINT PRIMARY KEY,
-                    reason TEXT,
-                    blocked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS blocklist (
+                        user_id BIGINT PRIMARY KEY,
+                        reason TEXT,
+                        blocked_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
                 )
-                """
-            )
-            await conn.commit()
+                await conn.commit()
+        except Exception as e:
+            log_error(f"[blocklist] Failed to initialize table: {e}")
+            raise
+
+
+async def load_blocklist() -> bool:
+    """Replace the in-memory blocklist with the contents of the table."""
+    global _blocked_ids, _loaded, _last_sync, _next_load_attempt, _load_changes, _loads_running
+    if _load_changes is None:
+        _load_changes = {}
+    changes = _load_changes
+    _loads_running += 1
+    try:
+        await init_blocklist_table()
+        async with acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT user_id FROM blocklist")
+                rows = await cur.fetchall()
     except Exception as e:
-        log_error(f"[blocklist] Failed to initialize table: {e}")
-        raise
+        _next_load_attempt = time.monotonic() + _LOAD_RETRY_DELAY
+        log_error(f"[blocklist] Failed to load blocklist: {e}")
+        return False
     finally:
-        conn.close()
+        _loads_running -= 1
+        if _loads_running == 0:
+            _load_changes = None
+
+    blocked_ids = {_normalize_user_id(row[0]) for row in rows}
+    for user_id, blocked in changes.items():
+        if blocked:
+            blocked_ids.add(user_id)
+        else:
+            blocked_ids.discard(user_id)
+    _blocked_ids = blocked_ids
+    _loaded = True
+    _last_sync = time.monotonic()
+    log_debug(f"[blocklist] Loaded {len(_blocked_ids)} blocked user(s)")
+    return True
+
+
+def set_resync_interval(seconds: float) -> None:
+    """Seconds between blocklist reloads; 0 disables the periodic resync."""
+    global _resync_interval
+    _resync_interval = max(0.0, float(seconds))
+
+
+async def _resync_loop() -> None:
+    while True:
+        interval = _resync_interval
+        await asyncio.sleep(interval if interval > 0 else 60.0)
+        if _resync_interval > 0 and time.monotonic() - _last_sync >= _resync_interval:
+            await load_blocklist()
 
 
 async def block_user(user_id: int, reason: str = None):
     """Block a user with optional reason."""
     await init_blocklist_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                REPLACE INTO blocklist (user_id, reason, blocked_at)
-                VALUES (%s, %s, NOW())
-                """,
-                (user_id, reason)
-            )
-            await conn.commit()
-            log_info(f"[blocklist] Blocked user {user_id}: {reason}")
-    except Exception as e:
-        log_error(f"[blocklist] Failed to block user {user_id}: {e}")
-        raise
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    REPLACE INTO blocklist (user_id, reason, blocked_at)
+                    VALUES (%s, %s, NOW())
+                    """,
+                    (user_id, reason)
+                )
+                await conn.commit()
+                _set_blocked(user_id, True)
+                log_info(f"[blocklist] Blocked user {user_id}: {reason}")
+        except Exception as e:
+            log_error(f"[blocklist] Failed to block user {user_id}: {e}")
+            raise
 
 
 async def unblock_user(user_id: int):
     """Unblock a user."""
     await init_blocklist_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                DELETE FROM blocklist WHERE user_id = %s
-                """,
-                (user_id,)
-            )
-            deleted = cur.rowcount
-            await conn.commit()
-            if deleted > 0:
-                log_info(f"[blocklist] Unblocked user {user_id}")
-                return True
-            else:
-                log_warning(f"[blocklist] User {user_id} was not blocked")
-                return False
-    except Exception as e:
-        log_error(f"[blocklist] Failed to unblock user {user_id}: {e}")
-        raise
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    DELETE FROM blocklist WHERE user_id = %s
+                    """,
+                    (user_id,)
+                )
+                deleted = cur.rowcount
+                await conn.commit()
+                _set_blocked(user_id, False)
+                if deleted > 0:
+                    log_info(f"[blocklist] Unblocked user {user_id}")
+                    return True
+                else:
+                    log_warning(f"[blocklist] User {user_id} was not blocked")
+                    return False
+        except Exception as e:
+            log_error(f"[blocklist] Failed to unblock user {user_id}: {e}")
+            raise
 
 
 async def is_user_blocked(user_id: int) -> bool:
-    """Check if a user is blocked."""
-    await init_blocklist_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT 1 FROM blocklist WHERE user_id = %s
-                """,
-                (user_id,)
-            )
-            result = await cur.fetchone()
-            return result is not None
-    except Exception as e:
-        log_error(f"[blocklist] Failed to check if user {user_id} is blocked: {e}")
-        return False
-    finally:
-        conn.close()
+    """Check if a user is blocked.
+
+    Reads the in-memory set only. The table is loaded on first use if the
+    plugin has not been started yet.
+    """
+    if not _loaded and time.monotonic() >= _next_load_attempt:
+        await load_blocklist()
+    return _normalize_user_id(user_id) in _blocked_ids
 
 
 async def get_blocked_users() -> List[Dict]:
     """Get list of all blocked users."""
     await init_blocklist_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor(aiomysql.DictCursor) as cur:
-            await cur.execute(
-                """
-                SELECT user_id, reason, blocked_at
-                FROM blocklist
-                ORDER BY blocked_at DESC
-                """
-            )
-            return await cur.fetchall()
-    except Exception as e:
-        log_error(f"[blocklist] Failed to get blocked users: {e}")
-        return []
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(
+                    """
+                    SELECT user_id, reason, blocked_at
+                    FROM blocklist
+                    ORDER BY blocked_at DESC
+                    """
+                )
+                return await cur.fetchall()
+        except Exception as e:
+            log_error(f"[blocklist] Failed to get blocked users: {e}")
+            return []
 
 
 class BlocklistPlugin:
     """Plugin for user blocking and management."""
 
     def __init__(self):
+        resync = config_registry.get_value(
+            "BLOCKLIST_RESYNC_INTERVAL",
+            300,
+            label="Blocklist Resync Interval",
+            description=(
+                "Seconds between reloads of the blocklist from the database, to pick up "
+                "edits made outside this process (0 disables)."
+            ),
+            value_type=int,
+            group="plugins",
+            component="blocklist",
+            advanced=True,
+        )
+        set_resync_interval(resync)
+
+        def _update_resync(value):
+            try:
+                set_resync_interval(value)
+            except (ValueError, TypeError):
+                log_warning(f"[blocklist] Invalid BLOCKLIST_RESYNC_INTERVAL value: {value}")
+
+        config_registry.add_listener("BLOCKLIST_RESYNC_INTERVAL", _update_resync)
+
+        self._resync_task = None
         register_plugin("blocklist", self)
         log_info("[blocklist] BlocklistPlugin initialized and registered")
 
+    async def start(self):
+        """Load the blocklist into memory and keep it in sync."""
+        await load_blocklist()
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.create_task(_resync_loop())
+
+    def stop(self):
+        """Cancel the periodic resync."""
+        if self._resync_task is not None and not self._resync_task.done():
+            self._resync_task.cancel()
+        self._resync_task = None
+
     def get_supported_action_types(self):
         return ["block_user", "unblock_user", "is_user_blocked", "get_blocked_users"]
 
@@ -213,23 +317,19 @@ class BlocklistPlugin:
             user_id = payload.get("user_id")
             reason = payload.get("reason", "No reason provided")
             if user_id:
-                import asyncio
                 asyncio.create_task(self._block_user_action(bot, original_message, user_id, reason))
                 
         elif action_type == "unblock_user":
             user_id = payload.get("user_id")
             if user_id:
-                import asyncio
                 asyncio.create_task(self._unblock_user_action(bot, original_message, user_id))
                 
         elif action_type == "is_user_blocked":
             user_id = payload.get("user_id")
             if user_id:
-                import asyncio
                 asyncio.create_task(self._check_user_blocked(bot, original_message, user_id))
                 
         elif action_type == "get_blocked_users":
-            import asyncio
             asyncio.create_task(self._send_blocked_users(bot, original_message))
 
     async def _block_user_action(self, bot, original_message, user_id, reason):
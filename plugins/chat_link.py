@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Optional, Dict, Any, Callable, Awaitable, List
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Awaitable, List, Tuple
 import aiomysql
 import json
 
-from core.db import get_conn
+from core.db import acquire
+from core.schema_registry import schema_registry
 from core.logging_utils import log_debug, log_error, log_warning, log_info
 from core.core_initializer import register_plugin
 
@@ -23,6 +27,134 @@ class ChatLinkMultipleMatches(ChatLinkError):
     """Raised when more than one chat link matches a lookup."""
 
 
+# Resolved chat/thread names are kept this long; failed lookups for less
+NAME_CACHE_TTL = 600.0
+NAME_CACHE_NEGATIVE_TTL = 60.0
+NAME_CACHE_SIZE = 1024
+
+
+def _chat_key(interface: Optional[str], chat_id, thread_id) -> Tuple:
+    return (interface, str(chat_id), str(thread_id) if thread_id is not None else None)
+
+
+class _NameCache:
+    """TTL/LRU cache of resolver results with single-flight lookups.
+
+    ``None`` results (resolver missing, failed or empty) are cached for a
+    shorter time so an unreachable chat does not trigger a lookup per
+    message. Concurrent misses for the same key share one resolver call.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Optional[Dict[str, Optional[str]]]]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Optional[Dict[str, Optional[str]]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Tuple, value: Optional[Dict[str, Optional[str]]]) -> None:
+        ttl = self.ttl if value else self.negative_ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Tuple] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[Optional[Dict[str, Optional[str]]]]]):
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            try:
+                value = await loader()
+            except Exception as e:
+                log_warning(f"[chatlink] Name resolver failed for {key}: {e}")
+                value = None
+            self.set(key, value or None)
+            future.set_result(value or None)
+            return value or None
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Base structure; engine-specific link columns are added by the Selenium engines
+_CHATLINK_CREATE = """
+    CREATE TABLE IF NOT EXISTS chatlink (
+        int_id INT AUTO_INCREMENT PRIMARY KEY,
+        interface VARCHAR(32) NOT NULL,
+        chat_id TEXT NOT NULL,
+        thread_id TEXT DEFAULT NULL,
+        chat_name TEXT DEFAULT NULL,
+        message_thread_name TEXT DEFAULT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY unique_chat (interface, chat_id(255))
+    )
+"""
+
+# Columns added to existing installations that predate them
+_CHATLINK_COLUMNS = [
+    ('thread_id', 'TEXT DEFAULT NULL'),
+    ('chat_name', 'TEXT DEFAULT NULL'),
+    ('message_thread_name', 'TEXT DEFAULT NULL'),
+    ('int_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+    ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+    ('last_updated', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'),
+]
+
+
+def _ensure_chat_columns(columns, with_chat_name: bool, with_thread_name: bool) -> List[str]:
+    names = ['interface', 'chat_id']
+    if 'thread_id' in columns:
+        names.append('thread_id')
+    if with_chat_name and 'chat_name' in columns:
+        names.append('chat_name')
+    if with_thread_name and 'message_thread_name' in columns:
+        names.append('message_thread_name')
+    return names
+
+
+def _build_ensure_chat_sql(columns, with_chat_name: bool, with_thread_name: bool) -> str:
+    names = _ensure_chat_columns(columns, with_chat_name, with_thread_name)
+    updates = [f"{name} = VALUES({name})" for name in names[2:]] or ["chat_id = chat_id"]
+    return (
+        f"INSERT INTO chatlink ({', '.join(names)}) VALUES ({', '.join(['%s'] * len(names))}) "
+        f"ON DUPLICATE KEY UPDATE {', '.join(updates)}"
+    )
+
+
 class ChatLinkStore:
     """Persistence layer for chat -> ChatGPT conversation links.
 
@@ -36,6 +168,12 @@ class ChatLinkStore:
         Callable[[int | str, Optional[int | str], Any], Awaitable[Dict[str, Optional[str]]]],
     ] = {}
 
+    _name_cache = _NameCache(NAME_CACHE_SIZE, NAME_CACHE_TTL, NAME_CACHE_NEGATIVE_TTL)
+    # (thread_id, chat_name, message_thread_name) last written per chatlink row.
+    # Rows are unique on (interface, chat_id), so that is the key and the
+    # thread is part of the compared value.
+    _written_names: "OrderedDict[Tuple, Tuple[Optional[str], Optional[str], Optional[str]]]" = OrderedDict()
+
     def __init__(self) -> None:
         self._table_ensured = False
 
@@ -55,70 +193,72 @@ class ChatLinkStore:
         """Get the name resolver for an interface."""
         return cls._name_resolvers.get(interface)
 
+    @classmethod
+    async def resolve_names(
+        cls,
+        interface: Optional[str],
+        chat_id: int | str,
+        thread_id: Optional[int | str] = None,
+        bot: Any = None,
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Return ``{"chat_name", "message_thread_name"}`` using the cached resolver."""
+        resolver = cls.get_name_resolver(interface)
+        if not resolver:
+            return None
+
+        async def _load():
+            return await resolver(chat_id, thread_id, bot)
+
+        return await cls._name_cache.get_or_load(_chat_key(interface, chat_id, thread_id), _load)
+
+    @classmethod
+    def invalidate_names(
+        cls,
+        interface: Optional[str] = None,
+        chat_id: int | str | None = None,
+        thread_id: Optional[int | str] = None,
+    ) -> None:
+        """Drop cached names for one chat, or everything when no chat is given."""
+        if chat_id is None:
+            cls._name_cache.invalidate()
+            cls._written_names.clear()
+        else:
+            key = _chat_key(interface, chat_id, thread_id)
+            cls._name_cache.invalidate(key)
+            cls._written_names.pop(key[:2], None)
+
+    @classmethod
+    def name_cache_stats(cls) -> Dict[str, int]:
+        return cls._name_cache.stats()
+
+    @classmethod
+    def _names_unchanged(cls, key: Tuple, chat_name: Optional[str], message_thread_name: Optional[str]) -> bool:
+        """True when the row was written for this thread with these names (``None`` means no new value)."""
+        written = cls._written_names.get(key[:2])
+        if written is None or written[0] != key[2]:
+            return False
+        return (chat_name is None or chat_name == written[1]) and (
+            message_thread_name is None or message_thread_name == written[2]
+        )
+
+    @classmethod
+    def _remember_names(cls, key: Tuple, chat_name: Optional[str], message_thread_name: Optional[str]) -> None:
+        row_key = key[:2]
+        cls._written_names[row_key] = (key[2], chat_name, message_thread_name)
+        cls._written_names.move_to_end(row_key)
+        while len(cls._written_names) > NAME_CACHE_SIZE:
+            cls._written_names.popitem(last=False)
+
     # ------------------------------------------------------------------
     # Table management
     async def _ensure_table(self) -> None:
-        """Create the chatlink table if it doesn't exist with all required columns."""
-        if self._table_ensured:
-            return
-        
-        conn = await get_conn()
-        async with conn.cursor() as cursor:
-            # Create table with base structure (chatgpt_link will be added by selenium_chatgpt.py)
-            await cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS chatlink (
-                    int_id INT AUTO_INCREMENT PRIMARY KEY,
-                    interface VARCHAR(32) NOT NULL,
-                    chat_id TEXT NOT NULL,
-                    thread_id TEXT DEFAULT NULL,
-                    chat_name TEXT DEFAULT NULL,
-                    message_thread_name TEXT DEFAULT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    UNIQUE KEY unique_chat (interface, chat_id(255))
-                )
-                """
-            )
-            
-            # Ensure all required columns exist (for existing installations)
-            # Note: chatgpt_link is NOT included here - it's managed by selenium_chatgpt.py
-            columns_to_ensure = [
-                ('thread_id', 'TEXT DEFAULT NULL'),
-                ('chat_name', 'TEXT DEFAULT NULL'),
-                ('message_thread_name', 'TEXT DEFAULT NULL'),
-                ('int_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
-                ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
-                ('last_updated', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
-            ]
-            
-            for col_name, col_definition in columns_to_ensure:
-                try:
-                    # Check if column exists
-                    await cursor.execute(
-                        """
-                        SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
-                        WHERE TABLE_SCHEMA = DATABASE() 
-                        AND TABLE_NAME = 'chatlink' 
-                        AND COLUMN_NAME = %s
-                        """,
-                        (col_name,)
-                    )
-                    result = await cursor.fetchone()
-                    
-                    if not result:
-                        # Column doesn't exist, add it
-                        await cursor.execute(f"ALTER TABLE chatlink ADD COLUMN {col_name} {col_definition}")
-                except Exception as e:
-                    # Log but continue - this is not fatal
-                    print(f"Warning: Could not add column {col_name}: {e}")
-                    pass
-            
-            await conn.commit()
-        conn.close()
-        self._table_ensured = True
-
+        """Create the chatlink table if it doesn't exist with all required columns.
 
+        The schema registry only touches the database the first time per
+        process (or after ``schema_registry.invalidate("chatlink")``).
+        """
+        await schema_registry.ensure_table("chatlink", _CHATLINK_CREATE, _CHATLINK_COLUMNS)
+        self._table_ensured = True
 
     async def get_or_create_internal_id(
         self,
@@ -136,8 +276,7 @@ class ChatLinkStore:
         if thread_id is not None:
             thread_ids = [str(thread_id)]
         
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
                 # Try to find existing record
                 await cursor.execute(
@@ -176,8 +315,6 @@ class ChatLinkStore:
                     )
                     await conn.commit()
                     return cursor.lastrowid
-        finally:
-            conn.close()
 
     async def ensure_chat_exists(
         self,
@@ -188,50 +325,46 @@ class ChatLinkStore:
         chat_name: Optional[str] = None,
         message_thread_name: Optional[str] = None,
     ) -> None:
-        """Ensure a chat record exists in the database."""
+        """Ensure a chat record exists in the database.
+
+        The row is only written when it is not known to exist yet or when one
+        of the given names differs from what this process last wrote.
+        """
+        key = _chat_key(interface, chat_id, thread_id)
+        if self._names_unchanged(key, chat_name, message_thread_name):
+            return
+
         await self._ensure_table()
-        
-        conn = await get_conn()
-        async with conn.cursor() as cursor:
-            # Check what columns actually exist
-            await cursor.execute(
-                """
-                SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_SCHEMA = DATABASE() 
-                AND TABLE_NAME = 'chatlink'
-                """
-            )
-            existing_columns = {row[0] for row in await cursor.fetchall()}
-            
-            # Build the query based on available columns
-            base_columns = ['interface', 'chat_id']
-            base_values = [interface, str(chat_id)]
-            
-            if 'thread_id' in existing_columns:
-                base_columns.append('thread_id')
-                base_values.append(str(thread_id) if thread_id is not None else '0')
-            
-            if 'chat_name' in existing_columns and chat_name is not None:
-                base_columns.append('chat_name')
-                base_values.append(chat_name)
-                
-            if 'message_thread_name' in existing_columns and message_thread_name is not None:
-                base_columns.append('message_thread_name')
-                base_values.append(message_thread_name)
-            
-            columns_str = ', '.join(base_columns)
-            placeholders = ', '.join(['%s'] * len(base_values))
-            
-            await cursor.execute(
-                f"""
-                REPLACE INTO chatlink 
-                ({columns_str})
-                VALUES ({placeholders})
-                """,
-                base_values
-            )
-            await conn.commit()
-        conn.close()
+
+        with_chat_name = chat_name is not None
+        with_thread_name = message_thread_name is not None
+        sql = schema_registry.statement(
+            "chatlink",
+            ("ensure_chat", with_chat_name, with_thread_name),
+            lambda columns: _build_ensure_chat_sql(columns, with_chat_name, with_thread_name),
+        )
+        values = {
+            'interface': interface,
+            'chat_id': str(chat_id),
+            'thread_id': str(thread_id) if thread_id is not None else '0',
+            'chat_name': chat_name,
+            'message_thread_name': message_thread_name,
+        }
+        names = _ensure_chat_columns(
+            schema_registry.columns("chatlink") or (), with_chat_name, with_thread_name
+        )
+
+        async with acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, [values[name] for name in names])
+                await conn.commit()
+
+        written = self._written_names.get(key[:2], (None, None, None))
+        self._remember_names(
+            key,
+            chat_name if with_chat_name else written[1],
+            message_thread_name if with_thread_name else written[2],
+        )
 
     async def get_chat_info(
         self,
@@ -242,8 +375,7 @@ class ChatLinkStore:
         """Get chat information for a chat/thread combination."""
         await self._ensure_table()
         
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
                 await cursor.execute(
                     """
@@ -254,8 +386,6 @@ class ChatLinkStore:
                 )
                 row = await cursor.fetchone()
                 return dict(row) if row else None
-        finally:
-            conn.close()
 
     async def resolve_chat_identifier(
         self,
@@ -265,8 +395,7 @@ class ChatLinkStore:
         """Resolve a chat identifier (name or ID) to chat records."""
         await self._ensure_table()
         
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
                 # Try exact chat_id match first
                 await cursor.execute(
@@ -290,8 +419,6 @@ class ChatLinkStore:
                     results = await cursor.fetchall()
                 
                 return list(results)
-        finally:
-            conn.close()
 
     async def update_chat_names(
         self,
@@ -305,8 +432,7 @@ class ChatLinkStore:
         """Update chat and thread names for existing records."""
         await self._ensure_table()
         
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(
                     """
@@ -320,9 +446,15 @@ class ChatLinkStore:
                 )
                 affected_rows = cursor.rowcount
                 await conn.commit()
-                return affected_rows
-        finally:
-            conn.close()
+        key = _chat_key(interface, chat_id, thread_id)
+        written = self._written_names.get(key[:2])
+        if written is not None and written[0] == key[2]:
+            self._remember_names(
+                key,
+                chat_name if chat_name is not None else written[1],
+                message_thread_name if message_thread_name is not None else written[2],
+            )
+        return affected_rows
 
     async def update_names_from_resolver(
         self,
@@ -354,7 +486,10 @@ class ChatLinkStore:
         if not result:
             log_debug("[chatlink] Resolver returned no result")
             return False
-            
+
+        # Fresh names replace whatever the ingress cache holds
+        self._name_cache.set(_chat_key(interface, chat_id, thread_id), result)
+
         # Update names using the resolved values
         affected_rows = await self.update_chat_names(
             chat_id,
@@ -371,8 +506,7 @@ class ChatLinkStore:
         """List all stored chat links, optionally filtered by interface."""
         await self._ensure_table()
         
-        conn = await get_conn()
-        try:
+        async with acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
                 if interface:
                     await cursor.execute(
@@ -391,8 +525,6 @@ class ChatLinkStore:
                         """
                     )
                 return await cursor.fetchall()
-        finally:
-            conn.close()
 
 
 class ChatLinkPlugin:
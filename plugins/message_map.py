@@ -6,134 +6,124 @@ import time
 from typing import Optional, Tuple, Dict, Any
 import aiomysql
 
-from core.db import get_conn
+from core.db import acquire
 from core.logging_utils import log_debug, log_info, log_warning, log_error
 from core.core_initializer import core_initializer, register_plugin
 
 
 async def init_message_map_table():
     """Initialize the message_map table if it doesn't exist."""
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS message_map (
-                    trainer_message_id INTEGER PRIMARY KEY,
-                    chat_id BIGINT NOT NULL,
-                    message_id INTEGER NOT NULL,
-                    timestamp REAL
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS message_map (
+                        trainer_message_id INTEGER PRIMARY KEY,
+                        chat_id BIGINT NOT NULL,
+                        message_id INTEGER NOT NULL,
+                        timestamp REAL
+                    )
+                    """
                 )
-                """
-            )
-            await conn.commit()
-    except Exception as e:
-        log_error(f"[message_map] Failed to initialize table: {e}")
-        raise
-    finally:
-        conn.close()
+                await conn.commit()
+        except Exception as e:
+            log_error(f"[message_map] Failed to initialize table: {e}")
+            raise
 
 
 async def store_message_mapping(trainer_message_id: int, chat_id: int, message_id: int):
     """Store a mapping between trainer message and original message."""
     await init_message_map_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT OR REPLACE INTO message_map 
-                (trainer_message_id, chat_id, message_id, timestamp)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (trainer_message_id, chat_id, message_id, time.time())
-            )
-            await conn.commit()
-            log_debug(f"[message_map] Stored mapping: trainer_msg={trainer_message_id} -> chat={chat_id}, msg={message_id}")
-    except Exception as e:
-        log_error(f"[message_map] Failed to store mapping: {e}")
-        raise
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT OR REPLACE INTO message_map 
+                    (trainer_message_id, chat_id, message_id, timestamp)
+                    VALUES (%s, %s, %s, %s)
+                    """,
+                    (trainer_message_id, chat_id, message_id, time.time())
+                )
+                await conn.commit()
+                log_debug(f"[message_map] Stored mapping: trainer_msg={trainer_message_id} -> chat={chat_id}, msg={message_id}")
+        except Exception as e:
+            log_error(f"[message_map] Failed to store mapping: {e}")
+            raise
 
 
 async def get_original_message(trainer_message_id: int) -> Optional[Tuple[int, int]]:
     """Get the original chat_id and message_id for a trainer message."""
     await init_message_map_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                SELECT chat_id, message_id 
-                FROM message_map 
-                WHERE trainer_message_id = %s
-                """,
-                (trainer_message_id,)
-            )
-            result = await cur.fetchone()
-            if result:
-                log_debug(f"[message_map] Found mapping: trainer_msg={trainer_message_id} -> chat={result[0]}, msg={result[1]}")
-                return (result[0], result[1])
-            else:
-                log_debug(f"[message_map] No mapping found for trainer_message_id={trainer_message_id}")
-                return None
-    except Exception as e:
-        log_error(f"[message_map] Failed to get original message: {e}")
-        return None
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT chat_id, message_id 
+                    FROM message_map 
+                    WHERE trainer_message_id = %s
+                    """,
+                    (trainer_message_id,)
+                )
+                result = await cur.fetchone()
+                if result:
+                    log_debug(f"[message_map] Found mapping: trainer_msg={trainer_message_id} -> chat={result[0]}, msg={result[1]}")
+                    return (result[0], result[1])
+                else:
+                    log_debug(f"[message_map] No mapping found for trainer_message_id={trainer_message_id}")
+                    return None
+        except Exception as e:
+            log_error(f"[message_map] Failed to get original message: {e}")
+            return None
 
 
 async def cleanup_old_mappings(older_than_hours: int = 24):
     """Remove old message mappings to prevent table bloat."""
     await init_message_map_table()
     cutoff_time = time.time() - (older_than_hours * 3600)
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                DELETE FROM message_map 
-                WHERE timestamp < %s
-                """,
-                (cutoff_time,)
-            )
-            deleted_count = cur.rowcount
-            await conn.commit()
-            log_info(f"[message_map] Cleaned up {deleted_count} old message mappings")
-    except Exception as e:
-        log_error(f"[message_map] Failed to cleanup old mappings: {e}")
-    finally:
-        conn.close()
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    DELETE FROM message_map 
+                    WHERE timestamp < %s
+                    """,
+                    (cutoff_time,)
+                )
+                deleted_count = cur.rowcount
+                await conn.commit()
+                log_info(f"[message_map] Cleaned up {deleted_count} old message mappings")
+        except Exception as e:
+            log_error(f"[message_map] Failed to cleanup old mappings: {e}")
 
 
 async def get_mapping_stats() -> Dict[str, int]:
     """Get statistics about message mappings."""
     await init_message_map_table()
-    conn = await get_conn()
-    try:
-        async with conn.cursor() as cur:
-            await cur.execute("SELECT COUNT(*) FROM message_map")
-            total_count = (await cur.fetchone())[0]
+    async with acquire() as conn:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT COUNT(*) FROM message_map")
+                total_count = (await cur.fetchone())[0]
             
-            # Count mappings from last 24 hours
-            cutoff_time = time.time() - (24 * 3600)
-            await cur.execute(
-                "SELECT COUNT(*) FROM message_map WHERE timestamp > %s",
-                (cutoff_time,)
-            )
-            recent_count = (await cur.fetchone())[0]
+                # Count mappings from last 24 hours
+                cutoff_time = time.time() - (24 * 3600)
+                await cur.execute(
+                    "SELECT COUNT(*) FROM message_map WHERE timestamp > %s",
+                    (cutoff_time,)
+                )
+                recent_count = (await cur.fetchone())[0]
             
-            return {
-                "total_mappings": total_count,
-                "recent_mappings": recent_count
-            }
-    except Exception as e:
-        log_error(f"[message_map] Failed to get mapping stats: {e}")
-        return {"total_mappings": 0, "recent_mappings": 0}
-    finally:
-        conn.close()
+                return {
+                    "total_mappings": total_count,
+                    "recent_mappings": recent_count
+                }
+        except Exception as e:
+            log_error(f"[message_map] Failed to get mapping stats: {e}")
+            return {"total_mappings": 0, "recent_mappings": 0}
 
 
 class MessageMapPlugin:
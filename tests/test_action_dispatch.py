@@ -0,0 +1,74 @@
+import pytest
+
+from core import action_parser
+import core.core_initializer as core_initializer
+
+
+@pytest.fixture(autouse=True)
+def _registries(monkeypatch):
+    for name in ("log_debug", "log_info", "log_warning", "log_error"):
+        monkeypatch.setattr(action_parser, name, lambda *a, **k: None)
+    monkeypatch.setattr(core_initializer, "PLUGIN_REGISTRY", {})
+    monkeypatch.setattr(core_initializer, "INTERFACE_REGISTRY", {})
+    action_parser.invalidate_dispatch_table()
+    yield
+    action_parser.invalidate_dispatch_table()
+
+
+class _Plugin:
+    def __init__(self, actions, restricted=()):
+        self.actions = actions
+        self.restricted = restricted
+        self.queries = 0
+
+    def get_supported_actions(self):
+        self.queries += 1
+        return {a: {"restricted": a in self.restricted} for a in self.actions}
+
+    def validate_payload(self, action_type, payload):
+        return [] if payload.get("ok") else [f"{action_type} needs ok"]
+
+
+class _Interface:
+    def get_supported_action_types(self):
+        return ["message_test"]
+
+    def validate_payload(self, action_type, payload):
+        return [] if payload.get("text") else ["text required"]
+
+
+def test_dispatch_table_routes_actions_once():
+    first = _Plugin(["message_test", "note"], restricted={"note"})
+    second = _Plugin(["message_test", "note"])
+    iface = _Interface()
+    core_initializer.PLUGIN_REGISTRY.update({"first": first, "second": second})
+    core_initializer.INTERFACE_REGISTRY["test"] = iface
+
+    table = action_parser.get_dispatch_table()
+    # Message actions stop at the first plugin, other actions reach all of them
+    assert table.route("message_test").handlers == (first, iface)
+    assert table.route("note").handlers == (first, second)
+    assert table.route("note").restricted is True
+    assert table.route("message_test").interface == "test"
+    assert table.route("unknown").handlers == ()
+
+    errors = []
+    action_parser._validate_payload("message_test", {}, errors)
+    assert errors == ["message_test needs ok", "message_test needs ok", "text required"]
+
+    for _ in range(5):
+        action_parser._plugins_for("note")
+        action_parser.validate_action({"type": "message_test", "payload": {"ok": True, "text": "x"}})
+    assert first.queries == 1
+    assert action_parser.get_dispatch_table() is table
+
+
+def test_registering_interface_rebuilds_table():
+    table = action_parser.get_dispatch_table()
+    assert "message_test" not in table.action_types
+
+    core_initializer.register_interface("test", _Interface())
+
+    rebuilt = action_parser.get_dispatch_table()
+    assert rebuilt is not table
+    assert "message_test" in rebuilt.action_types
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from plugins import bio_manager
+
+
+class _FakeCursor:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=()):
+        self.log.append((query, params))
+
+    async def fetchall(self):
+        return self.rows
+
+
+class _FakeConn:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+
+    def cursor(self, *args):
+        return _FakeCursor(self.rows, self.log)
+
+    async def commit(self):
+        pass
+
+
+def _patch_db(monkeypatch, rows=()):
+    log = []
+
+    @asynccontextmanager
+    async def fake_db():
+        yield _FakeConn(list(rows), log)
+
+    monkeypatch.setattr(bio_manager, "get_db", fake_db)
+    monkeypatch.setattr(bio_manager, "_table_ready", True)
+    monkeypatch.setattr(bio_manager.aiomysql, "DictCursor", object, raising=False)
+    return log
+
+
+def test_get_bios_light_uses_single_query(monkeypatch):
+    rows = [
+        {"id": "1", "known_as": json.dumps(["Al"]), "likes": "[]", "not_likes": "[]",
+         "feelings": "[]", "information": "likes trains"},
+        {"id": "2", "known_as": "not json", "likes": "[]", "not_likes": "[]",
+         "feelings": "{}", "information": None},
+    ]
+    log = _patch_db(monkeypatch, rows)
+
+    bios = asyncio.run(bio_manager.get_bios_light(["1", "2", "1", "3"]))
+
+    assert len(log) == 1
+    query, params = log[0]
+    assert "IN (%s, %s, %s)" in query
+    assert params == ("1", "2", "3")
+    assert bios["1"]["known_as"] == ["Al"]
+    assert bios["2"]["known_as"] == [] and bios["2"]["feelings"] == []
+    assert "3" not in bios
+
+
+def test_last_accessed_is_flushed_in_one_upsert(monkeypatch):
+    log = _patch_db(monkeypatch)
+    monkeypatch.setattr(bio_manager, "_pending_access", {})
+    monkeypatch.setattr(bio_manager, "ACCESS_FLUSH_DELAY", 0)
+    monkeypatch.setattr(bio_manager, "_access_flush_task", None)
+
+    async def run():
+        bio_manager.touch_last_accessed(["1", "2"], when="t1")
+        bio_manager.touch_last_accessed(["2"], when="t2")
+        await bio_manager._access_flush_task
+
+    asyncio.run(run())
+
+    assert len(log) == 1
+    query, params = log[0]
+    assert "ON DUPLICATE KEY UPDATE last_accessed" in query
+    assert params == ("1", "t1", "t1", "2", "t2", "t2")
+    assert bio_manager._pending_access == {}
+
+
+def test_shutdown_flushes_pending_stamps(monkeypatch):
+    log = _patch_db(monkeypatch)
+    monkeypatch.setattr(bio_manager, "_pending_access", {})
+    monkeypatch.setattr(bio_manager, "ACCESS_FLUSH_DELAY", 60)
+    monkeypatch.setattr(bio_manager, "_access_flush_task", None)
+
+    async def run():
+        bio_manager.touch_last_accessed(["1"], when="t1")
+        task = bio_manager._access_flush_task
+        await bio_manager.shutdown()
+        return task
+
+    task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert len(log) == 1
+    assert bio_manager._pending_access == {}
+    assert bio_manager._access_flush_task is None
+
+
+def test_cache_serves_repeat_lookups_and_write_invalidates(monkeypatch):
+    rows = [{"id": "7", "known_as": "[]", "likes": "[]", "not_likes": "[]",
+             "feelings": "[]", "information": "first"}]
+    log = _patch_db(monkeypatch, rows)
+    monkeypatch.setattr(bio_manager, "_bio_cache", bio_manager._BioCache(max_size=8, ttl=60))
+    monkeypatch.setattr(bio_manager, "_run", lambda coro: coro.close())
+
+    first = asyncio.run(bio_manager.get_bios_light(["7", "8"]))
+    second = asyncio.run(bio_manager.get_bios_light(["7", "8"]))
+
+    assert len(log) == 1
+    assert first == second == {"7": bio_manager._parse_bio_light(rows[0])}
+    stats = bio_manager.get_bio_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+    bio_manager._save_json_field("7", "likes", ["tea"])
+    assert bio_manager._bio_cache.get("7") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = bio_manager._BioCache(max_size=2, ttl=60)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.stats()["evictions"] == 1
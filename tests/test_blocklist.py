@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from plugins import blocklist
+
+
+class _FakeCursor:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+        self.rowcount = 1
+
+    async def execute(self, query, params=None):
+        self.log.append(query.split()[0])
+
+    async def fetchall(self):
+        return self.rows
+
+
+def _fake_acquire(rows, log):
+    class FakeConn:
+        @asynccontextmanager
+        async def cursor(self):
+            yield _FakeCursor(rows, log)
+
+        async def commit(self):
+            pass
+
+    @asynccontextmanager
+    async def acquire():
+        yield FakeConn()
+
+    return acquire
+
+
+def _reset(monkeypatch, rows, log):
+    monkeypatch.setattr(blocklist, "acquire", _fake_acquire(rows, log))
+    monkeypatch.setattr(blocklist, "_blocked_ids", set())
+    monkeypatch.setattr(blocklist, "_loaded", False)
+    monkeypatch.setattr(blocklist, "_next_load_attempt", 0.0)
+    for name in ("log_debug", "log_info", "log_warning", "log_error"):
+        monkeypatch.setattr(blocklist, name, lambda *a, **k: None)
+
+
+def test_blocked_check_reads_memory_after_first_load(monkeypatch):
+    log = []
+    _reset(monkeypatch, [(11,), (12,)], log)
+
+    async def run():
+        results = [await blocklist.is_user_blocked(uid) for uid in (11, "12", 13, 11)]
+        return results
+
+    assert asyncio.run(run()) == [True, True, False, True]
+    assert log.count("SELECT") == 1
+
+
+def test_block_and_unblock_update_the_set(monkeypatch):
+    log = []
+    _reset(monkeypatch, [], log)
+
+    async def run():
+        await blocklist.load_blocklist()
+        await blocklist.block_user(5, "spam")
+        blocked = await blocklist.is_user_blocked(5)
+        await blocklist.unblock_user(5)
+        return blocked, await blocklist.is_user_blocked(5)
+
+    assert asyncio.run(run()) == (True, False)
+    assert log.count("SELECT") == 1
+
+
+def test_failed_load_is_not_retried_per_message(monkeypatch):
+    log = []
+    _reset(monkeypatch, [], log)
+
+    @asynccontextmanager
+    async def broken_acquire():
+        log.append("CONNECT")
+        raise ConnectionError("database down")
+        yield
+
+    monkeypatch.setattr(blocklist, "acquire", broken_acquire)
+
+    async def run():
+        return [await blocklist.is_user_blocked(1) for _ in range(3)]
+
+    assert asyncio.run(run()) == [False, False, False]
+    assert log.count("CONNECT") == 1
+
+
+def test_block_during_resync_survives_the_swap(monkeypatch):
+    log = []
+    _reset(monkeypatch, [(1,)], log)
+    selected = asyncio.Event()
+    resume = asyncio.Event()
+
+    class SlowCursor(_FakeCursor):
+        async def fetchall(self):
+            selected.set()
+            await resume.wait()
+            return self.rows
+
+    class SlowConn:
+        @asynccontextmanager
+        async def cursor(self):
+            yield SlowCursor([(1,)], log)
+
+        async def commit(self):
+            pass
+
+    @asynccontextmanager
+    async def slow_acquire():
+        yield SlowConn()
+
+    async def run():
+        monkeypatch.setattr(blocklist, "acquire", slow_acquire)
+        load = asyncio.ensure_future(blocklist.load_blocklist())
+        await selected.wait()
+        monkeypatch.setattr(blocklist, "acquire", _fake_acquire([], log))
+        await blocklist.block_user(7, "spam")
+        resume.set()
+        await load
+        return await blocklist.is_user_blocked(7), await blocklist.is_user_blocked(1)
+
+    assert asyncio.run(run()) == (True, True)
+    assert blocklist._load_changes is None
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+
+import pytest
+
+from core import db  # noqa: F401  (registers the database config first)
+from core import browser_supervisor
+from core.browser_supervisor import WarmStandby, clone_profile, standby_profile
+
+
+@pytest.fixture(autouse=True)
+def standby_enabled(monkeypatch):
+    monkeypatch.setattr(browser_supervisor, "SELENIUM_WARM_STANDBY", True)
+
+
+class FakeDriver:
+    def __init__(self, profile):
+        self.profile = profile
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_standby(prepare=lambda driver: True):
+    launched = []
+
+    def launch(profile):
+        driver = FakeDriver(profile)
+        launched.append(driver)
+        return driver
+
+    return WarmStandby("test", launch, prepare), launched
+
+
+def wait_built(standby):
+    # Commands run in order, so a no-op returns once the build is done
+    standby._worker.submit(lambda: None).result(timeout=5)
+
+
+def test_take_hands_over_a_ready_standby(tmp_path):
+    active = str(tmp_path / "profile")
+    os.makedirs(active)
+    standby, launched = make_standby()
+    try:
+        assert standby.take() is None
+        standby.ensure(active)
+        wait_built(standby)
+        driver, profile = standby.take()
+        assert driver is launched[0]
+        assert profile == active + browser_supervisor.STANDBY_SUFFIX
+        assert standby.take() is None
+
+        # The next standby is built in the slot the old browser used
+        standby.ensure(profile)
+        wait_built(standby)
+        assert launched[1].profile == active
+        assert standby.stats()["swaps"] == 1
+    finally:
+        standby.close()
+
+
+def test_dead_or_discarded_standbys_are_not_used(tmp_path):
+    active = str(tmp_path / "profile")
+    standby, launched = make_standby()
+    try:
+        standby.ensure(active)
+        wait_built(standby)
+        launched[0].alive = False
+        assert standby.take() is None
+        assert launched[0].quit_called
+
+        standby.ensure(active)
+        standby.discard()
+        wait_built(standby)
+        assert standby.take() is None
+        assert launched[1].quit_called
+    finally:
+        standby.close()
+
+
+def test_failed_standby_is_quit_and_not_retried_at_once(tmp_path):
+    standby, launched = make_standby(prepare=lambda driver: False)
+    try:
+        standby.ensure(str(tmp_path / "profile"))
+        wait_built(standby)
+        assert launched[0].quit_called
+        standby.ensure(str(tmp_path / "profile"))
+        wait_built(standby)
+        assert len(launched) == 1
+        assert standby.stats()["failures"] == 1
+    finally:
+        standby.close()
+
+
+def test_clone_profile_skips_locks_and_caches(tmp_path):
+    source = tmp_path / "profile"
+    (source / "Default" / "Cache").mkdir(parents=True)
+    (source / "Default" / "Cookies").write_text("session")
+    (source / "Default" / "Cache" / "data_0").write_text("cached")
+    (source / "SingletonLock").write_text("host-123")
+    target = tmp_path / standby_profile(str(source))
+    (target / "stale").mkdir(parents=True)
+
+    clone_profile(str(source), str(target))
+
+    assert (target / "Default" / "Cookies").read_text() == "session"
+    assert not (target / "Default" / "Cache").exists()
+    assert not (target / "SingletonLock").exists()
+    assert not (target / "stale").exists()
+    assert standby_profile(str(target)) == str(source)
+
+
+def test_probe_leaves_a_healthy_standby_in_place(tmp_path):
+    active = str(tmp_path / "profile")
+    standby, launched = make_standby()
+    taken = []
+
+    def probe(script):
+        # take() while the probe runs must still get the standby
+        if not taken:
+            taken.append(None)
+            taken[0] = standby.take()
+        return 1
+
+    try:
+        standby.ensure(active)
+        wait_built(standby)
+        launched[0].execute_script = probe
+        standby.maintain(active)
+        wait_built(standby)
+        assert taken[0][0] is launched[0]
+        assert not launched[0].quit_called
+
+        # A dead standby found by the probe is replaced
+        launched[1].alive = False
+        standby.maintain(active)
+        wait_built(standby)
+        assert launched[1].quit_called
+        assert len(launched) == 3
+    finally:
+        standby.close()
+
+
+def test_take_checks_the_standby_on_its_worker(tmp_path):
+    standby, launched = make_standby()
+    threads = []
+    try:
+        standby.ensure(str(tmp_path / "profile"))
+        wait_built(standby)
+        original = launched[0].execute_script
+
+        def probe(script):
+            threads.append(threading.current_thread())
+            return original(script)
+
+        launched[0].execute_script = probe
+        driver, _ = standby.take()
+        assert driver is launched[0]
+        assert threads == [standby._worker._thread]
+    finally:
+        standby.close()
+
+
+def test_standby_handed_over_after_a_timeout_is_quit(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_supervisor, "TAKE_TIMEOUT", 0.05)
+    standby, launched = make_standby()
+    try:
+        standby.ensure(str(tmp_path / "profile"))
+        wait_built(standby)
+        original = launched[0].execute_script
+
+        def slow_probe(script):
+            time.sleep(0.2)
+            return original(script)
+
+        launched[0].execute_script = slow_probe
+        assert standby.take() is None
+        wait_built(standby)
+        assert launched[0].quit_called
+    finally:
+        standby.close()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+
+from core import browser_worker
+from core.browser_worker import BrowserWorker
+
+
+def test_commands_run_in_order_on_one_thread():
+    worker = BrowserWorker("test-order")
+    seen = []
+
+    def command(n):
+        seen.append((n, threading.current_thread().name))
+        return n * 2
+
+    async def main():
+        return await asyncio.gather(*(worker.call(command, n) for n in range(5)))
+
+    try:
+        assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    finally:
+        worker.stop(wait=1)
+    assert [n for n, _ in seen] == list(range(5))
+    assert len({name for _, name in seen}) == 1
+    assert seen[0][1] != threading.current_thread().name
+
+
+def test_exceptions_and_nested_submit():
+    worker = BrowserWorker("test-nested")
+
+    def inner():
+        return "inner"
+
+    def outer():
+        # Would deadlock if nested commands were queued behind this one
+        return worker.submit(inner).result(timeout=1)
+
+    def boom():
+        raise ValueError("bad")
+
+    async def main():
+        assert await worker.call(outer) == "inner"
+        with pytest.raises(ValueError):
+            await worker.call(boom)
+
+    try:
+        asyncio.run(main())
+    finally:
+        worker.stop(wait=1)
+    stats = worker.stats()
+    assert stats["completed"] == 1 and stats["failed"] == 1
+
+
+def test_step_timings_and_marks():
+    worker = BrowserWorker("test-steps")
+
+    def prompt():
+        browser_worker.set_reference()
+        browser_worker.mark("first_token")
+        browser_worker.mark("first_token")
+        return True
+
+    async def main():
+        await worker.call(prompt, step="prompt")
+
+    try:
+        asyncio.run(main())
+        stats = worker.stats()
+        assert stats["steps"]["prompt"]["count"] == 1
+        assert stats["steps"]["first_token"]["count"] == 1
+        assert stats["queue_depth"] == 0
+        assert "test-steps" in browser_worker.get_stats()
+    finally:
+        worker.stop(wait=1)
+
+
+def test_step_commands_interleave():
+    worker = BrowserWorker("test-interleave")
+    trace = []
+
+    def steps(name):
+        for i in range(3):
+            trace.append((name, i))
+            yield 0.01
+        return name
+
+    def focus(name):
+        trace.append(("focus", name))
+
+    async def main():
+        return await asyncio.gather(
+            worker.call_steps(steps, "a", before=lambda: focus("a")),
+            worker.call_steps(steps, "b", before=lambda: focus("b")),
+            worker.call(lambda: trace.append(("call", 0))),
+        )
+
+    try:
+        assert asyncio.run(main()) == ["a", "b", None]
+    finally:
+        worker.stop(wait=1)
+    work = [entry for entry in trace if entry[0] != "focus"]
+    # The plain call and b's first step run while a is paused
+    assert work.index(("b", 0)) < work.index(("a", 1))
+    assert work.index(("call", 0)) < work.index(("a", 1))
+    assert trace[0] == ("focus", "a") and trace.count(("focus", "a")) == 4
+
+
+def test_commands_queued_behind_stop_fail_instead_of_hanging():
+    worker = BrowserWorker("test-stop")
+    release = threading.Event()
+    busy = worker.submit(release.wait, 5)
+    worker.stop()
+    late = worker.submit(lambda: "late")
+    release.set()
+
+    assert busy.result(timeout=5) is True
+    with pytest.raises(RuntimeError):
+        late.result(timeout=5)
+    # The next command starts a new thread
+    try:
+        assert worker.submit(lambda: "again").result(timeout=5) == "again"
+    finally:
+        worker.stop(wait=1)
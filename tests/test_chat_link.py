@@ -0,0 +1,154 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from core import db
+from core.schema_registry import SchemaRegistry
+from plugins import chat_link
+from plugins.chat_link import ChatLinkStore, _NameCache
+
+
+def test_concurrent_lookups_share_one_resolver_call(monkeypatch):
+    monkeypatch.setattr(ChatLinkStore, "_name_cache", _NameCache(16, 60, 5))
+    calls = []
+
+    async def resolver(chat_id, thread_id, bot=None):
+        calls.append(chat_id)
+        await asyncio.sleep(0.01)
+        return {"chat_name": f"chat {chat_id}", "message_thread_name": None}
+
+    monkeypatch.setitem(ChatLinkStore._name_resolvers, "test_iface", resolver)
+
+    async def run():
+        first = await asyncio.gather(*(ChatLinkStore.resolve_names("test_iface", 1) for _ in range(5)))
+        again = await ChatLinkStore.resolve_names("test_iface", 1)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert calls == [1]
+    assert all(names == {"chat_name": "chat 1", "message_thread_name": None} for names in first)
+    assert again == first[0]
+
+
+def test_failed_lookups_are_cached(monkeypatch):
+    monkeypatch.setattr(ChatLinkStore, "_name_cache", _NameCache(16, 60, 5))
+    monkeypatch.setattr(chat_link, "log_warning", lambda *a, **k: None)
+    calls = []
+
+    async def resolver(chat_id, thread_id, bot=None):
+        calls.append(chat_id)
+        raise RuntimeError("chat not found")
+
+    monkeypatch.setitem(ChatLinkStore._name_resolvers, "test_iface", resolver)
+
+    async def run():
+        return [await ChatLinkStore.resolve_names("test_iface", 2) for _ in range(3)]
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert calls == [2]
+
+
+def test_lru_evicts_oldest_entry():
+    cache = _NameCache(2, 60, 5)
+    cache.set(("a",), {"chat_name": "a"})
+    cache.set(("b",), {"chat_name": "b"})
+    cache.get(("a",))
+    cache.set(("c",), {"chat_name": "c"})
+    assert cache.get(("b",)) == (False, None)
+    assert cache.get(("a",))[0]
+
+
+def test_ensure_chat_exists_skips_unchanged_rows(monkeypatch):
+    monkeypatch.setattr(ChatLinkStore, "_written_names", type(ChatLinkStore._written_names)())
+    statements = []
+
+    class FakeCursor:
+        async def execute(self, query, params=None):
+            statements.append(query.split()[0])
+
+        async def fetchall(self):
+            return [("thread_id",), ("chat_name",), ("message_thread_name",)]
+
+    class FakeConn:
+        @asynccontextmanager
+        async def cursor(self):
+            yield FakeCursor()
+
+        async def commit(self):
+            pass
+
+    @asynccontextmanager
+    async def fake_acquire():
+        yield FakeConn()
+
+    monkeypatch.setattr(chat_link, "acquire", fake_acquire)
+    registry = SchemaRegistry()
+    registry._columns["chatlink"] = frozenset(
+        ["interface", "chat_id", "thread_id", "chat_name", "message_thread_name"]
+        + [name for name, _ in chat_link._CHATLINK_COLUMNS]
+    )
+    monkeypatch.setattr(chat_link, "schema_registry", registry)
+    store = ChatLinkStore()
+
+    async def run():
+        await store.ensure_chat_exists(1, None, "test_iface", chat_name="Room")
+        await store.ensure_chat_exists(1, None, "test_iface", chat_name="Room")
+        await store.ensure_chat_exists(1, None, "test_iface")
+        writes = statements.count("INSERT")
+        await store.ensure_chat_exists(1, None, "test_iface", chat_name="Renamed")
+        # Threads share the chat's row, so switching thread rewrites it
+        await store.ensure_chat_exists(1, 5, "test_iface", chat_name="Renamed")
+        await store.ensure_chat_exists(1, None, "test_iface", chat_name="Renamed")
+        return writes, statements.count("INSERT")
+
+    assert asyncio.run(run()) == (1, 4)
+
+
+class _SchemaCursor:
+    def __init__(self, log, columns):
+        self.log = log
+        self.columns = columns
+
+    async def execute(self, query, params=None):
+        self.log.append(" ".join(query.split())[:60])
+        if query.startswith("ALTER"):
+            self.columns.append(query.split()[5])
+
+    async def fetchall(self):
+        return [(name,) for name in self.columns]
+
+
+def test_schema_registry_introspects_once(monkeypatch):
+    log = []
+    columns = ["interface", "chat_id"]
+
+    class FakeConn:
+        @asynccontextmanager
+        async def cursor(self):
+            yield _SchemaCursor(log, columns)
+
+        async def commit(self):
+            pass
+
+    @asynccontextmanager
+    async def fake_acquire():
+        yield FakeConn()
+
+    monkeypatch.setattr(db, "acquire", fake_acquire)
+    registry = SchemaRegistry()
+
+    async def run():
+        for _ in range(3):
+            await registry.ensure_table("chatlink", "CREATE TABLE chatlink", [("chat_name", "TEXT")])
+        await registry.ensure_column("chatlink", "chatgpt_link", "VARCHAR(255) NULL")
+        await registry.ensure_column("chatlink", "chatgpt_link", "VARCHAR(255) NULL")
+
+    asyncio.run(run())
+    assert sum(1 for q in log if "INFORMATION_SCHEMA" in q) == 1
+    assert sum(1 for q in log if q.startswith("ALTER")) == 2
+    assert registry.has_column("chatlink", "chatgpt_link")
+
+    sql = registry.statement("chatlink", "key", lambda cols: f"{len(cols)} columns")
+    assert sql == "4 columns"
+    assert registry.statement("chatlink", "key", lambda cols: "rebuilt") == sql
+    registry.invalidate("chatlink")
+    assert registry.columns("chatlink") is None
@@ -0,0 +1,62 @@
+import pytest
+
+from core import db  # noqa: F401  (registers the database config first)
+from core import completion_watch
+from core.browser_worker import run_steps
+
+
+@pytest.fixture(autouse=True)
+def watch_settings(monkeypatch):
+    monkeypatch.setattr(completion_watch, "SELENIUM_DOM_WATCH", True)
+    monkeypatch.setattr(completion_watch, "SELENIUM_COMPLETION_QUIET_MS", 250)
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_returns_when_the_page_reports_done():
+    driver = FakeDriver([
+        {"done": False, "started": False},
+        {"done": False, "started": True},
+        {"done": True, "started": True},
+    ])
+    steps = completion_watch.watch_steps(driver, "button.stop", "div.reply", timeout=5)
+    assert run_steps(steps) is True
+    # Only the first call resets the watch state on the page
+    assert [call[-2] for call in driver.calls] == [True, False, False]
+
+
+def test_script_failure_falls_back_to_polling():
+    driver = FakeDriver([RuntimeError("no async scripts"), {"error": "boom"}])
+    assert run_steps(completion_watch.watch_steps(driver, "b", "d", timeout=5)) is None
+    assert run_steps(completion_watch.watch_steps(driver, "b", "d", timeout=5)) is None
+
+
+def test_disabled_watcher_is_not_injected(monkeypatch):
+    monkeypatch.setattr(completion_watch, "SELENIUM_DOM_WATCH", False)
+    driver = FakeDriver([])
+    assert run_steps(completion_watch.watch_steps(driver, "b", "d", timeout=5)) is None
+    assert driver.calls == []
+
+
+def test_growing_text_is_reported(monkeypatch):
+    monkeypatch.setattr(completion_watch, "SELENIUM_STREAM_INTERVAL_MS", 200)
+    driver = FakeDriver([
+        {"done": False, "started": True, "text": "Hel"},
+        {"done": True, "started": True, "text": "Hello"},
+    ])
+    snapshots = []
+    steps = completion_watch.watch_steps(driver, "b", "d", timeout=5, on_text=snapshots.append)
+    assert run_steps(steps) is True
+    assert snapshots == ["Hel", "Hello"]
+    assert driver.calls[0][-1] == 200
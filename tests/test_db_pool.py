@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+from core import db
+
+
+class _FakeConn:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_acquire_falls_back_to_direct_connection(monkeypatch):
+    conn = _FakeConn()
+
+    async def fake_get_conn():
+        return conn
+
+    monkeypatch.setattr(db, "get_conn", fake_get_conn)
+    monkeypatch.setattr(db, "_pool", None)
+
+    async def use():
+        async with db.acquire() as acquired:
+            assert acquired is conn
+            assert not conn.closed
+
+    asyncio.run(use())
+    assert conn.closed
+
+
+def test_acquire_uses_pool_on_owning_loop(monkeypatch):
+    released = []
+    conn = SimpleNamespace(last_usage=0.0)
+
+    class FakePool:
+        closed = False
+
+        async def acquire(self):
+            return conn
+
+        def release(self, c):
+            released.append(c)
+
+    async def use():
+        loop = asyncio.get_running_loop()
+        conn.last_usage = loop.time()
+        monkeypatch.setattr(db, "_pool", FakePool())
+        monkeypatch.setattr(db, "_pool_loop", loop)
+        async with db.acquire() as acquired:
+            assert acquired is conn
+            assert db._pool_stats["waiting"] == 0
+
+    before = db._pool_stats["acquisitions"]
+    asyncio.run(use())
+    assert released == [conn]
+    assert db._pool_stats["acquisitions"] == before + 1
+
+
+def test_pool_stats_without_pool(monkeypatch):
+    monkeypatch.setattr(db, "_pool", None)
+    stats = db.get_pool_stats()
+    assert stats["enabled"] is False
+    assert stats["in_use"] == 0
+    assert set(stats["acquire_latency_ms"]) == {"last", "avg", "max"}
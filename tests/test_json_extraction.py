@@ -0,0 +1,57 @@
+import pytest
+
+from core import transport_layer
+from core.transport_layer import extract_json_from_text
+
+
+@pytest.fixture(autouse=True)
+def _quiet_logs(monkeypatch):
+    # The first log call would bootstrap config persistence against the DB
+    for name in ("log_debug", "log_info", "log_warning"):
+        monkeypatch.setattr(transport_layer, name, lambda *a, **k: None)
+
+
+def _extract(text):
+    transport_layer._EXTRACT_CACHE.clear()
+    return extract_json_from_text(text, return_metadata=True)
+
+
+def test_extracts_object_surrounded_by_prose():
+    obj, meta = _extract('Sure! {"type": "message", "payload": {"text": "hi {x}"}} bye')
+    assert obj == {"type": "message", "payload": {"text": "hi {x}"}}
+    assert meta["had_extra_text"] is True
+    assert meta["had_errors"] is False
+
+
+def test_code_fence_is_not_extra_text():
+    obj, meta = _extract('```json\n{"actions": [{"type": "a"}]}\n```')
+    assert obj == {"actions": [{"type": "a"}]}
+    assert meta["had_extra_text"] is False
+
+
+def test_braces_in_prose_count_as_recovered_errors():
+    obj, meta = _extract('use {name} here {"type": "a"}')
+    assert obj == {"type": "a"}
+    assert meta["error_count"] == 1
+    assert meta["recovered"] is True
+
+
+def test_truncated_reply_recovers_inner_object():
+    obj, meta = _extract('{"actions": [{"type": "a", "payload": {"text": "x"}}, {"type": "b", "pay')
+    assert obj == {"type": "a", "payload": {"text": "x"}}
+    assert meta["recovered"] is True
+
+
+def test_object_inside_failed_region_string_is_found():
+    obj, _ = _extract('{oops "{\\"a\\": 1}" {"b": 2}')
+    assert obj == {"b": 2}
+
+
+def test_memoized_result_returns_fresh_objects():
+    text = 'reply {"actions": [{"type": "a"}]}'
+    first, meta = _extract(text)
+    first["actions"].append("mutated")
+    meta["recovered"] = "mutated"
+    second, meta2 = extract_json_from_text(text, return_metadata=True)
+    assert second == {"actions": [{"type": "a"}]}
+    assert meta2["recovered"] is False
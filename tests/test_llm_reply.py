@@ -0,0 +1,58 @@
+from core import transport_layer
+from core.llm_reply import LLMReply
+
+
+def test_reply_parses_once_and_normalises_actions(monkeypatch):
+    calls = []
+    real = transport_layer.extract_json_from_text
+
+    def counting(text, return_metadata=False):
+        calls.append(text)
+        return real(text, return_metadata=return_metadata)
+
+    monkeypatch.setattr(transport_layer, "extract_json_from_text", counting)
+    for name in ("log_debug", "log_info", "log_warning"):
+        monkeypatch.setattr(transport_layer, name, lambda *a, **k: None)
+
+    reply = LLMReply('{"type": "message_telegram_bot", "payload": {"text": "hi"}}', chat_id=5)
+    assert reply.actions == [{"type": "message_telegram_bot", "payload": {"text": "hi"}}]
+    assert reply.payload["type"] == "message_telegram_bot"
+    assert reply.is_corrupted is False
+    assert len(calls) == 1
+
+    # Each stage gets its own objects
+    reply.actions[0]["payload"]["text"] = "changed"
+    reply.payload["type"] = "changed"
+    assert reply.actions[0]["payload"]["text"] == "hi"
+    assert reply.payload["type"] == "message_telegram_bot"
+
+    bad = LLMReply('{"actions": "nope"}')
+    assert bad.actions is None
+    assert bad.actions_error == "actions field must be a list"
+
+
+def test_with_text_keeps_routing_and_as_message():
+    reply = LLMReply("plain", chat_id=-100, thread_id=7, interface="telegram_bot")
+    assert reply.with_text("plain") is reply
+
+    corrected = reply.with_text('{"actions": []}')
+    assert (corrected.chat_id, corrected.thread_id, corrected.interface) == (-100, 7, "telegram_bot")
+
+    message = corrected.as_message()
+    assert message.chat_id == -100 and message.thread_id == 7
+    assert message.original_text == '{"actions": []}'
+    assert message.from_llm is True and message.llm_reply is corrected
+    assert not hasattr(corrected, "__dict__")
+
+
+def test_from_send_args_reads_chat_and_interface():
+    class Bot:
+        def get_interface_id(self):
+            return "discord_interface"
+
+        async def send_message(self, *a, **k):
+            pass
+
+    bot = Bot()
+    reply = LLMReply.from_send_args(bot.send_message, (bot, 42), {"thread_id": 3}, "hi")
+    assert (reply.chat_id, reply.thread_id, reply.interface) == (42, 3, "discord_interface")
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+
+from core import db  # noqa: F401  (config persistence needs core.db loaded)
+from core import logging_utils
+
+
+def test_logchat_sender_merges_duplicates_and_batches(monkeypatch):
+    sent = []
+
+    async def fake_deliver(text):
+        sent.append(text)
+
+    monkeypatch.setattr(logging_utils, "_deliver_to_logchat", fake_deliver)
+
+    async def main():
+        sender = logging_utils._LogChatSender(interval=0.05)
+        for _ in range(3):
+            sender.submit("[ERROR] same")
+        sender.submit("[ERROR] other")
+        await asyncio.sleep(0.01)
+        sender.submit("[ERROR] later")
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert sent == ["[ERROR] same (x3)\n[ERROR] other", "[ERROR] later"]
+
+
+def test_logchat_sender_caps_pending(monkeypatch):
+    sender = logging_utils._LogChatSender(max_pending=2)
+    for i in range(5):
+        sender.submit(f"line {i}")
+    assert sender._take_batch() == "line 0\nline 1\n... 3 more log line(s) dropped"
+    assert sender._take_batch() is None
+
+
+def test_disabled_level_skips_formatting(monkeypatch):
+    logger = logging_utils.setup_logging()
+    monkeypatch.setattr(logging_utils, "_LOGGING_LOGCHAT_LEVEL", "ERROR")
+    formatted = []
+
+    class Counting:
+        def __str__(self):
+            formatted.append(True)
+            return "value"
+
+    previous = logger.level
+    try:
+        logger.setLevel(logging.DEBUG)
+        assert logging_utils.is_debug_enabled()
+        logging_utils.log_debug("value %s", Counting())
+        assert formatted
+        seen = len(formatted)
+
+        logger.setLevel(logging.ERROR)
+        assert not logging_utils.is_debug_enabled()
+        logging_utils.log_debug("value %s", Counting())
+        assert len(formatted) == seen
+    finally:
+        logger.setLevel(previous)
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from core import mention_utils
+from core.mention_utils import get_bot_username, is_message_for_bot, set_bot_identity
+
+
+class _CountingBot:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_me(self):
+        self.calls += 1
+        return SimpleNamespace(id=99, username="synth_bot")
+
+
+def _group_message(text, reply_from=None):
+    return SimpleNamespace(
+        text=text,
+        chat=SimpleNamespace(type="group"),
+        reply_to_message=SimpleNamespace(from_user=reply_from) if reply_from else None,
+    )
+
+
+def test_identity_is_fetched_once(monkeypatch):
+    monkeypatch.setattr(mention_utils, "_bot_identities", {})
+    monkeypatch.setattr(mention_utils, "log_debug", lambda *a, **k: None)
+    bot = _CountingBot()
+
+    async def run():
+        first = await get_bot_username(bot, "telegram_bot")
+        second = await get_bot_username(bot, "telegram_bot")
+        return first, second
+
+    assert asyncio.run(run()) == ("synth_bot", "synth_bot")
+    assert bot.calls == 1
+
+
+def test_mention_check_uses_cached_identity(monkeypatch):
+    monkeypatch.setattr(mention_utils, "_bot_identities", {})
+    monkeypatch.setattr(mention_utils, "log_debug", lambda *a, **k: None)
+    monkeypatch.setattr(mention_utils, "get_current_aliases", lambda: [])
+    set_bot_identity("discord_bot", "helper", 42)
+    bot = _CountingBot()
+
+    async def run():
+        mention = await is_message_for_bot(_group_message("hi @helper"), bot, human_count=3, interface_id="discord_bot")
+        reply = await is_message_for_bot(
+            _group_message("thanks", reply_from=SimpleNamespace(id=42, username=None)),
+            bot,
+            human_count=3,
+            interface_id="discord_bot",
+        )
+        other = await is_message_for_bot(_group_message("hi all"), bot, human_count=3, interface_id="discord_bot")
+        return mention, reply, other
+
+    mention, reply, other = asyncio.run(run())
+    assert mention == (True, None)
+    assert reply == (True, None)
+    assert other == (False, "multiple_humans")
+    assert bot.calls == 0
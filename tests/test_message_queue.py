@@ -0,0 +1,321 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from core import message_queue
+from core.message_queue import HIGH_PRIORITY, NORMAL_PRIORITY, LaneQueue
+from core.queue_journal import QueueJournal, deserialize_item, serialize_item
+
+
+def _item(chat, text, ts, thread=None, interface="telegram_bot"):
+    return {
+        "chat_id": chat,
+        "thread_id": thread,
+        "interface": interface,
+        "timestamp": ts,
+        "message": SimpleNamespace(text=text),
+        "context": {"text": text},
+    }
+
+
+def test_lanes_coalesce_and_respect_priority():
+    async def run():
+        q = LaneQueue()
+        q.put_nowait(_item(1, "a1", 1.0))
+        q.put_nowait(_item(2, "b1", 2.0))
+        q.put_nowait(_item(1, "a2", 3.0))
+        q.put_nowait(_item(1, "a3", 4.0, thread=9))
+        # Same priority and payloads that cannot be ordered must not raise
+        q.put_nowait({"chat_id": 3, "timestamp": 5.0, "event_prompt": {"x": 1}}, HIGH_PRIORITY)
+        q.put_nowait({"chat_id": 3, "timestamp": 6.0, "event_prompt": {"x": 2}}, HIGH_PRIORITY)
+        assert q.qsize() == 6
+
+        served = []
+        while not q.empty():
+            key, priority, batch = await q.get_batch()
+            served.append((key[1], priority, [b.get("context", {}).get("text") or b["event_prompt"]["x"] for b in batch]))
+            q.release(key)
+        return served
+
+    served = asyncio.run(run())
+    assert served == [
+        (3, HIGH_PRIORITY, [1]),
+        (3, HIGH_PRIORITY, [2]),
+        (1, NORMAL_PRIORITY, ["a1", "a2"]),
+        (2, NORMAL_PRIORITY, ["b1"]),
+        (1, NORMAL_PRIORITY, ["a3"]),
+    ]
+
+
+def test_busy_lane_is_not_served_twice():
+    async def run():
+        q = LaneQueue()
+        q.put_nowait(_item(1, "a1", 1.0))
+        key, _, _ = await q.get_batch()
+        q.put_nowait(_item(1, "a2", 2.0))
+        q.put_nowait(_item(2, "b1", 3.0))
+        other, _, batch = await q.get_batch()
+        assert other[1] == 2
+        waiter = asyncio.ensure_future(q.get_batch())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        q.release(key)
+        _, _, batch = await asyncio.wait_for(waiter, 1)
+        return [b["context"]["text"] for b in batch]
+
+    assert asyncio.run(run()) == ["a2"]
+
+
+def test_merge_batch_joins_texts():
+    user = SimpleNamespace(username="alice", full_name="Alice", id=1)
+    batch = [
+        {"chat_id": 1, "message": SimpleNamespace(chat_id=1, message_id=1, text="hi", from_user=user), "context": 1},
+        {"chat_id": 1, "message": SimpleNamespace(chat_id=1, message_id=2, text="there", from_user=user), "context": 2},
+    ]
+    final = message_queue._merge_batch(batch)
+    assert final["message"].text == "@alice: hi\n@alice: there"
+    assert final["context"] == 2
+
+
+def test_worker_pool_orders_per_chat_and_runs_chats_in_parallel(monkeypatch):
+    events = []
+
+    class Engine:
+        def get_interface_limits(self):
+            return {"max_concurrent_requests": 2}
+
+    async def fake_process(final):
+        events.append(("start", final["context"]["text"]))
+        await asyncio.sleep(0.05)
+        events.append(("end", final["context"]["text"]))
+
+    for name in ("log_debug", "log_info"):
+        monkeypatch.setattr(message_queue, name, lambda *a, **k: None)
+    monkeypatch.setattr(message_queue.plugin_instance, "get_plugin", lambda: Engine())
+    monkeypatch.setattr(message_queue, "_process_item", fake_process)
+    monkeypatch.setattr(message_queue, "_merge_batch", lambda batch: batch[0])
+    monkeypatch.setattr(message_queue, "_engine_limit_cache", None)
+    monkeypatch.setattr(message_queue, "_slot_freed", None)
+
+    async def run():
+        queue = LaneQueue()
+        monkeypatch.setattr(message_queue, "_queue", queue)
+        # Outside the coalescing window, so each message is its own batch
+        queue.put_nowait(_item(1, "a1", 1.0), HIGH_PRIORITY)
+        queue.put_nowait(_item(1, "a2", 1000.0))
+        queue.put_nowait(_item(2, "b1", 1.0), HIGH_PRIORITY)
+        queue.put_nowait(_item(3, "c1", 1.0), HIGH_PRIORITY)
+        workers = [asyncio.ensure_future(message_queue._consumer_loop(i)) for i in range(3)]
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(events) == 8:
+                break
+        stats = message_queue.get_queue_stats()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        return stats
+
+    stats = asyncio.run(run())
+    assert len(events) == 8
+    assert events.index(("end", "a1")) < events.index(("start", "a2"))
+    # At most two conversations at once, as advertised by the engine
+    running = peak = 0
+    for kind, _ in events:
+        running += 1 if kind == "start" else -1
+        peak = max(peak, running)
+    assert peak == 2
+    assert stats["depth"] == 0
+    lane = stats["lanes"]["telegram_bot:1"]
+    assert lane["served"] == 2 and lane["service_avg_ms"] > 0
+
+
+def test_delayed_items_join_their_lane_when_due():
+    async def run():
+        q = LaneQueue()
+        q.put_later(_item(1, "late", 1.0), NORMAL_PRIORITY, time.time() + 0.05)
+        q.put_nowait(_item(2, "now", 2.0))
+        assert q.stats()["delayed"] == 1
+        first = await q.get_batch()
+        q.release(first[0])
+        second = await asyncio.wait_for(q.get_batch(), 1)
+        return first[2][0]["context"]["text"], second[2][0]["context"]["text"]
+
+    assert asyncio.run(run()) == ("now", "late")
+
+
+def test_journal_replays_pending_items(tmp_path):
+    path = str(tmp_path / "queue.journal")
+    message = SimpleNamespace(
+        message_id=7,
+        chat_id=1,
+        text="hello",
+        thread_id=None,
+        date=datetime(2024, 1, 2, 3, 4, 5),
+        from_user=SimpleNamespace(id=42, username="alice", first_name="Alice", full_name="Alice"),
+        chat=SimpleNamespace(id=1, type="private", title=None, username="alice", first_name="Alice"),
+    )
+
+    async def write():
+        journal = QueueJournal(path)
+        journal.load()
+        journal.start()
+        done = journal.put({**_item(1, "hello", 1.0), "message": message}, NORMAL_PRIORITY)
+        journal.put(_item(2, "later", 2.0), NORMAL_PRIORITY, due_at=123.0)
+        journal.ack(done)
+        journal.put({"chat_id": "events", "timestamp": 3.0, "event_prompt": {"x": 1}}, HIGH_PRIORITY)
+        await journal.flush()
+
+    asyncio.run(write())
+
+    records = QueueJournal(path).load()
+    assert [r["item"]["chat_id"] for r in records] == [2, "events"]
+    assert records[0]["due_at"] == 123.0
+    assert records[1]["priority"] == HIGH_PRIORITY
+
+    # Compaction on load leaves only the pending records in the file
+    with open(path) as fh:
+        assert len(fh.read().splitlines()) == 2
+
+
+def test_close_during_slow_compaction_keeps_every_pending_put(monkeypatch, tmp_path):
+    from core import queue_journal
+
+    path = str(tmp_path / "queue.journal")
+    monkeypatch.setattr(queue_journal, "COMPACT_AFTER", 3)
+    monkeypatch.setattr(queue_journal, "FLUSH_INTERVAL", 0)
+    rewriting = None
+
+    async def write():
+        nonlocal rewriting
+        journal = QueueJournal(path)
+        journal.load()
+        rewriting = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        original = journal._rewrite
+
+        def slow_rewrite(lines=None):
+            loop.call_soon_threadsafe(rewriting.set)
+            time.sleep(0.2)
+            original(lines)
+
+        journal._rewrite = slow_rewrite
+        journal.start()
+        first = journal.put(_item(1, "a", 1.0), NORMAL_PRIORITY)
+        journal.put(_item(1, "b", 1.0), NORMAL_PRIORITY)
+        journal.ack(first)
+        await rewriting.wait()
+        # Records arriving while the file is being replaced
+        journal.put(_item(2, "c", 1.0), NORMAL_PRIORITY)
+        journal.put(_item(3, "d", 1.0), NORMAL_PRIORITY)
+        await journal.close()
+
+    asyncio.run(write())
+
+    records = QueueJournal(path).load()
+    assert [r["item"]["context"]["text"] for r in records] == ["b", "c", "d"]
+
+
+def test_message_snapshot_round_trip():
+    message = SimpleNamespace(
+        message_id=7,
+        chat_id=1,
+        text="hello",
+        thread_id=5,
+        date=datetime(2024, 1, 2, 3, 4, 5),
+        from_user=SimpleNamespace(id=42, username="alice", first_name="Alice", full_name="Alice"),
+        chat=SimpleNamespace(id=1, type="group", title="Room", username=None, first_name=None),
+    )
+    data = serialize_item({**_item(1, "hello", 1.0, thread=5), "message": message, "bot": object()})
+    item = deserialize_item(json.loads(json.dumps(data)))
+    restored = item["message"]
+    assert item["bot"] is None
+    assert restored.text == "hello"
+    assert restored.from_user.username == "alice"
+    assert restored.chat.title == "Room"
+    assert restored.date == message.date
+    assert restored.thread_id == 5
+
+
+def test_journal_keeps_only_the_chat_history():
+    from collections import deque
+
+    context = {-100123: deque(["hi", "there"], maxlen=10), 555: deque(["other chat"])}
+    data = serialize_item({**_item(-100123, "hi", 1.0), "context": context})
+    assert data["history"] == ["hi", "there"]
+    assert "other chat" not in json.dumps(data)
+
+    item = deserialize_item(json.loads(json.dumps(data)))
+    assert list(item["context"][-100123]) == ["hi", "there"]
+
+
+def test_cancelled_batch_is_requeued_and_not_acked(monkeypatch, tmp_path):
+    started = asyncio.Event()
+
+    async def slow_process(final):
+        started.set()
+        await asyncio.sleep(10)
+
+    for name in ("log_debug", "log_info"):
+        monkeypatch.setattr(message_queue, name, lambda *a, **k: None)
+    monkeypatch.setattr(message_queue, "_process_item", slow_process)
+    monkeypatch.setattr(message_queue, "_merge_batch", lambda batch: batch[0])
+    monkeypatch.setattr(message_queue, "_engine_concurrency", lambda: 1)
+    monkeypatch.setattr(message_queue, "_slot_freed", None)
+
+    async def run():
+        queue = LaneQueue()
+        journal = QueueJournal(str(tmp_path / "queue.journal"))
+        journal.load()
+        monkeypatch.setattr(message_queue, "_queue", queue)
+        monkeypatch.setattr(message_queue, "_journal", journal)
+        message_queue._queue_item(_item(1, "a1", 1.0), NORMAL_PRIORITY)
+        message_queue._queue_item(_item(1, "a2", 1000.0), NORMAL_PRIORITY)
+        worker = asyncio.ensure_future(message_queue._consumer_loop(0))
+        await started.wait()
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        await journal.close()
+        # The interrupted message is still first in its chat
+        _, _, batch = await queue.get_batch()
+        return batch, journal
+
+    batch, journal = asyncio.run(run())
+    assert [item["context"]["text"] for item in batch] == ["a1"]
+    assert journal.stats()["pending"] == 2
+    assert len(QueueJournal(journal.path).load()) == 2
+
+
+def test_merge_batch_leaves_the_batch_untouched():
+    batch = [
+        _item(1, "a", 1.0),
+        _item(1, "b", 1.0),
+    ]
+    batch[0]["message"].from_user = SimpleNamespace(id=1, username="u1")
+    batch[1]["message"].from_user = SimpleNamespace(id=2, username="u2")
+
+    first = message_queue._merge_batch(batch)
+    again = message_queue._merge_batch(batch)
+
+    assert first["message"].text == again["message"].text == "@u1: a\n@u2: b"
+    assert batch[0]["message"].text == "a"
+
+
+def test_cancelled_slot_waiter_does_not_leak_a_slot(monkeypatch):
+    monkeypatch.setattr(message_queue, "_engine_concurrency", lambda: 1)
+    monkeypatch.setattr(message_queue, "_slot_freed", None)
+    monkeypatch.setattr(message_queue, "_active_workers", 0)
+
+    async def run():
+        await message_queue._acquire_slot()
+        waiter = asyncio.ensure_future(message_queue._acquire_slot())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        message_queue._release_slot()
+        await asyncio.wait_for(message_queue._acquire_slot(), 0.1)
+        return message_queue._active_workers
+
+    assert asyncio.run(run()) == 1
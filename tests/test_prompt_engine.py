@@ -28,3 +28,100 @@ def test_build_json_prompt_reply_without_text(monkeypatch):
     assert (
         result["input"]["payload"]["reply_message_id"]["text"] == "[Non-text content]"
     )
+
+
+def _silence_reducer_logs(monkeypatch):
+    import core.prompt_engine as prompt_engine
+
+    for name in ("log_debug", "log_warning", "log_error"):
+        monkeypatch.setattr(prompt_engine, name, lambda *a, **k: None)
+    return prompt_engine
+
+
+def test_reduce_prompt_trims_oldest_items_without_mutating(monkeypatch):
+    prompt_engine = _silence_reducer_logs(monkeypatch)
+    from core.json_utils import dumps
+
+    prompt = {
+        "context": {
+            "chat_history": [{"text": "m" * 50} for _ in range(10)],
+            "memories": [{"content": "x" * 80} for _ in range(5)],
+        },
+        "input": {"text": "hello"},
+        "instructions": "i" * 200,
+        "actions": {},
+    }
+    history_size = len(dumps(prompt["context"]["chat_history"]))
+    memories_size = len(dumps(prompt["context"]["memories"]))
+    limit = len(dumps(prompt)) - memories_size - history_size // 2
+
+    reduced = prompt_engine.reduce_prompt_for_llm_limit(prompt, limit)
+
+    assert len(prompt["context"]["memories"]) == 5
+    assert len(prompt["context"]["chat_history"]) == 10
+    assert "memories" in reduced["context"] and reduced["context"]["memories"] == []
+    kept = reduced["context"]["chat_history"]
+    assert kept == prompt["context"]["chat_history"][: len(kept)]
+    assert len(dumps(reduced)) <= limit
+    # Keeping one more message would have exceeded the limit
+    bigger = dict(reduced, context=dict(reduced["context"], chat_history=prompt["context"]["chat_history"][: len(kept) + 1]))
+    assert len(dumps(bigger)) > limit
+
+
+def test_prompt_sizes_match_serialized_length(monkeypatch):
+    prompt_engine = _silence_reducer_logs(monkeypatch)
+    from core.json_utils import dumps
+
+    prompt = {
+        "context": {"bio": "é\n\"q\"", "chat_history": [{"a": 1}, {"b": [1, 2]}]},
+        "input": {"payload": {"text": "hi"}},
+        "instructions": "do things",
+    }
+    sizes = prompt_engine._PromptSizes(prompt)
+    assert sizes.total() == len(dumps(prompt))
+    breakdown = sizes.breakdown()
+    assert breakdown["total"] == len(dumps(prompt))
+    assert set(breakdown["context"]) == {"bio", "chat_history"}
+
+    sizes.drop_context("bio")
+    del prompt["context"]["bio"]
+    assert sizes.total() == len(dumps(prompt))
+
+
+def test_static_prompt_block_is_spliced_and_invalidated(monkeypatch):
+    import core.prompt_engine as prompt_engine
+    from core.core_initializer import core_initializer
+    from core.json_utils import dumps
+
+    monkeypatch.setattr(prompt_engine, "log_debug", lambda *a, **k: None)
+    monkeypatch.setattr(
+        core_initializer,
+        "actions_block",
+        {"available_actions": {"message_test": {"description": "Send é \"quoted\""}}},
+    )
+    prompt_engine.invalidate_static_prompt_block()
+
+    block = prompt_engine.get_static_prompt_block()
+    assert prompt_engine.get_static_prompt_block() is block
+
+    prompt = {
+        "instructions": block.instructions,
+        "actions": block.actions,
+        "context": {"chat_history": [{"text": "hi\n"}]},
+        "input": {"payload": {"text": "ciao"}},
+    }
+    prefix, suffix = prompt_engine.serialize_prompt_parts(prompt)
+    assert prefix == "{" + block.fragment
+    assert prefix + suffix == dumps(prompt)
+    sanitized = prompt_engine.sanitize_prompt(prompt)
+    assert sanitized["actions"] is block.actions
+    assert prompt_engine.serialize_prompt(sanitized) == dumps(prompt)
+
+    # A prompt whose sections were replaced is serialized normally
+    changed = dict(prompt, actions={})
+    assert prompt_engine.serialize_prompt_parts(changed) == ("", dumps(changed))
+
+    prompt_engine.invalidate_static_prompt_block()
+    rebuilt = prompt_engine.get_static_prompt_block()
+    assert rebuilt is not block
+    assert rebuilt.version == block.version + 1
@@ -0,0 +1,67 @@
+import asyncio
+
+from core import db, rate_limit
+from core.rate_limit import DatabaseBackend, MemoryBackend, _gcra
+
+
+def test_gcra_allows_burst_then_reports_retry_after():
+    now = 1000.0
+    tat = None
+    for _ in range(3):
+        allowed, retry_after, tat = _gcra(tat, now, emission=20.0, window=60.0)
+        assert allowed and retry_after == 0.0
+
+    allowed, retry_after, _ = _gcra(tat, now, emission=20.0, window=60.0)
+    assert not allowed
+    assert retry_after == 20.0
+
+    allowed, _, _ = _gcra(tat, now + 20.0, emission=20.0, window=60.0)
+    assert allowed
+
+
+def test_memory_backend_evicts_idle_buckets():
+    backend = MemoryBackend()
+    backend.update(("llm", 1), 0.0, 10.0, 30.0, consume=True)
+    backend.update(("llm", 2), 50.0, 10.0, 30.0, consume=True)
+    assert len(backend) == 2
+    assert backend.evict_idle(20.0) == 1
+    assert len(backend) == 1
+
+
+def test_check_uses_caller_trainer_flag(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiter", rate_limit._RateLimiter())
+
+    def fail():
+        raise AssertionError("registry should not be consulted")
+
+    monkeypatch.setattr(rate_limit, "get_interface_registry", fail)
+
+    async def run():
+        results = []
+        for _ in range(3):
+            results.append(await rate_limit.check("llm", 7, "webui", 4, 60, 0.5, is_trainer=False))
+        return results
+
+    results = asyncio.run(run())
+    assert [allowed for allowed, _ in results] == [True, True, False]
+    assert 0 < results[2][1] <= 30.0
+
+
+def test_unlimited_quota_is_always_allowed():
+    assert rate_limit._limiter.check("llm", 1, "webui", float("inf"), 1, 1.0, is_trainer=False) == (True, 0.0)
+
+
+def test_database_backend_falls_back_to_memory(monkeypatch):
+    def broken_acquire():
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(db, "acquire", broken_acquire)
+    monkeypatch.setattr(rate_limit, "log_warning", lambda *a, **k: None)
+    fallback = MemoryBackend()
+    backend = DatabaseBackend(fallback)
+
+    async def run():
+        return await backend.update_async(("llm", 1), 0.0, 10.0, 10.0, consume=True)
+
+    assert asyncio.run(run()) == (True, 0.0)
+    assert len(fallback) == 1
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from core import recent_chats
+
+
+class _FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    async def execute(self, query, params=None):
+        self.log.append((" ".join(query.split()), list(params or ())))
+
+
+def _fake_acquire(log):
+    class FakeConn:
+        @asynccontextmanager
+        async def cursor(self, *args):
+            yield _FakeCursor(log)
+
+        async def commit(self):
+            pass
+
+    @asynccontextmanager
+    async def acquire():
+        yield FakeConn()
+
+    return acquire
+
+
+def _reset(monkeypatch, log):
+    async def no_tables():
+        pass
+
+    monkeypatch.setattr(recent_chats, "acquire", _fake_acquire(log))
+    monkeypatch.setattr(recent_chats, "ensure_core_tables", no_tables)
+    monkeypatch.setattr(recent_chats, "_activity", {})
+    monkeypatch.setattr(recent_chats, "_pending", {})
+    monkeypatch.setattr(recent_chats, "_metadata", {})
+    monkeypatch.setattr(recent_chats, "_seeded", True)
+    monkeypatch.setattr(recent_chats, "_flush_task", None)
+    monkeypatch.setattr(recent_chats, "log_debug", lambda *a, **k: None)
+
+
+def test_activity_is_coalesced_into_one_upsert(monkeypatch):
+    log = []
+    _reset(monkeypatch, log)
+
+    async def run():
+        for chat_id in (1, 2, 1, 3, 1):
+            await recent_chats.track_chat(chat_id, "telegram_bot", metadata=f"chat {chat_id}")
+        latest = await recent_chats.get_last_active_chats(2)
+        assert log == []
+        await recent_chats.shutdown()
+        return latest
+
+    latest = asyncio.run(run())
+    assert len(log) == 1
+    query, params = log[0]
+    assert query.startswith("INSERT INTO recent_chats")
+    assert sorted(params[0::2]) == ["1", "2", "3"]
+    assert latest[0] == "1"
+    assert recent_chats._metadata["3"] == "chat 3"
+
+
+def test_failed_flush_keeps_pending_updates(monkeypatch):
+    log = []
+    _reset(monkeypatch, log)
+    monkeypatch.setattr(recent_chats, "log_warning", lambda *a, **k: None)
+
+    @asynccontextmanager
+    async def broken_acquire():
+        raise ConnectionError("database down")
+        yield
+
+    async def run():
+        await recent_chats.track_chat(7, "webui")
+        monkeypatch.setattr(recent_chats, "acquire", broken_acquire)
+        assert await recent_chats.flush_activity() == 0
+        assert "7" in recent_chats._pending
+        monkeypatch.setattr(recent_chats, "acquire", _fake_acquire(log))
+        return await recent_chats.flush_activity()
+
+    assert asyncio.run(run()) == 1
+    assert recent_chats._pending == {}
+
+
+def test_chat_paths_are_saved_once_per_burst(monkeypatch, tmp_path):
+    path = tmp_path / "chat_paths.json"
+    monkeypatch.setattr(recent_chats, "_CHAT_MAP_PATH", path)
+    monkeypatch.setattr(recent_chats, "chat_path_map", {})
+    monkeypatch.setattr(recent_chats, "CHAT_PATH_SAVE_DELAY", 60)
+    writes = []
+    original = recent_chats._save_chat_paths
+    monkeypatch.setattr(recent_chats, "_save_chat_paths", lambda: (writes.append(1), original()))
+    monkeypatch.setattr(recent_chats, "log_debug", lambda *a, **k: None)
+
+    for i in range(5):
+        recent_chats.set_chat_path(i, f"/c/{i}")
+    recent_chats.clear_chat_path(0)
+    assert writes == []
+
+    recent_chats.flush_chat_paths()
+    assert writes == [1]
+    assert json.loads(path.read_text()) == {str(i): f"/c/{i}" for i in range(1, 5)}
+    assert not (tmp_path / "chat_paths.json.tmp").exists()
+
+
+def test_change_during_timer_write_is_saved_by_the_same_timer(monkeypatch, tmp_path):
+    path = tmp_path / "chat_paths.json"
+    monkeypatch.setattr(recent_chats, "_CHAT_MAP_PATH", path)
+    monkeypatch.setattr(recent_chats, "chat_path_map", {})
+    monkeypatch.setattr(recent_chats, "CHAT_PATH_SAVE_DELAY", 0.01)
+    monkeypatch.setattr(recent_chats, "log_debug", lambda *a, **k: None)
+    written = []
+    original = recent_chats._write_chat_paths
+
+    def slow_write(data):
+        if not written:
+            # Arrives after the snapshot, while the timer is still alive
+            recent_chats.set_chat_path(2, "/c/2")
+        written.append(dict(data))
+        original(data)
+
+    monkeypatch.setattr(recent_chats, "_write_chat_paths", slow_write)
+
+    recent_chats.set_chat_path(1, "/c/1")
+    timer = recent_chats._path_timer
+    timer.join(1)
+
+    assert written == [{"1": "/c/1"}, {"1": "/c/1", "2": "/c/2"}]
+    assert json.loads(path.read_text()) == {"1": "/c/1", "2": "/c/2"}
+    assert recent_chats._path_timer is None
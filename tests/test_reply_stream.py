@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+
+from core.reply_stream import ReplyStream, partial_action_text
+
+REPLY = json.dumps(
+    {
+        "actions": [
+            {"type": "message_telegram_bot", "payload": {"text": "not this one"}},
+            {"type": "message_ollama_serve", "payload": {"text": "Ciao \"mondo\"\nè 😀 ok", "target": "x"}},
+        ]
+    }
+)
+
+
+def test_partial_action_text_decodes_what_has_arrived():
+    final = json.loads(REPLY)["actions"][1]["payload"]["text"]
+    seen = [partial_action_text(REPLY[:cut], "message_ollama_serve") for cut in range(len(REPLY) + 1)]
+    assert seen[-1] == final
+    # Every snapshot is a prefix of the final text, never a garbled escape
+    assert all(final.startswith(text) for text in seen)
+    assert partial_action_text(REPLY, "message_discord_bot") == ""
+
+
+def test_deltas_reach_the_subscriber_loop():
+    stream = ReplyStream()
+    received = []
+
+    async def main():
+        stream.subscribe("ollama_serve", "chat-1", received.append)
+        assert stream.begin("ollama_serve", "other") is None
+        feed = stream.begin("ollama_serve", 'chat-1')
+
+        def engine():
+            # Snapshots come from the browser worker thread
+            for cut in (40, 90, 120, len(REPLY), len(REPLY)):
+                feed(REPLY[:cut])
+
+        thread = threading.Thread(target=engine)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        stream.unsubscribe("ollama_serve", "chat-1")
+        assert stream.begin("ollama_serve", "chat-1") is None
+
+    asyncio.run(main())
+    assert "".join(received) == json.loads(REPLY)["actions"][1]["payload"]["text"]
+    assert all(received)
+
+
+def test_paused_chat_gets_no_preview():
+    stream = ReplyStream()
+    received = []
+
+    async def main():
+        stream.subscribe("ollama_serve", "chat-1", received.append)
+        feed = stream.begin("ollama_serve", "chat-1")
+        feed(REPLY[:REPLY.index("Ciao") + 4])
+        stream.pause("chat-1")
+        stream.pause("chat-1")
+        # Neither the reply in progress nor a regenerated one streams
+        feed(REPLY)
+        assert stream.begin("ollama_serve", "chat-1") is None
+        stream.resume("chat-1")
+        assert stream.begin("ollama_serve", "chat-1") is None
+        stream.resume("chat-1")
+        await asyncio.sleep(0)
+        before = "".join(received)
+        stream.begin("ollama_serve", "chat-1")(REPLY)
+        await asyncio.sleep(0)
+        return before
+
+    before = asyncio.run(main())
+    final = json.loads(REPLY)["actions"][1]["payload"]["text"]
+    assert before and final.startswith(before) and before != final
+    assert "".join(received) == before + final
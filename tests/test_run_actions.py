@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core import action_parser
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    for name in ("log_debug", "log_info", "log_warning", "log_error"):
+        monkeypatch.setattr(action_parser, name, lambda *a, **k: None)
+    monkeypatch.setattr(action_parser, "validate_action", lambda action, *a: (action.get("type") != "bad", ["bad"]))
+
+    async def no_diary(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(action_parser, "_create_diary_entry_for_actions", no_diary)
+
+    events = []
+
+    async def fake_execute(action, context, bot, message):
+        payload = action["payload"]
+        events.append(("start", payload["id"]))
+        await asyncio.sleep(payload.get("delay", 0.05))
+        events.append(("end", payload["id"]))
+        return payload.get("result")
+
+    monkeypatch.setattr(action_parser, "_execute_action", fake_execute)
+    return events
+
+
+def _message():
+    return SimpleNamespace(chat_id=1, thread_id=None, message_id=1)
+
+
+def test_independent_actions_overlap_but_chat_order_is_kept(executed):
+    actions = [
+        {"type": "message_telegram_bot", "payload": {"id": "m1", "target": 1, "delay": 0.1}},
+        {"type": "bio_update", "payload": {"id": "bio"}},
+        {"type": "message_telegram_bot", "payload": {"id": "m2", "target": 1}},
+        {"type": "bad", "payload": {"id": "x"}},
+        {"type": "persona_like", "payload": {"id": "persona"}},
+    ]
+
+    result = asyncio.run(action_parser.run_actions(actions, {}, None, _message()))
+
+    assert [a["payload"]["id"] for a in result["processed"]] == ["m1", "bio", "m2", "persona"]
+    assert [f["index"] for f in result["failed_actions"]] == [3]
+    # Messages to the same chat never overlap
+    assert executed.index(("end", "m1")) < executed.index(("start", "m2"))
+    # Independent actions started before the first message finished
+    assert executed.index(("start", "bio")) < executed.index(("end", "m1"))
+    assert executed.index(("start", "persona")) < executed.index(("end", "m1"))
+    assert [t["index"] for t in result["timings"]] == [0, 1, 2, 4]
+    assert all(t["duration_ms"] >= 0 for t in result["timings"])
+
+
+def test_terminal_is_a_barrier(executed, monkeypatch):
+    async def no_delivery(**kwargs):
+        return None
+
+    monkeypatch.setattr("core.auto_response.request_llm_delivery", no_delivery)
+    actions = [
+        {"type": "bio_update", "payload": {"id": "before"}},
+        {"type": "terminal", "payload": {"id": "term", "command": "ls", "result": "out"}},
+        {"type": "message_telegram_bot", "payload": {"id": "after", "target": 1}},
+    ]
+
+    result = asyncio.run(action_parser.run_actions(actions, {"interface": "telegram_bot"}, None, _message()))
+
+    assert executed == [("start", "before"), ("end", "before"), ("start", "term"), ("end", "term")]
+    assert result["action_outputs"] == [{"type": "terminal", "command": "ls", "output": "out"}]
+    assert [a["payload"]["id"] for a in result["processed"]] == ["before", "term"]
+
+
+def test_targeted_non_message_actions_share_the_chat_lane(executed):
+    actions = [
+        {"type": "message_telegram_bot", "payload": {"id": "text", "target": 1, "delay": 0.1}},
+        {"type": "audio_telegram_bot", "payload": {"id": "voice", "target": 1}},
+        {"type": "audio_telegram_bot", "payload": {"id": "other", "target": 2}},
+    ]
+
+    asyncio.run(action_parser.run_actions(actions, {}, None, _message()))
+
+    assert executed.index(("end", "text")) < executed.index(("start", "voice"))
+    assert executed.index(("start", "other")) < executed.index(("end", "text"))
@@ -0,0 +1,126 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core import action_parser
+
+
+@pytest.fixture(autouse=True)
+def _isolated_injectors(monkeypatch):
+    for name in ("log_debug", "log_warning", "log_error"):
+        monkeypatch.setattr(action_parser, name, lambda *a, **k: None)
+    monkeypatch.setattr(action_parser, "_STATIC_INJECTORS", None)
+    monkeypatch.setattr(action_parser, "_STATIC_INJECTORS_SOURCE", None)
+    monkeypatch.setattr(action_parser, "_static_injection_cache", action_parser.OrderedDict())
+    monkeypatch.setattr(action_parser, "_static_injection_inflight", {})
+
+
+class _Injector:
+    def __init__(self, key, delay=0.0, static_injection_timeout=None):
+        self.key = key
+        self.delay = delay
+        self.calls = 0
+        self.static_injection_timeout = static_injection_timeout
+
+    def get_supported_action_types(self):
+        return ["static_inject"]
+
+    async def get_static_injection(self, message=None, context_memory=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {self.key: self.calls}
+
+
+def _use_plugins(monkeypatch, plugins):
+    monkeypatch.setattr(action_parser, "_load_action_plugins", lambda: plugins)
+
+
+def test_injectors_run_concurrently(monkeypatch):
+    plugins = [_Injector("a", 0.2), _Injector("b", 0.2), _Injector("c", 0.2), object()]
+    _use_plugins(monkeypatch, plugins)
+    message = SimpleNamespace(chat_id=1, thread_id=None)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await action_parser.gather_static_injections(message, {})
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == {"a": 1, "b": 1, "c": 1}
+    assert elapsed < 0.5
+    assert action_parser._static_injectors() == plugins[:3]
+
+
+def test_slow_injector_serves_last_good_value(monkeypatch):
+    slow = _Injector("slow", 0.0, static_injection_timeout=0.05)
+    _use_plugins(monkeypatch, [slow])
+    message = SimpleNamespace(chat_id=7, thread_id=None)
+
+    async def run():
+        first = await action_parser.gather_static_injections(message, {})
+        slow.delay = 0.3
+        second = await action_parser.gather_static_injections(message, {})
+        # The late call finishes in the background and refreshes the cache
+        await asyncio.sleep(0.4)
+        slow.delay = 0.0
+        third = await action_parser.gather_static_injections(message, {})
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == {"slow": 1}
+    assert second == {"slow": 1}
+    assert third == {"slow": 3}
+    assert action_parser._static_injection_cache[(id(slow), "7", "None")] == {"slow": 3}
+
+
+class _SyncInjector(_Injector):
+    def get_static_injection(self, message=None, context_memory=None):
+        import time
+
+        self.calls += 1
+        time.sleep(self.delay)
+        return {self.key: self.calls}
+
+
+def test_sync_injectors_run_off_loop_within_deadline(monkeypatch):
+    plugins = [_SyncInjector("a", 0.2), _SyncInjector("b", 0.2), _SyncInjector("c", 0.5, 0.05)]
+    _use_plugins(monkeypatch, plugins)
+    message = SimpleNamespace(chat_id=1, thread_id=None, message_id=1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await action_parser.gather_static_injections(message, {})
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+    assert result == {"a": 1, "b": 1}
+    assert elapsed < 0.4
+
+
+def test_inflight_call_not_shared_across_messages(monkeypatch):
+    seen = []
+
+    class _Recording(_Injector):
+        async def get_static_injection(self, message=None, context_memory=None):
+            seen.append(message.message_id)
+            await asyncio.sleep(self.delay)
+            return {self.key: message.message_id}
+
+    plugin = _Recording("who", 0.1)
+    _use_plugins(monkeypatch, [plugin])
+
+    async def run():
+        first = SimpleNamespace(chat_id=1, thread_id=None, message_id=1)
+        second = SimpleNamespace(chat_id=1, thread_id=None, message_id=2)
+        return await asyncio.gather(
+            action_parser.gather_static_injections(first, {}),
+            action_parser.gather_static_injections(second, {}),
+        )
+
+    first, second = asyncio.run(run())
+    assert first == {"who": 1}
+    assert second == {"who": 2}
+    assert seen == [1, 2]
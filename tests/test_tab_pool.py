@@ -0,0 +1,72 @@
+import asyncio
+
+from core import db  # noqa: F401  (registers the database config first)
+from core.tab_pool import TabPool
+
+
+def test_tab_stays_pinned_to_its_conversation():
+    pool = TabPool(size=2, max_uses=10)
+
+    async def main():
+        a = await pool.acquire("a")
+        a.handle = "h-a"
+        await pool.release(a)
+        b = await pool.acquire("b")
+        await pool.release(b)
+        again = await pool.acquire("a")
+        assert again is a and again.handle == "h-a"
+        await pool.release(again)
+
+    asyncio.run(main())
+    assert pool.stats() == {"size": 2, "tabs": 2, "busy": 0, "waiting": 0}
+
+
+def test_least_recently_used_tab_is_reassigned():
+    pool = TabPool(size=2, max_uses=10)
+
+    async def main():
+        a = await pool.acquire("a")
+        await pool.release(a)
+        b = await pool.acquire("b")
+        await pool.release(b)
+        c = await pool.acquire("c")
+        assert c is a and c.key == "c"
+        assert pool.pinned("a") is None and pool.pinned("b") is b
+
+    asyncio.run(main())
+
+
+def test_busy_conversation_waits_for_its_own_tab():
+    pool = TabPool(size=2, max_uses=10)
+    order = []
+
+    async def user(key, label):
+        tab = await pool.acquire(key)
+        order.append(("start", label))
+        await asyncio.sleep(0.01)
+        order.append(("end", label))
+        await pool.release(tab)
+
+    async def main():
+        await asyncio.gather(user("a", 1), user("a", 2), user("b", 3))
+
+    asyncio.run(main())
+    # Same chat runs one message at a time; the other chat runs alongside
+    assert order.index(("end", 1)) < order.index(("start", 2))
+    assert order.index(("start", 3)) < order.index(("end", 1))
+    assert pool.stats()["tabs"] == 2
+
+
+def test_failed_or_worn_tabs_are_recycled():
+    pool = TabPool(size=1, max_uses=2)
+
+    async def main():
+        tab = await pool.acquire("a")
+        assert await pool.release(tab, ok=False) is True
+        tab = await pool.acquire("a")
+        assert await pool.release(tab) is False
+        tab = await pool.acquire("a")
+        assert await pool.release(tab) is True
+        assert pool.stats()["tabs"] == 0
+
+    asyncio.run(main())